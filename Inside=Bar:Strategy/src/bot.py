@@ -77,6 +77,7 @@ except ImportError:
 from src.market_data import MarketData
 from src.strategies import SupertrendADXStrategy, InsideBarStrategy
 from src.integrations.order_manager import OrderManager
+from src.utils.symbols import to_bitget
 
 logger = logging.getLogger(__name__)
 
@@ -1279,7 +1280,7 @@ class TradingBot:
                 while retry_count <= max_retries:
                     try:
                         # Convert symbol format if needed (e.g., 'BTC/USDT' to 'BTCUSDT_UMCBL')
-                        formatted_symbol = symbol.replace('/', '') + '_UMCBL'
+                        formatted_symbol = to_bitget(symbol)
                         
                         # Check if there's still an active position
                         position_endpoint = f"/api/mix/v1/position/singlePosition?symbol={formatted_symbol}&marginCoin=USDT"
@@ -10,10 +10,14 @@ import time
 import hmac
 import hashlib
 import base64
+import math
+import threading
 from urllib.parse import urlencode
 from typing import Dict, List, Optional, Union
 from functools import wraps
 
+from src.utils.symbols import BITGET_SUFFIX, from_bitget, to_bitget
+
 logger = logging.getLogger(__name__)
 
 # Global flag to track method calls and prevent duplicate orders
@@ -79,6 +83,153 @@ def prevent_duplicate_orders(func):
     return wrapper
 
 
+BITGET_BASE_URL = "https://api.bitget.com"
+CONTRACTS_ENDPOINT = "/api/mix/v1/market/contracts"
+
+# Known Bitget USDT-M contracts, used until the contracts endpoint has answered
+FALLBACK_BITGET_SYMBOLS = frozenset(f"{symbol}{BITGET_SUFFIX}" for symbol in [
+    'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'DOGEUSDT', 'ADAUSDT', 'SOLUSDT', 'MATICUSDT',
+    'DOTUSDT', 'LTCUSDT', 'AVAXUSDT', 'LINKUSDT', 'UNIUSDT', 'ATOMUSDT', 'ETCUSDT',
+    'TRXUSDT', 'EOSUSDT', 'FILUSDT', 'XLMUSDT', 'NEARUSDT', 'APEUSDT', 'SANDUSDT',
+    'MANAUSDT', 'AAVEUSDT', 'FTMUSDT', 'LUNCUSDT', 'SHIBUSDT', 'PEPEUSDT', 'FLOKIUSDT',
+    'BONKUSDT', 'XECUSDT', 'SATSUSDT', 'OPUSDT', 'ARBUSDT', 'SUIUSDT', 'APTUSDT',
+    'INJUSDT', 'GMTUSDT', 'AXSUSDT', 'GALAUSDT', 'ICPUSDT', 'LDOUSDT', 'RUNEUSDT',
+    'SNXUSDT', 'CHZUSDT', 'GRTUSDT', 'ENJUSDT', 'STXUSDT', 'IMXUSDT', 'CFXUSDT',
+    'FETUSDT', 'FLOWUSDT', 'MINAUSDT', 'BNBUSDT', 'BCHUSDT', 'DASHUSDT', 'ZECUSDT'
+])
+
+
+class ContractMetadataCache:
+    """
+    Bitget USDT-M contract specifications keyed by Bitget symbol ('BTCUSDT_UMCBL')
+    
+    Loaded once from the public contracts endpoint and refreshed after
+    CONTRACTS_CACHE_TTL seconds, so symbol validation and price/size rounding
+    are dict lookups instead of per-order requests. In test mode (TEST_MODE)
+    the endpoint is never called and the fallback rules apply.
+    """
+    
+    def __init__(self, ttl: Optional[float] = None, fetch=None):
+        """
+        Initialize the cache
+        
+        Args:
+            ttl: Seconds before the contracts are reloaded (default: CONTRACTS_CACHE_TTL env, 3600)
+            fetch: Callable returning the raw contract list (default: Bitget contracts endpoint)
+        """
+        self.ttl = ttl if ttl is not None else float(os.getenv('CONTRACTS_CACHE_TTL', '3600'))
+        self.retry_interval = min(60.0, self.ttl)
+        self._fetch = fetch or self._fetch_contracts
+        self._remote = fetch is None
+        self._contracts: Dict[str, Dict] = {}
+        self._loaded = False
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _fetch_contracts() -> List[Dict]:
+        """Raw contract list from Bitget (public endpoint, no signature)"""
+        response = requests.get(f"{BITGET_BASE_URL}{CONTRACTS_ENDPOINT}", params={"productType": "umcbl"}, timeout=10)
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('code') != '00000':
+            raise ValueError(f"Bitget API error: {payload.get('msg', 'Unknown error')} (code: {payload.get('code')})")
+        return payload.get('data') or []
+    
+    @staticmethod
+    def parse_contract(contract: Dict) -> Dict:
+        """
+        Extract the trading rules of one contract
+        
+        Args:
+            contract: Contract entry from the contracts endpoint
+            
+        Returns:
+            Dict: symbol, price_place, tick_size, volume_place, lot_size, min_size, min_notional, max_leverage
+        """
+        price_place = int(contract.get('pricePlace', 4))
+        volume_place = int(contract.get('volumePlace', 4))
+        max_leverage = contract.get('maxLever') or contract.get('maxLeverage')
+        return {
+            'symbol': contract.get('symbol', ''),
+            'price_place': price_place,
+            'tick_size': float(contract.get('priceEndStep', 1) or 1) * 10 ** -price_place,
+            'volume_place': volume_place,
+            'lot_size': float(contract.get('sizeMultiplier') or 10 ** -volume_place),
+            'min_size': float(contract.get('minTradeNum', 0) or 0),
+            'min_notional': float(contract.get('minTradeUSDT', 5) or 5),
+            'max_leverage': int(float(max_leverage)) if max_leverage else None
+        }
+    
+    def refresh(self) -> bool:
+        """
+        Reload the contracts now
+        
+        Returns:
+            bool: True if the contracts were loaded
+        """
+        try:
+            contracts = {}
+            for contract in self._fetch():
+                info = self.parse_contract(contract)
+                contracts[info['symbol']] = info
+        except Exception as e:
+            logger.warning(f"Could not load Bitget contract metadata: {str(e)}")
+            with self._lock:
+                self._next_refresh = time.monotonic() + self.retry_interval
+            return False
+        
+        with self._lock:
+            self._contracts = contracts
+            self._loaded = True
+            self._next_refresh = time.monotonic() + self.ttl
+        logger.info(f"Loaded metadata for {len(contracts)} Bitget contracts")
+        return True
+    
+    def _ensure_fresh(self) -> None:
+        """Reload stale contracts; one caller refreshes while the others keep the current ones"""
+        if self._remote and os.getenv('TEST_MODE', 'false').lower() == 'true':
+            return
+        with self._lock:
+            if time.monotonic() < self._next_refresh:
+                return
+            # Claim the refresh before fetching so concurrent callers do not start their own
+            self._next_refresh = time.monotonic() + self.retry_interval
+        self.refresh()
+    
+    @property
+    def loaded(self) -> bool:
+        self._ensure_fresh()
+        return self._loaded
+    
+    def get(self, symbol: str) -> Optional[Dict]:
+        """
+        Trading rules of a symbol in any supported notation
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT' or 'BTCUSDT_UMCBL')
+            
+        Returns:
+            Optional[Dict]: Contract rules (see parse_contract), or None if unknown
+        """
+        self._ensure_fresh()
+        key = to_bitget(symbol)
+        return self._contracts.get(key) if key else None
+    
+    def is_listed(self, symbol: str) -> bool:
+        """Whether Bitget lists the symbol (the fallback list is used until contracts are loaded)"""
+        key = to_bitget(symbol)
+        if key is None:
+            return False
+        if self.loaded:
+            return key in self._contracts
+        return key in FALLBACK_BITGET_SYMBOLS
+
+
+# Shared by every TradingAPI instance
+contract_cache = ContractMetadataCache()
+
+
 class TradingAPI:
     """
     Trading API client for Bitget exchange
@@ -86,69 +237,23 @@ class TradingAPI:
 
     def _format_symbol_for_bitget(self, symbol: str) -> str:
         """
-        BULLETPROOF symbol formatting for Bitget API
-        Handles ALL special cases consistently across ALL API calls
-        """
-        logger.info(f"🔧 SYMBOL FORMATTING: Input symbol: '{symbol}'")
+        Format a trading pair as a Bitget USDT-M futures symbol
         
-        if not symbol:
-            logger.info(f"🔧 SYMBOL FORMATTING: Empty symbol, returning as-is")
-            return symbol
+        Handles already formatted symbols and the 1000x-prefixed Binance names
+        (see src.utils.symbols); the result is memoized.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT' or '1000SHIB/USDT')
             
-        # Handle already formatted symbols
-        if symbol.endswith('_UMCBL'):
-            logger.info(f"🔧 SYMBOL FORMATTING: Already formatted, returning: '{symbol}'")
+        Returns:
+            str: Bitget symbol (e.g., 'BTCUSDT_UMCBL'), or None if not supported on Bitget
+        """
+        if not symbol:
             return symbol
-            
-        # Extract base currency from trading pair
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            logger.info(f"🔧 SYMBOL FORMATTING: Extracted base currency from '/': '{base_currency}'")
-        else:
-            base_currency = symbol.replace('USDT', '').replace('_UMCBL', '')
-            logger.info(f"🔧 SYMBOL FORMATTING: Extracted base currency from string: '{base_currency}'")
-            
-        # Apply ALL special symbol mappings for Bitget
-        symbol_mappings = {
-            '1000LUNC': 'LUNC',
-            '1000SHIB': 'SHIB', 
-            '1000PEPE': 'PEPE',
-            '1000FLOKI': 'FLOKI',
-            '1000BONK': 'BONK',
-            '1000XEC': 'XEC',
-            '1000SATS': 'SATS',
-            'MATIC': 'MATIC',  # Ensure MATIC is properly mapped
-            'SC': None  # SC is not supported on Bitget, mark as None
-        }
         
-        # List of valid symbols on Bitget
-        self.valid_bitget_symbols = [
-            'BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'DOGEUSDT', 'ADAUSDT', 'SOLUSDT', 'MATICUSDT',
-            'DOTUSDT', 'LTCUSDT', 'AVAXUSDT', 'LINKUSDT', 'UNIUSDT', 'ATOMUSDT', 'ETCUSDT',
-            'TRXUSDT', 'EOSUSDT', 'FILUSDT', 'XLMUSDT', 'NEARUSDT', 'APEUSDT', 'SANDUSDT',
-            'MANAUSDT', 'AAVEUSDT', 'FTMUSDT', 'LUNCUSDT', 'SHIBUSDT', 'PEPEUSDT', 'FLOKIUSDT',
-            'BONKUSDT', 'XECUSDT', 'SATSUSDT', 'OPUSDT', 'ARBUSDT', 'SUIUSDT', 'APTUSDT',
-            'INJUSDT', 'GMTUSDT', 'AXSUSDT', 'GALAUSDT', 'ICPUSDT', 'LDOUSDT', 'RUNEUSDT',
-            'SNXUSDT', 'CHZUSDT', 'GRTUSDT', 'ENJUSDT', 'STXUSDT', 'IMXUSDT', 'CFXUSDT',
-            'FETUSDT', 'FLOWUSDT', 'MINAUSDT', 'BNBUSDT', 'BCHUSDT', 'DASHUSDT', 'ZECUSDT'
-        ]
-        
-        # Apply mapping if exists
-        if base_currency in symbol_mappings:
-            old_base = base_currency
-            base_currency = symbol_mappings[base_currency]
-            logger.info(f"🔧 SYMBOL FORMATTING: Mapped '{old_base}' -> '{base_currency}'")
-        else:
-            logger.info(f"🔧 SYMBOL FORMATTING: No mapping needed for '{base_currency}'")
-            
-        # Check if base currency is explicitly marked as unsupported
-        if base_currency is None:
+        formatted = to_bitget(symbol)
+        if formatted is None:
             logger.error(f"🔴 SYMBOL VALIDATION FAILED: '{symbol}' is not supported on Bitget")
-            return None
-            
-        # Return properly formatted Bitget futures symbol
-        formatted = f"{base_currency}USDT_UMCBL"
-        logger.info(f"🔧 SYMBOL FORMATTING: Final result: '{symbol}' -> '{formatted}'")
         return formatted
         
     def is_valid_symbol(self, symbol: str) -> bool:
@@ -161,34 +266,61 @@ class TradingAPI:
         Returns:
             bool: True if symbol is valid, False otherwise
         """
-        # Format the symbol first
-        formatted_symbol = self._format_symbol_for_bitget(symbol)
+        is_valid = contract_cache.is_listed(symbol)
+        if not is_valid:
+            logger.error(f"🔴 SYMBOL VALIDATION: '{symbol}' is not listed on Bitget")
+        return is_valid
+    
+    def round_price(self, symbol: str, price: float) -> float:
+        """
+        Round a price to the contract's tick size (5 decimals if the contract is unknown)
         
-        # If formatting returned None, symbol is explicitly unsupported
-        if formatted_symbol is None:
-            logger.error(f"🔴 SYMBOL VALIDATION: '{symbol}' is explicitly marked as unsupported")
-            return False
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            price: Price to round
             
-        # Extract the base currency for validation
-        base_currency = formatted_symbol.replace('USDT_UMCBL', '')
-        check_symbol = f"{base_currency}USDT"
-        
-        # Check if the symbol is in our valid symbols list
-        is_valid = check_symbol in self.valid_bitget_symbols
+        Returns:
+            float: Rounded price
+        """
+        contract = contract_cache.get(symbol)
+        if contract is None:
+            return round(price, 5)
+        return round(round(price / contract['tick_size']) * contract['tick_size'], contract['price_place'])
+    
+    def round_quantity(self, symbol: str, quantity: float) -> float:
+        """
+        Round a quantity down to the contract's lot size (4 decimals if the contract is unknown)
         
-        if not is_valid:
-            logger.error(f"🔴 SYMBOL VALIDATION: '{symbol}' (formatted as '{formatted_symbol}') is not in the list of valid Bitget symbols")
-        else:
-            logger.info(f"👍 SYMBOL VALIDATION: '{symbol}' is valid on Bitget")
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            quantity: Order size in base currency
             
-        return is_valid
+        Returns:
+            float: Rounded quantity
+            
+        Raises:
+            ValueError: If the rounded quantity is zero or below the contract's minimum size
+        """
+        contract = contract_cache.get(symbol)
+        if contract is None:
+            rounded = round(quantity, 4)
+            min_size = 0.0
+        else:
+            lot_size = contract['lot_size']
+            # The epsilon keeps float noise (0.3 / 0.1 = 2.9999...) from dropping a lot
+            rounded = round(math.floor(quantity / lot_size + 1e-9) * lot_size, contract['volume_place'])
+            min_size = contract['min_size']
+        
+        if rounded <= 0 or rounded < min_size:
+            raise ValueError(f"Order size {quantity} for {symbol} rounds to {rounded}, below the minimum of {min_size}")
+        return rounded
 
     def __init__(self):
         """Initialize the Bitget API client"""
         self.api_key = os.getenv('BITGET_API_KEY', '')
         self.api_secret = os.getenv('BITGET_API_SECRET', '')
         self.api_passphrase = os.getenv('BITGET_API_PASSPHRASE', '')
-        self.base_url = "https://api.bitget.com"
+        self.base_url = BITGET_BASE_URL
         self.is_configured = bool(self.api_key and self.api_secret and self.api_passphrase)
         
         # Determine whether to use test mode or not
@@ -396,18 +528,24 @@ class TradingAPI:
             hold_side = "long"
             logger.warning(f"Unclear side '{side}', defaulting to long")
         
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
+        
         # Order parameters
         params = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "side": order_side,
             "orderType": "market" if price is None else "limit",
-            "size": str(quantity),
+            "size": str(size),
             "holdSide": hold_side
         }
         
         if price is not None:
-            params["price"] = str(round(price, 5))
+            params["price"] = str(self.round_price(symbol, price))
         
         logger.info(f"Direct order: {params}")
         
@@ -447,31 +585,10 @@ class TradingAPI:
         results = {"take_profit": None, "stop_loss": None}
         
         try:
-            # Round prices to 5 decimal places to comply with Bitget requirements
-            rounded_tp = round(take_profit, 5)
-            rounded_sl = round(stop_loss, 5)
-            
-            # Get symbol info to ensure price complies with tick size
-            try:
-                endpoint = f"/api/mix/v1/market/contracts?productType=umcbl"
-                contracts_info = self._make_request("GET", endpoint)
-                
-                if 'error' not in contracts_info and 'data' in contracts_info:
-                    # Find the contract info for our symbol
-                    for contract in contracts_info.get('data', []):
-                        if contract.get('symbol') == formatted_symbol:
-                            # Extract tick size from pricePlace field
-                            price_place = int(contract.get('pricePlace', 4))
-                            tick_size = 10 ** -price_place
-                            
-                            # Ensure prices are multiples of tick size
-                            rounded_tp = round(rounded_tp / tick_size) * tick_size
-                            rounded_sl = round(rounded_sl / tick_size) * tick_size
-                            
-                            logger.info(f"Adjusted prices to tick size {tick_size}: TP={rounded_tp}, SL={rounded_sl}")
-                            break
-            except Exception as e:
-                logger.warning(f"Could not adjust prices to tick size: {str(e)}")
+            # Round prices to the contract tick size
+            rounded_tp = self.round_price(symbol, take_profit)
+            rounded_sl = self.round_price(symbol, stop_loss)
+            rounded_quantity = self.round_quantity(symbol, quantity)
             
             # Place Take Profit Order using plan order (conditional order)
             tp_params = {
@@ -479,7 +596,7 @@ class TradingAPI:
                 "marginCoin": "USDT",
                 "orderType": "market",
                 "side": close_side,
-                "size": str(round(quantity, 4)),
+                "size": str(rounded_quantity),
                 "triggerType": "market_price",
                 "triggerPrice": str(rounded_tp),
                 "planType": "profit",
@@ -507,7 +624,7 @@ class TradingAPI:
                 "marginCoin": "USDT",
                 "orderType": "market",
                 "side": close_side,
-                "size": str(round(quantity, 4)),
+                "size": str(rounded_quantity),
                 "triggerType": "market_price",
                 "triggerPrice": str(rounded_sl),
                 "planType": "stop",
@@ -720,7 +837,11 @@ class TradingAPI:
             
             # Set minimum size requirements based on asset (physical units)
             min_size = 0.01  # Default minimum size
-            if 'BTC' in symbol:
+            contract = contract_cache.get(symbol)
+            if contract is not None:
+                min_size = contract['min_size']
+                min_notional = contract['min_notional']
+            elif 'BTC' in symbol:
                 min_size = 0.001  # BTC minimum
             elif 'ETH' in symbol:
                 min_size = 0.01   # ETH minimum
@@ -791,52 +912,54 @@ class TradingAPI:
             logger.warning(f"Could not check account balance: {str(e)}")
         
         # Check if the symbol exists on Bitget and get price limits
-        try:
-            # Check if the symbol exists by getting its ticker info
-            ticker_endpoint = f"/api/mix/v1/market/ticker?symbol={formatted_symbol}"
-            ticker_info = self._make_request("GET", ticker_endpoint, signed=False)
-            
-            if 'error' in ticker_info or 'data' not in ticker_info or not ticker_info.get('data'):
-                error_msg = f"Symbol {formatted_symbol} does not exist on Bitget or has been removed"
-                logger.error(error_msg)
-                # Send Telegram notification for invalid symbol
-                from src.integrations.telegram import TelegramNotifier
-                telegram = TelegramNotifier()
-                telegram_message = f"⚠️ Trading Error: {symbol}\n\nThis symbol is not available on Bitget. Skipping trade."
-                telegram.send_message(telegram_message)
-                return {"error": error_msg}
-            
-            # Get price limits from ticker data
-            ticker_data = ticker_info.get('data', {})
-            if not isinstance(ticker_data, list):
-                ticker_data = [ticker_data]
+        # (market orders on a contract known from the metadata cache need neither)
+        if price is not None or contract_cache.get(symbol) is None:
+            try:
+                # Check if the symbol exists by getting its ticker info
+                ticker_endpoint = f"/api/mix/v1/market/ticker?symbol={formatted_symbol}"
+                ticker_info = self._make_request("GET", ticker_endpoint, signed=False)
+            
+                if 'error' in ticker_info or 'data' not in ticker_info or not ticker_info.get('data'):
+                    error_msg = f"Symbol {formatted_symbol} does not exist on Bitget or has been removed"
+                    logger.error(error_msg)
+                    # Send Telegram notification for invalid symbol
+                    from src.integrations.telegram import TelegramNotifier
+                    telegram = TelegramNotifier()
+                    telegram_message = f"⚠️ Trading Error: {symbol}\n\nThis symbol is not available on Bitget. Skipping trade."
+                    telegram.send_message(telegram_message)
+                    return {"error": error_msg}
+            
+                # Get price limits from ticker data
+                ticker_data = ticker_info.get('data', {})
+                if not isinstance(ticker_data, list):
+                    ticker_data = [ticker_data]
                 
-            if ticker_data:
-                current_ticker = ticker_data[0]
-                # Extract price information
-                market_price = float(current_ticker.get('last', price if price else 0))
-                high_24h = float(current_ticker.get('high24h', 0))
-                low_24h = float(current_ticker.get('low24h', 0))
+                if ticker_data:
+                    current_ticker = ticker_data[0]
+                    # Extract price information
+                    market_price = float(current_ticker.get('last', price if price else 0))
+                    high_24h = float(current_ticker.get('high24h', 0))
+                    low_24h = float(current_ticker.get('low24h', 0))
                 
-                # Calculate safe price limits (within 5% of market price)
-                max_price = min(market_price * 1.05, high_24h * 1.02)
-                min_price = max(market_price * 0.95, low_24h * 0.98)
+                    # Calculate safe price limits (within 5% of market price)
+                    max_price = min(market_price * 1.05, high_24h * 1.02)
+                    min_price = max(market_price * 0.95, low_24h * 0.98)
                 
-                logger.info(f"Symbol {formatted_symbol} verified to exist on Bitget")
-                logger.info(f"Market price: {market_price}, Safe price range: {min_price:.8f} - {max_price:.8f}")
+                    logger.info(f"Symbol {formatted_symbol} verified to exist on Bitget")
+                    logger.info(f"Market price: {market_price}, Safe price range: {min_price:.8f} - {max_price:.8f}")
                 
-                # If we have a price specified, ensure it's within limits
-                if price is not None:
-                    if price > max_price:
-                        logger.warning(f"Order price {price} exceeds maximum safe price {max_price} for {formatted_symbol}, adjusting to {max_price}")
-                        price = max_price
-                    elif price < min_price:
-                        logger.warning(f"Order price {price} below minimum safe price {min_price} for {formatted_symbol}, adjusting to {min_price}")
-                        price = min_price
-            else:
-                logger.warning(f"No ticker data available for {formatted_symbol}, proceeding with caution")
-        except Exception as e:
-            logger.warning(f"Could not verify symbol {formatted_symbol}: {str(e)}")
+                    # If we have a price specified, ensure it's within limits
+                    if price is not None:
+                        if price > max_price:
+                            logger.warning(f"Order price {price} exceeds maximum safe price {max_price} for {formatted_symbol}, adjusting to {max_price}")
+                            price = max_price
+                        elif price < min_price:
+                            logger.warning(f"Order price {price} below minimum safe price {min_price} for {formatted_symbol}, adjusting to {min_price}")
+                            price = min_price
+                else:
+                    logger.warning(f"No ticker data available for {formatted_symbol}, proceeding with caution")
+            except Exception as e:
+                logger.warning(f"Could not verify symbol {formatted_symbol}: {str(e)}")
         
         # Determine the holdSide parameter - must be lowercase 'long' or 'short'
         # Map from the original side parameter to holdSide
@@ -875,19 +998,25 @@ class TradingAPI:
             logger.warning(f"Could not set leverage: {str(e)}")
             return {"error": f"Failed to set leverage: {str(e)}"}
         
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
+        
         # Order parameters for Bitget futures API
         params = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",  # USDT-margined contract
             "side": order_side,
             "orderType": order_type,
-            "size": str(quantity),  # Don't round - let the API handle precision
+            "size": str(size),
             "holdSide": hold_side  # Must match the holdSide used for setting leverage
         }
         
         if order_type == "limit" and price is not None:
-            # Round price to 5 decimal places to ensure it's a multiple of 0.00001
-            rounded_price = round(price, 5)
+            # Round price to a multiple of the contract tick size
+            rounded_price = self.round_price(symbol, price)
             params["price"] = str(rounded_price)
             if rounded_price != price:
                 logger.info(f"Rounded order price from {price} to {rounded_price} to comply with Bitget tick size requirements")
@@ -934,26 +1063,26 @@ class TradingAPI:
         """
         logger.warning("Legacy set_stop_loss_bitget called - using direct implementation with holdSide")
         
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = self._format_symbol_for_bitget(symbol)
         
         # Determine close side based on position side
         hold_side = position_side.lower()
         close_side = "close_long" if hold_side == "long" else "close_short"
         
-        # Round stop_price to 5 decimal places
-        rounded_stop_price = round(stop_price, 5)
+        # Round stop_price to the contract tick size
+        rounded_stop_price = self.round_price(symbol, stop_price)
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
         
         data = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "orderType": "market",
             "side": close_side,
-            "size": str(round(quantity, 4)),
+            "size": str(size),
             "triggerType": "market_price",
             "triggerPrice": str(rounded_stop_price),
             "planType": "stop",
@@ -1001,26 +1130,26 @@ class TradingAPI:
         """
         logger.warning("Legacy set_take_profit_bitget called - using direct implementation with holdSide")
         
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = self._format_symbol_for_bitget(symbol)
         
         # Determine close side based on position side
         hold_side = position_side.lower()
         close_side = "close_long" if hold_side == "long" else "close_short"
         
-        # Round price to 5 decimal places
-        rounded_price = round(price, 5)
+        # Round price to the contract tick size
+        rounded_price = self.round_price(symbol, price)
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
         
         data = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "orderType": "market",
             "side": close_side,
-            "size": str(round(quantity, 4)),
+            "size": str(size),
             "triggerType": "market_price",
             "triggerPrice": str(rounded_price),
             "planType": "profit",
@@ -1066,12 +1195,7 @@ class TradingAPI:
         Returns:
             Dict: Order result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = self._format_symbol_for_bitget(symbol)
             
         # Determine position side from parameter or lookup
         if position_side:
@@ -1106,15 +1230,20 @@ class TradingAPI:
                 return {"error": f"Could not determine position side: {str(e)}"}
             
         # For Bitget, we need to place a conditional order with trigger price
-        # Round stop_price to 5 decimal places to comply with Bitget requirements
-        rounded_stop_price = round(stop_price, 5)
+        # Round stop_price to the contract tick size
+        rounded_stop_price = self.round_price(symbol, stop_price)
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
         
         data = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "orderType": "market",  # Market order for immediate execution when triggered
             "side": close_side,  # Close the correct position side
-            "size": str(round(quantity, 4)),
+            "size": str(size),
             "triggerType": "market_price",
             "triggerPrice": str(rounded_stop_price),
             "planType": "stop",
@@ -1160,12 +1289,7 @@ class TradingAPI:
         Returns:
             Dict: Order result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = self._format_symbol_for_bitget(symbol)
             
         # Determine position side from parameter or lookup
         if position_side:
@@ -1200,15 +1324,20 @@ class TradingAPI:
                 return {"error": f"Could not determine position side: {str(e)}"}
             
         # For Bitget, we need to place a conditional order with trigger price
-        # Round take profit price to 5 decimal places to comply with Bitget requirements
-        rounded_price = round(price, 5)
+        # Round take profit price to the contract tick size
+        rounded_price = self.round_price(symbol, price)
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
         
         data = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "orderType": "market",  # Market order for immediate execution when triggered
             "side": close_side,  # Close the correct position side
-            "size": str(round(quantity, 4)),
+            "size": str(size),
             "triggerType": "market_price",
             "triggerPrice": str(rounded_price),
             "planType": "profit_plan",  # Take-profit plan
@@ -1250,14 +1379,7 @@ class TradingAPI:
         Returns:
             List[Dict]: List of open orders
         """
-        # Format symbol for Bitget futures API if provided
-        formatted_symbol = None
-        if symbol:
-            if '/' in symbol:
-                base_currency = symbol.split('/')[0]
-                formatted_symbol = f"{base_currency}USDT_UMCBL"
-            else:
-                formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = self._format_symbol_for_bitget(symbol) if symbol else None
         
         # Set up parameters for the request
         params = {
@@ -1284,7 +1406,7 @@ class TradingAPI:
             for order in orders_data:
                 formatted_orders.append({
                     "orderId": order.get('orderId', ''),
-                    "symbol": order.get('symbol', '').replace('_UMCBL', '/USDT'),
+                    "symbol": from_bitget(order.get('symbol', '')),
                     "price": float(order.get('price', 0)),
                     "origQty": float(order.get('size', 0)),
                     "executedQty": float(order.get('filledQty', 0)),
@@ -1310,12 +1432,7 @@ class TradingAPI:
         Returns:
             Dict: Cancellation result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = self._format_symbol_for_bitget(symbol)
             
         # Set up parameters for the request
         params = {
@@ -1654,6 +1771,11 @@ class TradingAPI:
         if not self.is_configured or self.test_mode:
             logger.info(f"TEST MODE: Would set {leverage}x leverage for {symbol}")
             return {"success": True, "test_mode": True}
+        
+        contract = contract_cache.get(symbol)
+        if contract is not None and contract['max_leverage'] and leverage > contract['max_leverage']:
+            logger.warning(f"{leverage}x exceeds the {contract['max_leverage']}x maximum for {symbol}, using the maximum")
+            leverage = contract['max_leverage']
             
         # Endpoint for setting leverage in Bitget API
         endpoint = "/api/mix/v1/account/setLeverage"
@@ -12,6 +12,8 @@ from urllib.parse import urlencode
 from typing import Dict, Optional
 import logging
 
+from src.utils.symbols import to_binance
+
 logger = logging.getLogger(__name__)
 
 class BinanceFuturesAPI:
@@ -101,8 +103,8 @@ class BinanceFuturesAPI:
     
     def get_market_data(self, symbol: str) -> Dict:
         """Get current market price for symbol"""
-        # Format symbol for Binance (remove slash)
-        binance_symbol = symbol.replace('/', '').upper()
+        # Format symbol for Binance
+        binance_symbol = to_binance(symbol)
         
         try:
             response = self._make_request('GET', '/fapi/v1/ticker/price', {'symbol': binance_symbol})
@@ -120,7 +122,7 @@ class BinanceFuturesAPI:
     
     def set_leverage(self, symbol: str, leverage: int) -> Dict:
         """Set leverage for a symbol"""
-        binance_symbol = symbol.replace('/', '').upper()
+        binance_symbol = to_binance(symbol)
         
         params = {
             'symbol': binance_symbol,
@@ -155,7 +157,7 @@ class BinanceFuturesAPI:
             return {"error": "Binance API not configured"}
         
         # Format symbol for Binance
-        binance_symbol = symbol.replace('/', '').upper()
+        binance_symbol = to_binance(symbol)
         
         # Set leverage to 20x first
         leverage_result = self.set_leverage(symbol, 20)
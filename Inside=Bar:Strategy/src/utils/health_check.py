@@ -10,6 +10,8 @@ import traceback
 import threading
 import schedule
 
+from src.utils.symbols import from_bitget, to_bitget
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -344,7 +346,7 @@ class HealthCheck:
                 for position in positions_data:
                     if isinstance(position, dict):
                         total = float(position.get('total', 0))
-                        symbol = position.get('symbol', '').replace('_UMCBL', '')
+                        symbol = from_bitget(position.get('symbol', ''))
                         
                         if total > 0:
                             api_positions.append({
@@ -353,15 +355,14 @@ class HealthCheck:
                                 'side': position.get('holdSide', 'unknown')
                             })
                 
-                # Compare tracked vs actual
-                api_symbols = [p['symbol'] for p in api_positions]
-                
-                # Format for readability
-                tracked_formatted = [s.replace('/', '') for s in active_trades]
+                # Compare tracked vs actual as Bitget contracts, so notations like
+                # 'BTC/USDT:USDT' or '1000SHIB/USDT' match their positions
+                api_symbols = {to_bitget(p['symbol']) for p in api_positions}
+                tracked_formatted = {to_bitget(s) for s in active_trades}
                 
                 # Check for discrepancies
-                missing_from_tracking = [s for s in api_symbols if s not in tracked_formatted]
-                extra_in_tracking = [s for s in tracked_formatted if s not in api_symbols]
+                missing_from_tracking = [p['symbol'] for p in api_positions if to_bitget(p['symbol']) not in tracked_formatted]
+                extra_in_tracking = [s for s in active_trades if to_bitget(s) not in api_symbols]
                 
                 if missing_from_tracking or extra_in_tracking:
                     return {
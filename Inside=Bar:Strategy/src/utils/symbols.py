@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Symbol Registry Module
+
+Converts trading pair symbols between the notations used across the bot:
+- ccxt unified: 'BTC/USDT' (perpetual swaps: 'BTC/USDT:USDT')
+- Bitget USDT-M futures: 'BTCUSDT_UMCBL'
+- Binance futures and websocket streams: 'BTCUSDT'
+
+Every conversion is memoized in both directions, so hot paths pay for the
+string handling once per symbol.
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+
+BITGET_SUFFIX = '_UMCBL'
+BITGET_QUOTE = 'USDT'  # The only quote of Bitget's USDT-margined (UMCBL) product
+
+# Quote currencies recognised when splitting concatenated symbols ('BTCUSDT')
+QUOTE_CURRENCIES = ('USDT', 'USDC', 'BUSD', 'USD')
+
+# Binance/ccxt bases that Bitget lists under another name (None: not listed on Bitget)
+BITGET_BASE_ALIASES = {
+    '1000LUNC': 'LUNC',
+    '1000SHIB': 'SHIB',
+    '1000PEPE': 'PEPE',
+    '1000FLOKI': 'FLOKI',
+    '1000BONK': 'BONK',
+    '1000XEC': 'XEC',
+    '1000SATS': 'SATS',
+    'SC': None
+}
+
+
+class SymbolRegistry:
+    """Memoized bidirectional symbol mappings between ccxt, Bitget and Binance"""
+
+    def __init__(self, bitget_aliases: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Initialize the registry
+
+        Args:
+            bitget_aliases: Base currencies Bitget names differently (default: BITGET_BASE_ALIASES)
+        """
+        self.bitget_aliases = dict(BITGET_BASE_ALIASES if bitget_aliases is None else bitget_aliases)
+        self._pairs: Dict[str, Tuple[str, str]] = {}
+        self._ccxt: Dict[str, str] = {}
+        self._binance: Dict[str, str] = {}
+        self._bitget: Dict[str, Optional[str]] = {}
+        self._from_bitget: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def parse(self, symbol: str) -> Tuple[str, str]:
+        """
+        Split a symbol in any supported notation into base and quote
+
+        Args:
+            symbol: 'BTC/USDT', 'BTC/USDT:USDT', 'BTCUSDT', 'btcusdt' or 'BTCUSDT_UMCBL'
+                    (a bare base currency is quoted in USDT)
+
+        Returns:
+            Tuple[str, str]: ('BTC', 'USDT')
+        """
+        pair = self._pairs.get(symbol)
+        if pair is not None:
+            return pair
+
+        normalized = symbol.strip().upper()
+        if '/' in normalized:
+            base, quote = normalized.split('/', 1)
+            quote = quote.split(':')[0]
+        else:
+            normalized = normalized.split('_')[0]
+            quote = next((q for q in QUOTE_CURRENCIES if normalized.endswith(q) and len(normalized) > len(q)), None)
+            base, quote = (normalized[:-len(quote)], quote) if quote else (normalized, 'USDT')
+
+        pair = (base, quote)
+        self._pairs[symbol] = pair
+        return pair
+
+    def to_ccxt(self, symbol: str) -> str:
+        """'BTCUSDT_UMCBL' / 'BTCUSDT' / 'BTC/USDT:USDT' -> 'BTC/USDT'"""
+        if symbol.endswith(BITGET_SUFFIX):
+            return self.from_bitget(symbol)
+        ccxt_symbol = self._ccxt.get(symbol)
+        if ccxt_symbol is None:
+            base, quote = self.parse(symbol)
+            ccxt_symbol = self._ccxt[symbol] = f"{base}/{quote}"
+        return ccxt_symbol
+
+    def to_binance(self, symbol: str) -> str:
+        """'BTC/USDT' / 'BTCUSDT_UMCBL' -> 'BTCUSDT'"""
+        binance_symbol = self._binance.get(symbol)
+        if binance_symbol is None:
+            base, quote = self.parse(symbol)
+            binance_symbol = self._binance[symbol] = f"{base}{quote}"
+        return binance_symbol
+
+    def to_bitget(self, symbol: str) -> Optional[str]:
+        """
+        Bitget USDT-M futures symbol
+
+        Args:
+            symbol: Trading pair in any supported notation
+
+        Returns:
+            Optional[str]: 'BTCUSDT_UMCBL', or None if the base is not listed on Bitget
+                or the pair is not quoted in USDT
+        """
+        if symbol in self._bitget:
+            return self._bitget[symbol]
+
+        base, quote = self.parse(symbol)
+        base = self.bitget_aliases.get(base, base)
+        bitget_symbol = f"{base}{quote}{BITGET_SUFFIX}" if base and quote == BITGET_QUOTE else None
+        with self._lock:
+            self._bitget[symbol] = bitget_symbol
+            # The reverse mapping keeps the first notation a Bitget symbol was reached from
+            if bitget_symbol and not symbol.endswith(BITGET_SUFFIX):
+                self._from_bitget.setdefault(bitget_symbol, self.to_ccxt(symbol))
+        return bitget_symbol
+
+    def from_bitget(self, bitget_symbol: str) -> str:
+        """
+        ccxt symbol of a Bitget symbol
+
+        Returns the ccxt symbol that was converted to it if there was one
+        ('SHIBUSDT_UMCBL' -> '1000SHIB/USDT'), otherwise the plain pair.
+
+        Args:
+            bitget_symbol: Bitget symbol (e.g., 'BTCUSDT_UMCBL')
+
+        Returns:
+            str: ccxt symbol (e.g., 'BTC/USDT')
+        """
+        symbol = self._from_bitget.get(bitget_symbol)
+        if symbol is not None:
+            return symbol
+        base, quote = self.parse(bitget_symbol)
+        return f"{base}/{quote}"
+
+
+# Shared by every integration
+registry = SymbolRegistry()
+
+to_ccxt = registry.to_ccxt
+to_bitget = registry.to_bitget
+to_binance = registry.to_binance
+from_bitget = registry.from_bitget
@@ -0,0 +1,361 @@
+"""
+Event-driven strategy backtesting
+
+Replays stored candles through the live Strategy classes and simulates the
+trades they would have opened. Signals are generated once per candle set (on
+the strategy evaluation pool), then each symbol is walked from entry to exit
+with NumPy, jumping straight from one fill to the next.
+
+Fills follow DivinePaperTrader semantics:
+- One open position per symbol and strategy; signals while it is open are ignored
+- Positions are updated before new signals are taken on each candle
+- Entry at the close of the signal candle with 35% of the current balance
+- TP/SL checked against each later close, take profit first; the position exits
+  at that close, not at the TP/SL level
+- Balance compounds as positions close
+
+Fees and slippage default to zero, which reproduces the paper trader exactly.
+"""
+
+import os
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.strategies import Strategy
+from src.strategy_evaluator import ParallelStrategyEvaluator
+
+logger = logging.getLogger(__name__)
+
+EXIT_OPEN = 0
+EXIT_TAKE_PROFIT = 1
+EXIT_STOP_LOSS = 2
+EXIT_REASONS = np.array([None, 'TAKE_PROFIT', 'STOP_LOSS'], dtype=object)
+
+# Bars checked by the first exit search window; the window doubles until an exit is found
+_EXIT_SEARCH_WINDOW = 64
+
+
+def find_exit(close: np.ndarray, start: int, direction: int,
+              take_profit: float, stop_loss: float) -> tuple:
+    """
+    First close at or after `start` that triggers the take profit or stop loss
+
+    Args:
+        close: Close prices
+        start: First bar to check
+        direction: 1 for long, -1 for short
+        take_profit: Take profit price (disabled unless > 0)
+        stop_loss: Stop loss price (disabled unless > 0)
+
+    Returns:
+        tuple: (exit bar or -1 while still open, EXIT_* reason)
+    """
+    n = len(close)
+    use_tp = take_profit > 0
+    use_sl = stop_loss > 0
+    if not (use_tp or use_sl):
+        return -1, EXIT_OPEN
+
+    window = _EXIT_SEARCH_WINDOW
+    while start < n:
+        stop = min(n, start + window)
+        segment = close[start:stop]
+        if direction == 1:
+            tp_hit = segment >= take_profit if use_tp else np.zeros(len(segment), dtype=bool)
+            sl_hit = segment <= stop_loss if use_sl else np.zeros(len(segment), dtype=bool)
+        else:
+            tp_hit = segment <= take_profit if use_tp else np.zeros(len(segment), dtype=bool)
+            sl_hit = segment >= stop_loss if use_sl else np.zeros(len(segment), dtype=bool)
+
+        hits = np.flatnonzero(tp_hit | sl_hit)
+        if hits.size:
+            offset = hits[0]
+            return start + offset, EXIT_TAKE_PROFIT if tp_hit[offset] else EXIT_STOP_LOSS
+        start = stop
+        window *= 2
+    return -1, EXIT_OPEN
+
+
+def simulate_positions(close: np.ndarray, signal_bars: np.ndarray, directions: np.ndarray,
+                       take_profits: np.ndarray, stop_losses: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Walk one symbol's signals through entries and TP/SL exits
+
+    A signal opens a position unless one is already open; a position opened on
+    bar i is first checked against the close of bar i + 1. As in the live loop,
+    positions are updated before new signals, so a signal on the exit bar opens
+    the next position.
+
+    Args:
+        close: Close prices of the symbol
+        signal_bars: Bar index of every signal, ascending
+        directions: 1 (long) or -1 (short) per signal
+        take_profits: Take profit price per signal
+        stop_losses: Stop loss price per signal
+
+    Returns:
+        Dict[str, np.ndarray]: Per trade: signal (index into the signal arrays),
+                               entry_bar, exit_bar (-1 while open) and reason (EXIT_*)
+    """
+    taken, entry_bars, exit_bars, reasons = [], [], [], []
+    k = 0
+    while k < len(signal_bars):
+        entry_bar = int(signal_bars[k])
+        exit_bar, reason = find_exit(close, entry_bar + 1, int(directions[k]),
+                                     float(take_profits[k]), float(stop_losses[k]))
+        taken.append(k)
+        entry_bars.append(entry_bar)
+        exit_bars.append(exit_bar)
+        reasons.append(reason)
+        if exit_bar < 0:
+            break
+        # Jump to the first signal from the exit bar on
+        k = int(np.searchsorted(signal_bars, exit_bar, side='left'))
+
+    return {
+        'signal': np.asarray(taken, dtype=np.int64),
+        'entry_bar': np.asarray(entry_bars, dtype=np.int64),
+        'exit_bar': np.asarray(exit_bars, dtype=np.int64),
+        'reason': np.asarray(reasons, dtype=np.int8)
+    }
+
+
+def max_drawdown_percent(equity: np.ndarray) -> float:
+    """
+    Largest peak-to-trough fall of an equity curve
+
+    Args:
+        equity: Balance after each event, starting with the initial balance
+
+    Returns:
+        float: Maximum drawdown in percent of the running peak
+    """
+    if len(equity) == 0:
+        return 0.0
+    peaks = np.maximum.accumulate(equity)
+    return float(np.max((peaks - equity) / peaks) * 100)
+
+
+class Backtester:
+    """Simulates the trades of the live strategies on historical candles"""
+
+    def __init__(self, strategies: Dict[str, Strategy], fee_rate: Optional[float] = None,
+                 slippage: Optional[float] = None, position_size_percent: float = 35.0,
+                 initial_balance: float = 10000.0, min_confidence: float = 0.0,
+                 max_workers: Optional[int] = None):
+        """
+        Initialize the backtester
+
+        Args:
+            strategies: Strategy map keyed by strategy name
+            fee_rate: Fee per side as a fraction of notional (default: BACKTEST_FEE_RATE env, 0)
+            slippage: Adverse fill slippage as a fraction of price (default: BACKTEST_SLIPPAGE env, 0)
+            position_size_percent: Share of the current balance put into each position
+            initial_balance: Starting balance of each strategy's account
+            min_confidence: Ignore signals with a lower confidence score
+            max_workers: Signal generation worker processes (default: STRATEGY_WORKERS env)
+        """
+        self.strategies = strategies
+        self.fee_rate = fee_rate if fee_rate is not None else float(os.getenv('BACKTEST_FEE_RATE', '0'))
+        self.slippage = slippage if slippage is not None else float(os.getenv('BACKTEST_SLIPPAGE', '0'))
+        self.position_size_percent = position_size_percent
+        self.initial_balance = initial_balance
+        self.min_confidence = min_confidence
+        self.evaluator = ParallelStrategyEvaluator(strategies, max_workers=max_workers, last_bar_only=False)
+
+    def run(self, candles: Dict[str, pd.DataFrame], timeframe: str = '15m',
+            strategy_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Backtest the strategies on candle sets of one timeframe
+
+        Args:
+            candles: OHLCV DataFrames by symbol, indexed by candle open time
+            timeframe: Timeframe of the candles (e.g., '15m')
+            strategy_names: Strategies to backtest (default: all)
+
+        Returns:
+            Dict[str, Any]: success, per-strategy stats under 'strategies', every
+                            simulated trade under 'trades' and the run time
+        """
+        start_time = time.perf_counter()
+        strategy_names = list(self.strategies) if strategy_names is None else strategy_names
+        candles = {symbol: df for symbol, df in candles.items() if df is not None and not df.empty}
+        if not candles:
+            return {'success': False, 'error': 'No candles to backtest'}
+
+        try:
+            signals = self.evaluator.evaluate({symbol: {timeframe: df} for symbol, df in candles.items()},
+                                              strategy_names)
+        finally:
+            self.evaluator.shutdown()
+
+        results = self.backtest_signals(candles, signals, strategy_names, timeframe)
+        results['elapsed'] = time.perf_counter() - start_time
+        logger.debug(f"Backtested {len(strategy_names)} strategies on {len(candles)} symbols "
+                     f"({results['candles']} candles, {len(results['trades'])} trades) in {results['elapsed']:.2f}s")
+        return results
+
+    def backtest_signals(self, candles: Dict[str, pd.DataFrame], signals: List[Dict[str, Any]],
+                         strategy_names: List[str], timeframe: str = '15m') -> Dict[str, Any]:
+        """
+        Simulate the trades of already generated signals
+
+        Args:
+            candles: OHLCV DataFrames by symbol the signals were generated on
+            signals: Triggered signals in the strategy evaluator's format
+            strategy_names: Strategies to report
+            timeframe: Timeframe of the candles
+
+        Returns:
+            Dict[str, Any]: See run() (without the run time)
+        """
+        signals = [signal for signal in signals if signal['confidence'] >= self.min_confidence]
+        trades = self._simulate(candles, signals)
+
+        strategies = {}
+        for strategy_name in strategy_names:
+            strategy_trades = trades[trades['strategy'] == strategy_name]
+            strategies[strategy_name] = self._account(strategy_trades)
+            trades.loc[strategy_trades.index, ['position_value', 'pnl_value']] = \
+                strategies[strategy_name].pop('_fills')
+
+        return {
+            'success': True,
+            'timeframe': timeframe,
+            'symbols': list(candles),
+            'candles': sum(len(df) for df in candles.values()),
+            'strategies': strategies,
+            'trades': trades
+        }
+
+    def run_from_store(self, history_store, symbols: List[str], timeframe: str = '15m',
+                       since: Optional[int] = None, strategy_names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Backtest on candles memory-mapped from the columnar history store
+
+        Args:
+            history_store: HistoryStore holding the candles
+            symbols: Trading pair symbols
+            timeframe: Timeframe of the candles (e.g., '15m')
+            since: Only replay candles opened at or after this timestamp (ms)
+            strategy_names: Strategies to backtest (default: all)
+
+        Returns:
+            Dict[str, Any]: See run()
+        """
+        candles = {symbol: history_store.load_dataframe(symbol, timeframe, since=since) for symbol in symbols}
+        return self.run(candles, timeframe, strategy_names)
+
+    def _simulate(self, candles: Dict[str, pd.DataFrame], signals: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Simulate every (strategy, symbol) series and return the trades, one row each"""
+        grouped: Dict[tuple, List[Dict[str, Any]]] = {}
+        for signal in signals:
+            grouped.setdefault((signal['strategy'], signal['symbol']), []).append(signal)
+
+        frames = []
+        for (strategy_name, symbol), series in grouped.items():
+            df = candles[symbol]
+            close = df['close'].to_numpy(dtype=np.float64)
+            bars = df.index.get_indexer(pd.DatetimeIndex([signal['timestamp'] for signal in series]))
+            directions = np.array([1 if signal['direction'] == 'LONG' else -1 for signal in series], dtype=np.int8)
+            take_profits = np.array([signal['profit_target'] for signal in series], dtype=np.float64)
+            stop_losses = np.array([signal['stop_loss'] for signal in series], dtype=np.float64)
+
+            positions = simulate_positions(close, bars, directions, take_profits, stop_losses)
+            taken = positions['signal']
+            exit_bars = positions['exit_bar']
+            is_open = exit_bars < 0
+            frames.append(pd.DataFrame({
+                'strategy': strategy_name,
+                'symbol': symbol,
+                'direction': np.where(directions[taken] == 1, 'LONG', 'SHORT'),
+                'entry_time': df.index[positions['entry_bar']],
+                'exit_time': df.index[np.where(is_open, 0, exit_bars)].where(~is_open),
+                'entry_price': close[positions['entry_bar']],
+                'exit_price': np.where(is_open, np.nan, close[exit_bars]),
+                'take_profit': take_profits[taken],
+                'stop_loss': stop_losses[taken],
+                'exit_reason': EXIT_REASONS[positions['reason']]
+            }))
+
+        if not frames:
+            frames = [pd.DataFrame(columns=['strategy', 'symbol', 'direction', 'entry_time', 'exit_time',
+                                            'entry_price', 'exit_price', 'take_profit', 'stop_loss',
+                                            'exit_reason'])]
+        trades = pd.concat(frames, ignore_index=True)
+        trades['pnl_percent'] = self._trade_returns(trades) * 100
+        trades['position_value'] = np.nan
+        trades['pnl_value'] = np.nan
+        return trades
+
+    def _trade_returns(self, trades: pd.DataFrame) -> np.ndarray:
+        """Return of each closed trade on its position value, after slippage and fees (NaN while open)"""
+        direction = np.where(trades['direction'].to_numpy() == 'LONG', 1.0, -1.0)
+        entry_fill = trades['entry_price'].to_numpy(dtype=np.float64) * (1 + direction * self.slippage)
+        exit_fill = trades['exit_price'].to_numpy(dtype=np.float64) * (1 - direction * self.slippage)
+        price_ratio = exit_fill / entry_fill
+        # Fees are charged on the entry notional and on the exit notional
+        return direction * (price_ratio - 1) - self.fee_rate * (1 + price_ratio)
+
+    def _account(self, trades: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Replay one strategy's trades through a shared, compounding balance
+
+        Events are processed in time order, exits before entries on the same
+        candle, so every position is sized from the balance at its entry.
+
+        Args:
+            trades: Trades of one strategy
+
+        Returns:
+            Dict[str, Any]: Statistics, plus '_fills' (position value and PnL per trade)
+        """
+        entry_times = trades['entry_time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        exit_times = trades['exit_time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        returns = trades['pnl_percent'].to_numpy(dtype=np.float64) / 100
+        closed = ~np.isnan(returns)
+        n = len(trades)
+
+        # (time, kind, trade): exits (kind 0) sort before entries (kind 1)
+        trade_ids = np.arange(n)
+        event_times = np.concatenate([exit_times[closed], entry_times])
+        event_kinds = np.concatenate([np.zeros(closed.sum(), dtype=np.int8), np.ones(n, dtype=np.int8)])
+        event_trades = np.concatenate([trade_ids[closed], trade_ids])
+        order = np.lexsort((event_trades, event_kinds, event_times))
+
+        fraction = self.position_size_percent / 100
+        position_values = np.zeros(n)
+        pnl_values = np.full(n, np.nan)
+        balance = self.initial_balance
+        equity = [balance]
+        for kind, trade in zip(event_kinds[order].tolist(), event_trades[order].tolist()):
+            if kind:
+                position_values[trade] = balance * fraction
+            else:
+                pnl_values[trade] = position_values[trade] * returns[trade]
+                balance += pnl_values[trade]
+                equity.append(balance)
+
+        pnl = pnl_values[closed]
+        reasons = trades['exit_reason'].to_numpy()
+        wins = int((pnl > 0).sum())
+        total_trades = int(closed.sum())
+        return {
+            'trades': total_trades,
+            'open_trades': int(n - total_trades),
+            'wins': wins,
+            'losses': total_trades - wins,
+            'win_rate': wins / total_trades * 100 if total_trades else 0.0,
+            'take_profit_exits': int((reasons == 'TAKE_PROFIT').sum()),
+            'stop_loss_exits': int((reasons == 'STOP_LOSS').sum()),
+            'avg_trade_percent': float(returns[closed].mean() * 100) if total_trades else 0.0,
+            'total_pnl': float(balance - self.initial_balance),
+            'total_pnl_percent': float((balance / self.initial_balance - 1) * 100),
+            'final_balance': float(balance),
+            'max_drawdown_percent': max_drawdown_percent(np.asarray(equity)),
+            '_fills': np.column_stack([position_values, pnl_values])
+        }
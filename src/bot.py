@@ -54,8 +54,17 @@ except ImportError:
     MARKET_ANALYZER_AVAILABLE = False
     logger.warning("Market analyzer not available - adaptive market regime detection disabled")
     
+# Import async Bitget client if available (concurrent position checks)
+try:
+    from src.integrations.bidget_async import fetch_positions, AIOHTTP_AVAILABLE as BITGET_ASYNC_AVAILABLE
+except ImportError:
+    BITGET_ASYNC_AVAILABLE = False
+    
+from src.backtest import Backtester
 from src.market_data import MarketData
 from src.strategies import SupertrendADXStrategy, InsideBarStrategy
+from src.strategy_evaluator import ParallelStrategyEvaluator
+from src.utils.candle_scheduler import CandleCloseScheduler
 from src.integrations.order_manager import OrderManager
 
 logger = logging.getLogger(__name__)
@@ -91,6 +100,7 @@ class TradingBot:
             "supertrend_adx": SupertrendADXStrategy(),
             "inside_bar": InsideBarStrategy()
         }
+        self.strategy_evaluator = ParallelStrategyEvaluator(self.strategies)
         
         # Load confidence threshold from environment variable
         self.confidence_threshold = float(os.getenv('CONFIDENCE_THRESHOLD', '95'))
@@ -117,6 +127,14 @@ class TradingBot:
         self.daily_trades_count = 0
         self.last_signals_reset = datetime.now().date()
         self.active_trades = set()  # Set of symbols with active trades
+        self.pending_signals = []  # Signals waiting to be sent
+        self._stop_event = threading.Event()  # Set by stop() to leave the main loop
+        self._wake_event = threading.Event()  # Set to wake the main loop early (stop, streamed candle close)
+        self._streamed_closes = {}  # Timeframe -> time its first streamed candle close arrived
+        self._streamed_closes_lock = threading.Lock()
+        self.stream_batch_seconds = float(os.getenv('STREAM_BATCH_SECONDS', '1'))
+        self.signals_sent_today = 0
+        self.signal_history = []
         
         # Initialize Telegram (if available)
         self.telegram = None
@@ -205,9 +223,10 @@ class TradingBot:
         # Set up scheduled jobs with explicit logging
         logger.info("Setting up scheduled jobs...")
         
-        # Schedule market scanning every 4 hours
-        schedule.every(4).hours.do(self.scan_markets)
-        logger.info("Scheduled market scanning every 4 hours")
+        # Scan each timeframe when its candle closes
+        candle_scheduler = CandleCloseScheduler(self.market_data.timeframes)
+        logger.info(f"Scanning {', '.join(candle_scheduler.timeframes)} on candle close "
+                    f"(+{candle_scheduler.settle_delay:.0f}s settle delay)")
         
         # Schedule daily signal count reset
         schedule.every().day.at("00:00").do(self.reset_daily_signal_count)
@@ -217,6 +236,11 @@ class TradingBot:
         schedule.every(10).minutes.do(self.check_and_clean_active_trades)
         logger.info("Scheduled active trade cleanup every 10 minutes")
         
+        # Websocket candles: scan each timeframe as soon as the exchange publishes its close
+        if self.market_data.start_stream(on_candle_closed=self._on_candle_closed):
+            logger.info(f"Scanning on streamed candle closes (batched over {self.stream_batch_seconds:.1f}s), "
+                        f"candle-close schedule is the fallback while the stream is down")
+        
         # Initial scan
         logger.info("Running initial market scan...")
         self.scan_markets()
@@ -234,19 +258,38 @@ class TradingBot:
         
         logger.info(f"Active trades after startup: {self.active_trades}")
         
-        # Main loop
+        # Main loop: sleep until the next event instead of polling
         try:
-            next_schedule_run = time.time() + 60
+            wakeup_time, closing_timeframes = candle_scheduler.next_wakeup(time.time())
             next_cleanup_check = time.time() + 300  # Force cleanup every 5 minutes regardless of schedule
+            self.last_signal_process_time = 0.0  # Queued signals from the initial scan go out right away
             
-            while True:
+            while not self._stop_event.is_set():
+                self._wake_event.clear()
                 current_time = time.time()
                 
-                # Run scheduled jobs
-                if current_time >= next_schedule_run:
-                    logger.info("Running pending scheduled jobs")
-                    schedule.run_pending()
-                    next_schedule_run = current_time + 60
+                # Scan the timeframes the stream reported closed once the other symbols' closes are in
+                streamed_timeframes = self._take_streamed_closes(current_time)
+                if streamed_timeframes:
+                    logger.info(f"Streamed candle close: scanning {', '.join(streamed_timeframes)}")
+                    self.scan_markets(timeframes=streamed_timeframes)
+                    self.process_pending_signals()
+                    self.last_signal_process_time = time.time()
+                
+                # Scan the timeframes whose candles just closed (the stream covers them while connected)
+                if current_time >= wakeup_time:
+                    if not self.market_data.stream_connected:
+                        logger.info(f"Candle close: scanning {', '.join(closing_timeframes)}")
+                        self.scan_markets(timeframes=closing_timeframes)
+                        self.process_pending_signals()
+                        self.last_signal_process_time = time.time()
+                    # Continue from this close so a long scan never skips the next one
+                    wakeup_time, closing_timeframes = candle_scheduler.next_wakeup(
+                        wakeup_time - candle_scheduler.settle_delay
+                    )
+                
+                # Run scheduled jobs that are due
+                schedule.run_pending()
                 
                 # Force trade cleanup check periodically regardless of schedule
                 if current_time >= next_cleanup_check:
@@ -254,63 +297,90 @@ class TradingBot:
                     self.check_and_clean_active_trades()
                     next_cleanup_check = current_time + 300  # Every 5 minutes
                 
-                # Process signals with rate limiting
-                # Only process signals every 60 seconds instead of every 5 seconds
-                if not hasattr(self, 'last_signal_process_time') or current_time - getattr(self, 'last_signal_process_time', 0) >= 60:
+                # Retry queued signals every 60 seconds while any are waiting
+                if self.pending_signals and current_time - self.last_signal_process_time >= 60:
                     self.process_pending_signals()
                     self.last_signal_process_time = current_time
                 
-                # Sleep briefly to avoid CPU hogging
-                time.sleep(5)
+                # Sleep until the next candle close, scheduled job, cleanup or queued-signal retry
+                next_event = min(wakeup_time, next_cleanup_check)
+                idle_seconds = schedule.idle_seconds()
+                if idle_seconds is not None:
+                    next_event = min(next_event, time.time() + idle_seconds)
+                if self.pending_signals:
+                    next_event = min(next_event, self.last_signal_process_time + 60)
+                with self._streamed_closes_lock:
+                    if self._streamed_closes:
+                        next_event = min(next_event, min(self._streamed_closes.values()) + self.stream_batch_seconds)
+                self._wake_event.wait(max(0.0, next_event - time.time()))
                 
         except KeyboardInterrupt:
             logger.info("Trading bot stopped by user")
         except Exception as e:
             logger.error("Error in main loop: %s", str(e), exc_info=True)
+        finally:
+            self.market_data.stop_stream()
+            self.strategy_evaluator.shutdown()
+            if self.order_manager is not None:
+                self.order_manager.shutdown()
+            
+    def stop(self):
+        """Stop the main loop"""
+        self._stop_event.set()
+        self._wake_event.set()
+    
+    def _on_candle_closed(self, symbol: str, timeframe: str, candles) -> None:
+        """
+        Queue a scan of a timeframe when the stream reports one of its candles closed
+        
+        Runs on the stream thread; the main loop does the scan.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Timeframe whose candle closed
+            candles: Closed candles of the series
+        """
+        with self._streamed_closes_lock:
+            if timeframe not in self._streamed_closes:
+                self._streamed_closes[timeframe] = time.time()
+                self._wake_event.set()
+    
+    def _take_streamed_closes(self, now: float) -> List[str]:
+        """
+        Remove and return the timeframes whose streamed closes have been batched long enough
+        
+        Args:
+            now: Current time
             
-    def scan_markets(self):
-        """Scan all markets for trading signals"""
+        Returns:
+            List[str]: Timeframes to scan, in configured order
+        """
+        with self._streamed_closes_lock:
+            due = [timeframe for timeframe, first_close in self._streamed_closes.items()
+                   if now >= first_close + self.stream_batch_seconds]
+            for timeframe in due:
+                del self._streamed_closes[timeframe]
+        return [timeframe for timeframe in self.market_data.timeframes if timeframe in due]
+            
+    def scan_markets(self, timeframes: Optional[List[str]] = None):
+        """
+        Scan all markets for trading signals
+        
+        Args:
+            timeframes: Timeframes to scan (default: all configured timeframes)
+        """
         logger.info("Starting market scan")
         
         try:
             # Get market data
-            all_market_data = self.market_data.scan_all_markets()
-            signals = []
-            
-            # Process each market and timeframe
-            for symbol, timeframe_data in all_market_data.items():
-                for timeframe, df in timeframe_data.items():
-                    if df.empty:
-                        continue
-                        
-                    # Run each strategy on the data
-                    for strategy_name, strategy in self.strategies.items():
-                        try:
-                            # Generate signals
-                            signal_df = strategy.generate_signals(df)
-                            
-                            # Extract triggered signals
-                            triggered_signals = signal_df[signal_df['signal_triggered']]
-                            
-                            # Add signals to the list with metadata
-                            for idx, row in triggered_signals.iterrows():
-                                signal = {
-                                    'timestamp': idx,
-                                    'symbol': symbol,
-                                    'timeframe': timeframe,
-                                    'strategy': strategy_name,
-                                    'strategy_name': strategy.name,
-                                    'direction': 'LONG' if row['signal'] == 1 else 'SHORT',
-                                    'confidence': row['confidence'],
-                                    'price': row['close'],
-                                    'profit_target': row['profit_target'],
-                                    'stop_loss': row['stop_loss'],
-                                    'atr': row['atr']
-                                }
-                                signals.append(signal)
-                                
-                        except Exception as e:
-                            logger.error(f"Error applying {strategy_name} to {symbol} {timeframe}: {e}", exc_info=True)
+            all_market_data = self.market_data.scan_all_markets(timeframes=timeframes)
+            
+            # Run each strategy on every market and timeframe (fanned out to worker processes)
+            signals = self.strategy_evaluator.evaluate(all_market_data)
+            
+            # Summed over the worker processes, each of which has its own cache
+            cache_stats = self.strategy_evaluator.cache_stats
+            logger.info(f"Indicator cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses this scan")
             
             # Filter signals by confidence threshold
             high_confidence_signals = [s for s in signals if s['confidence'] >= self.confidence_threshold]
@@ -1119,6 +1189,52 @@ class TradingBot:
                 "error": str(e)
             }
         
+    def run_strategy_backtest(self, days_back: int = 30, timeframe: str = '15m',
+                              symbols: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Backtest the live strategies on historical candles with simulated fills
+        
+        Only signals at or above the confidence threshold are traded.
+        
+        Args:
+            days_back: Number of days to backtest
+            timeframe: Timeframe of the candles
+            symbols: Trading pairs to replay (default: the configured markets)
+            
+        Returns:
+            Backtest results dictionary (see Backtester.run)
+        """
+        try:
+            symbols = symbols or self.market_data.markets
+            since = int(time.time() * 1000) - days_back * 24 * 60 * 60 * 1000
+            
+            candles = {}
+            for symbol in symbols:
+                try:
+                    candles[symbol] = self.market_data.get_historical_data(symbol=symbol, timeframe=timeframe, since=since)
+                except Exception as e:
+                    logger.error(f"Error getting historical {timeframe} data for {symbol}: {e}")
+            
+            backtester = Backtester(self.strategies, min_confidence=self.confidence_threshold,
+                                    max_workers=self.strategy_evaluator.max_workers)
+            results = backtester.run(candles, timeframe)
+            
+            if results.get('success', False):
+                for strategy_name, stats in results['strategies'].items():
+                    logger.info(f"Backtest {strategy_name}: {stats['trades']} trades, win rate {stats['win_rate']:.1f}%, "
+                                f"PnL {stats['total_pnl_percent']:+.2f}%, max drawdown {stats['max_drawdown_percent']:.2f}%")
+            else:
+                logger.error(f"Strategy backtest failed: {results.get('error', 'Unknown error')}")
+                
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error in strategy backtest: {e}", exc_info=True)
+            return {
+                "success": False,
+                "error": str(e)
+            }
+        
     def check_and_clean_active_trades(self, force_reset=False, symbol_to_reset=None):
         """Check active trades and remove closed ones from the tracking list
         
@@ -1168,75 +1284,40 @@ class TradingBot:
                 
             logger.info(f"Checking {len(symbols_to_check)} active trades for closure: {symbols_to_check}")
             
+            # Check every position from one snapshot; symbols whose check failed are retried together
+            max_retries = 2  # Try up to 3 times (initial + 2 retries)
+            positions = {}
+            pending = symbols_to_check
+            for attempt in range(max_retries + 1):
+                if attempt:
+                    logger.info(f"Retrying position check for {pending} (attempt {attempt+1}/{max_retries+1})")
+                    time.sleep(2)  # Brief delay before retry
+                results = self._fetch_positions(api, pending, max_age=0 if attempt else None)
+                for symbol, position in results.items():
+                    if 'error' in position:
+                        logger.warning(f"Failed to get position info for {symbol}: {position}")
+                    else:
+                        positions[symbol] = position
+                pending = [symbol for symbol in pending if symbol not in positions]
+                if not pending:
+                    break
+            
             # Track symbols that couldn't be verified due to API errors
-            failed_checks = []
+            failed_checks = pending
             
-            for symbol in symbols_to_check:
-                retry_count = 0
-                max_retries = 2  # Try up to 3 times (initial + 2 retries)
+            for symbol, position in positions.items():
+                position_size = position.get('size', 0)
+                active_position = position_size > 0
+                logger.info(f"Position check for {symbol}: active={active_position}, size={position_size}")
                 
-                while retry_count <= max_retries:
-                    try:
-                        # Convert symbol format if needed (e.g., 'BTC/USDT' to 'BTCUSDT_UMCBL')
-                        formatted_symbol = symbol.replace('/', '') + '_UMCBL'
-                        
-                        # Check if there's still an active position
-                        position_endpoint = f"/api/mix/v1/position/singlePosition?symbol={formatted_symbol}&marginCoin=USDT"
-                        position_info = api._make_request("GET", position_endpoint, signed=True)
-                        
-                        active_position = False
-                        position_size = 0
-                        
-                        if 'error' not in position_info and 'data' in position_info:
-                            position_data = position_info.get('data', {})
-                            logger.info(f"Position data for {symbol}: {position_data}")
-                            
-                            # Handle if position_data is a list (some Bitget endpoints return list)
-                            if isinstance(position_data, list):
-                                for pos in position_data:
-                                    position_size = float(pos.get('total', 0)) if isinstance(pos, dict) else 0
-                                    if position_size > 0:
-                                        active_position = True
-                                        break
-                            elif isinstance(position_data, dict):
-                                position_size = float(position_data.get('total', 0))
-                                if position_size > 0:
-                                    active_position = True
-                            
-                            # Successfully checked the position, break retry loop
-                            break
-                        else:
-                            logger.warning(f"Failed to get position info for {symbol}: {position_info}")
-                            # Only retry on API errors, not on "no position" responses
-                            if retry_count < max_retries:
-                                retry_count += 1
-                                logger.info(f"Retrying position check for {symbol} (attempt {retry_count+1}/{max_retries+1})")
-                                time.sleep(2)  # Brief delay before retry
-                            else:
-                                failed_checks.append(symbol)
-                                break
-                    except Exception as e:
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            logger.warning(f"Error checking position for {symbol}, retrying (attempt {retry_count+1}/{max_retries+1}): {str(e)}")
-                            time.sleep(2)  # Brief delay before retry
-                        else:
-                            logger.error(f"Final error checking position for {symbol}: {str(e)}", exc_info=True)
-                            failed_checks.append(symbol)
-                            break
-                
-                # Only process position if we didn't add it to failed_checks
-                if symbol not in failed_checks:
-                    logger.info(f"Position check for {symbol}: active={active_position}, size={position_size}")
+                # If no active position, remove from tracking list
+                if not active_position:
+                    self.active_trades.discard(symbol)
+                    logger.info(f"Removed {symbol} from active trades - position closed")
                     
-                    # If no active position, remove from tracking list
-                    if not active_position:
-                        self.active_trades.remove(symbol)
-                        logger.info(f"Removed {symbol} from active trades - position closed")
-                        
-                        # Notify via Telegram
-                        close_msg = f"🔔 *Position Closed* - {symbol}\n\nThe bot will now consider new signals for this pair."
-                        self._send_telegram_message(close_msg)
+                    # Notify via Telegram
+                    close_msg = f"🔔 *Position Closed* - {symbol}\n\nThe bot will now consider new signals for this pair."
+                    self._send_telegram_message(close_msg)
             
             # Report on failed checks but don't remove them from tracking
             if failed_checks:
@@ -1246,6 +1327,32 @@ class TradingBot:
         except Exception as e:
             logger.error(f"Error during active trade cleanup: {str(e)}", exc_info=True)
         
+    def _fetch_positions(self, api, symbols: List[str], max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Query the positions of several symbols
+        
+        Reads the shared all-positions snapshot (one request for any number of symbols).
+        If it can't be fetched, queries each symbol, concurrently when aiohttp is available.
+        
+        Args:
+            api: TradingAPI client
+            symbols: Trading pair symbols
+            max_age: Maximum snapshot age in seconds (default: POSITIONS_CACHE_TTL)
+            
+        Returns:
+            Dict[str, Dict]: Position (or error) by symbol
+        """
+        positions = api.get_positions(symbols, max_age=max_age)
+        if not any('error' in position for position in positions.values()):
+            return positions
+        
+        if BITGET_ASYNC_AVAILABLE:
+            try:
+                return fetch_positions(symbols, trading_api=api)
+            except Exception as e:
+                logger.warning(f"Concurrent position check failed, checking sequentially: {str(e)}")
+        return {symbol: api.get_position(symbol) for symbol in symbols}
+        
     def prepare_bidget_integration(self):
         """
         Placeholder for Bidget API integration
@@ -349,6 +349,10 @@ def api_market_backtest():
             include_performance=include_performance
         )
         
+        # The regime timeline is columnar until it is serialized
+        if 'regime_timeline' in results:
+            results['regime_timeline'] = results['regime_timeline'].to_dicts()
+        
         return jsonify(results)
     except Exception as e:
         logger.error(f"Error running market backtest: {e}", exc_info=True)
@@ -0,0 +1,294 @@
+"""
+Incremental (streaming) technical indicators
+
+Each class keeps the recursive state of its batch counterpart in
+src/indicators.py and updates in O(1) per new closed candle. Fed the same
+candles from the same first bar, they produce exactly the batch values.
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+
+def _ewm_alpha(span: Optional[float] = None, alpha: Optional[float] = None) -> float:
+    """
+    Smoothing factor exactly as pandas derives it for ewm(span=...) or ewm(alpha=...)
+
+    Args:
+        span: EWM span
+        alpha: EWM smoothing factor
+
+    Returns:
+        float: Smoothing factor
+    """
+    if span is not None:
+        com = (span - 1) / 2.0
+    else:
+        com = (1.0 - alpha) / alpha
+    return 1.0 / (1.0 + com)
+
+
+def _true_range(high: float, low: float, prev_close: Optional[float]) -> float:
+    """
+    True Range of one candle, skipping NaN components like DataFrame.max(axis=1)
+
+    Args:
+        high: Candle high
+        low: Candle low
+        prev_close: Previous candle close (None for the first candle)
+
+    Returns:
+        float: True Range
+    """
+    components = [high - low]
+    if prev_close is not None:
+        components.append(abs(high - prev_close))
+        components.append(abs(low - prev_close))
+    components = [c for c in components if not math.isnan(c)]
+    return max(components) if components else math.nan
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """
+    Float division with NumPy semantics (x/0 is +-inf, 0/0 is NaN) instead of ZeroDivisionError
+
+    Args:
+        numerator: Dividend
+        denominator: Divisor
+
+    Returns:
+        float: Quotient
+    """
+    try:
+        return numerator / denominator
+    except ZeroDivisionError:
+        if numerator == 0 or math.isnan(numerator):
+            return math.nan
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+
+
+class IncrementalEWM:
+    """Exponentially weighted mean with adjust=False, matching pandas ewm().mean()"""
+
+    def __init__(self, span: Optional[float] = None, alpha: Optional[float] = None):
+        alpha = _ewm_alpha(span=span, alpha=alpha)
+        self.old_wt_factor = 1.0 - alpha
+        self.new_wt = alpha
+        self.old_wt = 1.0
+        self.weighted = math.nan
+        self.nobs = 0
+
+    def update(self, value: float) -> float:
+        """
+        Add one observation
+
+        Args:
+            value: New observation (NaN is treated as missing)
+
+        Returns:
+            float: Current mean
+        """
+        is_observation = not math.isnan(value)
+        self.nobs += is_observation
+
+        if not math.isnan(self.weighted):
+            self.old_wt *= self.old_wt_factor
+            if is_observation:
+                # Same operation order as pandas to stay bit-identical
+                if self.weighted != value:
+                    self.weighted = (self.old_wt * self.weighted + self.new_wt * value) / (self.old_wt + self.new_wt)
+                self.old_wt = 1.0
+        elif is_observation:
+            self.weighted = value
+
+        return self.weighted if self.nobs >= 1 else math.nan
+
+
+class IncrementalATR:
+    """Streaming Average True Range, matching calculate_atr"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.tr = math.nan
+        self.atr = math.nan
+        self._ewm = IncrementalEWM(span=period)
+
+    def update(self, high: float, low: float, close: float) -> float:
+        """
+        Add one closed candle
+
+        Args:
+            high: Candle high
+            low: Candle low
+            close: Candle close
+
+        Returns:
+            float: Current ATR
+        """
+        self.tr = _true_range(high, low, self.prev_close)
+        self.atr = self._ewm.update(self.tr)
+        self.prev_close = close
+        return self.atr
+
+
+class IncrementalSupertrend:
+    """Streaming Supertrend, matching calculate_supertrend"""
+
+    def __init__(self, atr_period: int = 10, multiplier: float = 3.0):
+        self.atr_period = atr_period
+        self.multiplier = multiplier
+        self._atr = IncrementalATR(atr_period)
+        self.prev_close = None
+        self.final_upper_band = math.nan
+        self.final_lower_band = math.nan
+        self.supertrend = math.nan
+        self.direction = 1  # 1 for bullish, -1 for bearish
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, int]:
+        """
+        Add one closed candle
+
+        Args:
+            high: Candle high
+            low: Candle low
+            close: Candle close
+
+        Returns:
+            Tuple[float, int]: Supertrend value and direction (1 for bullish, -1 for bearish)
+        """
+        atr = self._atr.update(high, low, close)
+        hl2 = (high + low) / 2
+        basic_upper_band = hl2 + (self.multiplier * atr)
+        basic_lower_band = hl2 - (self.multiplier * atr)
+
+        if self.prev_close is None:
+            # First bar seeds the line on the upper band, as the batch kernel does
+            self.final_upper_band = basic_upper_band
+            self.final_lower_band = basic_lower_band
+            self.supertrend = basic_upper_band
+            self.direction = -1
+            self.prev_close = close
+            return self.supertrend, self.direction
+
+        prev_upper = self.final_upper_band
+        prev_lower = self.final_lower_band
+        prev_supertrend = self.supertrend
+
+        if basic_upper_band < prev_upper or self.prev_close > prev_upper:
+            final_upper_band = basic_upper_band
+        else:
+            final_upper_band = prev_upper
+
+        if basic_lower_band > prev_lower or self.prev_close < prev_lower:
+            final_lower_band = basic_lower_band
+        else:
+            final_lower_band = prev_lower
+
+        # Determine direction and supertrend value (unmatched bars fall back to 0.0 / bullish)
+        supertrend, direction = 0.0, 1
+        if prev_supertrend == prev_upper and close <= final_upper_band:
+            supertrend, direction = final_upper_band, -1
+        elif prev_supertrend == prev_upper and close > final_upper_band:
+            supertrend, direction = final_lower_band, 1
+        elif prev_supertrend == prev_lower and close >= final_lower_band:
+            supertrend, direction = final_lower_band, 1
+        elif prev_supertrend == prev_lower and close < final_lower_band:
+            supertrend, direction = final_upper_band, -1
+
+        self.final_upper_band = final_upper_band
+        self.final_lower_band = final_lower_band
+        self.supertrend = supertrend
+        self.direction = direction
+        self.prev_close = close
+        return supertrend, direction
+
+
+class IncrementalADX:
+    """Streaming Average Directional Index, matching calculate_adx"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_high = None
+        self.prev_low = None
+        self.prev_close = None
+        self._tr = IncrementalEWM(span=1)  # calculate_adx takes TR as ATR with period=1
+        self._smoothed_tr = IncrementalEWM(alpha=1 / period)
+        self._smoothed_plus_dm = IncrementalEWM(alpha=1 / period)
+        self._smoothed_minus_dm = IncrementalEWM(alpha=1 / period)
+        self._adx = IncrementalEWM(alpha=1 / period)
+        self.plus_di = math.nan
+        self.minus_di = math.nan
+        self.adx = math.nan
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        """
+        Add one closed candle
+
+        Args:
+            high: Candle high
+            low: Candle low
+            close: Candle close
+
+        Returns:
+            Dict[str, float]: Current plus_di, minus_di and adx
+        """
+        tr = self._tr.update(_true_range(high, low, self.prev_close))
+
+        # Calculate +DM and -DM
+        plus_dm = 0.0
+        minus_dm = 0.0
+        if self.prev_high is not None:
+            high_diff = high - self.prev_high
+            low_diff = (low - self.prev_low) * -1
+            if high_diff > low_diff and high_diff > 0:
+                plus_dm = high_diff
+            if low_diff > high_diff and low_diff > 0:
+                minus_dm = low_diff
+
+        # Smooth +DM, -DM, and TR using Wilder's smoothing
+        smoothed_plus_dm = self._smoothed_plus_dm.update(plus_dm)
+        smoothed_minus_dm = self._smoothed_minus_dm.update(minus_dm)
+        smoothed_tr = self._smoothed_tr.update(tr)
+        self.plus_di = 100 * _divide(smoothed_plus_dm, smoothed_tr)
+        self.minus_di = 100 * _divide(smoothed_minus_dm, smoothed_tr)
+
+        # Calculate DX and ADX
+        dx = _divide(100 * abs(self.plus_di - self.minus_di), self.plus_di + self.minus_di)
+        self.adx = self._adx.update(dx)
+
+        self.prev_high = high
+        self.prev_low = low
+        self.prev_close = close
+        return {'plus_di': self.plus_di, 'minus_di': self.minus_di, 'adx': self.adx}
+
+
+class IncrementalInsideBar:
+    """Streaming inside bar detector, matching detect_inside_bar"""
+
+    def __init__(self):
+        self.prev_high = None
+        self.prev_low = None
+        self.mother_bar_high = math.nan
+        self.mother_bar_low = math.nan
+        self.is_inside_bar = False
+
+    def update(self, high: float, low: float) -> bool:
+        """
+        Add one closed candle
+
+        Args:
+            high: Candle high
+            low: Candle low
+
+        Returns:
+            bool: True if this candle is an inside bar of the previous one
+        """
+        self.is_inside_bar = (
+            self.prev_high is not None and high < self.prev_high and low > self.prev_low
+        )
+        self.mother_bar_high = self.prev_high if self.is_inside_bar else math.nan
+        self.mother_bar_low = self.prev_low if self.is_inside_bar else math.nan
+        self.prev_high = high
+        self.prev_low = low
+        return self.is_inside_bar
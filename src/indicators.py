@@ -4,19 +4,26 @@ Technical indicators module
 
 import numpy as np
 import pandas as pd
-from typing import Tuple
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Optional, Tuple
 
+# Numba is optional - the Supertrend kernel falls back to plain NumPy without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
-def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
+
+def calculate_true_range(df: pd.DataFrame) -> pd.Series:
     """
-    Calculate Average True Range (ATR)
+    Calculate True Range (TR)
     
     Args:
         df: DataFrame with OHLC data
-        period: ATR period
         
     Returns:
-        pd.Series: ATR values
+        pd.Series: True Range values
     """
     high = df['high']
     low = df['low']
@@ -28,7 +35,23 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     tr3 = abs(low - close)  # Current low - previous close
     
     # True Range is the maximum of the three
-    tr = pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
+    return pd.DataFrame({'tr1': tr1, 'tr2': tr2, 'tr3': tr3}).max(axis=1)
+
+
+def calculate_atr(df: pd.DataFrame, period: int = 14, tr: Optional[pd.Series] = None) -> pd.Series:
+    """
+    Calculate Average True Range (ATR)
+    
+    Args:
+        df: DataFrame with OHLC data
+        period: ATR period
+        tr: Precomputed True Range to reuse (optional)
+        
+    Returns:
+        pd.Series: ATR values
+    """
+    if tr is None:
+        tr = calculate_true_range(df)
     
     # Calculate ATR using exponential moving average
     atr = tr.ewm(span=period, adjust=False).mean()
@@ -36,7 +59,154 @@ def calculate_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     return atr
 
 
-def calculate_supertrend(df: pd.DataFrame, atr_period: int = 10, multiplier: float = 3.0) -> Tuple[pd.Series, pd.Series]:
+def _supertrend_kernel(close: np.ndarray, basic_upper_band: np.ndarray,
+                       basic_lower_band: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Supertrend band recursion over plain float64 arrays
+    
+    Args:
+        close: Close prices
+        basic_upper_band: hl2 + multiplier * ATR
+        basic_lower_band: hl2 - multiplier * ATR
+        
+    Returns:
+        Tuple of supertrend, direction, final upper band and final lower band arrays
+    """
+    n = close.shape[0]
+    final_upper_band = basic_upper_band.copy()
+    final_lower_band = basic_lower_band.copy()
+    supertrend = np.zeros(n)
+    direction = np.ones(n, dtype=np.int64)  # 1 for bullish, -1 for bearish
+    
+    if n == 0:
+        return supertrend, direction, final_upper_band, final_lower_band
+    
+    # Seed bar 0 on the upper band (bearish) so the recursion below has a band to follow
+    supertrend[0] = final_upper_band[0]
+    direction[0] = -1
+    
+    for i in range(1, n):
+        if basic_upper_band[i] < final_upper_band[i-1] or close[i-1] > final_upper_band[i-1]:
+            final_upper_band[i] = basic_upper_band[i]
+        else:
+            final_upper_band[i] = final_upper_band[i-1]
+            
+        if basic_lower_band[i] > final_lower_band[i-1] or close[i-1] < final_lower_band[i-1]:
+            final_lower_band[i] = basic_lower_band[i]
+        else:
+            final_lower_band[i] = final_lower_band[i-1]
+            
+        # Determine direction and supertrend value
+        if supertrend[i-1] == final_upper_band[i-1] and close[i] <= final_upper_band[i]:
+            supertrend[i] = final_upper_band[i]
+            direction[i] = -1
+        elif supertrend[i-1] == final_upper_band[i-1] and close[i] > final_upper_band[i]:
+            supertrend[i] = final_lower_band[i]
+            direction[i] = 1
+        elif supertrend[i-1] == final_lower_band[i-1] and close[i] >= final_lower_band[i]:
+            supertrend[i] = final_lower_band[i]
+            direction[i] = 1
+        elif supertrend[i-1] == final_lower_band[i-1] and close[i] < final_lower_band[i]:
+            supertrend[i] = final_upper_band[i]
+            direction[i] = -1
+    
+    return supertrend, direction, final_upper_band, final_lower_band
+
+
+def _supertrend_batch_kernel(close: np.ndarray, basic_upper_band: np.ndarray,
+                             basic_lower_band: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Supertrend band recursion for many parameter sets at once
+    
+    Same recursion as _supertrend_kernel, stepping through the bars once and
+    updating every parameter set (column) of a bar with whole-row operations.
+    
+    Args:
+        close: Close prices, shape (n,)
+        basic_upper_band: hl2 + multiplier * ATR per parameter set, shape (n, k)
+        basic_lower_band: hl2 - multiplier * ATR per parameter set, shape (n, k)
+        
+    Returns:
+        Tuple of supertrend and direction arrays, shape (n, k)
+    """
+    n, k = basic_upper_band.shape
+    final_upper_band = basic_upper_band.copy()
+    final_lower_band = basic_lower_band.copy()
+    supertrend = np.zeros((n, k))
+    direction = np.ones((n, k), dtype=np.int64)
+    
+    if n == 0:
+        return supertrend, direction
+    
+    supertrend[0] = final_upper_band[0]
+    direction[0] = -1
+    
+    for i in range(1, n):
+        prev_upper = final_upper_band[i-1]
+        prev_lower = final_lower_band[i-1]
+        upper = final_upper_band[i]
+        lower = final_lower_band[i]
+        
+        # Bands reset to the basic band, otherwise carry over (rows start as copies of the basic bands)
+        np.copyto(upper, prev_upper, where=~((basic_upper_band[i] < prev_upper) | (close[i-1] > prev_upper)))
+        np.copyto(lower, prev_lower, where=~((basic_lower_band[i] > prev_lower) | (close[i-1] < prev_lower)))
+        
+        # Same branch order as the single-column kernel; columns matching no branch keep 0 / 1
+        on_upper = supertrend[i-1] == prev_upper
+        upper_stays = on_upper & (close[i] <= upper)
+        upper_flips = on_upper & (close[i] > upper)
+        on_lower = ~(upper_stays | upper_flips) & (supertrend[i-1] == prev_lower)
+        to_upper = upper_stays | (on_lower & (close[i] < lower))
+        to_lower = upper_flips | (on_lower & (close[i] >= lower))
+        
+        np.copyto(supertrend[i], upper, where=to_upper)
+        np.copyto(supertrend[i], lower, where=to_lower)
+        direction[i][to_upper] = -1
+    
+    return supertrend, direction
+
+
+if NUMBA_AVAILABLE:
+    _SUPERTREND_KERNEL = njit(cache=True)(_supertrend_kernel)
+else:
+    _SUPERTREND_KERNEL = _supertrend_kernel
+
+# Below this many parameter sets the per-row overhead of the batch kernel outweighs
+# running the single-column kernel once per set
+_BATCH_KERNEL_MIN_COLUMNS = 10
+
+
+def _supertrend_columns(close: np.ndarray, basic_upper_band: np.ndarray,
+                        basic_lower_band: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Run the Supertrend recursion for many parameter sets at once
+    
+    Uses the row-vectorized batch kernel for wide inputs without numba, and
+    the (compiled) single-column kernel per parameter set otherwise.
+    
+    Args:
+        close: Close prices, shape (n,)
+        basic_upper_band: Basic upper bands, shape (n, k)
+        basic_lower_band: Basic lower bands, shape (n, k)
+        
+    Returns:
+        Tuple of supertrend and direction arrays, shape (n, k)
+    """
+    n, k = basic_upper_band.shape
+    if not NUMBA_AVAILABLE and k >= _BATCH_KERNEL_MIN_COLUMNS:
+        return _supertrend_batch_kernel(close, basic_upper_band, basic_lower_band)
+    
+    supertrend = np.zeros((n, k))
+    direction = np.ones((n, k), dtype=np.int64)
+    for j in range(k):
+        supertrend[:, j], direction[:, j], _, _ = _SUPERTREND_KERNEL(
+            close, np.ascontiguousarray(basic_upper_band[:, j]), np.ascontiguousarray(basic_lower_band[:, j])
+        )
+    return supertrend, direction
+
+
+def calculate_supertrend(df: pd.DataFrame, atr_period: int = 10, multiplier: float = 3.0,
+                         atr: Optional[pd.Series] = None, hl2: Optional[pd.Series] = None) -> Tuple[pd.Series, pd.Series]:
     """
     Calculate Supertrend indicator
     
@@ -44,66 +214,92 @@ def calculate_supertrend(df: pd.DataFrame, atr_period: int = 10, multiplier: flo
         df: DataFrame with OHLC data
         atr_period: Period for ATR calculation
         multiplier: ATR multiplier for band calculation
+        atr: Precomputed ATR(atr_period) to reuse (optional)
+        hl2: Precomputed (high + low) / 2 to reuse (optional)
         
     Returns:
         Tuple[pd.Series, pd.Series]: Supertrend values and direction (1 for bullish, -1 for bearish)
     """
     # Calculate ATR
-    atr = calculate_atr(df, atr_period)
+    if atr is None:
+        atr = calculate_atr(df, atr_period)
     
     # Calculate basic upper and lower bands
-    hl2 = (df['high'] + df['low']) / 2
+    if hl2 is None:
+        hl2 = (df['high'] + df['low']) / 2
     basic_upper_band = hl2 + (multiplier * atr)
     basic_lower_band = hl2 - (multiplier * atr)
     
-    # Initialize final bands and supertrend series
-    final_upper_band = basic_upper_band.copy()
-    final_lower_band = basic_lower_band.copy()
-    supertrend = pd.Series(0.0, index=df.index)
-    direction = pd.Series(1, index=df.index)  # 1 for bullish, -1 for bearish
+    # Run the band recursion on plain arrays (numba-compiled when available)
+    supertrend, direction, _, _ = _SUPERTREND_KERNEL(
+        np.asarray(df['close'], dtype=np.float64),
+        np.asarray(basic_upper_band, dtype=np.float64),
+        np.asarray(basic_lower_band, dtype=np.float64)
+    )
     
-    # Calculate final bands and supertrend values
-    for i in range(1, len(df)):
-        if basic_upper_band.iloc[i] < final_upper_band.iloc[i-1] or df['close'].iloc[i-1] > final_upper_band.iloc[i-1]:
-            final_upper_band.iloc[i] = basic_upper_band.iloc[i]
-        else:
-            final_upper_band.iloc[i] = final_upper_band.iloc[i-1]
-            
-        if basic_lower_band.iloc[i] > final_lower_band.iloc[i-1] or df['close'].iloc[i-1] < final_lower_band.iloc[i-1]:
-            final_lower_band.iloc[i] = basic_lower_band.iloc[i]
-        else:
-            final_lower_band.iloc[i] = final_lower_band.iloc[i-1]
-            
-        # Determine direction and supertrend value
-        if supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and df['close'].iloc[i] <= final_upper_band.iloc[i]:
-            supertrend.iloc[i] = final_upper_band.iloc[i]
-            direction.iloc[i] = -1
-        elif supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and df['close'].iloc[i] > final_upper_band.iloc[i]:
-            supertrend.iloc[i] = final_lower_band.iloc[i]
-            direction.iloc[i] = 1
-        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and df['close'].iloc[i] >= final_lower_band.iloc[i]:
-            supertrend.iloc[i] = final_lower_band.iloc[i]
-            direction.iloc[i] = 1
-        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and df['close'].iloc[i] < final_lower_band.iloc[i]:
-            supertrend.iloc[i] = final_upper_band.iloc[i]
-            direction.iloc[i] = -1
+    return pd.Series(supertrend, index=df.index), pd.Series(direction, index=df.index)
+
+
+def calculate_supertrend_batch(df: pd.DataFrame, atr_periods, multipliers,
+                               atrs: Optional[Dict[int, pd.Series]] = None,
+                               hl2: Optional[pd.Series] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate Supertrend for several (atr_period, multiplier) pairs in one pass
     
-    return supertrend, direction
+    Column j equals calculate_supertrend(df, atr_periods[j], multipliers[j]). The
+    True Range and midpoint are computed once and the ATR once per distinct period.
+    
+    Args:
+        df: DataFrame with OHLC data
+        atr_periods: ATR period of each pair
+        multipliers: ATR multiplier of each pair (same length as atr_periods)
+        atrs: Precomputed ATR series by period to reuse (optional)
+        hl2: Precomputed (high + low) / 2 to reuse (optional)
+        
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Supertrend values and directions, shape (len(df), pairs)
+    """
+    atr_periods = [int(period) for period in atr_periods]
+    multipliers = np.asarray(multipliers, dtype=np.float64)
+    if len(atr_periods) != len(multipliers):
+        raise ValueError("atr_periods and multipliers must have the same length")
+    
+    atrs = dict(atrs or {})
+    missing = [period for period in dict.fromkeys(atr_periods) if period not in atrs]
+    if missing:
+        tr = calculate_true_range(df)
+        for period in missing:
+            atrs[period] = calculate_atr(df, period, tr=tr)
+    
+    if hl2 is None:
+        hl2 = (df['high'] + df['low']) / 2
+    hl2 = np.asarray(hl2, dtype=np.float64)[:, None]
+    atr = np.column_stack([np.asarray(atrs[period], dtype=np.float64) for period in atr_periods]) \
+        if atr_periods else np.empty((len(df), 0))
+    
+    # Same arithmetic as calculate_supertrend, so every column is bit-identical to it
+    offset = multipliers * atr
+    return _supertrend_columns(
+        np.asarray(df['close'], dtype=np.float64),
+        np.ascontiguousarray(hl2 + offset),
+        np.ascontiguousarray(hl2 - offset)
+    )
 
 
-def calculate_adx(df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+def calculate_adx(df: pd.DataFrame, period: int = 14, tr: Optional[pd.Series] = None) -> pd.DataFrame:
     """
     Calculate Average Directional Index (ADX)
     
     Args:
         df: DataFrame with OHLC data
         period: ADX calculation period
+        tr: Precomputed True Range to reuse (optional)
         
     Returns:
         pd.DataFrame: DataFrame with ADX, +DI, and -DI values
     """
     # Calculate True Range
-    tr = calculate_atr(df, 1)  # Use ATR with period=1 to get TR
+    tr = calculate_atr(df, 1, tr=tr)  # Use ATR with period=1 to get TR
     
     # Calculate +DM and -DM
     high_diff = df['high'].diff()
@@ -158,7 +354,78 @@ def detect_inside_bar(df: pd.DataFrame) -> pd.Series:
     return inside_bar
 
 
-def is_atr_in_bottom_percentile(df: pd.DataFrame, atr_period: int = 14, lookback: int = 50, percentile: float = 30) -> pd.Series:
+def rolling_percentile_rank(series: pd.Series, window: int) -> pd.Series:
+    """
+    Percentile rank (0-100) of each value within its trailing window
+    
+    Matches `series.rolling(window).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1] * 100)`
+    (average rank for ties, NaN until the window is full or while it holds a NaN), but keeps
+    the window in a sorted list so each step costs O(log w) comparisons instead of a full re-rank.
+    
+    Args:
+        series: Values to rank
+        window: Rolling window length
+        
+    Returns:
+        pd.Series: Percentile rank of each value within its window
+    """
+    values = series.tolist()
+    ranks = np.full(len(values), np.nan)
+    sorted_window = []
+    nan_count = 0
+    
+    for i, value in enumerate(values):
+        # Add the incoming value (NaN is tracked by count, never sorted)
+        if value != value:
+            nan_count += 1
+        else:
+            insort(sorted_window, value)
+        
+        # Drop the value that just left the window
+        if i >= window:
+            old_value = values[i - window]
+            if old_value != old_value:
+                nan_count -= 1
+            else:
+                del sorted_window[bisect_left(sorted_window, old_value)]
+        
+        if i >= window - 1 and nan_count == 0:
+            below = bisect_left(sorted_window, value)
+            ties = bisect_right(sorted_window, value) - below
+            ranks[i] = (below + (ties + 1) / 2) / window * 100
+    
+    return pd.Series(ranks, index=series.index)
+
+
+def percentile_rank_last(values: np.ndarray, window: int) -> float:
+    """
+    Percentile rank (0-100) of the last value within its trailing window
+    
+    Equals `rolling_percentile_rank(series, window).iloc[-1]` without ranking the
+    earlier windows, for evaluating only the newest candle.
+    
+    Args:
+        values: Values to rank, oldest first
+        window: Rolling window length
+        
+    Returns:
+        float: Percentile rank of the last value (NaN if the window isn't full or holds a NaN)
+    """
+    if len(values) < window:
+        return np.nan
+    
+    window_values = np.asarray(values[len(values) - window:], dtype=np.float64)
+    if np.isnan(window_values).any():
+        return np.nan
+    
+    value = window_values[-1]
+    below = int(np.count_nonzero(window_values < value))
+    ties = int(np.count_nonzero(window_values == value))
+    return (below + (ties + 1) / 2) / window * 100
+
+
+def is_atr_in_bottom_percentile(df: pd.DataFrame, atr_period: int = 14, lookback: int = 50, percentile: float = 30,
+                                atr: Optional[pd.Series] = None, atr_rank: Optional[pd.Series] = None) -> pd.Series:
     """
     Check if current ATR is in the bottom percentile of its range
     
@@ -167,18 +434,19 @@ def is_atr_in_bottom_percentile(df: pd.DataFrame, atr_period: int = 14, lookback
         atr_period: Period for ATR calculation
         lookback: Period for percentile calculation
         percentile: Percentile threshold (0-100)
+        atr: Precomputed ATR(atr_period) to reuse (optional)
+        atr_rank: Precomputed rolling percentile rank of the ATR over lookback to reuse (optional)
         
     Returns:
         pd.Series: Boolean series indicating if ATR is in bottom percentile
     """
-    # Calculate ATR
-    atr = calculate_atr(df, atr_period)
-    
-    # Calculate rolling percentile rank of ATR
-    def rolling_percentile_rank(x):
-        return pd.Series(x).rank(pct=True).iloc[-1] * 100
-    
-    atr_rank = atr.rolling(window=lookback).apply(rolling_percentile_rank, raw=False)
+    if atr_rank is None:
+        # Calculate ATR
+        if atr is None:
+            atr = calculate_atr(df, atr_period)
+        
+        # Calculate rolling percentile rank of ATR
+        atr_rank = rolling_percentile_rank(atr, lookback)
     
     # Check if ATR is in bottom percentile
     is_low_volatility = atr_rank <= percentile
@@ -10,11 +10,220 @@ import time
 import hmac
 import hashlib
 import base64
+import math
+import threading
 from urllib.parse import urlencode
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.utils.latency_histogram import LatencyHistogram
+from src.utils.symbols import from_bitget, to_bitget
 
 logger = logging.getLogger(__name__)
 
+# Statuses worth retrying on idempotent requests (rate limited or transient server errors)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# One keep-alive connection pool and one set of latency histograms shared by every TradingAPI instance
+_http_session = None
+_http_session_lock = threading.Lock()
+_endpoint_latency: Dict[str, LatencyHistogram] = {}
+_endpoint_latency_lock = threading.Lock()
+
+# All-positions snapshot shared by every TradingAPI instance: symbol -> raw Bitget position entries
+_positions_snapshot: Optional[Dict[str, List[Dict]]] = None
+_positions_snapshot_time = 0.0
+_positions_generation = 0  # Bumped by every order-changing request
+_positions_snapshot_lock = threading.Lock()
+_positions_fetch_lock = threading.Lock()
+
+CONTRACTS_ENDPOINT = "/api/mix/v1/market/contracts"
+
+
+def _build_http_session() -> requests.Session:
+    """
+    Create the pooled session used for Bitget requests
+
+    GETs are retried with exponential backoff on connection errors and RETRY_STATUSES;
+    order-changing POSTs are only retried when the connection could not be opened,
+    so a request the exchange may have received is never sent twice.
+
+    Returns:
+        requests.Session: Session with a sized, retrying connection pool
+    """
+    retry = Retry(
+        total=int(os.getenv('BITGET_HTTP_RETRIES', '3')),
+        backoff_factor=float(os.getenv('BITGET_HTTP_BACKOFF', '0.3')),
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(['GET']),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    pool_size = int(os.getenv('BITGET_HTTP_POOL_SIZE', '10'))
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """Shared pooled session, created on first use"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = _build_http_session()
+        return _http_session
+
+
+def get_latency_stats() -> Dict[str, Dict]:
+    """
+    Latency histograms of Bitget requests
+
+    Returns:
+        Dict[str, Dict]: Histogram summary by 'METHOD /endpoint'
+    """
+    with _endpoint_latency_lock:
+        histograms = dict(_endpoint_latency)
+    return {endpoint: histogram.to_dict() for endpoint, histogram in sorted(histograms.items())}
+
+
+def invalidate_positions_snapshot() -> None:
+    """Drop the cached all-positions snapshot so the next read fetches a fresh one"""
+    global _positions_snapshot, _positions_generation
+    with _positions_snapshot_lock:
+        _positions_snapshot = None
+        _positions_generation += 1
+
+
+def _record_latency(method: str, endpoint: str, latency_ms: float, error: bool) -> None:
+    """Add one request to its endpoint's histogram (query strings are not part of the key)"""
+    key = f"{method} {endpoint.split('?')[0]}"
+    with _endpoint_latency_lock:
+        histogram = _endpoint_latency.get(key)
+        if histogram is None:
+            histogram = _endpoint_latency[key] = LatencyHistogram()
+    histogram.record(latency_ms, error=error)
+
+
+class ContractMetadataCache:
+    """
+    Bitget USDT-M contract specifications keyed by Bitget symbol ('BTCUSDT_UMCBL')
+    
+    Loaded once from the public contracts endpoint and refreshed after
+    CONTRACTS_CACHE_TTL seconds, so prices and sizes are rounded to the
+    contract tick and lot without a request per order. In test mode
+    (TEST_MODE) the endpoint is never called and the default rounding applies.
+    """
+    
+    def __init__(self, ttl: Optional[float] = None, fetch=None):
+        """
+        Initialize the cache
+        
+        Args:
+            ttl: Seconds before the contracts are reloaded (default: CONTRACTS_CACHE_TTL env, 3600)
+            fetch: Callable returning the raw contract list (default: Bitget contracts endpoint)
+        """
+        self.ttl = ttl if ttl is not None else float(os.getenv('CONTRACTS_CACHE_TTL', '3600'))
+        self.retry_interval = min(60.0, self.ttl)
+        self._fetch = fetch or self._fetch_contracts
+        self._remote = fetch is None
+        self._contracts: Dict[str, Dict] = {}
+        self._next_refresh = 0.0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _fetch_contracts() -> List[Dict]:
+        """Raw contract list from Bitget (public endpoint, no signature)"""
+        response = get_http_session().get(f"https://api.bitget.com{CONTRACTS_ENDPOINT}",
+                                          params={"productType": "umcbl"}, timeout=10)
+        response.raise_for_status()
+        payload = response.json()
+        if payload.get('code') != '00000':
+            raise ValueError(f"Bitget API error: {payload.get('msg', 'Unknown error')} (code: {payload.get('code')})")
+        return payload.get('data') or []
+    
+    @staticmethod
+    def parse_contract(contract: Dict) -> Dict:
+        """
+        Extract the trading rules of one contract
+        
+        Args:
+            contract: Contract entry from the contracts endpoint
+            
+        Returns:
+            Dict: symbol, price_place, tick_size, volume_place, lot_size, min_size, min_notional, max_leverage
+        """
+        price_place = int(contract.get('pricePlace', 4))
+        volume_place = int(contract.get('volumePlace', 4))
+        max_leverage = contract.get('maxLever') or contract.get('maxLeverage')
+        return {
+            'symbol': contract.get('symbol', ''),
+            'price_place': price_place,
+            'tick_size': float(contract.get('priceEndStep', 1) or 1) * 10 ** -price_place,
+            'volume_place': volume_place,
+            'lot_size': float(contract.get('sizeMultiplier') or 10 ** -volume_place),
+            'min_size': float(contract.get('minTradeNum', 0) or 0),
+            'min_notional': float(contract.get('minTradeUSDT', 5) or 5),
+            'max_leverage': int(float(max_leverage)) if max_leverage else None
+        }
+    
+    def refresh(self) -> bool:
+        """
+        Reload the contracts now
+        
+        Returns:
+            bool: True if the contracts were loaded
+        """
+        try:
+            contracts = {}
+            for contract in self._fetch():
+                info = self.parse_contract(contract)
+                contracts[info['symbol']] = info
+        except Exception as e:
+            logger.warning(f"Could not load Bitget contract metadata: {str(e)}")
+            with self._lock:
+                self._next_refresh = time.monotonic() + self.retry_interval
+            return False
+        
+        with self._lock:
+            self._contracts = contracts
+            self._next_refresh = time.monotonic() + self.ttl
+        logger.info(f"Loaded metadata for {len(contracts)} Bitget contracts")
+        return True
+    
+    def _ensure_fresh(self) -> None:
+        """Reload stale contracts; one caller refreshes while the others keep the current ones"""
+        if self._remote and os.getenv('TEST_MODE', 'false').lower() == 'true':
+            return
+        with self._lock:
+            if time.monotonic() < self._next_refresh:
+                return
+            # Claim the refresh before fetching so concurrent callers do not start their own
+            self._next_refresh = time.monotonic() + self.retry_interval
+        self.refresh()
+    
+    def get(self, symbol: str) -> Optional[Dict]:
+        """
+        Trading rules of a symbol in any supported notation
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT' or 'BTCUSDT_UMCBL')
+            
+        Returns:
+            Optional[Dict]: Contract rules (see parse_contract), or None if unknown
+        """
+        self._ensure_fresh()
+        key = to_bitget(symbol)
+        return self._contracts.get(key) if key else None
+
+
+# Shared by every TradingAPI instance
+contract_cache = ContractMetadataCache()
+
 
 class TradingAPI:
     """
@@ -38,6 +247,10 @@ class TradingAPI:
         # Bitget API endpoints
         self.futures_base_url = "https://api.bitget.com/api/mix/v1"
         
+        # (connect, read) timeouts in seconds for every request
+        self.timeout = (float(os.getenv('BITGET_CONNECT_TIMEOUT', '3.05')),
+                        float(os.getenv('BITGET_READ_TIMEOUT', '10')))
+        
         if self.is_configured:
             logger.info("Trading API client initialized with Bitget API")
         else:
@@ -62,9 +275,10 @@ class TradingAPI:
         signature = hmac.new(self.api_secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256).digest()
         return base64.b64encode(signature).decode()
 
-    def _make_bitget_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+    def _prepare_bitget_request(self, method: str, endpoint: str, params: Dict = None,
+                                data: Dict = None) -> Tuple[str, Dict, str]:
         """
-        Make a request to the Bitget API
+        Build the URL, signed headers and body of a Bitget request
 
         Args:
             method: HTTP method (GET, POST, etc.)
@@ -73,12 +287,8 @@ class TradingAPI:
             data: Request body data
 
         Returns:
-            Dict: API response
+            Tuple[str, Dict, str]: URL, headers and JSON body
         """
-        if not self.is_configured:
-            logger.error("Bitget API not configured")
-            return {"error": "API not configured"}
-
         # Prepare URL with query parameters if any
         url = f"{self.base_url}{endpoint}"
         if params:
@@ -105,28 +315,76 @@ class TradingAPI:
             "ACCESS-PASSPHRASE": self.api_passphrase,
             "Content-Type": "application/json"
         }
+        return url, headers, body
+
+    @staticmethod
+    def _check_bitget_response(status_code: int, response_data: Dict) -> Dict:
+        """
+        Turn a Bitget error response into an error dict
+
+        Args:
+            status_code: HTTP status
+            response_data: Decoded response body
+
+        Returns:
+            Dict: The response, or {'error': message} if the API reported an error
+        """
+        if status_code != 200 or (response_data.get('code') != '00000' and 'data' not in response_data):
+            error_msg = f"Bitget API error: {response_data.get('msg', 'Unknown error')}"
+            logger.error(error_msg)
+            return {"error": error_msg}
+        return response_data
+
+    def _make_bitget_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """
+        Make a request to the Bitget API
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path (e.g., '/api/mix/v1/account/account')
+            params: Query parameters
+            data: Request body data
+
+        Returns:
+            Dict: API response
+        """
+        if not self.is_configured:
+            logger.error("Bitget API not configured")
+            return {"error": "API not configured"}
 
+        url, headers, body = self._prepare_bitget_request(method, endpoint, params, data)
+        if method != 'GET':
+            # Orders change positions; don't serve a snapshot taken before this request
+            invalidate_positions_snapshot()
+
+        start = time.perf_counter()
+        response_data = {"error": "request failed"}
         try:
-            response = requests.request(
+            response = get_http_session().request(
                 method=method,
                 url=url,
                 headers=headers,
-                data=body
+                data=body,
+                timeout=self.timeout
             )
 
-            response_data = response.json()
-            
-            # Check for API errors
-            if response.status_code != 200 or (response_data.get('code') != '00000' and 'data' not in response_data):
-                error_msg = f"Bitget API error: {response_data.get('msg', 'Unknown error')}"
-                logger.error(error_msg)
-                return {"error": error_msg}
-                
+            response_data = self._check_bitget_response(response.status_code, response.json())
             return response_data
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Bitget API request failed: {e}")
             return {"error": str(e)}
+        finally:
+            _record_latency(method, endpoint, (time.perf_counter() - start) * 1000, 'error' in response_data)
+
+    def get_latency_stats(self) -> Dict[str, Dict]:
+        """
+        Latency histograms of Bitget requests made by any TradingAPI instance
+
+        Returns:
+            Dict[str, Dict]: Histogram summary by 'METHOD /endpoint'
+        """
+        return get_latency_stats()
 
     # Removed Binance integration code as we're using Bidget API exclusively
 
@@ -211,48 +469,242 @@ class TradingAPI:
         Returns:
             Dict: Account information
         """
-        endpoint = "/api/mix/v1/account/account"
-        params = {
+        endpoint, params = self._account_info_request()
+        
+        try:
+            response = self._make_request("GET", endpoint, params=params, signed=True)
+            return self._parse_account_info(response)
+        except Exception as e:
+            logger.error(f"Error getting account info: {str(e)}")
+            return {"error": str(e)}
+
+    @staticmethod
+    def _account_info_request() -> Tuple[str, Dict]:
+        """Endpoint and query parameters of the account info request"""
+        return "/api/mix/v1/account/account", {
             "symbol": "BTCUSDT_UMCBL",  # Any valid symbol works for account info
             "marginCoin": "USDT"  # We're using USDT margin
         }
+
+    @staticmethod
+    def _parse_account_info(response: Dict) -> Dict:
+        """
+        Format an account info response for our internal API
+
+        Args:
+            response: Bitget response
+
+        Returns:
+            Dict: Available balance, equity, margin ratio and unrealized PnL, or an error
+        """
+        if 'error' in response:
+            return response
+            
+        # Format response for consistency with our internal API
+        account_data = response.get('data', {})
         
+        if not account_data:
+            logger.error("Error parsing account data: no data returned")
+            return {"error": "No account data returned"}
+            
+        # Extract available balance
         try:
-            response = self._make_request("GET", endpoint, params=params, signed=True)
+            # Bitget returns available as a string, so convert to float
+            available_balance = float(account_data.get('available', 0))
+            equity = float(account_data.get('equity', available_balance))
+            unrealized_pnl = float(account_data.get('unrealizedPL', 0))
+            margin_ratio = float(account_data.get('marginRatio', 0))
+        except (ValueError, TypeError) as e:
+            logger.error(f"Error parsing account data: {e}")
+            return {"error": f"Failed to parse account data: {e}"}
             
+        return {
+            "available_balance": available_balance,
+            "equity": equity,
+            "margin_ratio": margin_ratio,
+            "unrealized_pnl": unrealized_pnl
+        }
+
+    def get_position(self, symbol: str) -> Dict:
+        """
+        Get the open position of a symbol
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+
+        Returns:
+            Dict: Position with size, holdSide and entryPrice (size 0 if flat), or an error
+        """
+        if to_bitget(symbol) is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
+        endpoint, params = self._position_request(symbol)
+        
+        try:
+            response = self._make_request("GET", endpoint, params=params, signed=True)
+            return self._parse_position(symbol, response)
+        except Exception as e:
+            error_msg = f"Error getting position for {symbol}: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return {"error": error_msg}
+
+    def get_positions(self, symbols: List[str], max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Get the positions of several symbols from one all-positions snapshot
+
+        The snapshot is fetched with a single request and shared by every TradingAPI
+        instance for POSITIONS_CACHE_TTL seconds; any order-changing request drops it.
+
+        Args:
+            symbols: Trading pair symbols (e.g., ['BTC/USDT', 'ETH/USDT'])
+            max_age: Maximum snapshot age in seconds (default: POSITIONS_CACHE_TTL env, 5)
+
+        Returns:
+            Dict[str, Dict]: Position by symbol in get_position format
+            (an error dict for every symbol if the snapshot could not be fetched)
+        """
+        snapshot = self._get_positions_snapshot(max_age)
+        if 'error' in snapshot:
+            return {symbol: snapshot for symbol in symbols}
+        
+        positions = {}
+        for symbol in symbols:
+            bitget_symbol = to_bitget(symbol)
+            if bitget_symbol is None:
+                # Not flat, just unknown: reporting size 0 would close the tracked trade
+                positions[symbol] = {"error": f"{symbol} is not supported on Bitget"}
+                continue
+            positions[symbol] = self._parse_position(symbol, {'data': snapshot.get(bitget_symbol, [])})
+        return positions
+
+    def _get_positions_snapshot(self, max_age: Optional[float] = None) -> Dict:
+        """
+        Raw position entries by Bitget symbol, fetched at most once per max_age seconds
+
+        Args:
+            max_age: Maximum snapshot age in seconds (default: POSITIONS_CACHE_TTL env, 5)
+
+        Returns:
+            Dict: Entries by Bitget symbol (e.g., 'BTCUSDT_UMCBL'), or {'error': message}
+        """
+        global _positions_snapshot, _positions_snapshot_time
+        if max_age is None:
+            max_age = float(os.getenv('POSITIONS_CACHE_TTL', '5'))
+
+        # Callers arriving while a fetch is in flight wait for it instead of sending their own
+        with _positions_fetch_lock:
+            with _positions_snapshot_lock:
+                if _positions_snapshot is not None and time.monotonic() - _positions_snapshot_time <= max_age:
+                    return _positions_snapshot
+                generation = _positions_generation
+
+            fetched_at = time.monotonic()
+            response = self._make_request("GET", "/api/mix/v1/position/allPosition",
+                                          params={"productType": "umcbl", "marginCoin": "USDT"}, signed=True)
             if 'error' in response:
+                logger.error(f"Failed to get positions: {response.get('error')}")
                 return response
-                
-            # Format response for consistency with our internal API
-            account_data = response.get('data', {})
+
+            position_data = response.get('data') or []
+            if isinstance(position_data, dict):
+                position_data = [position_data]
+            snapshot = {}
+            for position in position_data:
+                if isinstance(position, dict) and position.get('symbol'):
+                    snapshot.setdefault(position['symbol'], []).append(position)
+
+            with _positions_snapshot_lock:
+                # An order sent during the fetch may not be reflected; don't cache it
+                if generation == _positions_generation:
+                    _positions_snapshot = snapshot
+                    _positions_snapshot_time = fetched_at
+            return snapshot
+
+    @staticmethod
+    def _position_request(symbol: str) -> Tuple[str, Dict]:
+        """Endpoint and query parameters of the single-position request"""
+        return "/api/mix/v1/position/singlePosition", {"symbol": to_bitget(symbol), "marginCoin": "USDT"}
+
+    @staticmethod
+    def _parse_position(symbol: str, response: Dict) -> Dict:
+        """
+        Format a single-position response for our internal API
+
+        Args:
+            symbol: Trading pair symbol the position was requested for
+            response: Bitget response
+
+        Returns:
+            Dict: First non-empty position (size 0 if there is none), or an error
+        """
+        if 'error' in response:
+            return response
+        
+        # Bitget returns one entry per hold side (a single dict on some endpoints)
+        position_data = response.get('data') or []
+        if isinstance(position_data, dict):
+            position_data = [position_data]
+        
+        for position in position_data:
+            if not isinstance(position, dict):
+                continue
+            size = float(position.get('total', 0) or 0)
+            if size > 0:
+                return {
+                    "symbol": symbol,
+                    "size": size,
+                    "holdSide": position.get('holdSide', ''),
+                    "entryPrice": float(position.get('averageOpenPrice', 0) or 0),
+                    "unrealizedPL": float(position.get('unrealizedPL', 0) or 0),
+                    "leverage": float(position.get('leverage', 0) or 0)
+                }
+        return {"symbol": symbol, "size": 0.0}
+
+    def round_price(self, symbol: str, price: float) -> float:
+        """
+        Round a price to the contract's tick size (5 decimals if the contract is unknown)
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            price: Price to round
             
-            if not account_data:
-                logger.error("Error parsing account data: no data returned")
-                return {"error": "No account data returned"}
-                
-            # Extract available balance
-            try:
-                # Bitget returns available as a string, so convert to float
-                available_balance = float(account_data.get('available', 0))
-                equity = float(account_data.get('equity', available_balance))
-                unrealized_pnl = float(account_data.get('unrealizedPL', 0))
-                margin_ratio = float(account_data.get('marginRatio', 0))
-            except (ValueError, TypeError) as e:
-                logger.error(f"Error parsing account data: {e}")
-                return {"error": f"Failed to parse account data: {e}"}
-                
-            return {
-                "available_balance": available_balance,
-                "equity": equity,
-                "margin_ratio": margin_ratio,
-                "unrealized_pnl": unrealized_pnl
-            }
+        Returns:
+            float: Rounded price
+        """
+        contract = contract_cache.get(symbol)
+        if contract is None:
+            return round(price, 5)
+        return round(round(price / contract['tick_size']) * contract['tick_size'], contract['price_place'])
+    
+    def round_quantity(self, symbol: str, quantity: float) -> float:
+        """
+        Round a quantity down to the contract's lot size (4 decimals if the contract is unknown)
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            quantity: Order size in base currency
             
-        except Exception as e:
-            logger.error(f"Error getting account info: {str(e)}")
-            return {"error": str(e)}
-
-    def place_order(self, symbol: str, side: str, quantity: Optional[float] = None, price: Optional[float] = None, order_type: str = None, position_side: str = None) -> Dict:
+        Returns:
+            float: Rounded quantity
+            
+        Raises:
+            ValueError: If the rounded quantity is zero or below the contract's minimum size
+        """
+        contract = contract_cache.get(symbol)
+        if contract is None:
+            rounded = round(quantity, 4)
+            min_size = 0.0
+        else:
+            lot_size = contract['lot_size']
+            # The epsilon keeps float noise (0.3 / 0.1 = 2.9999...) from dropping a lot
+            rounded = round(math.floor(quantity / lot_size + 1e-9) * lot_size, contract['volume_place'])
+            min_size = contract['min_size']
+        
+        if rounded <= 0 or rounded < min_size:
+            raise ValueError(f"Order size {quantity} for {symbol} rounds to {rounded}, below the minimum of {min_size}")
+        return rounded
+    
+    def place_order(self, symbol: str, side: str, quantity: Optional[float] = None, price: Optional[float] = None, order_type: str = None, position_side: str = None,
+                    take_profit: Optional[float] = None, stop_loss: Optional[float] = None) -> Dict:
         """
         Place an order on the exchange
         
@@ -263,16 +715,15 @@ class TradingAPI:
             price: Limit price (if None, a market order will be placed)
             order_type: Optional order type override ('market' or 'limit')
             position_side: Optional explicit position side ('long' or 'short') for hedging mode
+            take_profit: Take-profit trigger attached to the order (Bitget preset, active from the fill)
+            stop_loss: Stop-loss trigger attached to the order (Bitget preset, active from the fill)
             
         Returns:
             Dict: Order execution result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = to_bitget(symbol)
+        if formatted_symbol is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
             
         # Set leverage to 15x for all trades as per user requirements
         try:
@@ -360,7 +811,11 @@ class TradingAPI:
             
             # Set minimum size requirements based on asset (physical units)
             min_size = 0.01  # Default minimum size
-            if 'BTC' in symbol:
+            contract = contract_cache.get(symbol)
+            if contract is not None:
+                min_size = contract['min_size']
+                min_notional = contract['min_notional']
+            elif 'BTC' in symbol:
                 min_size = 0.001  # BTC minimum
             elif 'ETH' in symbol:
                 min_size = 0.01   # ETH minimum
@@ -513,23 +968,35 @@ class TradingAPI:
             logger.warning(f"Could not set leverage: {str(e)}")
             return {"error": f"Failed to set leverage: {str(e)}"}
         
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
+        
         # Order parameters for Bitget futures API
         params = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",  # USDT-margined contract
             "side": order_side,
             "orderType": order_type,
-            "size": str(quantity),  # Don't round - let the API handle precision
+            "size": str(size),
             "holdSide": hold_side  # Must match the holdSide used for setting leverage
         }
         
         if order_type == "limit" and price is not None:
-            # Round price to 5 decimal places to ensure it's a multiple of 0.00001
-            rounded_price = round(price, 5)
+            # Round price to a multiple of the contract tick size
+            rounded_price = self.round_price(symbol, price)
             params["price"] = str(rounded_price)
             if rounded_price != price:
                 logger.info(f"Rounded order price from {price} to {rounded_price} to comply with Bitget tick size requirements")
         
+        # TP/SL placed atomically with the entry; an off-tick trigger would reject the entry itself
+        if take_profit is not None:
+            params["presetTakeProfitPrice"] = str(self.round_price(symbol, take_profit))
+        if stop_loss is not None:
+            params["presetStopLossPrice"] = str(self.round_price(symbol, stop_loss))
+        
         # Place the order using Bitget's futures API
         endpoint = "/api/mix/v1/order/placeOrder"
         
@@ -550,6 +1017,8 @@ class TradingAPI:
                 "status": order_data.get('state', ''),
                 "filled_qty": float(order_data.get('size', 0)),
                 "entry_price": float(order_data.get('price', price if price else 0)),
+                "take_profit": take_profit,
+                "stop_loss": stop_loss,
             }
         except Exception as e:
             error_msg = f"Error placing order: {str(e)}"
@@ -569,12 +1038,9 @@ class TradingAPI:
         Returns:
             Dict: Order result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = to_bitget(symbol)
+        if formatted_symbol is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
             
         # Determine position side from parameter or lookup
         if position_side:
@@ -609,15 +1075,20 @@ class TradingAPI:
                 return {"error": f"Could not determine position side: {str(e)}"}
             
         # For Bitget, we need to place a conditional order with trigger price
-        # Round stop_price to 5 decimal places to comply with Bitget requirements
-        rounded_stop_price = round(stop_price, 5)
+        # Round stop_price to the contract tick size
+        rounded_stop_price = self.round_price(symbol, stop_price)
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
         
         data = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "orderType": "market",  # Market order for immediate execution when triggered
             "side": close_side,  # Close the correct position side
-            "size": str(round(quantity, 4)),
+            "size": str(size),
             "triggerType": "market_price",
             "triggerPrice": str(rounded_stop_price),
             "planType": "stop",
@@ -661,12 +1132,9 @@ class TradingAPI:
         Returns:
             Dict: Order result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = to_bitget(symbol)
+        if formatted_symbol is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
             
         # Determine position side from parameter or lookup
         if position_side:
@@ -701,15 +1169,20 @@ class TradingAPI:
                 return {"error": f"Could not determine position side: {str(e)}"}
             
         # For Bitget, we need to place a conditional order with trigger price
-        # Round take profit price to 5 decimal places to comply with Bitget requirements
-        rounded_price = round(price, 5)
+        # Round take profit price to the contract tick size
+        rounded_price = self.round_price(symbol, price)
+        try:
+            size = self.round_quantity(symbol, quantity)
+        except ValueError as e:
+            logger.error(f"Order rejected: {str(e)}")
+            return {"error": str(e)}
         
         data = {
             "symbol": formatted_symbol,
             "marginCoin": "USDT",
             "orderType": "market",  # Market order for immediate execution when triggered
             "side": close_side,  # Close the correct position side
-            "size": str(round(quantity, 4)),
+            "size": str(size),
             "triggerType": "market_price",
             "triggerPrice": str(rounded_price),
             "planType": "profit_plan",  # Take-profit plan
@@ -750,14 +1223,23 @@ class TradingAPI:
         Returns:
             List[Dict]: List of open orders
         """
-        # Format symbol for Bitget futures API if provided
-        formatted_symbol = None
-        if symbol:
-            if '/' in symbol:
-                base_currency = symbol.split('/')[0]
-                formatted_symbol = f"{base_currency}USDT_UMCBL"
-            else:
-                formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        if symbol and to_bitget(symbol) is None:
+            logger.error(f"{symbol} is not supported on Bitget")
+            return []
+        endpoint, params = self._open_orders_request(symbol)
+        
+        try:
+            response = self._make_request("GET", endpoint, params=params, signed=True)
+            return self._parse_open_orders(response)
+        except Exception as e:
+            error_msg = f"Error getting open orders: {str(e)}"
+            logger.error(error_msg, exc_info=True)
+            return []
+
+    @staticmethod
+    def _open_orders_request(symbol: Optional[str] = None) -> Tuple[str, Dict]:
+        """Endpoint and query parameters of the open orders request"""
+        formatted_symbol = to_bitget(symbol) if symbol else None
         
         # Set up parameters for the request
         params = {
@@ -768,36 +1250,40 @@ class TradingAPI:
             params["symbol"] = formatted_symbol
             
         # Use Bitget's futures API endpoint for active orders
-        endpoint = "/api/mix/v1/order/current"
-        
-        try:
-            response = self._make_request("GET", endpoint, params=params, signed=True)
+        return "/api/mix/v1/order/current", params
+
+    @staticmethod
+    def _parse_open_orders(response: Dict) -> List[Dict]:
+        """
+        Format an open orders response for our internal API
+
+        Args:
+            response: Bitget response
+
+        Returns:
+            List[Dict]: Open orders (empty on error)
+        """
+        if 'error' in response:
+            logger.error(f"Failed to get open orders: {response.get('error')}")
+            return []
             
-            if 'error' in response:
-                logger.error(f"Failed to get open orders: {response.get('error')}")
-                return []
-                
-            # Format response for consistency with our internal API
-            orders_data = response.get('data', [])
-            formatted_orders = []
+        # Format response for consistency with our internal API
+        orders_data = response.get('data', [])
+        formatted_orders = []
+        
+        for order in orders_data:
+            formatted_orders.append({
+                "orderId": order.get('orderId', ''),
+                "symbol": from_bitget(order.get('symbol', '')),
+                "price": float(order.get('price', 0)),
+                "origQty": float(order.get('size', 0)),
+                "executedQty": float(order.get('filledQty', 0)),
+                "status": order.get('status', ''),
+                "type": order.get('orderType', ''),
+                "side": "buy" if order.get('side', '') == "long" else "sell"
+            })
             
-            for order in orders_data:
-                formatted_orders.append({
-                    "orderId": order.get('orderId', ''),
-                    "symbol": order.get('symbol', '').replace('_UMCBL', '/USDT'),
-                    "price": float(order.get('price', 0)),
-                    "origQty": float(order.get('size', 0)),
-                    "executedQty": float(order.get('filledQty', 0)),
-                    "status": order.get('status', ''),
-                    "type": order.get('orderType', ''),
-                    "side": "buy" if order.get('side', '') == "long" else "sell"
-                })
-                
-            return formatted_orders
-        except Exception as e:
-            error_msg = f"Error getting open orders: {str(e)}"
-            logger.error(error_msg, exc_info=True)
-            return []
+        return formatted_orders
 
     def cancel_order(self, order_id: str, symbol: str) -> Dict:
         """
@@ -810,12 +1296,9 @@ class TradingAPI:
         Returns:
             Dict: Cancellation result
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+        formatted_symbol = to_bitget(symbol)
+        if formatted_symbol is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
             
         # Set up parameters for the request
         params = {
@@ -856,47 +1339,79 @@ class TradingAPI:
         Returns:
             Dict: Market data including last price, 24h high/low, and volume
         """
-        # Format symbol for Bitget futures API
-        if '/' in symbol:
-            base_currency = symbol.split('/')[0]
-            formatted_symbol = f"{base_currency}USDT_UMCBL"
-        else:
-            formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
-            
-        # Use Bitget's market ticker endpoint
-        endpoint = f"/api/mix/v1/market/ticker?symbol={formatted_symbol}"
+        if to_bitget(symbol) is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
+        endpoint = self._market_data_endpoint(symbol)
         
         try:
             response = self._make_request("GET", endpoint)
-            
-            if 'error' in response:
-                logger.error(f"Failed to get market data: {response.get('error')}")
-                return response
-                
-            # Extract and format the relevant market data
-            ticker_data = response.get('data', {})
-            
-            # Log raw response for debugging price issues
-            logger.debug(f"Raw ticker response for {symbol}: {ticker_data}")
-            
-            # Format response for consistency with our internal API
-            last_price = float(ticker_data.get('last', 0))
-            
-            return {
-                "symbol": symbol,
-                "last_price": last_price,
-                "bid_price": float(ticker_data.get('bidPr', last_price)),
-                "ask_price": float(ticker_data.get('askPr', last_price)),
-                "high_price": float(ticker_data.get('high24h', 0)),
-                "low_price": float(ticker_data.get('low24h', 0)),
-                "volume": float(ticker_data.get('baseVolume', 0)),
-                "timestamp": int(time.time() * 1000)
-            }
+            return self._parse_market_data(symbol, response)
         except Exception as e:
             error_msg = f"Error getting market data for {symbol}: {str(e)}"
             logger.error(error_msg, exc_info=True)
             return {"error": error_msg}
 
+    def get_current_price(self, symbol: str) -> Dict:
+        """
+        Get the last traded price of a symbol
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+
+        Returns:
+            Dict: {'symbol', 'price'}, or an error
+        """
+        market_data = self.get_market_data(symbol)
+        if 'error' in market_data:
+            return market_data
+        if not market_data.get('last_price'):
+            return {"error": f"No price available for {symbol}"}
+        return {"symbol": symbol, "price": market_data['last_price']}
+
+    @staticmethod
+    def _market_data_endpoint(symbol: str) -> str:
+        """Ticker endpoint of a symbol"""
+        formatted_symbol = to_bitget(symbol)
+            
+        # Use Bitget's market ticker endpoint
+        return f"/api/mix/v1/market/ticker?symbol={formatted_symbol}"
+
+    @staticmethod
+    def _parse_market_data(symbol: str, response: Dict) -> Dict:
+        """
+        Format a ticker response for our internal API
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            response: Bitget response
+
+        Returns:
+            Dict: Market data, or an error
+        """
+        if 'error' in response:
+            logger.error(f"Failed to get market data: {response.get('error')}")
+            return response
+            
+        # Extract and format the relevant market data
+        ticker_data = response.get('data', {})
+        
+        # Log raw response for debugging price issues
+        logger.debug(f"Raw ticker response for {symbol}: {ticker_data}")
+        
+        # Format response for consistency with our internal API
+        last_price = float(ticker_data.get('last', 0))
+        
+        return {
+            "symbol": symbol,
+            "last_price": last_price,
+            "bid_price": float(ticker_data.get('bidPr', last_price)),
+            "ask_price": float(ticker_data.get('askPr', last_price)),
+            "high_price": float(ticker_data.get('high24h', 0)),
+            "low_price": float(ticker_data.get('low24h', 0)),
+            "volume": float(ticker_data.get('baseVolume', 0)),
+            "timestamp": int(time.time() * 1000)
+        }
+
     def execute_signal(self, signal: Dict) -> Dict:
         """
         Execute a trading signal with automatic position sizing and risk management
@@ -987,12 +1502,9 @@ class TradingAPI:
                 telegram.send_message(error_msg)
                 return {"success": False, "error": "Bitget API not configured"}
             
-            # Format symbol for Bitget futures API
-            if '/' in symbol:
-                base_currency = symbol.split('/')[0]
-                formatted_symbol = f"{base_currency}USDT_UMCBL"
-            else:
-                formatted_symbol = f"{symbol}_UMCBL" if not symbol.endswith('_UMCBL') else symbol
+            formatted_symbol = to_bitget(symbol)
+            if formatted_symbol is None:
+                return {"success": False, "error": f"{symbol} is not supported on Bitget"}
                 
             # Set leverage to 20x before placing any orders
             try:
@@ -1100,6 +1612,11 @@ class TradingAPI:
         if not self.is_configured or self.test_mode:
             logger.info(f"TEST MODE: Would set {leverage}x leverage for {symbol}")
             return {"success": True, "test_mode": True}
+        
+        contract = contract_cache.get(symbol)
+        if contract is not None and contract['max_leverage'] and leverage > contract['max_leverage']:
+            logger.warning(f"{leverage}x exceeds the {contract['max_leverage']}x maximum for {symbol}, using the maximum")
+            leverage = contract['max_leverage']
             
         # Endpoint for setting leverage in Bitget API
         endpoint = "/api/mix/v1/account/setLeverage"
@@ -0,0 +1,183 @@
+"""
+Asyncio Bitget client for concurrent read-only queries
+
+Wraps a TradingAPI (credentials, signing, response formatting, test-mode
+simulation) and sends its position, open order, market data and account
+queries concurrently over one aiohttp connection pool. A semaphore bounds the
+requests in flight, so checking every open position takes about one round trip.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from src.integrations.bidget import TradingAPI, RETRY_STATUSES, _record_latency
+from src.utils.symbols import to_bitget
+
+logger = logging.getLogger(__name__)
+
+# aiohttp ships with ccxt, but the async client stays optional
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    logger.warning("aiohttp not available - async Bitget client disabled")
+
+
+class AsyncTradingAPI:
+    """Concurrent read-only Bitget queries sharing a TradingAPI's credentials"""
+
+    def __init__(self, trading_api: Optional[TradingAPI] = None, max_concurrency: Optional[int] = None):
+        """
+        Initialize the async client
+
+        Args:
+            trading_api: Client whose credentials and settings are used (default: a new TradingAPI)
+            max_concurrency: Requests in flight at once (default: BITGET_ASYNC_CONCURRENCY env, 10)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for the async Bitget client")
+
+        self.api = trading_api or TradingAPI()
+        if max_concurrency is None:
+            max_concurrency = int(os.getenv('BITGET_ASYNC_CONCURRENCY', '10'))
+        self.max_concurrency = max(1, max_concurrency)
+        self.retries = int(os.getenv('BITGET_HTTP_RETRIES', '3'))
+        self.backoff = float(os.getenv('BITGET_HTTP_BACKOFF', '0.3'))
+        self._session = None
+        self._semaphore = None
+
+    @property
+    def is_configured(self) -> bool:
+        return self.api.is_configured
+
+    async def __aenter__(self) -> 'AsyncTradingAPI':
+        connect_timeout, read_timeout = self.api.timeout
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            timeout=aiohttp.ClientTimeout(connect=connect_timeout, sock_read=read_timeout)
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._session.close()
+        self._session = None
+
+    async def _make_request(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
+        """
+        Make a request to the Bitget API, mirroring TradingAPI._make_request
+
+        GETs are retried with exponential backoff on connection errors and
+        transient statuses, like the pooled sync session.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint path
+            params: Query parameters
+            data: Request body data
+
+        Returns:
+            Dict: API response, or {'error': message}
+        """
+        # Test mode simulation never touches the network
+        if self.api.test_mode and not endpoint.startswith('/api/mix/v1/market'):
+            return self.api._make_request(method, endpoint, params, data)
+        if not self.api.is_configured:
+            logger.error("Bitget API not configured")
+            return {"error": "API not configured"}
+
+        attempts = 1 + (self.retries if method == 'GET' else 0)
+        async with self._semaphore:
+            for attempt in range(attempts):
+                if attempt:
+                    await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+
+                # Signed per attempt so a retry carries a fresh timestamp
+                url, headers, body = self.api._prepare_bitget_request(method, endpoint, params, data)
+                start = time.perf_counter()
+                response_data = {"error": "request failed"}
+                try:
+                    async with self._session.request(method, url, headers=headers, data=body or None) as response:
+                        if response.status in RETRY_STATUSES and attempt < attempts - 1:
+                            response_data = {"error": f"HTTP {response.status}"}
+                            continue
+                        response_data = self.api._check_bitget_response(
+                            response.status, await response.json(content_type=None))
+                        return response_data
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                    response_data = {"error": str(e) or type(e).__name__}
+                    if attempt == attempts - 1:
+                        logger.error(f"Bitget API request failed: {response_data['error']}")
+                finally:
+                    _record_latency(method, endpoint, (time.perf_counter() - start) * 1000, 'error' in response_data)
+        return response_data
+
+    async def get_position(self, symbol: str) -> Dict:
+        """Async TradingAPI.get_position"""
+        if to_bitget(symbol) is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
+        endpoint, params = TradingAPI._position_request(symbol)
+        return TradingAPI._parse_position(symbol, await self._make_request("GET", endpoint, params=params))
+
+    async def get_open_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        """Async TradingAPI.get_open_orders"""
+        if symbol and to_bitget(symbol) is None:
+            logger.error(f"{symbol} is not supported on Bitget")
+            return []
+        endpoint, params = TradingAPI._open_orders_request(symbol)
+        return TradingAPI._parse_open_orders(await self._make_request("GET", endpoint, params=params))
+
+    async def get_market_data(self, symbol: str) -> Dict:
+        """Async TradingAPI.get_market_data"""
+        if to_bitget(symbol) is None:
+            return {"error": f"{symbol} is not supported on Bitget"}
+        response = await self._make_request("GET", TradingAPI._market_data_endpoint(symbol))
+        try:
+            return TradingAPI._parse_market_data(symbol, response)
+        except (ValueError, TypeError) as e:
+            return {"error": f"Error getting market data for {symbol}: {str(e)}"}
+
+    async def get_account_info(self) -> Dict:
+        """Async TradingAPI.get_account_info"""
+        endpoint, params = TradingAPI._account_info_request()
+        return TradingAPI._parse_account_info(await self._make_request("GET", endpoint, params=params))
+
+    async def get_positions(self, symbols: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Query several positions concurrently
+
+        Args:
+            symbols: Trading pair symbols
+
+        Returns:
+            Dict[str, Dict]: Position (or error) by symbol, in the given order
+        """
+        symbols = list(symbols)
+        positions = await asyncio.gather(*(self.get_position(symbol) for symbol in symbols),
+                                         return_exceptions=True)
+        return {symbol: position if isinstance(position, dict) else {"error": str(position)}
+                for symbol, position in zip(symbols, positions)}
+
+
+def fetch_positions(symbols: Iterable[str], trading_api: Optional[TradingAPI] = None,
+                    max_concurrency: Optional[int] = None) -> Dict[str, Dict]:
+    """
+    Query several positions concurrently from synchronous code
+
+    Args:
+        symbols: Trading pair symbols
+        trading_api: Client whose credentials are used (default: a new TradingAPI)
+        max_concurrency: Requests in flight at once
+
+    Returns:
+        Dict[str, Dict]: Position (or error) by symbol
+    """
+    async def query():
+        async with AsyncTradingAPI(trading_api, max_concurrency) as client:
+            return await client.get_positions(symbols)
+
+    return asyncio.run(query())
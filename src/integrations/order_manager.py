@@ -7,6 +7,9 @@ import time
 import logging
 from typing import Dict, List, Optional, Tuple, Union
 import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from src.integrations.order_tracker import OrderStateTracker
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +29,42 @@ class OrderManager:
         self.open_orders = {}  # Maps symbol to list of {orderId, type, position_side}
         self.open_positions = {}  # Maps symbol to position details
         self.order_lock = threading.RLock()  # Thread-safe operations
+        
+        # Attach TP/SL to the entry order instead of placing them after the fill
+        self.preset_tpsl = os.getenv('ORDER_PRESET_TPSL', 'false').lower() == 'true'
+        self.fill_timeout = float(os.getenv('ORDER_FILL_TIMEOUT', '10'))
+        self.order_tracker = OrderStateTracker(trading_api)
+        self.order_tracker.start_stream()
+        self._executor = None
         logger.info("Order manager initialized")
     
+    def _submit(self, fn, *args) -> Future:
+        """Run fn in the background fill-handling pool"""
+        with self.order_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='order-fill')
+        return self._executor.submit(fn, *args)
+    
+    def shutdown(self) -> None:
+        """Stop the private stream and wait for background fill handling"""
+        self.order_tracker.stop_stream()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
     def place_main_order_with_tpsl(self, symbol: str, direction: str, quantity: float, 
                                    entry_price: Optional[float] = None, 
                                    take_profit: Optional[float] = None,
-                                   stop_loss: Optional[float] = None) -> Dict:
+                                   stop_loss: Optional[float] = None,
+                                   wait: bool = True) -> Dict:
         """
         Place a main order with take-profit and stop-loss orders
         
+        With ORDER_PRESET_TPSL (opt-in) the TP/SL triggers ride on the entry order
+        itself, so the position is protected from the fill and this returns right
+        after placement. Otherwise TP/SL orders are placed once the order tracker
+        sees the position open (private stream or backoff polling).
+        
         Args:
             symbol: Trading pair symbol (e.g., 'BTC/USDT')
             direction: Trade direction ('LONG' or 'SHORT')
@@ -42,6 +72,9 @@ class OrderManager:
             entry_price: Entry price (None for market order)
             take_profit: Take-profit price
             stop_loss: Stop-loss price
+            wait: Without preset TP/SL, block until they are placed; if False they are
+                  placed in the background and result['protection'] is a Future of the
+                  TP/SL results
             
         Returns:
             Dict: Order result with all order IDs
@@ -58,13 +91,16 @@ class OrderManager:
         
         # Place the main order
         order_type = "limit" if entry_price is not None else "market"
+        preset = self.preset_tpsl and (take_profit is not None or stop_loss is not None)
+        placed_at = time.monotonic()
         main_order = self.trading_api.place_order(
             symbol=symbol,
             side=direction.lower(),
             quantity=quantity,
             price=entry_price,
             order_type=order_type,
-            position_side=position_side  # Explicitly pass position side
+            position_side=position_side,  # Explicitly pass position side
+            **({'take_profit': take_profit, 'stop_loss': stop_loss} if preset else {})
         )
         
         if 'error' in main_order:
@@ -86,39 +122,81 @@ class OrderManager:
                 'position_side': position_side
             })
         
-        # Wait for the position to be established before setting TP/SL
-        # This ensures we have accurate position data
-        max_wait = 10  # Maximum wait time in seconds
-        position_established = False
-        start_time = time.time()
-        
-        while not position_established and time.time() - start_time < max_wait:
-            # Check if the position is established
-            position = self.trading_api.get_position(symbol)
-            if position and not position.get('error') and float(position.get('size', 0)) > 0:
-                position_established = True
-                logger.info(f"Position established for {symbol}: {position}")
-                # Store position details
-                with self.order_lock:
-                    self.open_positions[symbol] = {
-                        'size': float(position.get('size', 0)),
-                        'position_side': position.get('holdSide', position_side),
-                        'entry_price': float(position.get('entryPrice', 0))
-                    }
-                break
-            time.sleep(1)  # Wait a second before checking again
-        
         result = {
             'main_order': main_order,
             'take_profit_order': None,
             'stop_loss_order': None
         }
         
-        # Place take-profit order if specified
-        if take_profit is not None and position_established:
-            # Use the actual position size for TP
-            position_size = self.open_positions[symbol]['size']
+        if preset:
+            # Bitget holds the preset TP/SL as position-level triggers, there are no separate orders to track
+            if take_profit is not None:
+                result['take_profit_order'] = {'orderId': main_order_id, 'preset': True, 'price': take_profit}
+            if stop_loss is not None:
+                result['stop_loss_order'] = {'orderId': main_order_id, 'preset': True, 'price': stop_loss}
+            logger.info(f"Attached TP {take_profit} / SL {stop_loss} to order {main_order_id} for {symbol}")
+            self._submit(self._await_position, symbol, position_side, placed_at)
+            return result
+        
+        if not wait:
+            result['protection'] = self._submit(self._protect_position, symbol, position_side,
+                                                take_profit, stop_loss, placed_at)
+            return result
+        
+        result.update(self._protect_position(symbol, position_side, take_profit, stop_loss, placed_at))
+        return result
+    
+    def _await_position(self, symbol: str, position_side: str, since: Optional[float] = None) -> Optional[Dict]:
+        """
+        Wait for the entry to fill and record the position
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            position_side: Expected position side ('long' or 'short')
+            since: time.monotonic() of the order placement
+            
+        Returns:
+            Optional[Dict]: Recorded position details, or None if not filled in time
+        """
+        position = self.order_tracker.wait_for_position(symbol, self.fill_timeout, since=since)
+        if position is None:
+            logger.warning(f"Position for {symbol} not established within {self.fill_timeout}s")
+            return None
+        
+        logger.info(f"Position established for {symbol}: {position}")
+        details = {
+            'size': float(position.get('size', 0)),
+            'position_side': position.get('holdSide') or position_side,
+            'entry_price': float(position.get('entryPrice', 0))
+        }
+        with self.order_lock:
+            self.open_positions[symbol] = details
+        return details
+    
+    def _protect_position(self, symbol: str, position_side: str, take_profit: Optional[float],
+                          stop_loss: Optional[float], since: Optional[float] = None) -> Dict:
+        """
+        Place TP/SL orders for the filled position size once the entry fills
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            position_side: Position side ('long' or 'short')
+            take_profit: Take-profit price
+            stop_loss: Stop-loss price
+            since: time.monotonic() of the order placement
             
+        Returns:
+            Dict: take_profit_order and stop_loss_order results (None if not placed)
+        """
+        result = {'take_profit_order': None, 'stop_loss_order': None}
+        position = self._await_position(symbol, position_side, since)
+        if position is None:
+            return result
+        # Use the actual position size for TP/SL
+        position_size = position['size']
+        
+        # Place take-profit order if specified
+        if take_profit is not None:
             tp_order = self.trading_api.set_take_profit(
                 symbol=symbol,
                 quantity=position_size,
@@ -131,22 +209,11 @@ class OrderManager:
             else:
                 tp_order_id = tp_order.get('orderId', '')
                 logger.info(f"Placed take-profit order {tp_order_id} at {take_profit} for {symbol}")
-                
-                # Add TP order to tracked orders
-                with self.order_lock:
-                    self.open_orders[symbol].append({
-                        'orderId': tp_order_id,
-                        'type': 'take_profit',
-                        'position_side': position_side
-                    })
-                
+                self._track_order(symbol, tp_order_id, 'take_profit', position_side)
                 result['take_profit_order'] = tp_order
         
         # Place stop-loss order if specified
-        if stop_loss is not None and position_established:
-            # Use the actual position size for SL
-            position_size = self.open_positions[symbol]['size']
-            
+        if stop_loss is not None:
             sl_order = self.trading_api.set_stop_loss(
                 symbol=symbol,
                 quantity=position_size,
@@ -159,19 +226,20 @@ class OrderManager:
             else:
                 sl_order_id = sl_order.get('orderId', '')
                 logger.info(f"Placed stop-loss order {sl_order_id} at {stop_loss} for {symbol}")
-                
-                # Add SL order to tracked orders
-                with self.order_lock:
-                    self.open_orders[symbol].append({
-                        'orderId': sl_order_id,
-                        'type': 'stop_loss',
-                        'position_side': position_side
-                    })
-                
+                self._track_order(symbol, sl_order_id, 'stop_loss', position_side)
                 result['stop_loss_order'] = sl_order
         
         return result
     
+    def _track_order(self, symbol: str, order_id: str, order_type: str, position_side: str) -> None:
+        """Add an order to the tracked orders of a symbol"""
+        with self.order_lock:
+            self.open_orders.setdefault(symbol, []).append({
+                'orderId': order_id,
+                'type': order_type,
+                'position_side': position_side
+            })
+    
     def handle_order_filled(self, symbol: str, order_id: str, order_type: str) -> None:
         """
         Handle an order fill event - implement OCO logic
@@ -226,34 +294,40 @@ class OrderManager:
         """
         Update the status of all open positions and handle closed positions
         Should be called periodically to keep position tracking accurate
+        
+        Positions come from one shared all-positions snapshot; order_lock is only
+        held while reading and updating the tracking state, never during requests.
         """
         with self.order_lock:
-            for symbol in list(self.open_positions.keys()):
+            tracked = dict(self.open_positions)
+        if not tracked:
+            return
+        
+        try:
+            positions = self.trading_api.get_positions(list(tracked))
+        except Exception as e:
+            logger.warning(f"Failed to update positions: {str(e)}")
+            return
+        
+        for symbol, position in positions.items():
+            if position.get('error'):
+                logger.warning(f"Failed to update position for {symbol}: {position.get('error')}")
+                continue
+            if float(position.get('size', 0)) > 0:
+                continue
+            
+            # Position no longer exists: stop tracking it and cancel any remaining orders
+            with self.order_lock:
+                # Leave it alone if a new position was opened while the snapshot was in flight
+                if self.open_positions.get(symbol) is not tracked[symbol]:
+                    continue
+                del self.open_positions[symbol]
+                orders = self.open_orders.pop(symbol, [])
+            logger.info(f"Position closed for {symbol}")
+            
+            for order in orders:
                 try:
-                    position = self.trading_api.get_position(symbol)
-                    
-                    # If position no longer exists or size is 0, handle position close
-                    if position.get('error') or float(position.get('size', 0)) <= 0:
-                        logger.info(f"Position closed for {symbol}")
-                        
-                        # Cancel any remaining orders
-                        if symbol in self.open_orders:
-                            for order in self.open_orders[symbol]:
-                                try:
-                                    self.trading_api.cancel_order(
-                                        symbol, 
-                                        order['orderId'], 
-                                        order.get('position_side')
-                                    )
-                                    logger.info(f"Cancelled order {order['orderId']} after position close")
-                                except Exception as e:
-                                    logger.warning(f"Failed to cancel order {order['orderId']}: {str(e)}")
-                            
-                            # Clean up tracking data
-                            del self.open_orders[symbol]
-                        
-                        # Remove from open positions
-                        del self.open_positions[symbol]
-                    
+                    self.trading_api.cancel_order(order_id=order['orderId'], symbol=symbol)
+                    logger.info(f"Cancelled order {order['orderId']} after position close")
                 except Exception as e:
-                    logger.warning(f"Failed to update position for {symbol}: {str(e)}")
+                    logger.warning(f"Failed to cancel order {order['orderId']}: {str(e)}")
@@ -0,0 +1,236 @@
+"""
+Order and position state tracking for fill detection
+
+Learns when an entry order has filled so TP/SL can be placed immediately:
+- Bitget's private websocket pushes order and position updates as they happen
+  (BITGET_PRIVATE_WS=true)
+- An adaptive backoff poll of get_position covers the time before the stream
+  connects, dropped connections and accounts without the stream
+"""
+
+import os
+import time
+import hmac
+import base64
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+from src.kline_stream import AIOHTTP_AVAILABLE, WebSocketStream
+from src.utils.symbols import from_bitget
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRIVATE_WS_URL = 'wss://ws.bitget.com/mix/v1/stream'
+
+
+class BitgetPrivateStream(WebSocketStream):
+    """Bitget private websocket subscription to USDT-M order and position updates"""
+
+    name = 'Bitget private'
+    ping_message = 'ping'
+
+    def __init__(self, api_key: str, api_secret: str, api_passphrase: str, tracker: 'OrderStateTracker',
+                 url: Optional[str] = None, record_path: Optional[str] = None):
+        """
+        Initialize the stream
+
+        Args:
+            api_key: Bitget API key
+            api_secret: Bitget API secret
+            api_passphrase: Bitget API passphrase
+            tracker: Tracker receiving the updates
+            url: Private websocket endpoint (default: BITGET_PRIVATE_WS_URL env or Bitget)
+            record_path: Append every received frame to this JSONL file for later replay
+        """
+        super().__init__(record_path=record_path)
+        self.url = url or os.getenv('BITGET_PRIVATE_WS_URL', DEFAULT_PRIVATE_WS_URL)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.api_passphrase = api_passphrase
+        self.tracker = tracker
+
+    @property
+    def subscribe_url(self) -> str:
+        return self.url
+
+    def login_message(self) -> Dict[str, Any]:
+        """Signed login request"""
+        timestamp = str(int(time.time()))
+        signature = hmac.new(self.api_secret.encode('utf-8'), f"{timestamp}GET/user/verify".encode('utf-8'),
+                             hashlib.sha256).digest()
+        return {'op': 'login', 'args': [{
+            'apiKey': self.api_key,
+            'passphrase': self.api_passphrase,
+            'timestamp': timestamp,
+            'sign': base64.b64encode(signature).decode()
+        }]}
+
+    async def _on_connect(self, ws) -> None:
+        await ws.send_json(self.login_message())
+        await ws.send_json({'op': 'subscribe', 'args': [
+            {'instType': 'UMCBL', 'channel': channel, 'instId': 'default'} for channel in ('orders', 'positions')
+        ]})
+
+    def handle_frame(self, frame: Dict[str, Any]) -> None:
+        """
+        Forward order and position updates to the tracker
+
+        Args:
+            frame: Decoded frame ({'action', 'arg': {'channel'}, 'data': [...]}); events are ignored
+        """
+        if frame.get('event') == 'error':
+            logger.error(f"Bitget private stream error: {frame.get('msg', frame)}")
+            return
+
+        channel = (frame.get('arg') or {}).get('channel')
+        for entry in frame.get('data') or []:
+            if channel == 'positions':
+                self.tracker.on_position_update(entry)
+            elif channel == 'orders':
+                self.tracker.on_order_update(entry)
+
+
+class OrderStateTracker:
+    """Latest order and position state by symbol, from the private stream or polling"""
+
+    def __init__(self, trading_api, poll_initial: Optional[float] = None, poll_max: Optional[float] = None):
+        """
+        Initialize the tracker
+
+        Args:
+            trading_api: Trading API client used for polling
+            poll_initial: First poll interval in seconds (default: ORDER_POLL_INITIAL env, 0.1)
+            poll_max: Longest poll interval in seconds (default: ORDER_POLL_MAX env, 2.0)
+        """
+        self.trading_api = trading_api
+        self.poll_initial = poll_initial if poll_initial is not None else float(os.getenv('ORDER_POLL_INITIAL', '0.1'))
+        self.poll_max = poll_max if poll_max is not None else float(os.getenv('ORDER_POLL_MAX', '2.0'))
+        self.stream = None
+        self._positions: Dict[str, Dict] = {}  # symbol -> (monotonic update time, position)
+        self._orders: Dict[str, Dict] = {}  # order id -> latest order update
+        self._condition = threading.Condition()
+
+    @property
+    def stream_connected(self) -> bool:
+        return self.stream is not None and self.stream.connected.is_set()
+
+    def start_stream(self) -> bool:
+        """
+        Subscribe to the private order/position stream if BITGET_PRIVATE_WS=true
+
+        Returns:
+            bool: True if the stream was started
+        """
+        if os.getenv('BITGET_PRIVATE_WS', 'false').lower() != 'true' or self.stream is not None:
+            return self.stream is not None
+        if not AIOHTTP_AVAILABLE or not getattr(self.trading_api, 'is_configured', False):
+            logger.warning("Bitget private stream needs aiohttp and API credentials, polling for fills instead")
+            return False
+
+        self.stream = BitgetPrivateStream(self.trading_api.api_key, self.trading_api.api_secret,
+                                          self.trading_api.api_passphrase, self)
+        self.stream.start()
+        return True
+
+    def stop_stream(self) -> None:
+        if self.stream is not None:
+            self.stream.stop()
+            self.stream = None
+
+    def on_position_update(self, entry: Dict[str, Any]) -> None:
+        """
+        Record a position update in Bitget format (instId, holdSide, total, averageOpenPrice)
+
+        Args:
+            entry: Position entry from the stream
+        """
+        symbol = from_bitget(entry.get('instId') or entry.get('symbol', ''))
+        position = {
+            'symbol': symbol,
+            'size': float(entry.get('total', 0) or 0),
+            'holdSide': entry.get('holdSide', ''),
+            'entryPrice': float(entry.get('averageOpenPrice', 0) or 0)
+        }
+        with self._condition:
+            # One entry per hold side; keep the open one
+            current = self._positions.get(symbol)
+            if position['size'] > 0 or current is None or current[1]['holdSide'] == position['holdSide']:
+                self._positions[symbol] = (time.monotonic(), position)
+            self._condition.notify_all()
+
+    def on_order_update(self, entry: Dict[str, Any]) -> None:
+        """
+        Record an order update in Bitget format (ordId, instId, status, accFillSz, avgPx)
+
+        Args:
+            entry: Order entry from the stream
+        """
+        order_id = str(entry.get('ordId') or entry.get('orderId') or '')
+        if not order_id:
+            return
+        with self._condition:
+            self._orders[order_id] = {
+                'orderId': order_id,
+                'symbol': from_bitget(entry.get('instId', '')),
+                'status': entry.get('status', ''),
+                'filled_qty': float(entry.get('accFillSz', 0) or 0),
+                'avg_price': float(entry.get('avgPx', 0) or 0)
+            }
+            self._condition.notify_all()
+
+    def get_order(self, order_id: str) -> Optional[Dict]:
+        """Latest streamed state of an order, if any"""
+        with self._condition:
+            return self._orders.get(str(order_id))
+
+    def wait_for_position(self, symbol: str, timeout: float, since: Optional[float] = None) -> Optional[Dict]:
+        """
+        Wait until a position in the symbol is open
+
+        Returns as soon as the stream reports it; meanwhile polls get_position with
+        intervals growing from poll_initial to poll_max (poll_max only while the
+        stream is connected).
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeout: Seconds to wait
+            since: Only accept streamed updates received after this time.monotonic() value
+
+        Returns:
+            Optional[Dict]: Position with size, holdSide and entryPrice, or None on timeout
+        """
+        since = time.monotonic() if since is None else since
+        deadline = time.monotonic() + timeout
+        # With the stream up, polling is only a safety net
+        delay = self.poll_max if self.stream_connected else self.poll_initial
+
+        while True:
+            position = self._streamed_position(symbol, since)
+            if position is not None:
+                return position
+
+            try:
+                position = self.trading_api.get_position(symbol)
+                if position and not position.get('error') and float(position.get('size', 0)) > 0:
+                    return position
+            except Exception as e:
+                logger.warning(f"Error polling position for {symbol}: {str(e)}")
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            with self._condition:
+                # A streamed update wakes the wait early
+                self._condition.wait_for(lambda: self._streamed_position(symbol, since) is not None,
+                                         timeout=min(delay, remaining))
+            delay = min(delay * 2, self.poll_max)
+
+    def _streamed_position(self, symbol: str, since: float) -> Optional[Dict]:
+        """Open position streamed after `since`, if any"""
+        with self._condition:
+            update = self._positions.get(symbol)
+        if update is not None and update[0] >= since and update[1]['size'] > 0:
+            return update[1]
+        return None
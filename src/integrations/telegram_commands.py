@@ -15,6 +15,8 @@ import traceback
 from typing import Dict, List, Any, Optional, Callable
 from datetime import datetime
 
+from src.utils.symbols import from_bitget, to_bitget
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -309,7 +311,7 @@ class TelegramCommandHandler:
                             if isinstance(position, dict):
                                 total = float(position.get('total', 0))
                                 if total > 0:
-                                    symbol = position.get('symbol', '').replace('_UMCBL', '')
+                                    symbol = from_bitget(position.get('symbol', ''))
                                     side = position.get('holdSide', 'unknown')
                                     leverage = position.get('leverage', 'N/A')
                                     
@@ -333,12 +335,12 @@ class TelegramCommandHandler:
                 response += f"\n⚠️ Error retrieving API positions: {str(e)[:100]}...\n"
                 
             # Check for discrepancies
-            tracked_set = {s.replace('/', '') for s in active_trades}
+            tracked_set = {to_bitget(s) for s in active_trades}
             
             try:
-                api_set = {p['symbol'] for p in active_positions}
-                missing = [s for s in api_set if s not in tracked_set]
-                extra = [s for s in tracked_set if s not in api_set]
+                api_set = {to_bitget(p['symbol']) for p in active_positions}
+                missing = [p['symbol'] for p in active_positions if to_bitget(p['symbol']) not in tracked_set]
+                extra = [s for s in active_trades if to_bitget(s) not in api_set]
                 
                 if missing or extra:
                     response += "\n⚠️ *Tracking Discrepancies:*\n"
@@ -0,0 +1,495 @@
+"""
+WebSocket kline ingestion for live candles
+
+Subscribes to the exchange's kline and ticker channels, keeps a rolling candle
+buffer per (symbol, timeframe) and the last price per symbol in memory, and
+reports every closed candle to a callback as soon as the exchange publishes it.
+Frames use Binance's combined-stream format. WebSocketStream holds the
+connection, reconnect and recording logic for reuse by other streams.
+KlineReplayServer serves recorded frames from a local websocket so it can
+stand in for the exchange in tests and offline replays.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import ccxt
+import pandas as pd
+
+from src.utils.symbols import to_binance
+
+logger = logging.getLogger(__name__)
+
+# aiohttp ships with ccxt, but streaming stays optional
+try:
+    import aiohttp
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+    logger.warning("aiohttp not available - websocket kline streaming disabled")
+
+DEFAULT_STREAM_URL = 'wss://stream.binance.com:9443/stream'
+
+# Called with (symbol, timeframe, buffered candles) when a candle closes
+CandleClosedCallback = Callable[[str, str, pd.DataFrame], None]
+
+
+def exchange_symbol_id(symbol: str) -> str:
+    """Exchange id of a symbol as used in stream names and frames (e.g., 'BTCUSDT')"""
+    return to_binance(symbol)
+
+
+def stream_name(symbol: str, timeframe: Optional[str] = None) -> str:
+    """
+    Exchange stream name of a symbol's kline channel, or its ticker channel without a timeframe
+
+    Args:
+        symbol: Trading pair symbol (e.g., 'BTC/USDT')
+        timeframe: Timeframe (e.g., '15m')
+
+    Returns:
+        str: Stream name (e.g., 'btcusdt@kline_15m' or 'btcusdt@miniTicker')
+    """
+    channel = 'miniTicker' if timeframe is None else f"kline_{timeframe}"
+    return f"{exchange_symbol_id(symbol).lower()}@{channel}"
+
+
+def parse_kline_frame(frame: Dict[str, Any]) -> Optional[Tuple[str, str, List[float], bool]]:
+    """
+    Extract the candle from a kline frame
+
+    Args:
+        frame: Decoded frame, either combined-stream ({'stream', 'data'}) or a raw kline event
+
+    Returns:
+        Optional[Tuple[str, str, List[float], bool]]: Exchange symbol (e.g., 'BTCUSDT'), timeframe,
+        [timestamp_ms, open, high, low, close, volume] and whether the candle is closed;
+        None for frames that aren't klines
+    """
+    data = frame.get('data', frame)
+    if data.get('e') != 'kline':
+        return None
+
+    kline = data['k']
+    candle = [int(kline['t']), float(kline['o']), float(kline['h']), float(kline['l']),
+              float(kline['c']), float(kline['v'])]
+    return kline['s'], kline['i'], candle, bool(kline['x'])
+
+
+def parse_ticker_frame(frame: Dict[str, Any]) -> Optional[Tuple[str, float]]:
+    """
+    Extract the last price from a ticker frame
+
+    Args:
+        frame: Decoded frame, either combined-stream ({'stream', 'data'}) or a raw ticker event
+
+    Returns:
+        Optional[Tuple[str, float]]: Exchange symbol and last price; None for frames that aren't tickers
+    """
+    data = frame.get('data', frame)
+    if data.get('e') not in ('24hrMiniTicker', '24hrTicker'):
+        return None
+    return data['s'], float(data['c'])
+
+
+class CandleBuffer:
+    """Rolling buffer of closed candles plus the currently forming one"""
+
+    def __init__(self, symbol: str, timeframe: str, maxlen: int = 500):
+        """
+        Initialize the buffer
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe (e.g., '15m')
+            maxlen: Maximum number of closed candles kept
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        self.closed = deque(maxlen=maxlen)
+        self.forming = None
+        self.gapped = False  # A closed candle was missed (e.g., during a reconnect); reseed before use
+        self._lock = threading.Lock()
+
+    def seed(self, ohlcv: Iterable[List[float]], now_ms: Optional[int] = None) -> None:
+        """
+        Fill the buffer from REST history, keeping newer candles already received from the stream
+
+        Args:
+            ohlcv: Candles as [timestamp_ms, open, high, low, close, volume] rows, oldest first
+            now_ms: Current time in ms, used to tell whether the newest candle is still forming
+        """
+        candles = [list(candle) for candle in ohlcv]
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        forming = None
+        if candles and candles[-1][0] + self.timeframe_ms > now_ms:
+            forming = candles.pop()
+
+        with self._lock:
+            last_seeded = candles[-1][0] if candles else None
+            streamed = [candle for candle in self.closed if last_seeded is None or candle[0] > last_seeded]
+            self.closed.clear()
+            self.closed.extend(candles)
+            self.closed.extend(streamed)
+            if self.forming is None or (forming is not None and forming[0] > self.forming[0]):
+                self.forming = forming
+            if self.forming is not None and self.closed and self.forming[0] <= self.closed[-1][0]:
+                self.forming = None
+            self.gapped = False
+
+    def update(self, candle: List[float], closed: bool) -> bool:
+        """
+        Apply a candle update from the stream
+
+        Args:
+            candle: [timestamp_ms, open, high, low, close, volume]
+            closed: Whether the candle is final
+
+        Returns:
+            bool: True if this update closed a new candle
+        """
+        with self._lock:
+            if not closed:
+                self.forming = candle
+                return False
+
+            if self.closed and self.closed[-1][0] >= candle[0]:
+                # Repeated final frame: keep the latest values without a new event
+                if self.closed[-1][0] == candle[0]:
+                    self.closed[-1] = candle
+                return False
+
+            if self.closed and candle[0] - self.closed[-1][0] > self.timeframe_ms:
+                self.gapped = True
+            self.closed.append(candle)
+            if self.forming is not None and self.forming[0] <= candle[0]:
+                self.forming = None
+            return True
+
+    def to_dataframe(self, include_forming: bool = True, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Buffered candles in the same format as MarketData.fetch_ohlcv_data
+
+        Args:
+            include_forming: Append the forming candle, as a REST fetch would
+            limit: Return only the newest `limit` candles
+
+        Returns:
+            pd.DataFrame: DataFrame with OHLCV data tagged with symbol and timeframe
+        """
+        with self._lock:
+            candles = list(self.closed)
+            if include_forming and self.forming is not None:
+                candles.append(self.forming)
+        if limit is not None:
+            candles = candles[-limit:]
+
+        df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        df.attrs.update(symbol=self.symbol, timeframe=self.timeframe)
+        return df
+
+
+class WebSocketStream:
+    """Websocket subscription on a background thread that reconnects with backoff"""
+
+    name = 'Websocket'
+    # Text keepalive for exchanges that expect one instead of protocol-level pings
+    ping_message: Optional[str] = None
+    ping_interval = 25.0
+
+    def __init__(self, record_path: Optional[str] = None):
+        """
+        Initialize the stream
+
+        Args:
+            record_path: Append every received frame to this JSONL file for later replay
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(f"aiohttp is required for the {self.name.lower()} stream")
+
+        self.record_path = record_path
+        self.connected = threading.Event()
+        self.frames_received = 0
+        self.last_frame_time = None
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._stopping = False
+
+    @property
+    def subscribe_url(self) -> str:
+        """Endpoint URL to connect to"""
+        raise NotImplementedError
+
+    def handle_frame(self, frame: Dict[str, Any]) -> None:
+        """Apply one decoded frame"""
+        raise NotImplementedError
+
+    async def _on_connect(self, ws) -> None:
+        """Send login/subscribe messages after connecting"""
+
+    def start(self) -> None:
+        """Connect in a background thread (reconnects until stop() is called)"""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run_loop, name=f"{self.name.lower()}-stream", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Disconnect and stop the background thread"""
+        self._stopping = True
+        loop, task = self._loop, self._task
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop already closed
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+        self.connected.clear()
+
+    def _run_loop(self) -> None:
+        """Thread target: run the connection loop on a private event loop"""
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._consume())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+            self._loop = self._task = None
+
+    async def _consume(self) -> None:
+        """Receive frames, reconnecting with exponential backoff"""
+        backoff = 1.0
+        async with aiohttp.ClientSession() as session:
+            while not self._stopping:
+                keepalive = None
+                try:
+                    async with session.ws_connect(self.subscribe_url, heartbeat=30) as ws:
+                        await self._on_connect(ws)
+                        logger.info(f"{self.name} stream connected")
+                        self.connected.set()
+                        backoff = 1.0
+                        if self.ping_message is not None:
+                            keepalive = asyncio.ensure_future(self._keepalive(ws))
+                        async for message in ws:
+                            if message.type == aiohttp.WSMsgType.TEXT:
+                                if message.data == 'pong':
+                                    continue
+                                self.frames_received += 1
+                                self.last_frame_time = time.time()
+                                self._record(message.data)
+                                self.handle_frame(json.loads(message.data))
+                            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"{self.name} stream error: {e}")
+                finally:
+                    if keepalive is not None:
+                        keepalive.cancel()
+
+                self.connected.clear()
+                if not self._stopping:
+                    logger.info(f"{self.name} stream disconnected, reconnecting in {backoff:.0f}s")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 60.0)
+
+    async def _keepalive(self, ws) -> None:
+        """Send the text keepalive periodically"""
+        while not ws.closed:
+            await asyncio.sleep(self.ping_interval)
+            await ws.send_str(self.ping_message)
+
+    def _record(self, raw: str) -> None:
+        """Append a raw frame to the recording file"""
+        if self.record_path is not None:
+            with open(self.record_path, 'a') as f:
+                f.write(raw + '\n')
+
+
+class KlineStream(WebSocketStream):
+    """Websocket kline subscription feeding per-(symbol, timeframe) candle buffers"""
+
+    name = 'Kline'
+
+    def __init__(self, symbols: List[str], timeframes: List[str], url: Optional[str] = None,
+                 buffer_size: int = 500, on_candle_closed: Optional[CandleClosedCallback] = None,
+                 record_path: Optional[str] = None, tickers: bool = True):
+        """
+        Initialize the stream
+
+        Args:
+            symbols: Trading pair symbols (e.g., ['BTC/USDT'])
+            timeframes: Timeframes (e.g., ['15m', '1h'])
+            url: Combined-stream endpoint (default: KLINE_STREAM_URL env or Binance)
+            buffer_size: Closed candles kept per buffer
+            on_candle_closed: Called from the stream thread with (symbol, timeframe, candles)
+            record_path: Append every received frame to this JSONL file for later replay
+            tickers: Also subscribe to each symbol's ticker channel for last prices
+        """
+        super().__init__(record_path=record_path)
+        self.url = url or os.getenv('KLINE_STREAM_URL', DEFAULT_STREAM_URL)
+        self.symbols = list(symbols)
+        self.timeframes = list(timeframes)
+        self.on_candle_closed = on_candle_closed
+        self.tickers = tickers
+        self.prices: Dict[str, float] = {}
+        self.buffers: Dict[Tuple[str, str], CandleBuffer] = {
+            (symbol, timeframe): CandleBuffer(symbol, timeframe, maxlen=buffer_size)
+            for symbol in self.symbols for timeframe in self.timeframes
+        }
+        # Frames name symbols the exchange's way ('BTCUSDT')
+        self._symbols_by_id = {exchange_symbol_id(symbol): symbol for symbol in self.symbols}
+
+        self.candles_closed = 0
+
+    @property
+    def subscribe_url(self) -> str:
+        """Endpoint URL with all kline (and ticker) streams subscribed"""
+        streams = [stream_name(symbol, timeframe) for symbol in self.symbols for timeframe in self.timeframes]
+        if self.tickers:
+            streams.extend(stream_name(symbol) for symbol in self.symbols)
+        return f"{self.url}?streams={'/'.join(streams)}"
+
+    def get_buffer(self, symbol: str, timeframe: str) -> Optional[CandleBuffer]:
+        """Buffer of a (symbol, timeframe) pair, or None if it isn't subscribed"""
+        return self.buffers.get((symbol, timeframe))
+
+    def handle_frame(self, frame: Dict[str, Any]) -> None:
+        """
+        Apply one decoded frame to the buffers and report a closed candle
+
+        Args:
+            frame: Decoded websocket frame
+        """
+        ticker = parse_ticker_frame(frame)
+        if ticker is not None:
+            symbol = self._symbols_by_id.get(ticker[0])
+            if symbol is not None:
+                self.prices[symbol] = ticker[1]
+            return
+
+        parsed = parse_kline_frame(frame)
+        if parsed is None:
+            return
+        symbol_id, timeframe, candle, closed = parsed
+        symbol = self._symbols_by_id.get(symbol_id)
+        buffer = self.buffers.get((symbol, timeframe))
+        if buffer is None:
+            return
+
+        if buffer.update(candle, closed):
+            self.candles_closed += 1
+            if self.on_candle_closed is not None:
+                try:
+                    self.on_candle_closed(symbol, timeframe, buffer.to_dataframe(include_forming=False))
+                except Exception as e:
+                    logger.error(f"Error handling closed {timeframe} candle for {symbol}: {e}", exc_info=True)
+
+
+class KlineReplayServer:
+    """Local websocket server that replays recorded kline frames to every client"""
+
+    def __init__(self, frames: List[Dict[str, Any]], interval: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Initialize the replay server
+
+        Args:
+            frames: Decoded frames to send, in order
+            interval: Seconds between frames
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port)
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for the kline replay server")
+
+        self.frames = list(frames)
+        self.interval = interval
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._loop = None
+        self._runner = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'KlineReplayServer':
+        """
+        Create a server replaying a JSONL recording made with KlineStream(record_path=...)
+
+        Args:
+            path: Recording file
+            **kwargs: Passed to the constructor
+
+        Returns:
+            KlineReplayServer: Server replaying the recording
+        """
+        with open(path) as f:
+            frames = [json.loads(line) for line in f if line.strip()]
+        return cls(frames, **kwargs)
+
+    @property
+    def url(self) -> str:
+        """Endpoint URL to pass to KlineStream"""
+        return f"ws://{self.host}:{self.port}/stream"
+
+    def start(self) -> None:
+        """Start serving in a background thread"""
+        self._thread = threading.Thread(target=self._run_loop, name='kline-replay', daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+
+    def stop(self) -> None:
+        """Stop the server"""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join(10)
+
+    def _run_loop(self) -> None:
+        """Thread target: run the server on a private event loop"""
+        self._loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get('/stream', self._handle)
+        self._runner = web.AppRunner(app)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, self.host, self.port)
+        self._loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _handle(self, request) -> 'web.WebSocketResponse':
+        """Send every frame to a new client, then keep the connection open"""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections += 1
+        for frame in self.frames:
+            await ws.send_str(json.dumps(frame))
+            if self.interval:
+                await asyncio.sleep(self.interval)
+        async for _ in ws:
+            pass
+        return ws
@@ -3,20 +3,71 @@ Market data module for fetching and processing trading data
 """
 
 import os
+import time
 import logging
+import threading
 import pandas as pd
 import numpy as np
 import ccxt
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 
+from src.utils.candle_store import CandleStore
+from src.utils.history_store import HistoryStore
+from src.kline_stream import KlineStream, AIOHTTP_AVAILABLE
+
 logger = logging.getLogger(__name__)
 
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces request starts by a minimum interval
+    
+    Each caller reserves the next free slot under the lock and sleeps outside it,
+    so concurrent workers overlap their network round-trips while the request
+    rate never exceeds one per interval.
+    """
+    
+    def __init__(self, min_interval: float = 0.0):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            min_interval: Minimum seconds between request starts
+        """
+        self.min_interval = min_interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+    
+    def acquire(self) -> None:
+        """Block until the caller may start its request"""
+        if self.min_interval <= 0:
+            return
+            
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+            self._local.waited = self.waited() + delay
+    
+    def waited(self) -> float:
+        """Total seconds the calling thread has spent waiting for slots"""
+        return getattr(self._local, 'waited', 0.0)
+
+
 class MarketData:
     """
     Handles all market data fetching and processing
     """
     
+    HISTORY_PAGE_SIZE = 1000  # Candles per request when downloading history
+    
     def __init__(self, exchange_id: str = 'binance', test_mode: bool = False):
         """
         Initialize the market data handler
@@ -30,6 +81,32 @@ class MarketData:
         self.exchange = self._initialize_exchange()
         self.markets = self._get_markets_from_config()
         self.timeframes = self._get_timeframes_from_config()
+        
+        # Concurrent fetching: worker count and the exchange's request spacing (ccxt rateLimit is in ms)
+        self.max_concurrency = max(1, int(os.getenv('SCAN_CONCURRENCY', '8')))
+        self.rate_limiter = RateLimiter(getattr(self.exchange, 'rateLimit', 0) / 1000.0)
+        self.fetch_latencies = []  # Per-request latency records from the last scan
+        
+        # Ticker snapshot shared by consecutive scans
+        self.ticker_ttl = float(os.getenv('TICKER_CACHE_TTL', '30'))
+        self._ticker_snapshot = {}
+        self._ticker_snapshot_time = 0.0
+        
+        # Local candle store: scans fetch only new candles, deep history is served from disk
+        # Closed candles are also exported to memory-mapped column files for backtests
+        self.candle_store = None
+        self.history_store = None
+        if not test_mode and self.exchange is not None and os.getenv('CANDLE_STORE', 'true').lower() == 'true':
+            try:
+                self.candle_store = CandleStore(os.getenv('CANDLE_STORE_PATH') or None)
+                self.history_store = HistoryStore(os.getenv('HISTORY_STORE_DIR') or None)
+            except Exception as e:
+                logger.error(f"Failed to open candle store, fetching full windows instead: {e}")
+        
+        # Optional websocket ingestion: candles and prices served from in-memory buffers
+        self.stream_enabled = os.getenv('MARKET_DATA_STREAM', 'false').lower() == 'true'
+        self.stream_buffer_size = int(os.getenv('KLINE_STREAM_BUFFER', '500'))
+        self.kline_stream = None
         logger.info(f"Initialized market data handler with {len(self.markets)} markets and {len(self.timeframes)} timeframes in {'test mode' if test_mode else 'live mode'}")
 
     def _initialize_exchange(self) -> Optional[ccxt.Exchange]:
@@ -50,7 +127,8 @@ class MarketData:
                 'apiKey': os.getenv('BIDGET_API_KEY', ''),
                 'secret': os.getenv('BIDGET_API_SECRET', ''),
                 'timeout': 30000,
-                'enableRateLimit': True,
+                # Requests are spaced by the shared RateLimiter instead; throttling in ccxt as well would double every wait
+                'enableRateLimit': False,
             })
             
             # Load markets
@@ -100,22 +178,255 @@ class MarketData:
         """
         if self.test_mode or self.exchange is None:
             # Generate synthetic data for testing
-            return self._generate_test_ohlcv(symbol, timeframe, limit)
+            df = self._generate_test_ohlcv(symbol, timeframe, limit)
+            df.attrs.update(symbol=symbol, timeframe=timeframe)
+            return df
+            
+        # Serve from the stream's candle buffer while it is connected and complete
+        buffer = self.kline_stream.get_buffer(symbol, timeframe) if self.stream_connected else None
+        if buffer is not None and not buffer.gapped and len(buffer.closed) >= limit - 1:
+            return buffer.to_dataframe(limit=limit)
             
         try:
-            # Fetch OHLCV data
+            # Fetch OHLCV data (only the new candles when they are kept in the candle store)
+            if self.candle_store is not None:
+                ohlcv = self._fetch_ohlcv_delta(symbol, timeframe, limit)
+            else:
+                self.rate_limiter.acquire()
+                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            
+            if buffer is not None:
+                buffer.seed(ohlcv, now_ms=self.exchange.milliseconds())
+            return self._ohlcv_to_dataframe(ohlcv, symbol, timeframe)
+            
+        except Exception as e:
+            logger.error(f"Error fetching {timeframe} data for {symbol}: {e}")
+            return pd.DataFrame()
+    
+    @property
+    def stream_connected(self) -> bool:
+        """Whether the websocket kline stream is running and connected"""
+        return self.kline_stream is not None and self.kline_stream.connected.is_set()
+    
+    def start_stream(self, on_candle_closed=None, connect_timeout: float = 10.0) -> bool:
+        """
+        Start websocket ingestion of klines and tickers for all markets and timeframes
+        
+        Buffers are seeded from REST once the stream is connected, so no candle
+        closes unseen between the two. Does nothing unless MARKET_DATA_STREAM=true.
+        
+        Args:
+            on_candle_closed: Called from the stream thread with (symbol, timeframe, closed candles)
+            connect_timeout: Seconds to wait for the connection before seeding anyway
+            
+        Returns:
+            bool: True if the stream was started
+        """
+        if not self.stream_enabled or self.test_mode or self.exchange is None:
+            return False
+        if not AIOHTTP_AVAILABLE:
+            logger.warning("MARKET_DATA_STREAM is set but aiohttp is not installed, polling REST instead")
+            return False
+        if self.kline_stream is not None:
+            return True
+        
+        self.kline_stream = KlineStream(
+            self.markets, self.timeframes,
+            buffer_size=self.stream_buffer_size,
+            on_candle_closed=on_candle_closed,
+            record_path=os.getenv('KLINE_STREAM_RECORD') or None
+        )
+        self.kline_stream.start()
+        if not self.kline_stream.connected.wait(connect_timeout):
+            logger.warning("Kline stream not connected yet, scans use REST until it is")
+        
+        for (symbol, timeframe), buffer in self.kline_stream.buffers.items():
+            try:
+                self.rate_limiter.acquire()
+                buffer.seed(self.exchange.fetch_ohlcv(symbol, timeframe, limit=self.stream_buffer_size),
+                            now_ms=self.exchange.milliseconds())
+            except Exception as e:
+                # Left empty; the first scan falls back to REST and seeds it
+                logger.error(f"Error seeding {timeframe} buffer for {symbol}: {e}")
+        
+        logger.info(f"Streaming {len(self.kline_stream.buffers)} kline series from {self.kline_stream.url}")
+        return True
+    
+    def stop_stream(self) -> None:
+        """Stop websocket ingestion"""
+        if self.kline_stream is not None:
+            self.kline_stream.stop()
+            self.kline_stream = None
+    
+    def _fetch_ohlcv_delta(self, symbol: str, timeframe: str, limit: int) -> List[List[float]]:
+        """
+        Bring the stored candles up to date and return the newest `limit` of them
+        
+        The newest stored candle is always refetched because it may have been
+        stored while still forming. A full window is fetched instead when the
+        store holds fewer than `limit` candles, and a gap of `limit` or more
+        candles is downloaded page by page so the stored series stays contiguous.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe for the data (e.g., '1h', '4h', '1d')
+            limit: Number of candles to return
+            
+        Returns:
+            List[List[float]]: Candles as [timestamp_ms, open, high, low, close, volume] rows
+        """
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        last_timestamp = self.candle_store.last_timestamp(symbol, timeframe)
+        now_ms = self.exchange.milliseconds()
+        
+        if last_timestamp is None:
+            self.rate_limiter.acquire()
+            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            self.candle_store.append(symbol, timeframe, ohlcv)
+            return ohlcv
+        
+        new_candles = (now_ms - last_timestamp) // timeframe_ms + 1
+        if new_candles > limit:
+            # A detached window would leave a hole that no later fetch fills
+            ohlcv = self._fetch_ohlcv_range(symbol, timeframe, last_timestamp)
+            logger.debug(f"Filled a {len(ohlcv)}-candle {timeframe} gap for {symbol}")
+            return self.candle_store.load(symbol, timeframe, limit=limit)
+        
+        if self.candle_store.count(symbol, timeframe) < limit:
+            # The window overlaps the newest stored candle, so it joins the series
+            self.rate_limiter.acquire()
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            self.candle_store.append(symbol, timeframe, ohlcv)
+            return ohlcv
+        
+        self.rate_limiter.acquire()
+        ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since=last_timestamp, limit=new_candles)
+        self.candle_store.append(symbol, timeframe, ohlcv)
+        logger.debug(f"Fetched {len(ohlcv)} new {timeframe} candles for {symbol}")
+        
+        return self.candle_store.load(symbol, timeframe, limit=limit)
+    
+    def get_historical_data(self, symbol: str, timeframe: str, since: int) -> pd.DataFrame:
+        """
+        Get all candles opened at or after a timestamp
+        
+        With the candle store enabled, only candles missing on disk are downloaded and
+        the closed candles are returned memory-mapped from the columnar history store.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe for the data (e.g., '1h', '4h', '1d')
+            since: Start timestamp in milliseconds
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
+        Returns:
+            pd.DataFrame: DataFrame with OHLCV data
+        """
+        timeframe_ms = ccxt.Exchange.parse_timeframe(timeframe) * 1000
+        
+        if self.test_mode or self.exchange is None:
+            limit = max(1, int((time.time() * 1000 - since) // timeframe_ms))
+            return self.fetch_ohlcv_data(symbol, timeframe, limit=limit)
+        
+        try:
+            if self.candle_store is None:
+                return self._ohlcv_to_dataframe(self._fetch_ohlcv_range(symbol, timeframe, since), symbol, timeframe)
             
-            return df
+            # Refresh the newest candles, then backfill anything older than what is on disk
+            self.fetch_ohlcv_data(symbol, timeframe)
+            first_timestamp = self.candle_store.first_timestamp(symbol, timeframe)
+            first_needed = -(-since // timeframe_ms) * timeframe_ms  # Open time of the first candle at/after since
+            if first_timestamp is None or first_needed < first_timestamp:
+                self._fetch_ohlcv_range(symbol, timeframe, since, until=first_timestamp)
+            
+            if self.history_store is not None:
+                self._sync_history(symbol, timeframe)
+                return self.history_store.load_dataframe(symbol, timeframe, since=since)
+            
+            return self._ohlcv_to_dataframe(self.candle_store.load(symbol, timeframe, since=since), symbol, timeframe)
             
         except Exception as e:
-            logger.error(f"Error fetching {timeframe} data for {symbol}: {e}")
+            logger.error(f"Error fetching historical {timeframe} data for {symbol}: {e}")
             return pd.DataFrame()
+    
+    def _sync_history(self, symbol: str, timeframe: str) -> None:
+        """
+        Export closed candles from the candle store to the columnar history store
+        
+        New candles are appended; the series is rewritten when the candle store
+        has been backfilled further back than the exported history.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe for the data (e.g., '1h', '4h', '1d')
+        """
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        newest_closed = self.exchange.milliseconds() - timeframe_ms  # Open time of the newest closed candle
+        first_exported, last_exported = self.history_store.bounds(symbol, timeframe)
+        
+        if first_exported is None or self.candle_store.first_timestamp(symbol, timeframe) < first_exported:
+            candles = self.candle_store.load(symbol, timeframe)
+            self.history_store.write(symbol, timeframe, [c for c in candles if c[0] <= newest_closed])
+        else:
+            candles = self.candle_store.load(symbol, timeframe, since=last_exported + 1)
+            self.history_store.append(symbol, timeframe, [c for c in candles if c[0] <= newest_closed])
+    
+    def _fetch_ohlcv_range(self, symbol: str, timeframe: str, since: int,
+                           until: Optional[int] = None) -> List[List[float]]:
+        """
+        Download candles page by page from `since` up to `until` (or the present)
+        
+        Pages are appended to the candle store as they arrive when it is enabled.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe for the data (e.g., '1h', '4h', '1d')
+            since: Start timestamp in milliseconds
+            until: Stop once candles reach this timestamp in milliseconds
+            
+        Returns:
+            List[List[float]]: Candles as [timestamp_ms, open, high, low, close, volume] rows
+        """
+        timeframe_ms = self.exchange.parse_timeframe(timeframe) * 1000
+        candles = []
+        cursor = since
+        
+        while True:
+            self.rate_limiter.acquire()
+            page = self.exchange.fetch_ohlcv(symbol, timeframe, since=cursor, limit=self.HISTORY_PAGE_SIZE)
+            if not page or page[-1][0] < cursor:
+                break
+                
+            candles.extend(page)
+            if self.candle_store is not None:
+                self.candle_store.append(symbol, timeframe, page)
+                
+            cursor = page[-1][0] + timeframe_ms
+            if cursor > self.exchange.milliseconds() or (until is not None and cursor >= until):
+                break
+        
+        return candles
+    
+    @staticmethod
+    def _ohlcv_to_dataframe(ohlcv: List[List[float]], symbol: str, timeframe: str) -> pd.DataFrame:
+        """
+        Convert raw exchange candles to a tagged DataFrame
+        
+        Args:
+            ohlcv: Candles as [timestamp_ms, open, high, low, close, volume] rows
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe for the data (e.g., '1h', '4h', '1d')
+            
+        Returns:
+            pd.DataFrame: DataFrame with OHLCV data
+        """
+        df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        
+        # Tag the candles so indicators can be shared through the indicator cache
+        df.attrs.update(symbol=symbol, timeframe=timeframe)
+        
+        return df
             
     def _generate_test_ohlcv(self, symbol: str, timeframe: str, limit: int = 100) -> pd.DataFrame:
         """
@@ -190,10 +501,13 @@ class MarketData:
         
         return df
     
-    def scan_all_markets(self) -> Dict[str, Dict[str, pd.DataFrame]]:
+    def scan_all_markets(self, timeframes: Optional[List[str]] = None) -> Dict[str, Dict[str, pd.DataFrame]]:
         """
         Scan all configured markets and timeframes
         
+        Args:
+            timeframes: Timeframes to scan (default: all configured timeframes)
+            
         Returns:
             Dict[str, Dict[str, pd.DataFrame]]: Nested dict of market data by symbol and timeframe
         """
@@ -202,38 +516,134 @@ class MarketData:
         if os.getenv('LOW_PRICE_FILTER', 'true').lower() == 'true':
             logger.info(f"Filtering for cryptos under ${max_price}")
             
-            # Get current prices
+            # Get current prices from one bulk snapshot
             markets = self.markets[:]
+            prices = self.get_ticker_prices(markets)
             for market in markets[:]:
-                try:
-                    ticker = self.exchange.fetch_ticker(market)
-                    price = ticker.get('last')
-                    
-                    if price is not None and price > max_price:
-                        markets.remove(market)
-                        logger.info(f"Filtered out high-priced crypto: {market} (${price:.3f})")
-                    elif price is None:
-                        logger.warning(f"Could not get price for {market}, keeping it in the scan list")
-                except Exception as e:
-                    logger.error(f"Error checking price for {market}: {e}")
-                    # Keep the market in the list, we'll handle errors during data fetching
+                price = prices.get(market)
+                
+                if price is not None and price > max_price:
+                    markets.remove(market)
+                    logger.info(f"Filtered out high-priced crypto: {market} (${price:.3f})")
+                elif price is None:
+                    logger.warning(f"Could not get price for {market}, keeping it in the scan list")
         else:
             markets = self.markets
         
+        # Fetch every symbol x timeframe concurrently, then assemble in configured order
+        timeframes = self.timeframes if timeframes is None else timeframes
+        tasks = [(symbol, timeframe) for symbol in markets for timeframe in timeframes]
+        scan_start = time.perf_counter()
+        
+        if tasks:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(tasks)),
+                                    thread_name_prefix='ohlcv-fetch') as executor:
+                results = list(executor.map(lambda task: self._timed_fetch(*task), tasks))
+        else:
+            results = []
+        
+        self.fetch_latencies = [
+            {'symbol': symbol, 'timeframe': timeframe, 'latency_ms': latency_ms, 'success': df is not None and not df.empty}
+            for (symbol, timeframe), (df, latency_ms) in zip(tasks, results)
+        ]
+        
         for symbol in markets:
             all_data[symbol] = {}
+        
+        for (symbol, timeframe), (df, _) in zip(tasks, results):
+            if df is None:
+                continue
+            if not df.empty:
+                all_data[symbol][timeframe] = df
+                logger.debug(f"Successfully fetched {timeframe} data for {symbol}")
+            else:
+                logger.warning(f"Empty data returned for {symbol} on {timeframe}")
+        
+        stats = self.get_fetch_stats()
+        logger.info(f"Fetched {stats['requests']} OHLCV series in {(time.perf_counter() - scan_start) * 1000:.0f}ms "
+                    f"with {self.max_concurrency} workers (p50 {stats['p50_ms']:.0f}ms, p95 {stats['p95_ms']:.0f}ms)")
+        
+        return all_data
+    
+    def get_ticker_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Get last prices for several symbols
+        
+        Uses the stream's ticker prices while it is connected, otherwise one bulk
+        fetch_tickers request, cached for TICKER_CACHE_TTL seconds.
+        Falls back to per-symbol fetch_ticker calls (not cached) if the bulk request fails.
+        
+        Args:
+            symbols: Trading pair symbols (e.g., ['BTC/USDT', 'ETH/USDT'])
             
-            for timeframe in self.timeframes:
+        Returns:
+            Dict[str, Optional[float]]: Last price by symbol (None if unavailable)
+        """
+        if self.stream_connected and all(symbol in self.kline_stream.prices for symbol in symbols):
+            return {symbol: self.kline_stream.prices[symbol] for symbol in symbols}
+        
+        now = time.monotonic()
+        cached = now - self._ticker_snapshot_time < self.ticker_ttl
+        if cached and all(symbol in self._ticker_snapshot for symbol in symbols):
+            return {symbol: self._ticker_snapshot[symbol] for symbol in symbols}
+        
+        prices = {}
+        try:
+            self.rate_limiter.acquire()
+            tickers = self.exchange.fetch_tickers(symbols)
+            prices = {symbol: (tickers.get(symbol) or {}).get('last') for symbol in symbols}
+            self._ticker_snapshot = prices
+            self._ticker_snapshot_time = now
+        except Exception as e:
+            logger.warning(f"Bulk ticker fetch failed, falling back to per-symbol requests: {e}")
+            for symbol in symbols:
                 try:
-                    df = self.fetch_ohlcv_data(symbol, timeframe)
-                    
-                    if not df.empty:
-                        all_data[symbol][timeframe] = df
-                        logger.debug(f"Successfully fetched {timeframe} data for {symbol}")
-                    else:
-                        logger.warning(f"Empty data returned for {symbol} on {timeframe}")
-                        
+                    self.rate_limiter.acquire()
+                    prices[symbol] = self.exchange.fetch_ticker(symbol).get('last')
                 except Exception as e:
-                    logger.error(f"Error scanning {symbol} on {timeframe}: {e}")
+                    logger.error(f"Error checking price for {symbol}: {e}")
+                    prices[symbol] = None
         
-        return all_data
+        return prices
+    
+    def _timed_fetch(self, symbol: str, timeframe: str) -> Tuple[Optional[pd.DataFrame], float]:
+        """
+        Fetch one OHLCV series and measure its latency
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe for the data (e.g., '1h', '4h', '1d')
+            
+        Returns:
+            Tuple[Optional[pd.DataFrame], float]: The data (None on error) and latency in milliseconds
+        """
+        # Time spent waiting on the rate limiter is not request latency
+        waited = self.rate_limiter.waited()
+        start = time.perf_counter()
+        try:
+            df = self.fetch_ohlcv_data(symbol, timeframe)
+        except Exception as e:
+            logger.error(f"Error scanning {symbol} on {timeframe}: {e}")
+            df = None
+        elapsed = time.perf_counter() - start - (self.rate_limiter.waited() - waited)
+        return df, max(elapsed, 0.0) * 1000
+    
+    def get_fetch_stats(self) -> Dict[str, float]:
+        """
+        Summarize per-request latencies from the last scan
+        
+        Returns:
+            Dict[str, float]: Request count, failures and latency percentiles in milliseconds
+        """
+        latencies = np.array([r['latency_ms'] for r in self.fetch_latencies], dtype=float)
+        if latencies.size == 0:
+            return {'requests': 0, 'failures': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+            
+        return {
+            'requests': int(latencies.size),
+            'failures': sum(1 for r in self.fetch_latencies if not r['success']),
+            'mean_ms': float(latencies.mean()),
+            'p50_ms': float(np.percentile(latencies, 50)),
+            'p95_ms': float(np.percentile(latencies, 95)),
+            'max_ms': float(latencies.max())
+        }
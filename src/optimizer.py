@@ -0,0 +1,408 @@
+"""
+Parallel parameter sweeps for strategy settings
+
+Backtests grid or random combinations of a strategy's tunable settings on a
+process pool and ranks them by an objective. Candles are packed once per sweep
+into shared-memory NumPy arrays together with the inputs every combination
+shares (True Range and the candle midpoint), so workers map them instead of
+unpickling DataFrames or recomputing them. Each worker keeps one indicator
+cache across its combinations, so ATRs, ADXs and percentile ranks are also
+computed once per distinct period, and the Supertrends of a chunk of
+combinations are computed in one batched pass.
+
+The best combinations can be stored as named parameter profiles.
+"""
+
+import os
+import time
+import itertools
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.backtest import Backtester
+from src.indicators import calculate_true_range
+from src.strategies import InsideBarStrategy, SupertrendADXStrategy
+from src.strategy_evaluator import OHLCV_COLUMNS, evaluate_strategy
+from src.utils.indicator_cache import IndicatorCache
+
+# Parameter profiles are optional (the manager persists to the config directory)
+try:
+    from src.utils.parameter_manager import parameter_manager
+    PARAMETER_MANAGER_AVAILABLE = True
+except ImportError:
+    PARAMETER_MANAGER_AVAILABLE = False
+    parameter_manager = None
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_CLASSES = {
+    'supertrend_adx': SupertrendADXStrategy,
+    'inside_bar': InsideBarStrategy
+}
+
+# Default search spaces: lists of values for grid search; random search also takes (low, high) ranges
+PARAMETER_SPACES = {
+    'supertrend_adx': {
+        'supertrend_period': [7, 10, 14, 21],
+        'supertrend_multiplier': [2.0, 2.5, 3.0, 3.5, 4.0],
+        'adx_threshold': [20, 25, 30, 35],
+        'atr_period': [10, 14, 21]
+    },
+    'inside_bar': {
+        'atr_period': [7, 10, 14, 21],
+        'volatility_percentile': [10, 20, 30, 40, 50]
+    }
+}
+
+OBJECTIVES: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    'total_pnl_percent': lambda stats: stats['total_pnl_percent'],
+    'win_rate': lambda stats: stats['win_rate'],
+    'avg_trade_percent': lambda stats: stats['avg_trade_percent'],
+    # Return per unit of drawdown; without a drawdown the return itself
+    'pnl_to_drawdown': lambda stats: (stats['total_pnl_percent'] / stats['max_drawdown_percent']
+                                      if stats['max_drawdown_percent'] > 0 else stats['total_pnl_percent'])
+}
+
+# Shared block columns: OHLCV followed by the precomputed inputs
+_SHARED_COLUMNS = OHLCV_COLUMNS + ['true_range', 'hl2']
+
+# Combinations whose Supertrends are computed together in one batched pass
+_MAX_CHUNK_SIZE = 64
+
+# Candles and cache of the current worker process, installed by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def grid_combinations(space: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """
+    Every combination of the listed values
+
+    Args:
+        space: Values to try by parameter name
+
+    Returns:
+        List[Dict[str, Any]]: Combinations, the last parameter varying fastest
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_combinations(space: Dict[str, Any], samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Distinct random combinations
+
+    Args:
+        space: Per parameter name, a list of values to choose from or a (low, high) range
+               (integer bounds sample integers, float bounds sample floats)
+        samples: Number of combinations to draw
+        seed: Random seed for reproducible sweeps
+
+    Returns:
+        List[Dict[str, Any]]: Up to `samples` distinct combinations
+    """
+    rng = np.random.default_rng(seed)
+    combinations = {}
+    # Discrete spaces may hold fewer combinations than requested
+    for _ in range(samples * 10):
+        if len(combinations) >= samples:
+            break
+        combination = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, (int, np.integer)) and isinstance(high, (int, np.integer)):
+                    combination[name] = int(rng.integers(low, high + 1))
+                else:
+                    combination[name] = round(float(rng.uniform(low, high)), 4)
+            else:
+                combination[name] = values[int(rng.integers(len(values)))]
+        combinations.setdefault(tuple(combination.values()), combination)
+    return list(combinations.values())
+
+
+def _install_candles(candles: Dict[str, pd.DataFrame], shared_inputs: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                     strategy_name: str, timeframe: str, settings: Dict[str, Any], handles: Tuple = ()) -> None:
+    """
+    Set up the candles of the current process with the precomputed inputs seeded in its cache
+
+    Args:
+        candles: OHLCV DataFrames by symbol
+        shared_inputs: (true range, hl2) arrays by symbol
+        strategy_name: Strategy being swept
+        timeframe: Timeframe of the candles
+        settings: Backtester keyword arguments
+        handles: Shared memory blocks backing the arrays, kept open for the process lifetime
+    """
+    cache = IndicatorCache(max_entries=max(1024, 64 * len(candles)))
+    for symbol, df in candles.items():
+        df.attrs.update(symbol=symbol, timeframe=timeframe)
+        true_range, hl2 = shared_inputs[symbol]
+        cache.put(df, 'true_range', (), pd.Series(true_range, index=df.index))
+        cache.put(df, 'hl2', (), pd.Series(hl2, index=df.index))
+
+    _worker_state.clear()
+    _worker_state.update(candles=candles, cache=cache, strategy_name=strategy_name,
+                         timeframe=timeframe, settings=settings, handles=handles)
+
+
+def _init_worker(values_name: str, index_name: str, total_rows: int, layout: List[Tuple[str, int, int]],
+                 index_dtype, strategy_name: str, timeframe: str, settings: Dict[str, Any]) -> None:
+    """Map the shared candles in a freshly started worker process"""
+    values_shm = shared_memory.SharedMemory(name=values_name)
+    index_shm = shared_memory.SharedMemory(name=index_name)
+    values = np.ndarray((total_rows, len(_SHARED_COLUMNS)), dtype=np.float64, buffer=values_shm.buf)
+    timestamps = np.ndarray((total_rows,), dtype=np.int64, buffer=index_shm.buf)
+
+    candles, shared_inputs = {}, {}
+    for symbol, start, stop in layout:
+        index = pd.DatetimeIndex(timestamps[start:stop].view(index_dtype).copy(), name='timestamp')
+        candles[symbol] = pd.DataFrame(values[start:stop, :len(OHLCV_COLUMNS)], columns=OHLCV_COLUMNS,
+                                       index=index, copy=False)
+        shared_inputs[symbol] = (values[start:stop, len(OHLCV_COLUMNS)], values[start:stop, len(OHLCV_COLUMNS) + 1])
+
+    _install_candles(candles, shared_inputs, strategy_name, timeframe, settings, (values_shm, index_shm))
+
+
+def _evaluate_chunk(combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Backtest a chunk of combinations on the installed candles
+
+    Signals are generated symbol by symbol for the whole chunk, after computing
+    the chunk's Supertrends of that symbol in one batched pass.
+
+    Args:
+        combinations: Strategy settings
+
+    Returns:
+        List[Dict[str, Any]]: Backtest statistics of each combination
+    """
+    strategy_name = _worker_state['strategy_name']
+    timeframe = _worker_state['timeframe']
+    cache = _worker_state['cache']
+    candles = _worker_state['candles']
+
+    strategies = []
+    for parameters in combinations:
+        strategy = STRATEGY_CLASSES[strategy_name](cache=cache)
+        strategy.set_parameters(parameters)
+        strategies.append(strategy)
+    supertrend_pairs = [(strategy.supertrend_period, strategy.supertrend_multiplier)
+                        for strategy in strategies if isinstance(strategy, SupertrendADXStrategy)]
+
+    signals = [[] for _ in strategies]
+    for symbol, df in candles.items():
+        if supertrend_pairs:
+            cache.supertrend_batch(df, *zip(*supertrend_pairs))
+        for strategy_signals, strategy in zip(signals, strategies):
+            strategy_signals.extend(evaluate_strategy(strategy_name, strategy, df, symbol, timeframe))
+
+    backtester = Backtester({}, max_workers=1, **_worker_state['settings'])
+    return [backtester.backtest_signals(candles, strategy_signals, [strategy_name], timeframe)['strategies'][strategy_name]
+            for strategy_signals in signals]
+
+
+def _chunks(combinations: List[Dict[str, Any]], size: int) -> List[List[Dict[str, Any]]]:
+    """Split combinations into consecutive chunks"""
+    return [combinations[start:start + size] for start in range(0, len(combinations), size)]
+
+
+class ParameterSweep:
+    """Backtests combinations of one strategy's settings and ranks them"""
+
+    def __init__(self, strategy_name: str, objective: str = 'total_pnl_percent', min_trades: int = 10,
+                 max_workers: Optional[int] = None, **backtest_settings):
+        """
+        Initialize the sweep
+
+        Args:
+            strategy_name: Strategy to tune ('supertrend_adx' or 'inside_bar')
+            objective: Ranking objective, a key of OBJECTIVES
+            min_trades: Combinations with fewer closed trades rank last
+            max_workers: Worker processes (default: STRATEGY_WORKERS env or CPU count;
+                         1 runs in-process)
+            **backtest_settings: Backtester keyword arguments (fee_rate, slippage,
+                                 position_size_percent, initial_balance, min_confidence)
+        """
+        if strategy_name not in STRATEGY_CLASSES:
+            raise ValueError(f"Unknown strategy: {strategy_name}")
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective} (expected one of {', '.join(OBJECTIVES)})")
+
+        self.strategy_name = strategy_name
+        self.objective = objective
+        self.min_trades = min_trades
+        if max_workers is None:
+            max_workers = int(os.getenv('STRATEGY_WORKERS', '0')) or os.cpu_count() or 1
+        self.max_workers = max(1, max_workers)
+        self.backtest_settings = backtest_settings
+
+    def run(self, candles: Dict[str, pd.DataFrame], timeframe: str = '15m',
+            combinations: Optional[List[Dict[str, Any]]] = None, space: Optional[Dict[str, Any]] = None,
+            search: str = 'grid', samples: int = 100, seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Backtest the combinations and rank them by the objective
+
+        Args:
+            candles: OHLCV DataFrames by symbol, indexed by candle open time
+            timeframe: Timeframe of the candles (e.g., '15m')
+            combinations: Explicit combinations to try (overrides space/search)
+            space: Search space (default: PARAMETER_SPACES for the strategy)
+            search: 'grid' or 'random'
+            samples: Combinations drawn by random search
+            seed: Random search seed
+
+        Returns:
+            Dict[str, Any]: success, objective, combination count, the ranked 'results'
+                            (parameters, score and backtest statistics) and the run time
+        """
+        start_time = time.perf_counter()
+        candles = {symbol: df for symbol, df in candles.items() if df is not None and not df.empty}
+        if not candles:
+            return {'success': False, 'error': 'No candles to sweep'}
+
+        if combinations is None:
+            space = space or PARAMETER_SPACES[self.strategy_name]
+            if search == 'grid':
+                combinations = grid_combinations(space)
+            elif search == 'random':
+                combinations = random_combinations(space, samples, seed)
+            else:
+                return {'success': False, 'error': f"Unknown search: {search}"}
+
+        if self.max_workers == 1 or len(combinations) <= 1:
+            stats = self._run_serial(candles, timeframe, combinations)
+        else:
+            stats = self._run_parallel(candles, timeframe, combinations)
+
+        ranked = self.rank(combinations, stats)
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Swept {len(combinations)} {self.strategy_name} combinations on {len(candles)} symbols "
+                    f"in {elapsed:.2f}s")
+        return {
+            'success': True,
+            'strategy': self.strategy_name,
+            'objective': self.objective,
+            'timeframe': timeframe,
+            'symbols': list(candles),
+            'combinations': len(combinations),
+            'results': ranked,
+            'elapsed': elapsed
+        }
+
+    def rank(self, combinations: List[Dict[str, Any]], stats: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score the combinations and sort them best first
+
+        Args:
+            combinations: Strategy settings
+            stats: Backtest statistics of each combination
+
+        Returns:
+            List[Dict[str, Any]]: parameters, score and statistics per combination, best first
+        """
+        objective = OBJECTIVES[self.objective]
+        results = []
+        for parameters, combination_stats in zip(combinations, stats):
+            score = objective(combination_stats) if combination_stats['trades'] >= self.min_trades else -np.inf
+            results.append({'parameters': dict(parameters), 'score': float(score), **combination_stats})
+        # Stable sort keeps search order among equal scores
+        results.sort(key=lambda result: result['score'], reverse=True)
+        return results
+
+    def save_profiles(self, results: List[Dict[str, Any]], top: int = 3, prefix: Optional[str] = None,
+                      manager=None) -> List[str]:
+        """
+        Store the best combinations as parameter profiles
+
+        Existing profiles with the same id are updated.
+
+        Args:
+            results: Ranked results from run()
+            top: Number of combinations to store
+            prefix: Profile id prefix (default: '<strategy>_sweep')
+            manager: Parameter manager (default: the shared one)
+
+        Returns:
+            List[str]: Ids of the stored profiles
+        """
+        manager = manager or parameter_manager
+        if manager is None:
+            logger.warning("Parameter manager not available, sweep results not stored")
+            return []
+
+        prefix = prefix or f"{self.strategy_name}_sweep"
+        profile_ids = []
+        for rank, result in enumerate(results[:top], start=1):
+            if not np.isfinite(result['score']):
+                break
+            profile_id = f"{prefix}_{rank}"
+            name = f"{self.strategy_name} sweep #{rank}"
+            description = (f"{self.objective} {result['score']:.2f}: {result['trades']} trades, "
+                           f"win rate {result['win_rate']:.1f}%, PnL {result['total_pnl_percent']:+.2f}%, "
+                           f"max drawdown {result['max_drawdown_percent']:.2f}%")
+            stored = manager.create_profile(profile_id, name, description, dict(result['parameters']))
+            if not stored:
+                stored = manager.update_profile(profile_id, name, description, dict(result['parameters']))
+            if stored:
+                profile_ids.append(profile_id)
+        return profile_ids
+
+    def _run_serial(self, candles: Dict[str, pd.DataFrame], timeframe: str,
+                    combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Evaluate every combination in this process"""
+        shared_inputs = {symbol: (calculate_true_range(df).to_numpy(), ((df['high'] + df['low']) / 2).to_numpy())
+                         for symbol, df in candles.items()}
+        candles = {symbol: df.copy(deep=False) for symbol, df in candles.items()}
+        _install_candles(candles, shared_inputs, self.strategy_name, timeframe, self.backtest_settings)
+        try:
+            stats = []
+            for chunk in _chunks(combinations, _MAX_CHUNK_SIZE):
+                stats.extend(_evaluate_chunk(chunk))
+            return stats
+        finally:
+            _worker_state.clear()
+
+    def _run_parallel(self, candles: Dict[str, pd.DataFrame], timeframe: str,
+                      combinations: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Pack candles and shared inputs into shared memory and evaluate the combinations on a process pool"""
+        total_rows = sum(len(df) for df in candles.values())
+        values_shm = shared_memory.SharedMemory(create=True, size=max(1, total_rows * len(_SHARED_COLUMNS) * 8))
+        index_shm = shared_memory.SharedMemory(create=True, size=max(1, total_rows * 8))
+        try:
+            values = np.ndarray((total_rows, len(_SHARED_COLUMNS)), dtype=np.float64, buffer=values_shm.buf)
+            timestamps = np.ndarray((total_rows,), dtype=np.int64, buffer=index_shm.buf)
+
+            layout = []
+            start = 0
+            index_dtype = None
+            for symbol, df in candles.items():
+                stop = start + len(df)
+                values[start:stop, :len(OHLCV_COLUMNS)] = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+                values[start:stop, len(OHLCV_COLUMNS)] = calculate_true_range(df).to_numpy()
+                values[start:stop, len(OHLCV_COLUMNS) + 1] = ((df['high'] + df['low']) / 2).to_numpy()
+                timestamps[start:stop] = df.index.to_numpy().view(np.int64)
+                index_dtype = df.index.dtype
+                layout.append((symbol, start, stop))
+                start = stop
+            values = timestamps = None
+
+            workers = min(self.max_workers, len(combinations))
+            # Contiguous chunks keep combinations that share a period on one worker's cache
+            chunk_size = min(_MAX_CHUNK_SIZE, max(1, -(-len(combinations) // (workers * 4))))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(values_shm.name, index_shm.name, total_rows, layout, index_dtype,
+                                               self.strategy_name, timeframe, self.backtest_settings)) as executor:
+                stats = []
+                for chunk_stats in executor.map(_evaluate_chunk, _chunks(combinations, chunk_size)):
+                    stats.extend(chunk_stats)
+                return stats
+        finally:
+            values_shm.close()
+            values_shm.unlink()
+            index_shm.close()
+            index_shm.unlink()
@@ -5,24 +5,74 @@ Trading strategies implementation
 import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from src.indicators import (
-    calculate_supertrend,
-    calculate_adx,
-    calculate_atr,
-    detect_inside_bar,
-    is_atr_in_bottom_percentile
-)
+from src.indicators import detect_inside_bar, percentile_rank_last
+from src.utils.indicator_cache import IndicatorCache, indicator_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _shift(values: np.ndarray, periods: int = 1, fill_value=np.nan) -> np.ndarray:
+    """
+    Shift an array forward by `periods` rows, like pd.Series.shift
+    
+    Args:
+        values: Array to shift
+        periods: Number of rows to shift by
+        fill_value: Value for the vacated leading rows
+        
+    Returns:
+        np.ndarray: Shifted array
+    """
+    if fill_value is np.nan and values.dtype.kind in 'biu':
+        values = values.astype(np.float64)
+    shifted = np.full_like(values, fill_value)
+    if periods < len(values):
+        shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+
 class Strategy:
     """Base strategy class that all strategies inherit from"""
     
-    def __init__(self, name: str):
+    # Tunable settings (attribute names), swept by the optimizer and stored in parameter profiles
+    PARAMETERS: Tuple[str, ...] = ()
+    
+    def __init__(self, name: str, cache: Optional[IndicatorCache] = None):
         self.name = name
+        # Indicators are requested from the shared cache so each series is computed once per candle set
+        self.indicator_cache = cache or indicator_cache
+    
+    def __getstate__(self) -> dict:
+        # The cache holds a lock and is per-process; worker processes use their own global cache
+        state = self.__dict__.copy()
+        state.pop('indicator_cache', None)
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.indicator_cache = indicator_cache
+    
+    def get_parameters(self) -> Dict[str, Any]:
+        """Current values of the tunable settings"""
+        return {name: getattr(self, name) for name in self.PARAMETERS}
+    
+    def set_parameters(self, parameters: Dict[str, Any]) -> None:
+        """
+        Change tunable settings
+        
+        Args:
+            parameters: Values by setting name (a subset of PARAMETERS)
+            
+        Raises:
+            ValueError: If a setting is not tunable for this strategy
+        """
+        unknown = set(parameters) - set(self.PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown {self.name} parameters: {', '.join(sorted(unknown))}")
+        for name, value in parameters.items():
+            setattr(self, name, value)
     
     def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -36,6 +86,35 @@ class Strategy:
         """
         raise NotImplementedError("Subclasses must implement this method")
     
+    def generate_last_bar_signal(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Evaluate only whether the newest candle triggers a signal
+        
+        Gives the same values as the last row of generate_signals. Subclasses
+        override this to compute just the state the last bar needs.
+        
+        Args:
+            df: DataFrame with OHLCV data, newest candle last
+            
+        Returns:
+            Optional[Dict[str, Any]]: timestamp, signal, confidence, close, profit_target,
+            stop_loss and atr of the newest candle, or None if it doesn't trigger
+        """
+        signal_df = self.generate_signals(df)
+        if signal_df.empty or not signal_df['signal_triggered'].iloc[-1]:
+            return None
+            
+        row = signal_df.iloc[-1]
+        return {
+            'timestamp': signal_df.index[-1],
+            'signal': row['signal'],
+            'confidence': row['confidence'],
+            'close': row['close'],
+            'profit_target': row['profit_target'],
+            'stop_loss': row['stop_loss'],
+            'atr': row['atr']
+        }
+    
     def calculate_confidence(self, df: pd.DataFrame, signal_idx: int) -> float:
         """
         Calculate confidence level for a specific signal
@@ -48,6 +127,18 @@ class Strategy:
             float: Confidence level (0-100)
         """
         raise NotImplementedError("Subclasses must implement this method")
+    
+    def calculate_confidence_scores(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate confidence levels for every row as whole-array operations
+        
+        Args:
+            df: DataFrame with signals
+            
+        Returns:
+            np.ndarray: Confidence level (0-100) per row
+        """
+        raise NotImplementedError("Subclasses must implement this method")
 
 
 class SupertrendADXStrategy(Strategy):
@@ -62,8 +153,10 @@ class SupertrendADXStrategy(Strategy):
     - Stop-loss: at the Supertrend line
     """
     
-    def __init__(self):
-        super().__init__(name="Supertrend+ADX")
+    PARAMETERS = ('supertrend_period', 'supertrend_multiplier', 'adx_threshold', 'atr_period')
+    
+    def __init__(self, cache: Optional[IndicatorCache] = None):
+        super().__init__(name="Supertrend+ADX", cache=cache)
         self.supertrend_period = 10
         self.supertrend_multiplier = 3
         self.adx_period = 14
@@ -84,7 +177,7 @@ class SupertrendADXStrategy(Strategy):
         result_df = df.copy()
         
         # Calculate Supertrend
-        supertrend, direction = calculate_supertrend(
+        supertrend, direction = self.indicator_cache.supertrend(
             result_df, 
             atr_period=self.supertrend_period, 
             multiplier=self.supertrend_multiplier
@@ -93,111 +186,141 @@ class SupertrendADXStrategy(Strategy):
         result_df['supertrend_direction'] = direction
         
         # Calculate ADX
-        adx_data = calculate_adx(result_df, period=self.adx_period)
+        adx_data = self.indicator_cache.adx(result_df, period=self.adx_period)
         result_df['adx'] = adx_data['adx']
         result_df['plus_di'] = adx_data['plus_di']
         result_df['minus_di'] = adx_data['minus_di']
         
         # Calculate ATR for profit target and stop loss
-        result_df['atr'] = calculate_atr(result_df, period=self.atr_period)
-        
-        # Initialize signal columns
-        result_df['signal'] = 0  # 0: no signal, 1: long, -1: short
-        result_df['signal_triggered'] = False
-        result_df['profit_target'] = np.nan
-        result_df['stop_loss'] = np.nan
-        result_df['confidence'] = 0.0
-        
-        # Generate signals
-        for i in range(1, len(result_df)):
-            # Check for Supertrend flip (direction change)
-            direction_change = result_df['supertrend_direction'].iloc[i] != result_df['supertrend_direction'].iloc[i-1]
-            
-            # Strong trend condition (ADX > threshold)
-            strong_trend = result_df['adx'].iloc[i] > self.adx_threshold
-            
-            # Signal conditions
-            if direction_change and strong_trend:
-                # Long signal
-                if result_df['supertrend_direction'].iloc[i] == 1:
-                    result_df.loc[result_df.index[i], 'signal'] = 1
-                    result_df.loc[result_df.index[i], 'signal_triggered'] = True
-                    result_df.loc[result_df.index[i], 'profit_target'] = result_df['close'].iloc[i] + (1.5 * result_df['atr'].iloc[i])
-                    result_df.loc[result_df.index[i], 'stop_loss'] = result_df['supertrend'].iloc[i]
-                    
-                # Short signal
-                elif result_df['supertrend_direction'].iloc[i] == -1:
-                    result_df.loc[result_df.index[i], 'signal'] = -1
-                    result_df.loc[result_df.index[i], 'signal_triggered'] = True
-                    result_df.loc[result_df.index[i], 'profit_target'] = result_df['close'].iloc[i] - (1.5 * result_df['atr'].iloc[i])
-                    result_df.loc[result_df.index[i], 'stop_loss'] = result_df['supertrend'].iloc[i]
+        result_df['atr'] = self.indicator_cache.atr(result_df, period=self.atr_period)
+        
+        # Entry on a Supertrend flip (direction change) in a strong trend (ADX > threshold)
+        direction = result_df['supertrend_direction'].to_numpy()
+        direction_change = np.zeros(len(result_df), dtype=bool)
+        direction_change[1:] = direction[1:] != direction[:-1]
+        strong_trend = result_df['adx'].to_numpy() > self.adx_threshold
+        triggered = direction_change & strong_trend
+        
+        # Long: target above price, short: target below price; stop at the Supertrend line
+        close = result_df['close'].to_numpy()
+        atr = result_df['atr'].to_numpy()
+        result_df['signal'] = np.where(triggered, direction, 0)  # 0: no signal, 1: long, -1: short
+        result_df['signal_triggered'] = triggered
+        result_df['profit_target'] = np.where(triggered, close + direction * (1.5 * atr), np.nan)
+        result_df['stop_loss'] = np.where(triggered, result_df['supertrend'].to_numpy(), np.nan)
         
         # Calculate confidence for each signal
-        for i in range(len(result_df)):
-            if result_df['signal_triggered'].iloc[i]:
-                result_df.loc[result_df.index[i], 'confidence'] = self.calculate_confidence(result_df, i)
+        result_df['confidence'] = np.where(triggered, self.calculate_confidence_scores(result_df), 0.0)
         
         return result_df
     
-    def calculate_confidence(self, df: pd.DataFrame, signal_idx: int) -> float:
+    def generate_last_bar_signal(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         """
-        Calculate confidence level for a Supertrend + ADX signal
+        Evaluate only whether the newest candle flips the Supertrend in a strong trend
+        
+        Args:
+            df: DataFrame with OHLCV data, newest candle last
+            
+        Returns:
+            Optional[Dict[str, Any]]: Signal values of the newest candle, or None if it doesn't trigger
+        """
+        if len(df) < 2:
+            return None
+            
+        supertrend, direction = self.indicator_cache.supertrend(
+            df,
+            atr_period=self.supertrend_period,
+            multiplier=self.supertrend_multiplier
+        )
+        adx_data = self.indicator_cache.adx(df, period=self.adx_period)
+        
+        direction = direction.to_numpy()
+        adx = adx_data['adx'].to_numpy()
+        if direction[-1] == direction[-2] or not adx[-1] > self.adx_threshold:
+            return None
+        
+        # Confidence only looks at the signal bar and the bar before it
+        atr = self.indicator_cache.atr(df, period=self.atr_period).to_numpy()
+        close = df['close'].to_numpy()
+        tail = pd.DataFrame({
+            'adx': adx[-2:],
+            'plus_di': adx_data['plus_di'].to_numpy()[-2:],
+            'minus_di': adx_data['minus_di'].to_numpy()[-2:],
+            'close': close[-2:],
+            'supertrend': supertrend.to_numpy()[-2:],
+            'atr': atr[-2:],
+            'volume': df['volume'].to_numpy()[-2:]
+        })
+        
+        return {
+            'timestamp': df.index[-1],
+            'signal': direction[-1],
+            'confidence': self.calculate_confidence_scores(tail)[-1],
+            'close': close[-1],
+            'profit_target': close[-1] + direction[-1] * (1.5 * atr[-1]),
+            'stop_loss': supertrend.to_numpy()[-1],
+            'atr': atr[-1]
+        }
+    
+    def calculate_confidence_scores(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate Supertrend + ADX confidence for every row at once
         
         Factors affecting confidence:
         1. ADX strength - higher ADX = more confidence
         2. DI separation - larger spread between +DI and -DI = more confidence
         3. Supertrend stability - distance from price to Supertrend line
-        4. Recent success rate - backtest last few signals
+        4. Volume confirmation - volume expansion against the previous bar
         
         Args:
-            df: DataFrame with signals
-            signal_idx: Index of the signal to evaluate
+            df: DataFrame with indicator columns
             
         Returns:
-            float: Confidence level (0-100)
+            np.ndarray: Confidence level (0-100) per row
         """
-        # Confidence starts at base level
-        confidence = 85.0  # Base level for this high-win-rate strategy
+        adx = df['adx'].to_numpy()
+        di_spread = np.abs(df['plus_di'].to_numpy() - df['minus_di'].to_numpy())
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price_to_supertrend_ratio = np.abs(df['close'].to_numpy() - df['supertrend'].to_numpy()) / df['atr'].to_numpy()
+        volume = df['volume'].to_numpy()
+        prev_volume = _shift(volume)
+        
+        # Confidence starts at base level for this high-win-rate strategy
+        confidence = np.full(len(df), 85.0)
         
         # 1. ADX strength factor (0-5%)
-        adx = df['adx'].iloc[signal_idx]
-        if adx > 40:  # Very strong trend
-            confidence += 5
-        elif adx > 30:  # Strong trend
-            confidence += 3
-        elif adx > 25:  # Moderate trend
-            confidence += 1
-            
+        confidence += np.select([adx > 40, adx > 30, adx > 25], [5, 3, 1], 0)
+        
         # 2. DI separation factor (0-4%)
-        plus_di = df['plus_di'].iloc[signal_idx]
-        minus_di = df['minus_di'].iloc[signal_idx]
-        di_spread = abs(plus_di - minus_di)
-        if di_spread > 30:
-            confidence += 4
-        elif di_spread > 20:
-            confidence += 2
-        elif di_spread > 10:
-            confidence += 1
-            
+        confidence += np.select([di_spread > 30, di_spread > 20, di_spread > 10], [4, 2, 1], 0)
+        
         # 3. Supertrend stability factor (0-3%)
-        price = df['close'].iloc[signal_idx]
-        supertrend = df['supertrend'].iloc[signal_idx]
-        price_to_supertrend_ratio = abs(price - supertrend) / df['atr'].iloc[signal_idx]
-        
-        if price_to_supertrend_ratio > 1.0:
-            confidence += 3
-        elif price_to_supertrend_ratio > 0.5:
-            confidence += 2
-        
-        # 4. Volume confirmation (0-3%)
-        if signal_idx > 0:
-            if df['volume'].iloc[signal_idx] > df['volume'].iloc[signal_idx-1] * 1.5:
-                confidence += 3
-            elif df['volume'].iloc[signal_idx] > df['volume'].iloc[signal_idx-1] * 1.2:
-                confidence += 1
-                
+        confidence += np.select([price_to_supertrend_ratio > 1.0, price_to_supertrend_ratio > 0.5], [3, 2], 0)
+        
+        # 4. Volume confirmation (0-3%), needs a previous bar
+        confidence += np.select([volume > prev_volume * 1.5, volume > prev_volume * 1.2], [3, 1], 0)
+        
         # Ensure confidence is capped at 100%
-        return min(confidence, 100.0)
+        return np.minimum(confidence, 100.0)
+    
+    def calculate_confidence(self, df: pd.DataFrame, signal_idx: int) -> float:
+        """
+        Calculate confidence level for a Supertrend + ADX signal
+        
+        Factors affecting confidence:
+        1. ADX strength - higher ADX = more confidence
+        2. DI separation - larger spread between +DI and -DI = more confidence
+        3. Supertrend stability - distance from price to Supertrend line
+        4. Volume confirmation - volume expansion against the previous bar
+        
+        Args:
+            df: DataFrame with signals
+            signal_idx: Index of the signal to evaluate
+            
+        Returns:
+            float: Confidence level (0-100)
+        """
+        return float(self.calculate_confidence_scores(df)[signal_idx])
 
 
 class InsideBarStrategy(Strategy):
@@ -212,8 +335,10 @@ class InsideBarStrategy(Strategy):
     - Stop-loss: 0.5× ATR
     """
     
-    def __init__(self):
-        super().__init__(name="InsideBar+ATR")
+    PARAMETERS = ('atr_period', 'volatility_percentile')
+    
+    def __init__(self, cache: Optional[IndicatorCache] = None):
+        super().__init__(name="InsideBar+ATR", cache=cache)
         self.atr_period = 14
         self.lookback_period = 50
         self.volatility_percentile = 30
@@ -232,157 +357,206 @@ class InsideBarStrategy(Strategy):
         result_df = df.copy()
         
         # Calculate ATR
-        result_df['atr'] = calculate_atr(result_df, period=self.atr_period)
+        result_df['atr'] = self.indicator_cache.atr(result_df, period=self.atr_period)
         
         # Detect inside bars
         result_df['inside_bar'] = detect_inside_bar(result_df)
         
         # Check if ATR is in bottom percentile
-        result_df['low_volatility'] = is_atr_in_bottom_percentile(
+        result_df['low_volatility'] = self.indicator_cache.atr_in_bottom_percentile(
             result_df, 
             atr_period=self.atr_period, 
             lookback=self.lookback_period, 
             percentile=self.volatility_percentile
         )
         
-        # Initialize signal columns
-        result_df['signal'] = 0  # 0: no signal, 1: long, -1: short
-        result_df['signal_triggered'] = False
-        result_df['mother_bar_high'] = np.nan
-        result_df['mother_bar_low'] = np.nan
-        result_df['profit_target_long'] = np.nan
-        result_df['profit_target_short'] = np.nan
-        result_df['stop_loss_long'] = np.nan
-        result_df['stop_loss_short'] = np.nan
-        result_df['confidence'] = 0.0
-        
-        # Generate signals
-        for i in range(1, len(result_df) - 1):  # -1 to avoid looking ahead
-            # Check for inside bar with low volatility
-            if result_df['inside_bar'].iloc[i] and result_df['low_volatility'].iloc[i]:
-                # Store mother bar high and low (the previous bar)
-                mother_bar_high = result_df['high'].iloc[i-1]
-                mother_bar_low = result_df['low'].iloc[i-1]
-                
-                result_df.loc[result_df.index[i], 'mother_bar_high'] = mother_bar_high
-                result_df.loc[result_df.index[i], 'mother_bar_low'] = mother_bar_low
-                
-                # Set up potential signals for next bar
-                current_atr = result_df['atr'].iloc[i]
-                
-                # Long setup (breakout above mother bar high)
-                result_df.loc[result_df.index[i], 'profit_target_long'] = mother_bar_high + current_atr
-                result_df.loc[result_df.index[i], 'stop_loss_long'] = mother_bar_high - (0.5 * current_atr)
-                
-                # Short setup (breakout below mother bar low)
-                result_df.loc[result_df.index[i], 'profit_target_short'] = mother_bar_low - current_atr
-                result_df.loc[result_df.index[i], 'stop_loss_short'] = mother_bar_low + (0.5 * current_atr)
-                
-                # Check if the next bar breaks out (we're not at the end of the dataframe)
-                if i < len(result_df) - 1:
-                    next_bar = result_df.iloc[i+1]
-                    
-                    # Long signal: breakout above mother bar high
-                    if next_bar['high'] > mother_bar_high:
-                        result_df.loc[result_df.index[i+1], 'signal'] = 1
-                        result_df.loc[result_df.index[i+1], 'signal_triggered'] = True
-                        result_df.loc[result_df.index[i+1], 'profit_target'] = result_df.loc[result_df.index[i], 'profit_target_long']
-                        result_df.loc[result_df.index[i+1], 'stop_loss'] = result_df.loc[result_df.index[i], 'stop_loss_long']
-                    
-                    # Short signal: breakout below mother bar low
-                    elif next_bar['low'] < mother_bar_low:
-                        result_df.loc[result_df.index[i+1], 'signal'] = -1
-                        result_df.loc[result_df.index[i+1], 'signal_triggered'] = True
-                        result_df.loc[result_df.index[i+1], 'profit_target'] = result_df.loc[result_df.index[i], 'profit_target_short']
-                        result_df.loc[result_df.index[i+1], 'stop_loss'] = result_df.loc[result_df.index[i], 'stop_loss_short']
+        high = result_df['high'].to_numpy()
+        low = result_df['low'].to_numpy()
+        atr = result_df['atr'].to_numpy()
+        
+        # Inside bar with low volatility; the first and last bars can't set up a trade
+        setup = result_df['inside_bar'].to_numpy(dtype=bool) & result_df['low_volatility'].to_numpy(dtype=bool)
+        setup[:1] = False
+        setup[-1:] = False  # -1 to avoid looking ahead
+        
+        # Store mother bar high and low (the previous bar) on each setup bar
+        mother_bar_high = np.where(setup, _shift(high), np.nan)
+        mother_bar_low = np.where(setup, _shift(low), np.nan)
+        
+        # Long setup (breakout above mother bar high), short setup (breakout below mother bar low)
+        profit_target_long = mother_bar_high + atr
+        stop_loss_long = mother_bar_high - (0.5 * atr)
+        profit_target_short = mother_bar_low - atr
+        stop_loss_short = mother_bar_low + (0.5 * atr)
+        
+        # The bar after a setup triggers on a breakout, long taking precedence over short
+        prev_setup = _shift(setup, fill_value=False)
+        long_breakout = prev_setup & (high > _shift(mother_bar_high))
+        short_breakout = prev_setup & ~long_breakout & (low < _shift(mother_bar_low))
+        
+        result_df['signal'] = np.select([long_breakout, short_breakout], [1, -1], 0)  # 0: no signal, 1: long, -1: short
+        result_df['signal_triggered'] = long_breakout | short_breakout
+        result_df['mother_bar_high'] = mother_bar_high
+        result_df['mother_bar_low'] = mother_bar_low
+        result_df['profit_target_long'] = profit_target_long
+        result_df['profit_target_short'] = profit_target_short
+        result_df['stop_loss_long'] = stop_loss_long
+        result_df['stop_loss_short'] = stop_loss_short
         
         # Calculate confidence for each signal
-        for i in range(len(result_df)):
-            if result_df['signal_triggered'].iloc[i]:
-                result_df.loc[result_df.index[i], 'confidence'] = self.calculate_confidence(result_df, i)
+        result_df['confidence'] = np.where(
+            result_df['signal_triggered'].to_numpy(), self.calculate_confidence_scores(result_df), 0.0
+        )
+        
+        result_df['profit_target'] = np.select(
+            [long_breakout, short_breakout], [_shift(profit_target_long), _shift(profit_target_short)], np.nan
+        )
+        result_df['stop_loss'] = np.select(
+            [long_breakout, short_breakout], [_shift(stop_loss_long), _shift(stop_loss_short)], np.nan
+        )
         
         return result_df
     
-    def calculate_confidence(self, df: pd.DataFrame, signal_idx: int) -> float:
+    def generate_last_bar_signal(self, df: pd.DataFrame) -> Optional[Dict[str, Any]]:
         """
-        Calculate confidence level for an Inside Bar + ATR signal
+        Evaluate only whether the newest candle breaks out of a low-volatility inside bar
+        
+        Args:
+            df: DataFrame with OHLCV data, newest candle last
+            
+        Returns:
+            Optional[Dict[str, Any]]: Signal values of the newest candle, or None if it doesn't trigger
+        """
+        # The newest candle is the breakout bar, the one before it the inside bar, then the mother bar
+        if len(df) < 3:
+            return None
+            
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        if not (high[-2] < high[-3] and low[-2] > low[-3]):
+            return None
+            
+        atr = self.indicator_cache.atr(df, period=self.atr_period).to_numpy()
+        if not percentile_rank_last(atr[:-1], self.lookback_period) <= self.volatility_percentile:
+            return None
+        
+        mother_bar_high = high[-3]
+        mother_bar_low = low[-3]
+        if high[-1] > mother_bar_high:
+            signal = 1
+            profit_target = mother_bar_high + atr[-2]
+            stop_loss = mother_bar_high - (0.5 * atr[-2])
+        elif low[-1] < mother_bar_low:
+            signal = -1
+            profit_target = mother_bar_low - atr[-2]
+            stop_loss = mother_bar_low + (0.5 * atr[-2])
+        else:
+            return None
+        
+        # Confidence looks back at most 12 bars (10-bar ATR max ending at the mother bar)
+        tail_length = min(len(df), 12)
+        signal_column = np.zeros(tail_length, dtype=int)
+        signal_column[-1] = signal
+        mother_high_column = np.full(tail_length, np.nan)
+        mother_low_column = np.full(tail_length, np.nan)
+        mother_high_column[-2] = mother_bar_high
+        mother_low_column[-2] = mother_bar_low
+        tail = pd.DataFrame({
+            'high': high[-tail_length:],
+            'low': low[-tail_length:],
+            'atr': atr[-tail_length:],
+            'volume': df['volume'].to_numpy()[-tail_length:],
+            'signal': signal_column,
+            'mother_bar_high': mother_high_column,
+            'mother_bar_low': mother_low_column
+        })
+        
+        return {
+            'timestamp': df.index[-1],
+            'signal': signal,
+            'confidence': self.calculate_confidence_scores(tail)[-1],
+            'close': df['close'].to_numpy()[-1],
+            'profit_target': profit_target,
+            'stop_loss': stop_loss,
+            'atr': atr[-1]
+        }
+    
+    def calculate_confidence_scores(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Calculate Inside Bar + ATR confidence for every row at once
+        
+        Each row is scored as a signal bar whose previous bar is the inside bar
+        and the bar before that the mother bar.
         
         Factors affecting confidence:
         1. How low the volatility is - lower = better
         2. Bar size - smaller inside bar = better
         3. Breakout strength
-        4. Trend alignment
+        4. Volume confirmation
         
         Args:
             df: DataFrame with signals
-            signal_idx: Index of the signal to evaluate
             
         Returns:
-            float: Confidence level (0-100)
+            np.ndarray: Confidence level (0-100) per row
         """
-        # Confidence starts at base level
-        confidence = 88.0  # Base level for this high-win-rate strategy
+        high = df['high'].to_numpy()
+        low = df['low'].to_numpy()
+        atr = df['atr'].to_numpy()
+        volume = df['volume'].to_numpy()
+        signal_direction = df['signal'].to_numpy()
         
-        if signal_idx < 2:  # Need at least 2 bars before the signal
-            return confidence
-            
-        # Find the inside bar (one bar before signal)
-        inside_bar_idx = signal_idx - 1
+        # Inside bar values, aligned on the signal bar
+        inside_bar_atr = _shift(atr)
+        inside_bar_range = _shift(high - low)
+        mother_bar_range = _shift(high - low, periods=2)
+        inside_bar_volume = _shift(volume)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # ATR of the inside bar against the max ATR over the 10 bars before it
+            atr_rank = inside_bar_atr / df['atr'].rolling(window=10).max().shift(2).to_numpy()
+            size_ratio = inside_bar_range / mother_bar_range
+            long_strength = (high - _shift(df['mother_bar_high'].to_numpy())) / inside_bar_atr
+            short_strength = (_shift(df['mother_bar_low'].to_numpy()) - low) / inside_bar_atr
+        breakout_strength = np.select([signal_direction == 1, signal_direction == -1], [long_strength, short_strength], np.nan)
+        
+        # Confidence starts at base level for this high-win-rate strategy
+        confidence = np.full(len(df), 88.0)
         
         # 1. Volatility factor (0-3%)
-        # Check how deep in the bottom percentile the ATR is
-        atr_rank = df['atr'].iloc[inside_bar_idx] / df['atr'].iloc[inside_bar_idx-10:inside_bar_idx].max()
-        if atr_rank < 0.2:  # Very low volatility
-            confidence += 3
-        elif atr_rank < 0.3:
-            confidence += 2
-        elif atr_rank < 0.4:
-            confidence += 1
-            
-        # 2. Inside bar size factor (0-3%)
-        # Smaller inside bars relative to the mother bar are better
-        mother_bar_idx = inside_bar_idx - 1
-        mother_bar_range = df['high'].iloc[mother_bar_idx] - df['low'].iloc[mother_bar_idx]
-        inside_bar_range = df['high'].iloc[inside_bar_idx] - df['low'].iloc[inside_bar_idx]
+        confidence += np.select([atr_rank < 0.2, atr_rank < 0.3, atr_rank < 0.4], [3, 2, 1], 0)
+        
+        # 2. Inside bar size factor (0-3%), smaller inside bars relative to the mother bar are better
+        size_ratio = np.where(mother_bar_range > 0, size_ratio, np.nan)
+        confidence += np.select([size_ratio < 0.3, size_ratio < 0.5, size_ratio < 0.7], [3, 2, 1], 0)
         
-        if mother_bar_range > 0:  # Avoid division by zero
-            size_ratio = inside_bar_range / mother_bar_range
-            if size_ratio < 0.3:  # Very small inside bar
-                confidence += 3
-            elif size_ratio < 0.5:
-                confidence += 2
-            elif size_ratio < 0.7:
-                confidence += 1
-                
         # 3. Breakout strength (0-4%)
-        signal_direction = df['signal'].iloc[signal_idx]
-        if signal_direction == 1:  # Long signal
-            mother_bar_high = df['mother_bar_high'].iloc[inside_bar_idx]
-            breakout_strength = (df['high'].iloc[signal_idx] - mother_bar_high) / df['atr'].iloc[inside_bar_idx]
-            
-            if breakout_strength > 0.5:  # Strong breakout
-                confidence += 4
-            elif breakout_strength > 0.3:
-                confidence += 2
-            elif breakout_strength > 0.1:
-                confidence += 1
-                
-        elif signal_direction == -1:  # Short signal
-            mother_bar_low = df['mother_bar_low'].iloc[inside_bar_idx]
-            breakout_strength = (mother_bar_low - df['low'].iloc[signal_idx]) / df['atr'].iloc[inside_bar_idx]
-            
-            if breakout_strength > 0.5:  # Strong breakout
-                confidence += 4
-            elif breakout_strength > 0.3:
-                confidence += 2
-            elif breakout_strength > 0.1:
-                confidence += 1
-                
+        confidence += np.select([breakout_strength > 0.5, breakout_strength > 0.3, breakout_strength > 0.1], [4, 2, 1], 0)
+        
         # 4. Volume confirmation (0-2%)
-        if df['volume'].iloc[signal_idx] > df['volume'].iloc[inside_bar_idx] * 1.3:
-            confidence += 2
-        elif df['volume'].iloc[signal_idx] > df['volume'].iloc[inside_bar_idx] * 1.1:
-            confidence += 1
-            
+        confidence += np.select([volume > inside_bar_volume * 1.3, volume > inside_bar_volume * 1.1], [2, 1], 0)
+        
+        # Need at least 2 bars before the signal
+        confidence[:2] = 88.0
+        
         # Ensure confidence is capped at 100%
-        return min(confidence, 100.0)
+        return np.minimum(confidence, 100.0)
+    
+    def calculate_confidence(self, df: pd.DataFrame, signal_idx: int) -> float:
+        """
+        Calculate confidence level for an Inside Bar + ATR signal
+        
+        Factors affecting confidence:
+        1. How low the volatility is - lower = better
+        2. Bar size - smaller inside bar = better
+        3. Breakout strength
+        4. Volume confirmation
+        
+        Args:
+            df: DataFrame with signals
+            signal_idx: Index of the signal to evaluate
+            
+        Returns:
+            float: Confidence level (0-100)
+        """
+        return float(self.calculate_confidence_scores(df)[signal_idx])
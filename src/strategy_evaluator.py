@@ -0,0 +1,324 @@
+"""
+Parallel strategy evaluation across symbols and timeframes
+
+Fans (symbol, timeframe, strategy) work units out to a process pool. Candles
+are packed once per scan into shared-memory NumPy arrays, so workers map them
+instead of unpickling a DataFrame per unit. Triggered signals come back in the
+same (symbol, timeframe, strategy) order as a serial scan, together with the
+indicator cache hits and misses each unit caused, since every worker process
+has its own cache.
+
+In last-bar mode (the default) each unit only decides whether the newest closed
+candle triggers, and a bar that already produced a signal is not emitted again.
+"""
+
+import os
+import logging
+import ccxt
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.strategies import Strategy
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Strategies of the current worker process, installed by the pool initializer
+_worker_strategies: Dict[str, Strategy] = {}
+
+
+def _make_signal(timestamp, symbol: str, timeframe: str, strategy_name: str, strategy: Strategy,
+                 direction: int, confidence: float, price: float, profit_target: float,
+                 stop_loss: float, atr: float) -> Dict[str, Any]:
+    """Build the signal dict the bot queues and sends"""
+    return {
+        'timestamp': timestamp,
+        'symbol': symbol,
+        'timeframe': timeframe,
+        'strategy': strategy_name,
+        'strategy_name': strategy.name,
+        'direction': 'LONG' if direction == 1 else 'SHORT',
+        'confidence': confidence,
+        'price': price,
+        'profit_target': profit_target,
+        'stop_loss': stop_loss,
+        'atr': atr
+    }
+
+
+def extract_triggered_signals(signal_df: pd.DataFrame, symbol: str, timeframe: str,
+                              strategy_name: str, strategy: Strategy) -> List[Dict[str, Any]]:
+    """
+    Convert triggered rows of a strategy's signal frame to signal dicts
+
+    Args:
+        signal_df: Output of strategy.generate_signals
+        symbol: Trading pair symbol (e.g., 'BTC/USDT')
+        timeframe: Timeframe of the candles (e.g., '1h')
+        strategy_name: Key of the strategy in the bot's strategy map
+        strategy: Strategy that produced the signals
+
+    Returns:
+        List[Dict[str, Any]]: Signals with metadata, oldest first
+    """
+    triggered = signal_df['signal_triggered'].to_numpy(dtype=bool)
+    columns = [signal_df[column].to_numpy()[triggered]
+               for column in ('signal', 'confidence', 'close', 'profit_target', 'stop_loss', 'atr')]
+
+    return [
+        _make_signal(timestamp, symbol, timeframe, strategy_name, strategy, *values)
+        for timestamp, *values in zip(signal_df.index[triggered], *columns)
+    ]
+
+
+def closed_candles(df: pd.DataFrame, now: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """
+    Drop the newest candle if it is still forming
+
+    Uses the timeframe MarketData tags on the frame; untagged frames are returned as-is.
+
+    Args:
+        df: DataFrame with OHLCV data indexed by candle open time (UTC)
+        now: Current UTC time (default: now)
+
+    Returns:
+        pd.DataFrame: Candles that have closed
+    """
+    timeframe = df.attrs.get('timeframe')
+    if df.empty or timeframe is None:
+        return df
+
+    now = pd.Timestamp.now(tz='UTC').tz_localize(None) if now is None else now
+    if df.index[-1] + pd.Timedelta(seconds=ccxt.Exchange.parse_timeframe(timeframe)) > now:
+        return df.iloc[:-1]
+    return df
+
+
+def evaluate_strategy(strategy_name: str, strategy: Strategy, df: pd.DataFrame,
+                      symbol: str, timeframe: str, last_bar_only: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run one strategy on one candle set, logging instead of raising on failure
+
+    Args:
+        strategy_name: Key of the strategy in the bot's strategy map
+        strategy: Strategy to run
+        df: DataFrame with OHLCV data
+        symbol: Trading pair symbol (e.g., 'BTC/USDT')
+        timeframe: Timeframe of the candles (e.g., '1h')
+        last_bar_only: Only evaluate the newest candle of df
+
+    Returns:
+        List[Dict[str, Any]]: Triggered signals
+    """
+    try:
+        if last_bar_only:
+            signal = strategy.generate_last_bar_signal(df)
+            if signal is None:
+                return []
+            return [_make_signal(signal['timestamp'], symbol, timeframe, strategy_name, strategy,
+                                 signal['signal'], signal['confidence'], signal['close'],
+                                 signal['profit_target'], signal['stop_loss'], signal['atr'])]
+
+        signal_df = strategy.generate_signals(df)
+        return extract_triggered_signals(signal_df, symbol, timeframe, strategy_name, strategy)
+    except Exception as e:
+        logger.error(f"Error applying {strategy_name} to {symbol} {timeframe}: {e}", exc_info=True)
+        return []
+
+
+def _evaluate_counted(strategy_name: str, strategy: Strategy, df: pd.DataFrame, symbol: str,
+                      timeframe: str, last_bar_only: bool) -> Tuple[List[Dict[str, Any]], int, int]:
+    """evaluate_strategy plus the indicator cache hits and misses it caused"""
+    cache = strategy.indicator_cache
+    hits, misses = cache.hits, cache.misses
+    signals = evaluate_strategy(strategy_name, strategy, df, symbol, timeframe, last_bar_only)
+    return signals, cache.hits - hits, cache.misses - misses
+
+
+def _init_worker(strategies: Dict[str, Strategy]) -> None:
+    """Install the strategies in a freshly started worker process"""
+    global _worker_strategies
+    _worker_strategies = strategies
+
+
+def _evaluate_unit(unit: Tuple) -> Tuple[List[Dict[str, Any]], int, int]:
+    """
+    Evaluate one (symbol, timeframe, strategy) work unit in a worker process
+
+    Args:
+        unit: (values_name, index_name, total_rows, start, stop, index_dtype,
+               attrs, symbol, timeframe, strategy_name, parameters, last_bar_only)
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int, int]: Triggered signals, and the worker's
+        indicator cache hits and misses for the unit
+    """
+    (values_name, index_name, total_rows, start, stop, index_dtype,
+     attrs, symbol, timeframe, strategy_name, parameters, last_bar_only) = unit
+
+    # The pool outlives parameter changes on the bot's strategies; apply the current ones
+    strategy = _worker_strategies[strategy_name]
+    if strategy.get_parameters() != parameters:
+        strategy.set_parameters(parameters)
+
+    values_shm = shared_memory.SharedMemory(name=values_name)
+    index_shm = shared_memory.SharedMemory(name=index_name)
+    try:
+        values = np.ndarray((total_rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=values_shm.buf)
+        timestamps = np.ndarray((total_rows,), dtype=np.int64, buffer=index_shm.buf)
+
+        # Columns map the shared block; the small index is copied so nothing outlives the mapping
+        index = pd.DatetimeIndex(timestamps[start:stop].view(index_dtype).copy(), name='timestamp')
+        df = pd.DataFrame(values[start:stop], columns=OHLCV_COLUMNS, index=index, copy=False)
+        df.attrs.update(attrs)
+
+        return _evaluate_counted(strategy_name, strategy, df, symbol, timeframe, last_bar_only)
+    finally:
+        df = values = timestamps = None
+        values_shm.close()
+        index_shm.close()
+
+
+class ParallelStrategyEvaluator:
+    """Evaluates strategies on every (symbol, timeframe) candle set, in parallel when configured"""
+
+    def __init__(self, strategies: Dict[str, Strategy], max_workers: Optional[int] = None,
+                 last_bar_only: Optional[bool] = None):
+        """
+        Initialize the evaluator
+
+        Args:
+            strategies: Strategy map keyed by strategy name
+            max_workers: Worker processes (default: STRATEGY_WORKERS env or CPU count;
+                         1 evaluates in-process)
+            last_bar_only: Only evaluate the newest closed candle of each candle set
+                           (default: LAST_BAR_SIGNALS env, true)
+        """
+        self.strategies = strategies
+        if max_workers is None:
+            max_workers = int(os.getenv('STRATEGY_WORKERS', '0')) or os.cpu_count() or 1
+        self.max_workers = max(1, max_workers)
+        if last_bar_only is None:
+            last_bar_only = os.getenv('LAST_BAR_SIGNALS', 'true').lower() == 'true'
+        self.last_bar_only = last_bar_only
+        self._executor = None
+        self.cache_stats = {'hits': 0, 'misses': 0}  # Indicator cache lookups of the last evaluate(), all workers
+        self._last_signal_bars = {}  # (symbol, timeframe, strategy) -> bar of the last emitted signal
+
+    def evaluate(self, market_data: Dict[str, Dict[str, pd.DataFrame]],
+                 strategy_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Run the strategies on all candle sets and gather triggered signals
+
+        Args:
+            market_data: Nested dict of OHLCV DataFrames by symbol and timeframe
+            strategy_names: Strategies to run (default: all)
+
+        Returns:
+            List[Dict[str, Any]]: Triggered signals in (symbol, timeframe, strategy) order
+        """
+        strategy_names = list(self.strategies) if strategy_names is None else strategy_names
+        candle_sets = []
+        for symbol, timeframe_data in market_data.items():
+            for timeframe, df in timeframe_data.items():
+                if self.last_bar_only:
+                    df = closed_candles(df)
+                if not df.empty:
+                    candle_sets.append((symbol, timeframe, df))
+
+        if self.max_workers == 1 or len(candle_sets) * len(strategy_names) <= 1:
+            results = self._evaluate_serial(candle_sets, strategy_names)
+        else:
+            try:
+                results = self._evaluate_parallel(candle_sets, strategy_names)
+            except Exception as e:
+                logger.error(f"Parallel strategy evaluation failed, falling back to serial: {e}", exc_info=True)
+                self.shutdown()
+                results = self._evaluate_serial(candle_sets, strategy_names)
+
+        signals = []
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        for unit_signals, hits, misses in results:
+            signals.extend(unit_signals)
+            self.cache_stats['hits'] += hits
+            self.cache_stats['misses'] += misses
+
+        if self.last_bar_only:
+            signals = self._drop_emitted(signals)
+        return signals
+
+    def _drop_emitted(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keep only signals on a bar newer than the last one emitted for the same series and strategy"""
+        new_signals = []
+        for signal in signals:
+            key = (signal['symbol'], signal['timeframe'], signal['strategy'])
+            last_bar = self._last_signal_bars.get(key)
+            if last_bar is not None and signal['timestamp'] <= last_bar:
+                continue
+            self._last_signal_bars[key] = signal['timestamp']
+            new_signals.append(signal)
+        return new_signals
+
+    def _evaluate_serial(self, candle_sets: List[Tuple[str, str, pd.DataFrame]],
+                         strategy_names: List[str]) -> List[Tuple[List[Dict[str, Any]], int, int]]:
+        """Evaluate every work unit in this process"""
+        return [
+            _evaluate_counted(strategy_name, self.strategies[strategy_name], df, symbol, timeframe, self.last_bar_only)
+            for symbol, timeframe, df in candle_sets
+            for strategy_name in strategy_names
+        ]
+
+    def _evaluate_parallel(self, candle_sets: List[Tuple[str, str, pd.DataFrame]],
+                           strategy_names: List[str]) -> List[Tuple[List[Dict[str, Any]], int, int]]:
+        """Pack candles into shared memory and evaluate the work units on the process pool"""
+        total_rows = sum(len(df) for _, _, df in candle_sets)
+        values_shm = shared_memory.SharedMemory(create=True, size=max(1, total_rows * len(OHLCV_COLUMNS) * 8))
+        index_shm = shared_memory.SharedMemory(create=True, size=max(1, total_rows * 8))
+        try:
+            values = np.ndarray((total_rows, len(OHLCV_COLUMNS)), dtype=np.float64, buffer=values_shm.buf)
+            timestamps = np.ndarray((total_rows,), dtype=np.int64, buffer=index_shm.buf)
+
+            parameters = {name: self.strategies[name].get_parameters() for name in strategy_names}
+            units = []
+            start = 0
+            for symbol, timeframe, df in candle_sets:
+                stop = start + len(df)
+                values[start:stop] = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+                timestamps[start:stop] = df.index.to_numpy().view(np.int64)
+                for strategy_name in strategy_names:
+                    units.append((values_shm.name, index_shm.name, total_rows, start, stop, df.index.dtype,
+                                  dict(df.attrs), symbol, timeframe, strategy_name, parameters[strategy_name],
+                                  self.last_bar_only))
+                start = stop
+            values = timestamps = None
+
+            # map() yields results in submission order, keeping the output deterministic
+            chunksize = max(1, len(units) // (self.max_workers * 4))
+            return list(self._get_executor().map(_evaluate_unit, units, chunksize=chunksize))
+        finally:
+            values_shm.close()
+            values_shm.unlink()
+            index_shm.close()
+            index_shm.unlink()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Start the worker pool on first use and keep it for later scans"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(self.strategies,)
+            )
+            logger.info(f"Started strategy evaluation pool with {self.max_workers} workers")
+        return self._executor
+
+    def shutdown(self) -> None:
+        """Stop the worker pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
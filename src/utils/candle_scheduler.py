@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Candle Close Scheduler Module
+
+Computes when the candles of each configured timeframe close so the bot can
+sleep until exactly then (plus a short settle delay for the exchange to
+publish the final candle) and scan only the timeframes that just closed.
+Candle boundaries are UTC, as on the exchanges:
+- Minute/hour/day timeframes are aligned to multiples of their length since the epoch
+- Weekly candles open on Monday
+- Monthly candles open on the first day of the month
+"""
+
+import os
+import logging
+import calendar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import ccxt
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+# The epoch (1970-01-01) was a Thursday; weekly candles open on Monday
+WEEK_OFFSET_SECONDS = 4 * 86400
+
+
+class CandleCloseScheduler:
+    """Computes the next candle-close wakeup across several timeframes"""
+
+    def __init__(self, timeframes: List[str], settle_delay: Optional[float] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            timeframes: Timeframes to track (e.g., ['15m', '1h', '4h'])
+            settle_delay: Seconds to wait after a close before scanning
+                          (default: CANDLE_SETTLE_SECONDS env, 5)
+        """
+        self.timeframes = list(timeframes)
+        if settle_delay is None:
+            settle_delay = float(os.getenv('CANDLE_SETTLE_SECONDS', '5'))
+        self.settle_delay = settle_delay
+
+    @staticmethod
+    def next_close(timeframe: str, after: float) -> float:
+        """
+        First candle close of a timeframe strictly after a time
+
+        Args:
+            timeframe: Timeframe string (e.g., '15m', '4h', '1w', '1M')
+            after: Unix time in seconds
+
+        Returns:
+            float: Unix time of the close in seconds
+        """
+        if timeframe.endswith('M'):
+            months = int(timeframe[:-1])
+            moment = datetime.fromtimestamp(after, tz=timezone.utc)
+            month_index = moment.year * 12 + moment.month - 1
+            # Monthly candles are aligned to January; step to the next boundary
+            next_index = (month_index // months + 1) * months
+            year, month = divmod(next_index, 12)
+            return float(calendar.timegm((year, month + 1, 1, 0, 0, 0)))
+
+        length = ccxt.Exchange.parse_timeframe(timeframe)
+        offset = WEEK_OFFSET_SECONDS if timeframe.endswith('w') else 0
+        return ((after - offset) // length + 1) * length + offset
+
+    def next_wakeup(self, after: float) -> Tuple[float, List[str]]:
+        """
+        Next candle close across all timeframes, and the timeframes closing then
+
+        Args:
+            after: Unix time in seconds; closes at or before it are ignored
+
+        Returns:
+            Tuple[float, List[str]]: Wakeup time (close + settle delay) and the
+            timeframes whose candles close at that instant, in configured order
+        """
+        closes: Dict[str, float] = {timeframe: self.next_close(timeframe, after) for timeframe in self.timeframes}
+        close_time = min(closes.values())
+        closing = [timeframe for timeframe in self.timeframes if closes[timeframe] == close_time]
+        return close_time + self.settle_delay, closing
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Candle Store Module
+
+Persists OHLCV candles per (symbol, timeframe) in a local SQLite database so
+scans only download candles newer than the last stored one and deep history
+is served from disk:
+- One row per candle, keyed by symbol, timeframe and open timestamp (ms)
+- Appends replace existing rows, so a candle stored while still forming is
+  overwritten by its final values on the next fetch
+- Thread-safe for the concurrent market scan
+"""
+
+import os
+import logging
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class CandleStore:
+    """SQLite-backed store of OHLCV candles by symbol and timeframe"""
+
+    DATA_DIR = "data/candles"
+    DB_FILE = "candles.db"
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the candle store
+
+        Args:
+            db_path: Path to the SQLite database (default: data/candles/candles.db)
+        """
+        if db_path is None:
+            base_dir = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                self.DATA_DIR
+            )
+            db_path = os.path.join(base_dir, self.DB_FILE)
+
+        if db_path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            if db_path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS candles (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    PRIMARY KEY (symbol, timeframe, timestamp)
+                ) WITHOUT ROWID
+                """
+            )
+            self._conn.commit()
+        logger.info(f"Candle store opened at {db_path}")
+
+    def append(self, symbol: str, timeframe: str, ohlcv: Sequence[Sequence[float]]) -> int:
+        """
+        Insert or replace candles
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe of the candles (e.g., '1h')
+            ohlcv: Candles as [timestamp_ms, open, high, low, close, volume] rows
+
+        Returns:
+            int: Number of candles written
+        """
+        rows = [(symbol, timeframe, int(c[0]), c[1], c[2], c[3], c[4], c[5]) for c in ohlcv]
+        if not rows:
+            return 0
+
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+        return len(rows)
+
+    def first_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Open timestamp (ms) of the oldest stored candle, or None if there are none"""
+        return self._scalar("SELECT MIN(timestamp) FROM candles WHERE symbol = ? AND timeframe = ?",
+                            (symbol, timeframe))
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Open timestamp (ms) of the newest stored candle, or None if there are none"""
+        return self._scalar("SELECT MAX(timestamp) FROM candles WHERE symbol = ? AND timeframe = ?",
+                            (symbol, timeframe))
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        """Number of stored candles"""
+        return self._scalar("SELECT COUNT(*) FROM candles WHERE symbol = ? AND timeframe = ?",
+                            (symbol, timeframe))
+
+    def load(self, symbol: str, timeframe: str, limit: Optional[int] = None,
+             since: Optional[int] = None) -> List[List[float]]:
+        """
+        Read stored candles in ascending time order
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe of the candles (e.g., '1h')
+            limit: Return only the newest `limit` candles
+            since: Return only candles opened at or after this timestamp (ms)
+
+        Returns:
+            List[List[float]]: Candles as [timestamp_ms, open, high, low, close, volume] rows
+        """
+        query = "SELECT timestamp, open, high, low, close, volume FROM candles WHERE symbol = ? AND timeframe = ?"
+        params: List[Any] = [symbol, timeframe]
+        if since is not None:
+            query += " AND timestamp >= ?"
+            params.append(int(since))
+        query += " ORDER BY timestamp DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [list(row) for row in reversed(rows)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get store statistics
+
+        Returns:
+            Dictionary with the number of series and candles stored
+        """
+        with self._lock:
+            series, candles = self._conn.execute(
+                "SELECT COUNT(DISTINCT symbol || '|' || timeframe), COUNT(*) FROM candles"
+            ).fetchone()
+        return {'path': self.db_path, 'series': series, 'candles': candles}
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _scalar(self, query: str, params: Sequence[Any]) -> Any:
+        """Run a single-value query"""
+        with self._lock:
+            return self._conn.execute(query, params).fetchone()[0]
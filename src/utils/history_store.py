@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+History Store Module
+
+Columnar on-disk format for closed historical candles, read with numpy.memmap
+so backtests load months of data zero-copy and share pages between processes:
+- One directory per (symbol, timeframe) with a fixed-width file per column
+  (timestamp as little-endian int64 ms, OHLCV as little-endian float64)
+- Append-only for new candles; rows become visible once their timestamp is
+  written, so readers never see a partially appended candle
+- Rewrites write the whole series into a new generation directory and swap
+  the CURRENT pointer with one atomic rename, so readers see either the old
+  or the new series, never a mix; the previous generation is kept so readers
+  that resolved it just before the swap can still open it
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class HistoryStore:
+    """Memory-mapped columnar store of closed OHLCV candles"""
+
+    DATA_DIR = "data/history"
+    TIMESTAMP_DTYPE = np.dtype('<i8')
+    VALUE_DTYPE = np.dtype('<f8')
+    VALUE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+    CURRENT_FILE = 'CURRENT'
+    GENERATION_PREFIX = 'gen-'
+
+    def __init__(self, base_dir: Optional[str] = None):
+        """
+        Initialize the history store
+
+        Args:
+            base_dir: Root directory of the column files (default: data/history)
+        """
+        if base_dir is None:
+            base_dir = os.path.join(
+                os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                self.DATA_DIR
+            )
+        self.base_dir = base_dir
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def series_dir(self, symbol: str, timeframe: str) -> str:
+        """Directory holding the generations of one series"""
+        return os.path.join(self.base_dir, symbol.replace('/', '_').replace(':', '_'), timeframe)
+
+    def _generation_dir(self, symbol: str, timeframe: str) -> str:
+        """Directory holding the current column files of one series"""
+        series_dir = self.series_dir(symbol, timeframe)
+        try:
+            with open(os.path.join(series_dir, self.CURRENT_FILE)) as f:
+                return os.path.join(series_dir, f.read().strip())
+        except FileNotFoundError:
+            # No rewrite yet (or written before generations): columns live in the series directory
+            return series_dir
+
+    def _column_path(self, directory: str, column: str) -> str:
+        """Path of one column file"""
+        extension = 'i8' if column == 'timestamp' else 'f8'
+        return os.path.join(directory, f"{column}.{extension}")
+
+    def row_count(self, symbol: str, timeframe: str) -> int:
+        """Number of complete candles stored"""
+        return self._row_count(self._generation_dir(symbol, timeframe))
+
+    def _row_count(self, directory: str, missing_ok: bool = True) -> int:
+        """Number of complete candles in a generation directory"""
+        path = self._column_path(directory, 'timestamp')
+        if missing_ok and not os.path.exists(path):
+            return 0
+        return os.path.getsize(path) // self.TIMESTAMP_DTYPE.itemsize
+
+    def bounds(self, symbol: str, timeframe: str) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Open timestamps (ms) of the oldest and newest stored candles
+
+        Returns:
+            Tuple[Optional[int], Optional[int]]: (first, last), or (None, None) if empty
+        """
+        timestamps = self.load(symbol, timeframe).get('timestamp')
+        if timestamps is None:
+            return None, None
+        return int(timestamps[0]), int(timestamps[-1])
+
+    def write(self, symbol: str, timeframe: str, ohlcv: Sequence[Sequence[float]]) -> int:
+        """
+        Replace a series with the given candles
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe of the candles (e.g., '1h')
+            ohlcv: Closed candles as [timestamp_ms, open, high, low, close, volume] rows, oldest first
+
+        Returns:
+            int: Number of candles written
+        """
+        timestamps, values = self._to_columns(ohlcv)
+        series_dir = self.series_dir(symbol, timeframe)
+        os.makedirs(series_dir, exist_ok=True)
+        previous = self._generation_dir(symbol, timeframe)
+
+        directory = tempfile.mkdtemp(prefix=self.GENERATION_PREFIX, dir=series_dir)
+        for column, data in list(zip(self.VALUE_COLUMNS, values)) + [('timestamp', timestamps)]:
+            data.tofile(self._column_path(directory, column))
+
+        # One rename publishes every column at once
+        pointer = os.path.join(series_dir, self.CURRENT_FILE)
+        with open(pointer + '.tmp', 'w') as f:
+            f.write(os.path.basename(directory))
+        os.replace(pointer + '.tmp', pointer)
+
+        self._prune_generations(series_dir, keep=(directory, previous))
+        return len(timestamps)
+
+    def append(self, symbol: str, timeframe: str, ohlcv: Sequence[Sequence[float]]) -> int:
+        """
+        Append candles newer than the last stored one
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe of the candles (e.g., '1h')
+            ohlcv: Closed candles as [timestamp_ms, open, high, low, close, volume] rows, oldest first
+
+        Returns:
+            int: Number of candles appended
+        """
+        directory = self._generation_dir(symbol, timeframe)
+        rows = self._row_count(directory)
+        timestamps = self._open_column(directory, 'timestamp', rows)
+        last_timestamp = int(timestamps[-1]) if timestamps is not None else None
+        if last_timestamp is not None:
+            ohlcv = [candle for candle in ohlcv if candle[0] > last_timestamp]
+        if not ohlcv:
+            return 0
+        if last_timestamp is None:
+            return self.write(symbol, timeframe, ohlcv)
+
+        timestamps, values = self._to_columns(ohlcv)
+        for column, data in list(zip(self.VALUE_COLUMNS, values)) + [('timestamp', timestamps)]:
+            path = self._column_path(directory, column)
+            # Drop bytes past the visible rows left by an interrupted append
+            with open(path, 'r+b') as f:
+                f.truncate(rows * data.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                data.tofile(f)
+        return len(timestamps)
+
+    def load(self, symbol: str, timeframe: str, since: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Memory-map a series as read-only column arrays
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe of the candles (e.g., '1h')
+            since: Return only candles opened at or after this timestamp (ms)
+
+        Returns:
+            Dict[str, np.ndarray]: 'timestamp' and OHLCV columns (empty dict if nothing is stored)
+        """
+        series_dir = self.series_dir(symbol, timeframe)
+        while True:
+            # Resolve the generation once so every column comes from the same series
+            directory = self._generation_dir(symbol, timeframe)
+            try:
+                # A generation always holds every column, so a missing file means it was pruned
+                rows = self._row_count(directory, missing_ok=directory == series_dir)
+                mapped = {column: self._open_column(directory, column, rows)
+                          for column in ('timestamp',) + self.VALUE_COLUMNS}
+                break
+            except FileNotFoundError:
+                # Two rewrites landed before it was mapped; follow the pointer again
+                continue
+
+        if rows == 0:
+            return {}
+        start = int(np.searchsorted(mapped['timestamp'], since, side='left')) if since is not None else 0
+        return {column: data[start:] for column, data in mapped.items()}
+
+    def load_dataframe(self, symbol: str, timeframe: str, since: Optional[int] = None) -> pd.DataFrame:
+        """
+        Memory-map a series as a DataFrame whose OHLCV columns share the mapped pages
+
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTC/USDT')
+            timeframe: Timeframe of the candles (e.g., '1h')
+            since: Return only candles opened at or after this timestamp (ms)
+
+        Returns:
+            pd.DataFrame: DataFrame with OHLCV data indexed by timestamp
+        """
+        columns = self.load(symbol, timeframe, since=since)
+        if not columns:
+            return pd.DataFrame()
+
+        index = pd.DatetimeIndex(pd.to_datetime(columns.pop('timestamp'), unit='ms'), name='timestamp')
+        df = pd.DataFrame(columns, index=index, copy=False)
+        df.attrs.update(symbol=symbol, timeframe=timeframe)
+        return df
+
+    def _open_column(self, directory: str, column: str, rows: int) -> Optional[np.ndarray]:
+        """Memory-map the first `rows` values of a column file"""
+        if rows == 0:
+            return None
+        dtype = self.TIMESTAMP_DTYPE if column == 'timestamp' else self.VALUE_DTYPE
+        return np.memmap(self._column_path(directory, column), dtype=dtype, mode='r', shape=(rows,))
+
+    def _prune_generations(self, series_dir: str, keep: Sequence[str]) -> None:
+        """Delete generations of a series other than `keep` (open memory maps stay valid)"""
+        for name in os.listdir(series_dir):
+            path = os.path.join(series_dir, name)
+            if name.startswith(self.GENERATION_PREFIX) and path not in keep:
+                shutil.rmtree(path, ignore_errors=True)
+
+        if series_dir not in keep:
+            # Column files from before the first rewrite
+            for column in ('timestamp',) + self.VALUE_COLUMNS:
+                path = self._column_path(series_dir, column)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _to_columns(self, ohlcv: Sequence[Sequence[float]]) -> Tuple[np.ndarray, list]:
+        """Split candle rows into a timestamp column and value columns"""
+        array = np.asarray(ohlcv, dtype=np.float64).reshape(-1, 6)
+        timestamps = np.asarray([int(candle[0]) for candle in ohlcv], dtype=self.TIMESTAMP_DTYPE)
+        values = [np.ascontiguousarray(array[:, i + 1], dtype=self.VALUE_DTYPE) for i in range(len(self.VALUE_COLUMNS))]
+        return timestamps, values
@@ -0,0 +1,241 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Indicator Cache Module
+
+Shares indicator series between the strategies and the market analyzer so each
+series is computed once per candle set:
+- Entries keyed by (symbol, timeframe, candle set, indicator, params)
+- Candle set identified by length, first/last timestamp and the last candle's OHLCV,
+  so a still-forming last candle never serves stale values
+- Bounded memory with LRU eviction
+- Hit/miss/eviction counters
+"""
+
+import os
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from src.indicators import (
+    calculate_true_range,
+    calculate_atr,
+    calculate_supertrend,
+    calculate_supertrend_batch,
+    calculate_adx,
+    is_atr_in_bottom_percentile,
+    rolling_percentile_rank
+)
+
+# Configure module logger
+logger = logging.getLogger(__name__)
+
+
+class IndicatorCache:
+    """LRU cache of indicator series keyed by candle set, indicator and parameters"""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the indicator cache
+
+        Args:
+            max_entries: Maximum number of cached series before LRU eviction
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def candle_key(df: pd.DataFrame) -> Optional[Tuple]:
+        """
+        Build the candle-set part of a cache key
+
+        The symbol and timeframe come from `df.attrs` (set by MarketData when the
+        candles are fetched). Frames without them are not cached.
+
+        Args:
+            df: DataFrame with OHLCV data
+
+        Returns:
+            Tuple identifying the candle set, or None if the frame can't be cached
+        """
+        symbol = df.attrs.get('symbol')
+        timeframe = df.attrs.get('timeframe')
+        if symbol is None or timeframe is None or df.empty:
+            return None
+
+        last_candle = tuple(
+            float(df[col].iloc[-1]) for col in ('open', 'high', 'low', 'close', 'volume') if col in df.columns
+        )
+        return (symbol, timeframe, len(df), df.index[0], df.index[-1], last_candle)
+
+    def get(self, df: pd.DataFrame, indicator: str, params: Tuple[Hashable, ...],
+            compute: Callable[[], Any]) -> Any:
+        """
+        Return a cached indicator value, computing and storing it on a miss
+
+        Args:
+            df: DataFrame the indicator is computed on
+            indicator: Indicator name
+            params: Indicator parameters
+            compute: Zero-argument callable producing the value
+
+        Returns:
+            The cached or freshly computed value
+        """
+        candle_key = self.candle_key(df)
+        if candle_key is None:
+            return compute()
+
+        key = candle_key + (indicator, params)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock - indicators request their inputs from the cache too
+        value = compute()
+        self._store(key, value)
+        return value
+
+    def put(self, df: pd.DataFrame, indicator: str, params: Tuple[Hashable, ...], value: Any) -> None:
+        """
+        Store a precomputed indicator value, e.g. an array shared between processes
+
+        Args:
+            df: DataFrame the indicator was computed on
+            indicator: Indicator name
+            params: Indicator parameters
+            value: Indicator value
+        """
+        candle_key = self.candle_key(df)
+        if candle_key is not None:
+            self._store(candle_key + (indicator, params), value)
+
+    def _store(self, key: Tuple, value: Any) -> None:
+        """Insert an entry as most recently used, evicting the least recently used beyond max_entries"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def true_range(self, df: pd.DataFrame) -> pd.Series:
+        """True Range shared by every ATR and ADX calculation"""
+        return self.get(df, 'true_range', (), lambda: calculate_true_range(df))
+
+    def atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
+        """ATR built on the cached True Range"""
+        return self.get(df, 'atr', (period,), lambda: calculate_atr(df, period, tr=self.true_range(df)))
+
+    def hl2(self, df: pd.DataFrame) -> pd.Series:
+        """Candle midpoint (high + low) / 2 shared by every Supertrend"""
+        return self.get(df, 'hl2', (), lambda: (df['high'] + df['low']) / 2)
+
+    def supertrend(self, df: pd.DataFrame, atr_period: int = 10, multiplier: float = 3.0) -> Tuple[pd.Series, pd.Series]:
+        """Supertrend line and direction built on the cached ATR and midpoint"""
+        return self.get(
+            df, 'supertrend', (atr_period, multiplier),
+            lambda: self._compute_supertrend(df, atr_period, multiplier)
+        )
+
+    def supertrend_batch(self, df: pd.DataFrame, atr_periods: Sequence[int],
+                         multipliers: Sequence[float]) -> List[Tuple[pd.Series, pd.Series]]:
+        """
+        Supertrends of several (atr_period, multiplier) pairs
+
+        Pairs missing from the cache are computed together in one batched pass
+        and stored like individual supertrend() entries.
+
+        Args:
+            df: DataFrame with OHLCV data
+            atr_periods: ATR period of each pair
+            multipliers: ATR multiplier of each pair
+
+        Returns:
+            List[Tuple[pd.Series, pd.Series]]: Supertrend line and direction per pair
+        """
+        pairs = list(zip(atr_periods, multipliers))
+        candle_key = self.candle_key(df)
+        with self._lock:
+            missing = [pair for pair in dict.fromkeys(pairs)
+                       if candle_key is None or candle_key + ('supertrend', pair) not in self._entries]
+
+        computed = {}
+        if missing:
+            periods, batch_multipliers = zip(*missing)
+            atrs = {period: self.atr(df, period) for period in set(periods)}
+            supertrend, direction = calculate_supertrend_batch(df, periods, batch_multipliers,
+                                                               atrs=atrs, hl2=self.hl2(df))
+            for j, pair in enumerate(missing):
+                computed[pair] = (pd.Series(supertrend[:, j], index=df.index),
+                                  pd.Series(direction[:, j], index=df.index))
+                self.put(df, 'supertrend', pair, computed[pair])
+
+        results = []
+        for pair in pairs:
+            # Through get() so lookups are counted; a pair evicted meanwhile is recomputed on its own
+            compute = lambda pair=pair: computed.get(pair) or self._compute_supertrend(df, *pair)
+            results.append(self.get(df, 'supertrend', pair, compute))
+        return results
+
+    def _compute_supertrend(self, df: pd.DataFrame, atr_period: int, multiplier: float) -> Tuple[pd.Series, pd.Series]:
+        """Supertrend of one pair on the cached ATR and midpoint"""
+        return calculate_supertrend(df, atr_period, multiplier, atr=self.atr(df, atr_period), hl2=self.hl2(df))
+
+    def adx(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+        """ADX, +DI and -DI built on the cached True Range"""
+        return self.get(df, 'adx', (period,), lambda: calculate_adx(df, period, tr=self.true_range(df)))
+
+    def atr_in_bottom_percentile(self, df: pd.DataFrame, atr_period: int = 14, lookback: int = 50,
+                                 percentile: float = 30) -> pd.Series:
+        """Low-volatility flags built on the cached ATR"""
+        return self.get(
+            df, 'atr_in_bottom_percentile', (atr_period, lookback, percentile),
+            lambda: is_atr_in_bottom_percentile(df, atr_period, lookback, percentile,
+                                                atr_rank=self.atr_percentile_rank(df, atr_period, lookback))
+        )
+
+    def atr_percentile_rank(self, df: pd.DataFrame, atr_period: int = 14, lookback: int = 50) -> pd.Series:
+        """Rolling percentile rank of the cached ATR, shared by every percentile threshold"""
+        return self.get(
+            df, 'atr_percentile_rank', (atr_period, lookback),
+            lambda: rolling_percentile_rank(self.atr(df, atr_period), lookback)
+        )
+
+    def clear(self) -> None:
+        """Drop all cached entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+# Global indicator cache instance
+indicator_cache = IndicatorCache(max_entries=int(os.getenv('INDICATOR_CACHE_SIZE', '1024')))
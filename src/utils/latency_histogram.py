@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Latency Histogram Module
+
+Fixed-bucket latency histograms for outgoing API requests:
+- Constant memory per histogram regardless of request volume
+- Percentiles estimated from bucket upper bounds (exact min/max/mean kept alongside)
+- Thread-safe, so one histogram can be shared by every API client instance
+"""
+
+import bisect
+import threading
+from typing import Dict, Sequence
+
+# Bucket upper bounds in milliseconds; the last bucket catches everything slower
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket histogram of request latencies in milliseconds"""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        """
+        Initialize the histogram
+
+        Args:
+            buckets_ms: Ascending bucket upper bounds in milliseconds
+        """
+        self.buckets_ms = tuple(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, error: bool = False) -> None:
+        """
+        Record one request
+
+        Args:
+            latency_ms: Request latency in milliseconds
+            error: Whether the request failed
+        """
+        index = bisect.bisect_left(self.buckets_ms, latency_ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.errors += int(error)
+            self.total_ms += latency_ms
+            self.min_ms = min(self.min_ms, latency_ms)
+            self.max_ms = max(self.max_ms, latency_ms)
+
+    def percentile(self, q: float) -> float:
+        """
+        Estimate a latency percentile
+
+        Args:
+            q: Percentile between 0 and 100
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile, capped at the
+                   slowest recorded latency (0.0 if nothing was recorded)
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = max(1, -(-self.count * q // 100))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    break
+            upper = self.buckets_ms[index] if index < len(self.buckets_ms) else self.max_ms
+            return float(min(upper, self.max_ms))
+
+    def to_dict(self) -> Dict:
+        """
+        Summary and bucket counts
+
+        Returns:
+            Dict: count, errors, mean/min/max/p50/p95/p99 in ms and counts by bucket label
+        """
+        p50, p95, p99 = self.percentile(50), self.percentile(95), self.percentile(99)
+        with self._lock:
+            labels = [f"<={bound:g}ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]:g}ms"]
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'mean_ms': self.total_ms / self.count if self.count else 0.0,
+                'min_ms': self.min_ms if self.count else 0.0,
+                'max_ms': self.max_ms,
+                'p50_ms': p50,
+                'p95_ms': p95,
+                'p99_ms': p99,
+                'buckets': dict(zip(labels, self.counts))
+            }
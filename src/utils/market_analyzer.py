@@ -20,10 +20,13 @@ from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from enum import Enum, auto
 import time
 import warnings
 
+from src.utils.indicator_cache import indicator_cache
+
 # Suppress pandas warnings that might occur during calculations
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
@@ -99,6 +102,90 @@ class MarketRegime(Enum):
         }
         return profile_map.get(regime, "default")
 
+# Regimes in enum order; a regime's position is its code in a RegimeTimeline
+REGIMES = list(MarketRegime)
+REGIME_CODES = {regime: code for code, regime in enumerate(REGIMES)}
+
+class RegimeTimeline:
+    """
+    Columnar per-bar regime classification from a backtest
+    
+    Holds one array per field and only builds per-bar dictionaries when
+    iterated or serialized.
+    """
+    
+    FIELDS = ('timestamp', 'regime', 'adx', 'trend_direction', 'volatility_ratio', 'close')
+    
+    def __init__(self, index: pd.Index, regime_codes: np.ndarray, adx: np.ndarray,
+                 trend_direction: np.ndarray, volatility_ratio: np.ndarray, close: np.ndarray):
+        """
+        Initialize the timeline
+        
+        Args:
+            index: Bar timestamps
+            regime_codes: Position of each bar's regime in REGIMES
+            adx: ADX values
+            trend_direction: 1 when +DI is above -DI, otherwise -1
+            volatility_ratio: ATR% relative to its rolling mean
+            close: Close prices
+        """
+        self.index = index
+        self.regime_codes = regime_codes
+        self.adx = adx
+        self.trend_direction = trend_direction
+        self.volatility_ratio = volatility_ratio
+        self.close = close
+    
+    def __len__(self) -> int:
+        return len(self.regime_codes)
+    
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+    
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return {
+            "timestamp": self.index[i].isoformat(),
+            "regime": REGIMES[self.regime_codes[i]].name,
+            "adx": float(self.adx[i]),
+            "trend_direction": int(self.trend_direction[i]),
+            "volatility_ratio": float(self.volatility_ratio[i]),
+            "close": float(self.close[i])
+        }
+    
+    @property
+    def regimes(self) -> List[str]:
+        """Regime name of each bar"""
+        names = np.array([regime.name for regime in REGIMES], dtype=object)
+        return names[self.regime_codes].tolist()
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Per-bar records for JSON responses
+        
+        Returns:
+            List of dictionaries with the FIELDS keys, one per bar
+        """
+        columns = zip([timestamp.isoformat() for timestamp in self.index], self.regimes,
+                      self.adx.tolist(), self.trend_direction.tolist(),
+                      self.volatility_ratio.tolist(), self.close.tolist())
+        return [dict(zip(self.FIELDS, values)) for values in columns]
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Timeline as a DataFrame indexed by timestamp
+        
+        Returns:
+            DataFrame with regime, adx, trend_direction, volatility_ratio and close columns
+        """
+        return pd.DataFrame({
+            "regime": self.regimes,
+            "adx": self.adx,
+            "trend_direction": self.trend_direction,
+            "volatility_ratio": self.volatility_ratio,
+            "close": self.close
+        }, index=self.index)
+
 class MarketAnalyzer:
     """
     Market analyzer for detecting market conditions and regimes
@@ -466,8 +553,8 @@ class MarketAnalyzer:
         Returns:
             DataFrame with ADX values added
         """
-        # Make a copy of the dataframe to avoid modifying the original
-        df = df.copy()
+        # Shallow copy: only new columns are added, so the original is untouched without duplicating it
+        df = df.copy(deep=False)
         
         # Calculate +DM and -DM
         df['high_diff'] = df['high'] - df['high'].shift(1)
@@ -487,11 +574,8 @@ class MarketAnalyzer:
             0
         )
         
-        # Calculate True Range
-        df['tr0'] = abs(df['high'] - df['low'])
-        df['tr1'] = abs(df['high'] - df['close'].shift(1))
-        df['tr2'] = abs(df['low'] - df['close'].shift(1))
-        df['tr'] = df[['tr0', 'tr1', 'tr2']].max(axis=1)
+        # True Range is shared with the strategies through the indicator cache
+        df['tr'] = indicator_cache.true_range(df)
         
         # Calculate smoothed values
         df['smoothed_tr'] = df['tr'].rolling(period).sum()
@@ -521,15 +605,12 @@ class MarketAnalyzer:
         Returns:
             DataFrame with volatility metrics added
         """
-        # Make a copy of the dataframe to avoid modifying the original
-        df = df.copy()
+        # Shallow copy: only new columns are added, so the original is untouched without duplicating it
+        df = df.copy(deep=False)
         
         # Calculate True Range if not already done
         if 'tr' not in df.columns:
-            df['tr0'] = abs(df['high'] - df['low'])
-            df['tr1'] = abs(df['high'] - df['close'].shift(1))
-            df['tr2'] = abs(df['low'] - df['close'].shift(1))
-            df['tr'] = df[['tr0', 'tr1', 'tr2']].max(axis=1)
+            df['tr'] = indicator_cache.true_range(df)
         
         # Calculate ATR
         df['atr'] = df['tr'].rolling(period).mean()
@@ -679,39 +760,37 @@ class MarketAnalyzer:
         if len(df) <= lookback:
             return df
         
-        # Find local price extremes and corresponding RSI values within lookback window
-        for i in range(lookback, len(df)):
-            # Get window for analysis
-            window = df.iloc[i-lookback:i+1]
-            
-            # Find local price low and corresponding RSI
-            low_idx = window['low'].idxmin()
-            price_low = window.loc[low_idx, 'low']
-            rsi_at_price_low = window.loc[low_idx, 'rsi']
-            
-            # Find local price high and corresponding RSI
-            high_idx = window['high'].idxmax()
-            price_high = window.loc[high_idx, 'high']
-            rsi_at_price_high = window.loc[high_idx, 'rsi']
-            
-            # Current values
-            current_idx = window.index[-1]
-            current_close = window.loc[current_idx, 'close']
-            current_rsi = window.loc[current_idx, 'rsi']
-            
-            # Detect bullish divergence (price makes lower low but RSI makes higher low)
-            if (low_idx != current_idx and 
-                current_close < price_low and 
-                current_rsi > rsi_at_price_low and
-                current_rsi < 40):  # Only valid in oversold region
-                df.loc[current_idx, 'bullish_divergence'] = True
-                
-            # Detect bearish divergence (price makes higher high but RSI makes lower high)
-            if (high_idx != current_idx and 
-                current_close > price_high and 
-                current_rsi < rsi_at_price_high and
-                current_rsi > 60):  # Only valid in overbought region
-                df.loc[current_idx, 'bearish_divergence'] = True
+        low = df['low'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        rsi = df['rsi'].to_numpy(dtype=np.float64)
+        
+        # Offset of the first lowest low / highest high in each window of the bar and the
+        # 'lookback' bars before it, like idxmin/idxmax (NaN never wins)
+        low_offset = sliding_window_view(np.where(np.isnan(low), np.inf, low), lookback + 1).argmin(axis=1)
+        high_offset = sliding_window_view(np.where(np.isnan(high), -np.inf, high), lookback + 1).argmax(axis=1)
+        current = np.arange(lookback, len(df))
+        low_idx = current - lookback + low_offset
+        high_idx = current - lookback + high_offset
+        current_close = close[current]
+        current_rsi = rsi[current]
+        
+        # Bullish divergence: price makes lower low but RSI makes higher low (only valid in oversold region)
+        bullish = np.zeros(len(df), dtype=bool)
+        bullish[lookback:] = ((low_idx != current) &
+                              (current_close < low[low_idx]) &
+                              (current_rsi > rsi[low_idx]) &
+                              (current_rsi < 40))
+        
+        # Bearish divergence: price makes higher high but RSI makes lower high (only valid in overbought region)
+        bearish = np.zeros(len(df), dtype=bool)
+        bearish[lookback:] = ((high_idx != current) &
+                              (current_close > high[high_idx]) &
+                              (current_rsi < rsi[high_idx]) &
+                              (current_rsi > 60))
+        
+        df['bullish_divergence'] = bullish
+        df['bearish_divergence'] = bearish
         
         return df
     
@@ -1266,7 +1345,8 @@ class MarketAnalyzer:
             primary_symbol: Primary symbol to use for market regime detection
             
         Returns:
-            Dictionary with backtest results
+            Dictionary with backtest results; "regime_timeline" is a RegimeTimeline
+            (call to_dicts() before serializing it)
         """
         if not historical_data or primary_symbol not in historical_data:
             logger.error(f"Primary symbol {primary_symbol} not found in historical data")
@@ -1276,8 +1356,8 @@ class MarketAnalyzer:
             }
             
         try:
-            # Get data for primary symbol
-            df = historical_data[primary_symbol].copy()
+            # Get data for primary symbol (shallow copy keeps memory-mapped history on disk)
+            df = historical_data[primary_symbol].copy(deep=False)
             
             # Add technical indicators
             trend_period = self.config['trend_period']
@@ -1289,92 +1369,76 @@ class MarketAnalyzer:
             # Calculate volatility metrics
             df = self.calculate_volatility(df, period=volatility_period)
             
-            # Detect regime for each data point
-            regimes = []
-            for i in range(max(trend_period, volatility_period) * 2, len(df)):
-                row = df.iloc[i]
-                
-                # Get indicator values
-                adx = row.get('adx', 0)
-                plus_di = row.get('plus_di', 0)
-                minus_di = row.get('minus_di', 0)
-                volatility_ratio = row.get('volatility_ratio', 1.0)
-                
-                # Determine trend direction
-                trend_direction = 1 if plus_di > minus_di else -1
-                
-                # Classify market regime
-                regime = MarketRegime.UNKNOWN
-                confidence = 0.5  # Default confidence
-                
-                # Strong trend threshold
-                strong_trend = self.config['strong_trend_threshold']
-                weak_trend = self.config['weak_trend_threshold']
-                
-                # Volatility thresholds
-                high_vol = self.config['high_volatility_threshold']
-                low_vol = self.config['low_volatility_threshold']
-                
-                # Check for high volatility first (overrides trend)
-                if volatility_ratio > high_vol:
-                    regime = MarketRegime.HIGH_VOLATILITY
-                # Check for low volatility
-                elif volatility_ratio < low_vol:
-                    regime = MarketRegime.LOW_VOLATILITY
-                # Strong uptrend
-                elif adx > strong_trend and trend_direction > 0:
-                    regime = MarketRegime.STRONG_UPTREND
-                # Strong downtrend
-                elif adx > strong_trend and trend_direction < 0:
-                    regime = MarketRegime.STRONG_DOWNTREND
-                # Weak uptrend
-                elif adx > weak_trend and trend_direction > 0:
-                    regime = MarketRegime.WEAK_UPTREND
-                # Weak downtrend
-                elif adx > weak_trend and trend_direction < 0:
-                    regime = MarketRegime.WEAK_DOWNTREND
-                # Ranging market
-                else:
-                    regime = MarketRegime.RANGING
-                
-                # Add to results
-                regimes.append({
-                    "timestamp": df.index[i].isoformat(),
-                    "regime": regime.name,
-                    "adx": adx,
-                    "trend_direction": trend_direction,
-                    "volatility_ratio": volatility_ratio,
-                    "close": row['close']
-                })
+            # Classify every bar after the indicator warm-up at once
+            start = max(trend_period, volatility_period) * 2
+            n = max(len(df) - start, 0)
+            
+            def column(name: str, default: float) -> np.ndarray:
+                if name not in df:
+                    return np.full(n, default)
+                return df[name].to_numpy(dtype=np.float64)[start:]
+            
+            adx = column('adx', 0)
+            plus_di = column('plus_di', 0)
+            minus_di = column('minus_di', 0)
+            volatility_ratio = column('volatility_ratio', 1.0)
+            close = df['close'].to_numpy(dtype=np.float64)[start:]
+            
+            # Determine trend direction
+            trend_direction = np.where(plus_di > minus_di, 1, -1)
+            uptrend = trend_direction > 0
+            
+            strong_trend = self.config['strong_trend_threshold']
+            weak_trend = self.config['weak_trend_threshold']
+            high_vol = self.config['high_volatility_threshold']
+            low_vol = self.config['low_volatility_threshold']
+            
+            # First matching condition wins: high volatility overrides trend, then low volatility
+            regime_codes = np.select(
+                [volatility_ratio > high_vol,
+                 volatility_ratio < low_vol,
+                 (adx > strong_trend) & uptrend,
+                 (adx > strong_trend) & ~uptrend,
+                 (adx > weak_trend) & uptrend,
+                 (adx > weak_trend) & ~uptrend],
+                [REGIME_CODES[MarketRegime.HIGH_VOLATILITY],
+                 REGIME_CODES[MarketRegime.LOW_VOLATILITY],
+                 REGIME_CODES[MarketRegime.STRONG_UPTREND],
+                 REGIME_CODES[MarketRegime.STRONG_DOWNTREND],
+                 REGIME_CODES[MarketRegime.WEAK_UPTREND],
+                 REGIME_CODES[MarketRegime.WEAK_DOWNTREND]],
+                default=REGIME_CODES[MarketRegime.RANGING]
+            )
+            
+            timeline = RegimeTimeline(df.index[start:], regime_codes, adx, trend_direction,
+                                      volatility_ratio, close)
             
             # Calculate regime statistics
-            regime_stats = {}
-            for regime in MarketRegime:
-                regime_name = regime.name
-                regime_count = sum(1 for r in regimes if r["regime"] == regime_name)
-                regime_pct = regime_count / len(regimes) * 100 if regimes else 0
-                
-                regime_stats[regime_name] = {
-                    "count": regime_count,
-                    "percentage": regime_pct
+            counts = np.bincount(regime_codes, minlength=len(REGIMES))
+            regime_stats = {
+                regime.name: {
+                    "count": int(count),
+                    "percentage": int(count) / n * 100 if n else 0
                 }
+                for regime, count in zip(REGIMES, counts)
+            }
             
-            # Calculate transitions between regimes
+            # Calculate transitions between regimes, keyed in order of first occurrence
+            changed = np.flatnonzero(regime_codes[1:] != regime_codes[:-1])
+            pairs = regime_codes[changed] * len(REGIMES) + regime_codes[changed + 1]
+            unique_pairs, first_seen, pair_counts = np.unique(pairs, return_index=True, return_counts=True)
             transitions = {}
-            prev_regime = None
-            for r in regimes:
-                curr_regime = r["regime"]
-                if prev_regime is not None and prev_regime != curr_regime:
-                    key = f"{prev_regime}->{curr_regime}"
-                    transitions[key] = transitions.get(key, 0) + 1
-                prev_regime = curr_regime
+            for k in np.argsort(first_seen):
+                prev_regime, curr_regime = divmod(int(unique_pairs[k]), len(REGIMES))
+                key = f"{REGIMES[prev_regime].name}->{REGIMES[curr_regime].name}"
+                transitions[key] = int(pair_counts[k])
                 
             return {
                 "success": True,
-                "total_periods": len(regimes),
+                "total_periods": n,
                 "regimes": regime_stats,
                 "transitions": transitions,
-                "regime_timeline": regimes
+                "regime_timeline": timeline
             }
             
         except Exception as e:
@@ -91,6 +91,41 @@ class ParameterManager:
             "max": 100,
             "default": 40,
             "description": "Weight of InsideBar strategy in combined signals"
+        },
+        "supertrend_period": {
+            "type": "int",
+            "min": 2,
+            "max": 100,
+            "default": 10,
+            "description": "ATR period of the Supertrend bands"
+        },
+        "supertrend_multiplier": {
+            "type": "float",
+            "min": 0.5,
+            "max": 10.0,
+            "default": 3.0,
+            "description": "ATR multiplier of the Supertrend bands"
+        },
+        "adx_threshold": {
+            "type": "float",
+            "min": 0.0,
+            "max": 100.0,
+            "default": 25.0,
+            "description": "Minimum ADX for a Supertrend flip to trigger"
+        },
+        "atr_period": {
+            "type": "int",
+            "min": 2,
+            "max": 100,
+            "default": 14,
+            "description": "ATR period for profit targets, stops and the volatility filter"
+        },
+        "volatility_percentile": {
+            "type": "float",
+            "min": 1.0,
+            "max": 100.0,
+            "default": 30.0,
+            "description": "ATR percentile below which an inside bar counts as low volatility"
         }
     }
     
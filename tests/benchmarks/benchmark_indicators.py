@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for technical indicators
+
+Usage:
+    python -m tests.benchmarks.benchmark_indicators
+"""
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.indicators import (calculate_supertrend, calculate_supertrend_batch, is_atr_in_bottom_percentile,
+                            NUMBA_AVAILABLE)
+from tests.reference_indicators import reference_supertrend, reference_atr_in_bottom_percentile
+
+
+def make_ohlcv(n: int, seed: int = 42) -> pd.DataFrame:
+    """Create a random-walk OHLCV frame with n bars"""
+    rng = np.random.default_rng(seed)
+    price = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'open': price,
+        'high': price + np.abs(rng.normal(0, 1, n)),
+        'low': price - np.abs(rng.normal(0, 1, n)),
+        'close': price + rng.normal(0, 0.5, n),
+        'volume': rng.random(n) * 1000
+    }, index=pd.date_range('2024-01-01', periods=n, freq='15min'))
+
+
+def time_call(func, *args, repeat: int = 3, **kwargs) -> float:
+    """Return the best wall time in milliseconds over `repeat` runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench_supertrend(sizes, reference_limit: int) -> None:
+    """Compare the array kernel with the per-row reference loop"""
+    print(f"Supertrend (numba: {'on' if NUMBA_AVAILABLE else 'off'})")
+    print(f"{'bars':>8} {'kernel ms':>12} {'reference ms':>14} {'speedup':>9}")
+    
+    # Warm up (triggers JIT compilation when numba is available)
+    calculate_supertrend(make_ohlcv(50))
+    
+    for n in sizes:
+        df = make_ohlcv(n)
+        kernel_ms = time_call(calculate_supertrend, df)
+        if n <= reference_limit:
+            reference_ms = time_call(reference_supertrend, df, repeat=1)
+            print(f"{n:>8} {kernel_ms:>12.2f} {reference_ms:>14.2f} {reference_ms / kernel_ms:>8.1f}x")
+        else:
+            print(f"{n:>8} {kernel_ms:>12.2f} {'skipped':>14} {'-':>9}")
+
+
+def bench_supertrend_batch(n: int, pair_counts) -> None:
+    """Compare one batched Supertrend pass with one call per (period, multiplier) pair"""
+    print(f"Supertrend batch ({n} bars)")
+    print(f"{'pairs':>8} {'batch ms':>12} {'per-pair ms':>14} {'speedup':>9}")
+    
+    df = make_ohlcv(n)
+    for pairs in pair_counts:
+        periods = [(7, 10, 14, 21)[j % 4] for j in range(pairs)]
+        multipliers = np.linspace(1.0, 5.0, pairs)
+        batch_ms = time_call(calculate_supertrend_batch, df, periods, multipliers)
+        single_ms = time_call(lambda: [calculate_supertrend(df, p, m) for p, m in zip(periods, multipliers)], repeat=1)
+        print(f"{pairs:>8} {batch_ms:>12.2f} {single_ms:>14.2f} {single_ms / batch_ms:>8.1f}x")
+
+
+def bench_atr_percentile(n: int, lookbacks) -> None:
+    """Compare the sorted-window rank with the rolling().apply() path"""
+    print(f"ATR bottom percentile ({n} bars)")
+    print(f"{'lookback':>8} {'sorted ms':>12} {'apply ms':>14} {'speedup':>9}")
+    
+    df = make_ohlcv(n)
+    for lookback in lookbacks:
+        sorted_ms = time_call(is_atr_in_bottom_percentile, df, lookback=lookback)
+        apply_ms = time_call(reference_atr_in_bottom_percentile, df, lookback=lookback, repeat=1)
+        print(f"{lookback:>8} {sorted_ms:>12.2f} {apply_ms:>14.2f} {apply_ms / sorted_ms:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark technical indicators')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1_000, 10_000, 100_000],
+                        help='Bar counts to benchmark')
+    parser.add_argument('--reference-limit', type=int, default=100_000,
+                        help='Largest bar count to run the slow reference implementation on')
+    parser.add_argument('--percentile-bars', type=int, default=5_000,
+                        help='Bar count for the ATR percentile benchmark')
+    args = parser.parse_args()
+    
+    bench_supertrend(args.sizes, args.reference_limit)
+    print()
+    bench_supertrend_batch(args.percentile_bars * 4, [4, 20, 100])
+    print()
+    bench_atr_percentile(args.percentile_bars, [50, 500])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Reference (per-row pandas) indicator implementations
+
+These mirror the original loop-based code in src/indicators.py and are kept
+only as the ground truth for parity tests and benchmarks.
+"""
+import pandas as pd
+from typing import Tuple
+
+try:
+    from src.indicators import calculate_atr
+except ImportError:
+    # Fallback for different project structure
+    from Inside.Bar.Strategy.src.indicators import calculate_atr
+
+
+def reference_supertrend(df: pd.DataFrame, atr_period: int = 10, multiplier: float = 3.0) -> Tuple[pd.Series, pd.Series]:
+    """Supertrend computed bar by bar with .iloc scalar access"""
+    atr = calculate_atr(df, atr_period)
+    
+    hl2 = (df['high'] + df['low']) / 2
+    basic_upper_band = hl2 + (multiplier * atr)
+    basic_lower_band = hl2 - (multiplier * atr)
+    
+    final_upper_band = basic_upper_band.copy()
+    final_lower_band = basic_lower_band.copy()
+    supertrend = pd.Series(0.0, index=df.index)
+    direction = pd.Series(1, index=df.index)
+    
+    if len(df) > 0:
+        supertrend.iloc[0] = final_upper_band.iloc[0]
+        direction.iloc[0] = -1
+    
+    for i in range(1, len(df)):
+        if basic_upper_band.iloc[i] < final_upper_band.iloc[i-1] or df['close'].iloc[i-1] > final_upper_band.iloc[i-1]:
+            final_upper_band.iloc[i] = basic_upper_band.iloc[i]
+        else:
+            final_upper_band.iloc[i] = final_upper_band.iloc[i-1]
+            
+        if basic_lower_band.iloc[i] > final_lower_band.iloc[i-1] or df['close'].iloc[i-1] < final_lower_band.iloc[i-1]:
+            final_lower_band.iloc[i] = basic_lower_band.iloc[i]
+        else:
+            final_lower_band.iloc[i] = final_lower_band.iloc[i-1]
+            
+        if supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and df['close'].iloc[i] <= final_upper_band.iloc[i]:
+            supertrend.iloc[i] = final_upper_band.iloc[i]
+            direction.iloc[i] = -1
+        elif supertrend.iloc[i-1] == final_upper_band.iloc[i-1] and df['close'].iloc[i] > final_upper_band.iloc[i]:
+            supertrend.iloc[i] = final_lower_band.iloc[i]
+            direction.iloc[i] = 1
+        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and df['close'].iloc[i] >= final_lower_band.iloc[i]:
+            supertrend.iloc[i] = final_lower_band.iloc[i]
+            direction.iloc[i] = 1
+        elif supertrend.iloc[i-1] == final_lower_band.iloc[i-1] and df['close'].iloc[i] < final_lower_band.iloc[i]:
+            supertrend.iloc[i] = final_upper_band.iloc[i]
+            direction.iloc[i] = -1
+    
+    return supertrend, direction
+
+
+def reference_atr_in_bottom_percentile(df: pd.DataFrame, atr_period: int = 14, lookback: int = 50, percentile: float = 30) -> pd.Series:
+    """ATR bottom-percentile flag computed by re-ranking every window with rolling().apply()"""
+    atr = calculate_atr(df, atr_period)
+    
+    def rolling_percentile_rank(x):
+        return pd.Series(x).rank(pct=True).iloc[-1] * 100
+    
+    atr_rank = atr.rolling(window=lookback).apply(rolling_percentile_rank, raw=False)
+    
+    return atr_rank <= percentile
+
+
+def reference_rsi_divergence(df: pd.DataFrame, lookback: int = 10) -> pd.DataFrame:
+    """RSI divergence flags computed with a per-bar window scan"""
+    df = df.copy()
+    df['bullish_divergence'] = False
+    df['bearish_divergence'] = False
+    
+    if len(df) <= lookback:
+        return df
+    
+    for i in range(lookback, len(df)):
+        window = df.iloc[i-lookback:i+1]
+        
+        low_idx = window['low'].idxmin()
+        high_idx = window['high'].idxmax()
+        current_idx = window.index[-1]
+        
+        if low_idx != current_idx:
+            price_low = df.loc[low_idx, 'low']
+            rsi_at_low = df.loc[low_idx, 'rsi']
+            current_close = df['close'].iloc[i]
+            current_rsi = df['rsi'].iloc[i]
+            if current_close < price_low and current_rsi > rsi_at_low and current_rsi < 40:
+                df.loc[current_idx, 'bullish_divergence'] = True
+        
+        if high_idx != current_idx:
+            price_high = df.loc[high_idx, 'high']
+            rsi_at_high = df.loc[high_idx, 'rsi']
+            current_close = df['close'].iloc[i]
+            current_rsi = df['rsi'].iloc[i]
+            if current_close > price_high and current_rsi < rsi_at_high and current_rsi > 60:
+                df.loc[current_idx, 'bearish_divergence'] = True
+    
+    return df
+
+
+def reference_regime_timeline(analyzer, df: pd.DataFrame) -> list:
+    """Per-bar regime records built with df.iloc[i] and an if/elif chain"""
+    from src.utils.market_analyzer import MarketRegime
+    
+    config = analyzer.config
+    start = max(config['trend_period'], config['volatility_period']) * 2
+    regimes = []
+    for i in range(start, len(df)):
+        row = df.iloc[i]
+        adx = row.get('adx', 0)
+        volatility_ratio = row.get('volatility_ratio', 1.0)
+        trend_direction = 1 if row.get('plus_di', 0) > row.get('minus_di', 0) else -1
+        
+        if volatility_ratio > config['high_volatility_threshold']:
+            regime = MarketRegime.HIGH_VOLATILITY
+        elif volatility_ratio < config['low_volatility_threshold']:
+            regime = MarketRegime.LOW_VOLATILITY
+        elif adx > config['strong_trend_threshold'] and trend_direction > 0:
+            regime = MarketRegime.STRONG_UPTREND
+        elif adx > config['strong_trend_threshold'] and trend_direction < 0:
+            regime = MarketRegime.STRONG_DOWNTREND
+        elif adx > config['weak_trend_threshold'] and trend_direction > 0:
+            regime = MarketRegime.WEAK_UPTREND
+        elif adx > config['weak_trend_threshold'] and trend_direction < 0:
+            regime = MarketRegime.WEAK_DOWNTREND
+        else:
+            regime = MarketRegime.RANGING
+        
+        regimes.append({
+            "timestamp": df.index[i].isoformat(),
+            "regime": regime.name,
+            "adx": adx,
+            "trend_direction": trend_direction,
+            "volatility_ratio": volatility_ratio,
+            "close": row['close']
+        })
+    
+    return regimes
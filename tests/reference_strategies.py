@@ -0,0 +1,228 @@
+"""
+Reference (per-row pandas) strategy signal generation
+
+These mirror the original loop-based generate_signals/calculate_confidence
+code in src/strategies.py and are kept only as the ground truth for parity
+tests.
+"""
+import numpy as np
+import pandas as pd
+
+try:
+    from src.indicators import (
+        calculate_supertrend, calculate_adx, calculate_atr, detect_inside_bar, is_atr_in_bottom_percentile
+    )
+except ImportError:
+    # Fallback for different project structure
+    from Inside.Bar.Strategy.src.indicators import (
+        calculate_supertrend, calculate_adx, calculate_atr, detect_inside_bar, is_atr_in_bottom_percentile
+    )
+
+
+def reference_supertrend_adx_confidence(df: pd.DataFrame, signal_idx: int) -> float:
+    """Supertrend + ADX confidence for a single row"""
+    confidence = 85.0
+    
+    adx = df['adx'].iloc[signal_idx]
+    if adx > 40:
+        confidence += 5
+    elif adx > 30:
+        confidence += 3
+    elif adx > 25:
+        confidence += 1
+        
+    di_spread = abs(df['plus_di'].iloc[signal_idx] - df['minus_di'].iloc[signal_idx])
+    if di_spread > 30:
+        confidence += 4
+    elif di_spread > 20:
+        confidence += 2
+    elif di_spread > 10:
+        confidence += 1
+        
+    price = df['close'].iloc[signal_idx]
+    supertrend = df['supertrend'].iloc[signal_idx]
+    price_to_supertrend_ratio = abs(price - supertrend) / df['atr'].iloc[signal_idx]
+    if price_to_supertrend_ratio > 1.0:
+        confidence += 3
+    elif price_to_supertrend_ratio > 0.5:
+        confidence += 2
+    
+    if signal_idx > 0:
+        if df['volume'].iloc[signal_idx] > df['volume'].iloc[signal_idx-1] * 1.5:
+            confidence += 3
+        elif df['volume'].iloc[signal_idx] > df['volume'].iloc[signal_idx-1] * 1.2:
+            confidence += 1
+            
+    return min(confidence, 100.0)
+
+
+def reference_supertrend_adx_signals(strategy, df: pd.DataFrame) -> pd.DataFrame:
+    """Supertrend + ADX signals generated bar by bar with .loc writes"""
+    result_df = df.copy()
+    
+    supertrend, direction = calculate_supertrend(
+        result_df,
+        atr_period=strategy.supertrend_period,
+        multiplier=strategy.supertrend_multiplier
+    )
+    result_df['supertrend'] = supertrend
+    result_df['supertrend_direction'] = direction
+    
+    adx_data = calculate_adx(result_df, period=strategy.adx_period)
+    result_df['adx'] = adx_data['adx']
+    result_df['plus_di'] = adx_data['plus_di']
+    result_df['minus_di'] = adx_data['minus_di']
+    
+    result_df['atr'] = calculate_atr(result_df, period=strategy.atr_period)
+    
+    result_df['signal'] = 0
+    result_df['signal_triggered'] = False
+    result_df['profit_target'] = np.nan
+    result_df['stop_loss'] = np.nan
+    result_df['confidence'] = 0.0
+    
+    for i in range(1, len(result_df)):
+        direction_change = result_df['supertrend_direction'].iloc[i] != result_df['supertrend_direction'].iloc[i-1]
+        strong_trend = result_df['adx'].iloc[i] > strategy.adx_threshold
+        
+        if direction_change and strong_trend:
+            if result_df['supertrend_direction'].iloc[i] == 1:
+                result_df.loc[result_df.index[i], 'signal'] = 1
+                result_df.loc[result_df.index[i], 'signal_triggered'] = True
+                result_df.loc[result_df.index[i], 'profit_target'] = result_df['close'].iloc[i] + (1.5 * result_df['atr'].iloc[i])
+                result_df.loc[result_df.index[i], 'stop_loss'] = result_df['supertrend'].iloc[i]
+            elif result_df['supertrend_direction'].iloc[i] == -1:
+                result_df.loc[result_df.index[i], 'signal'] = -1
+                result_df.loc[result_df.index[i], 'signal_triggered'] = True
+                result_df.loc[result_df.index[i], 'profit_target'] = result_df['close'].iloc[i] - (1.5 * result_df['atr'].iloc[i])
+                result_df.loc[result_df.index[i], 'stop_loss'] = result_df['supertrend'].iloc[i]
+    
+    for i in range(len(result_df)):
+        if result_df['signal_triggered'].iloc[i]:
+            result_df.loc[result_df.index[i], 'confidence'] = reference_supertrend_adx_confidence(result_df, i)
+    
+    return result_df
+
+
+def reference_inside_bar_confidence(df: pd.DataFrame, signal_idx: int) -> float:
+    """Inside Bar + ATR confidence for a single row"""
+    confidence = 88.0  # Base level for this high-win-rate strategy
+
+    if signal_idx < 2:  # Need at least 2 bars before the signal
+        return confidence
+
+    inside_bar_idx = signal_idx - 1
+
+    atr_rank = df['atr'].iloc[inside_bar_idx] / df['atr'].iloc[inside_bar_idx-10:inside_bar_idx].max()
+    if atr_rank < 0.2:  # Very low volatility
+        confidence += 3
+    elif atr_rank < 0.3:
+        confidence += 2
+    elif atr_rank < 0.4:
+        confidence += 1
+
+    mother_bar_idx = inside_bar_idx - 1
+    mother_bar_range = df['high'].iloc[mother_bar_idx] - df['low'].iloc[mother_bar_idx]
+    inside_bar_range = df['high'].iloc[inside_bar_idx] - df['low'].iloc[inside_bar_idx]
+
+    if mother_bar_range > 0:  # Avoid division by zero
+        size_ratio = inside_bar_range / mother_bar_range
+        if size_ratio < 0.3:  # Very small inside bar
+            confidence += 3
+        elif size_ratio < 0.5:
+            confidence += 2
+        elif size_ratio < 0.7:
+            confidence += 1
+
+    signal_direction = df['signal'].iloc[signal_idx]
+    if signal_direction == 1:  # Long signal
+        mother_bar_high = df['mother_bar_high'].iloc[inside_bar_idx]
+        breakout_strength = (df['high'].iloc[signal_idx] - mother_bar_high) / df['atr'].iloc[inside_bar_idx]
+
+        if breakout_strength > 0.5:  # Strong breakout
+            confidence += 4
+        elif breakout_strength > 0.3:
+            confidence += 2
+        elif breakout_strength > 0.1:
+            confidence += 1
+
+    elif signal_direction == -1:  # Short signal
+        mother_bar_low = df['mother_bar_low'].iloc[inside_bar_idx]
+        breakout_strength = (mother_bar_low - df['low'].iloc[signal_idx]) / df['atr'].iloc[inside_bar_idx]
+
+        if breakout_strength > 0.5:  # Strong breakout
+            confidence += 4
+        elif breakout_strength > 0.3:
+            confidence += 2
+        elif breakout_strength > 0.1:
+            confidence += 1
+
+    if df['volume'].iloc[signal_idx] > df['volume'].iloc[inside_bar_idx] * 1.3:
+        confidence += 2
+    elif df['volume'].iloc[signal_idx] > df['volume'].iloc[inside_bar_idx] * 1.1:
+        confidence += 1
+
+    return min(confidence, 100.0)
+
+
+def reference_inside_bar_signals(strategy, df: pd.DataFrame) -> pd.DataFrame:
+    """Inside Bar + ATR signals generated bar by bar with .loc writes"""
+    result_df = df.copy()
+
+    result_df['atr'] = calculate_atr(result_df, period=strategy.atr_period)
+
+    result_df['inside_bar'] = detect_inside_bar(result_df)
+
+    result_df['low_volatility'] = is_atr_in_bottom_percentile(
+        result_df, 
+        atr_period=strategy.atr_period, 
+        lookback=strategy.lookback_period, 
+        percentile=strategy.volatility_percentile
+    )
+
+    result_df['signal'] = 0  # 0: no signal, 1: long, -1: short
+    result_df['signal_triggered'] = False
+    result_df['mother_bar_high'] = np.nan
+    result_df['mother_bar_low'] = np.nan
+    result_df['profit_target_long'] = np.nan
+    result_df['profit_target_short'] = np.nan
+    result_df['stop_loss_long'] = np.nan
+    result_df['stop_loss_short'] = np.nan
+    result_df['confidence'] = 0.0
+
+    for i in range(1, len(result_df) - 1):  # -1 to avoid looking ahead
+        if result_df['inside_bar'].iloc[i] and result_df['low_volatility'].iloc[i]:
+            mother_bar_high = result_df['high'].iloc[i-1]
+            mother_bar_low = result_df['low'].iloc[i-1]
+
+            result_df.loc[result_df.index[i], 'mother_bar_high'] = mother_bar_high
+            result_df.loc[result_df.index[i], 'mother_bar_low'] = mother_bar_low
+
+            current_atr = result_df['atr'].iloc[i]
+
+            result_df.loc[result_df.index[i], 'profit_target_long'] = mother_bar_high + current_atr
+            result_df.loc[result_df.index[i], 'stop_loss_long'] = mother_bar_high - (0.5 * current_atr)
+
+            result_df.loc[result_df.index[i], 'profit_target_short'] = mother_bar_low - current_atr
+            result_df.loc[result_df.index[i], 'stop_loss_short'] = mother_bar_low + (0.5 * current_atr)
+
+            if i < len(result_df) - 1:
+                next_bar = result_df.iloc[i+1]
+
+                if next_bar['high'] > mother_bar_high:
+                    result_df.loc[result_df.index[i+1], 'signal'] = 1
+                    result_df.loc[result_df.index[i+1], 'signal_triggered'] = True
+                    result_df.loc[result_df.index[i+1], 'profit_target'] = result_df.loc[result_df.index[i], 'profit_target_long']
+                    result_df.loc[result_df.index[i+1], 'stop_loss'] = result_df.loc[result_df.index[i], 'stop_loss_long']
+
+                elif next_bar['low'] < mother_bar_low:
+                    result_df.loc[result_df.index[i+1], 'signal'] = -1
+                    result_df.loc[result_df.index[i+1], 'signal_triggered'] = True
+                    result_df.loc[result_df.index[i+1], 'profit_target'] = result_df.loc[result_df.index[i], 'profit_target_short']
+                    result_df.loc[result_df.index[i+1], 'stop_loss'] = result_df.loc[result_df.index[i], 'stop_loss_short']
+
+    for i in range(len(result_df)):
+        if result_df['signal_triggered'].iloc[i]:
+            result_df.loc[result_df.index[i], 'confidence'] = reference_inside_bar_confidence(result_df, i)
+
+    return result_df
@@ -0,0 +1,154 @@
+"""
+Unit tests for the strategy backtester
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.backtest import (Backtester, EXIT_OPEN, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, find_exit,
+                          max_drawdown_percent, simulate_positions)
+from src.strategies import InsideBarStrategy, Strategy, SupertrendADXStrategy
+from src.utils.indicator_cache import IndicatorCache
+
+
+def make_candles(close, start='2024-01-01'):
+    close = np.asarray(close, dtype=np.float64)
+    index = pd.DatetimeIndex(pd.date_range(start, periods=len(close), freq='15min'), name='timestamp')
+    return pd.DataFrame({'open': close, 'high': close * 1.001, 'low': close * 0.999,
+                         'close': close, 'volume': np.ones(len(close))}, index=index)
+
+
+def random_candles(n=1500, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+    df = make_candles(close)
+    df['high'] = close * (1 + np.abs(rng.normal(0, 0.002, n)))
+    df['low'] = close * (1 - np.abs(rng.normal(0, 0.002, n)))
+    return df
+
+
+class ScriptedStrategy(Strategy):
+    """Signals on fixed bars: {bar: (direction, take_profit, stop_loss)}"""
+
+    def __init__(self, script):
+        super().__init__("Scripted")
+        self.script = script
+
+    def generate_signals(self, df):
+        result = df.copy()
+        signal = np.zeros(len(df), dtype=int)
+        take_profit = np.full(len(df), np.nan)
+        stop_loss = np.full(len(df), np.nan)
+        for bar, (direction, tp, sl) in self.script.items():
+            signal[bar], take_profit[bar], stop_loss[bar] = direction, tp, sl
+        result['signal'] = signal
+        result['signal_triggered'] = signal != 0
+        result['profit_target'] = take_profit
+        result['stop_loss'] = stop_loss
+        result['confidence'] = 100.0
+        result['atr'] = 1.0
+        return result
+
+
+def paper_trader_balance(candles, signal_frames, initial_balance):
+    """Reference replay with DivinePaperTrader fills: update positions, then take new signals"""
+    balance = initial_balance
+    positions = {}
+    for i in range(len(next(iter(candles.values())))):
+        for symbol in list(positions):
+            direction, entry, value, tp, sl = positions[symbol]
+            price = candles[symbol]['close'].iat[i]
+            if direction == 1:
+                hit = (tp > 0 and price >= tp) or (sl > 0 and price <= sl)
+            else:
+                hit = (tp > 0 and price <= tp) or (sl > 0 and price >= sl)
+            if hit:
+                balance += value * direction * (price - entry) / entry
+                del positions[symbol]
+        for symbol, signals in signal_frames.items():
+            if signals['signal_triggered'].iat[i] and symbol not in positions:
+                positions[symbol] = (signals['signal'].iat[i], signals['close'].iat[i], balance * 0.35,
+                                     signals['profit_target'].iat[i], signals['stop_loss'].iat[i])
+    return balance
+
+
+class TestExitSearch:
+    """Test TP/SL exit detection"""
+
+    def test_take_profit_checked_first(self):
+        close = np.array([100, 101, 99, 105.0])
+        assert find_exit(close, 1, 1, take_profit=104, stop_loss=99.5) == (2, EXIT_STOP_LOSS)
+        assert find_exit(close, 1, 1, take_profit=101, stop_loss=101) == (1, EXIT_TAKE_PROFIT)
+        assert find_exit(close, 1, -1, take_profit=99, stop_loss=110) == (2, EXIT_TAKE_PROFIT)
+
+    def test_disabled_levels_stay_open(self):
+        close = np.linspace(100, 200, 500)
+        assert find_exit(close, 1, 1, take_profit=np.nan, stop_loss=0) == (-1, EXIT_OPEN)
+        assert find_exit(close, 1, 1, take_profit=199, stop_loss=np.nan)[1] == EXIT_TAKE_PROFIT
+
+    def test_one_position_at_a_time(self):
+        close = np.array([100, 100, 100, 103, 100, 100, 100.0])
+        bars = np.array([0, 2, 3, 5])
+        positions = simulate_positions(close, bars, np.array([1, -1, 1, 1]),
+                                       np.array([102.0, 90, 110, 101]), np.array([95.0, 110, 101, 95]))
+
+        # The signal on bar 2 comes while the first position is open; bar 3 exits and re-enters
+        assert positions['signal'].tolist() == [0, 2, 3]
+        assert positions['entry_bar'].tolist() == [0, 3, 5]
+        assert positions['exit_bar'].tolist() == [3, 4, -1]
+        assert positions['reason'].tolist() == [EXIT_TAKE_PROFIT, EXIT_STOP_LOSS, EXIT_OPEN]
+
+    def test_max_drawdown(self):
+        assert max_drawdown_percent(np.array([100, 120, 90, 130, 117.0])) == pytest.approx(25.0)
+        assert max_drawdown_percent(np.array([100.0])) == 0.0
+
+
+class TestBacktester:
+    """Test simulated fills and per-strategy statistics"""
+
+    def test_matches_paper_trader(self):
+        candles = {'BTC/USDT': random_candles(seed=3), 'ETH/USDT': random_candles(seed=4)}
+        for strategy in (SupertrendADXStrategy(cache=IndicatorCache()), InsideBarStrategy(cache=IndicatorCache())):
+            backtester = Backtester({'strategy': strategy}, initial_balance=10.17, max_workers=1,
+                                    fee_rate=0, slippage=0)
+            results = backtester.run(candles)
+
+            signal_frames = {symbol: strategy.generate_signals(df) for symbol, df in candles.items()}
+            expected = paper_trader_balance(candles, signal_frames, 10.17)
+            assert results['strategies']['strategy']['trades'] > 0
+            assert results['strategies']['strategy']['final_balance'] == pytest.approx(expected, rel=1e-12)
+
+    def test_fees_and_slippage(self):
+        candles = {'BTC/USDT': make_candles([100, 101, 110, 100, 100, 95])}
+        strategy = ScriptedStrategy({0: (1, 110, 90), 3: (-1, 90, 95)})
+        backtester = Backtester({'scripted': strategy}, initial_balance=1000, max_workers=1,
+                                fee_rate=0.001, slippage=0.01)
+
+        results = backtester.run(candles)
+        trades = results['trades']
+        stats = results['strategies']['scripted']
+
+        assert trades['exit_reason'].tolist() == ['TAKE_PROFIT', 'STOP_LOSS']
+        assert trades['exit_price'].tolist() == [110.0, 100.0]
+        first_return = (110 * 0.99) / (100 * 1.01) - 1 - 0.001 * (1 + 110 * 0.99 / 101)
+        assert trades['pnl_value'].iat[0] == pytest.approx(350 * first_return)
+        # The second position is sized from the balance after the first closed
+        assert trades['position_value'].iat[1] == pytest.approx((1000 + 350 * first_return) * 0.35)
+        assert stats['trades'] == 2 and stats['wins'] == 1 and stats['win_rate'] == 50.0
+        assert stats['take_profit_exits'] == 1 and stats['stop_loss_exits'] == 1
+        assert stats['final_balance'] == pytest.approx(1000 + trades['pnl_value'].sum())
+        assert stats['max_drawdown_percent'] > 0
+
+    def test_open_positions_and_confidence_filter(self):
+        candles = {'BTC/USDT': make_candles([100, 101, 102, 103])}
+        backtester = Backtester({'scripted': ScriptedStrategy({1: (1, 120, 80)})}, max_workers=1)
+        stats = backtester.run(candles)['strategies']['scripted']
+        assert stats['trades'] == 0 and stats['open_trades'] == 1
+        assert stats['final_balance'] == backtester.initial_balance
+
+        backtester.min_confidence = 101
+        assert backtester.run(candles)['trades'].empty
+
+    def test_no_candles(self):
+        backtester = Backtester({'scripted': ScriptedStrategy({})}, max_workers=1)
+        assert backtester.run({'BTC/USDT': pd.DataFrame()})['success'] is False
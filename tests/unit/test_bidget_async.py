@@ -0,0 +1,148 @@
+"""
+Unit tests for the async Bitget client
+"""
+import json
+import time
+import asyncio
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.integrations import bidget
+from src.integrations.bidget import TradingAPI
+from src.integrations.bidget_async import AIOHTTP_AVAILABLE, AsyncTradingAPI, fetch_positions
+
+pytestmark = pytest.mark.skipif(not AIOHTTP_AVAILABLE, reason="aiohttp not installed")
+
+LATENCY = 0.2
+
+
+class FakeBitgetHandler(BaseHTTPRequestHandler):
+    """Serves positions, orders, tickers and the account with a fixed latency"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with server.lock:
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            status = server.statuses.pop(0) if server.statuses else 200
+        time.sleep(LATENCY)
+
+        if url.path.endswith('/position/singlePosition'):
+            size = server.sizes.get(query['symbol'], 0)
+            data = [{'symbol': query['symbol'], 'holdSide': 'long', 'total': str(size),
+                     'averageOpenPrice': '1.5', 'unrealizedPL': '0.1', 'leverage': '10'},
+                    {'symbol': query['symbol'], 'holdSide': 'short', 'total': '0'}]
+        elif url.path.endswith('/order/current'):
+            data = [{'orderId': '1', 'symbol': query.get('symbol', 'BTCUSDT_UMCBL'), 'price': '2', 'size': '3',
+                     'filledQty': '0', 'status': 'new', 'orderType': 'limit', 'side': 'long'}]
+        elif url.path.endswith('/market/ticker'):
+            data = {'last': '2.5', 'bidPr': '2.4', 'askPr': '2.6', 'high24h': '3', 'low24h': '2', 'baseVolume': '9'}
+        else:
+            data = {'available': '100', 'equity': '120', 'unrealizedPL': '5', 'marginRatio': '0.1'}
+
+        body = json.dumps({'code': '00000', 'msg': 'success', 'data': data} if status == 200
+                          else {'code': str(status), 'msg': 'busy'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with server.lock:
+            server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_bitget():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBitgetHandler)
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    server.statuses = []
+    server.sizes = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(fake_bitget, monkeypatch):
+    monkeypatch.setenv('BITGET_API_KEY', 'key')
+    monkeypatch.setenv('BITGET_API_SECRET', 'secret')
+    monkeypatch.setenv('BITGET_API_PASSPHRASE', 'pass')
+    monkeypatch.setenv('BITGET_HTTP_BACKOFF', '0')
+    monkeypatch.setenv('TEST_MODE', 'false')
+    monkeypatch.setattr(bidget, '_http_session', None)
+    monkeypatch.setattr(bidget, '_endpoint_latency', {})
+    trading_api = TradingAPI()
+    trading_api.base_url = f"http://127.0.0.1:{fake_bitget.server_address[1]}"
+    return trading_api
+
+
+SYMBOLS = ['BTC/USDT', 'ETH/USDT', 'XRP/USDT', 'DOGE/USDT', 'SOL/USDT', 'ADA/USDT', 'DOT/USDT', 'LTC/USDT']
+
+
+class TestAsyncTradingAPI:
+    """Test concurrent queries against a local fake Bitget"""
+
+    def test_positions_checked_in_one_round_trip(self, api, fake_bitget):
+        fake_bitget.sizes = {'BTCUSDT_UMCBL': 0.5, 'XRPUSDT_UMCBL': 100}
+
+        start = time.perf_counter()
+        positions = fetch_positions(SYMBOLS, trading_api=api, max_concurrency=10)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 2 * LATENCY
+        assert list(positions) == SYMBOLS
+        assert positions['BTC/USDT'] == {'symbol': 'BTC/USDT', 'size': 0.5, 'holdSide': 'long',
+                                         'entryPrice': 1.5, 'unrealizedPL': 0.1, 'leverage': 10.0}
+        assert positions['XRP/USDT']['size'] == 100
+        assert positions['ETH/USDT'] == {'symbol': 'ETH/USDT', 'size': 0.0}
+
+    def test_semaphore_bounds_requests_in_flight(self, api, fake_bitget):
+        fetch_positions(SYMBOLS, trading_api=api, max_concurrency=3)
+        assert 1 < fake_bitget.max_active <= 3
+
+    def test_matches_sync_client(self, api, fake_bitget):
+        fake_bitget.sizes = {'BTCUSDT_UMCBL': 2}
+
+        async def query():
+            async with AsyncTradingAPI(api) as client:
+                return await asyncio.gather(client.get_position('BTC/USDT'), client.get_open_orders('BTC/USDT'),
+                                            client.get_market_data('BTC/USDT'), client.get_account_info())
+
+        position, orders, ticker, account = asyncio.run(query())
+        assert position == api.get_position('BTC/USDT')
+        assert orders == api.get_open_orders('BTC/USDT')
+        assert account == api.get_account_info()
+        assert {k: v for k, v in ticker.items() if k != 'timestamp'} == \
+               {k: v for k, v in api.get_market_data('BTC/USDT').items() if k != 'timestamp'}
+
+    def test_transient_errors_retried(self, api, fake_bitget):
+        fake_bitget.statuses = [503, 503]
+        positions = fetch_positions(['BTC/USDT'], trading_api=api)
+        assert positions['BTC/USDT'] == {'symbol': 'BTC/USDT', 'size': 0.0}
+
+        fake_bitget.statuses = [503] * 4
+        assert 'error' in fetch_positions(['BTC/USDT'], trading_api=api)['BTC/USDT']
+        assert api.get_latency_stats()['GET /api/mix/v1/position/singlePosition']['count'] == 7
+
+    def test_test_mode_is_simulated(self, api, fake_bitget):
+        api.test_mode = True
+
+        async def query():
+            async with AsyncTradingAPI(api) as client:
+                return await client.get_account_info()
+
+        assert asyncio.run(query())['available_balance'] == 10000.0
+        assert fake_bitget.max_active == 0
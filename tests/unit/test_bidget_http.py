@@ -0,0 +1,228 @@
+"""
+Unit tests for the pooled Bitget HTTP client
+"""
+import json
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.integrations import bidget
+from src.integrations.bidget import TradingAPI
+from src.utils.latency_histogram import LatencyHistogram
+
+
+class FakeBitgetHandler(BaseHTTPRequestHandler):
+    """Answers every request with the next scripted status (200 once the script runs out)"""
+
+    protocol_version = 'HTTP/1.1'  # Keep connections alive
+
+    def _respond(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.command, self.path.split('?')[0], self.client_address))
+            status = server.statuses.pop(0) if server.statuses else 200
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+
+        data = server.payloads.get(self.path.split('?')[0], {'ok': True})
+        body = json.dumps({'code': '00000', 'msg': 'success', 'data': data} if status == 200
+                          else {'code': str(status), 'msg': 'busy'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_bitget():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBitgetHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.statuses = []
+    server.payloads = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(fake_bitget, monkeypatch):
+    """TradingAPI pointed at the local fake with a fresh session and histograms"""
+    monkeypatch.setenv('BITGET_API_KEY', 'key')
+    monkeypatch.setenv('BITGET_API_SECRET', 'secret')
+    monkeypatch.setenv('BITGET_API_PASSPHRASE', 'pass')
+    monkeypatch.setenv('BITGET_HTTP_BACKOFF', '0')
+    monkeypatch.setattr(bidget, '_http_session', None)
+    monkeypatch.setattr(bidget, '_endpoint_latency', {})
+    monkeypatch.setattr(bidget, '_positions_snapshot', None)
+    trading_api = TradingAPI()
+    trading_api.base_url = f"http://127.0.0.1:{fake_bitget.server_address[1]}"
+    return trading_api
+
+
+class TestPooledSession:
+    """Test connection reuse, retries and timeouts of Bitget requests"""
+
+    def test_connection_reused_across_instances(self, api, fake_bitget):
+        for _ in range(3):
+            assert api._make_bitget_request('GET', '/api/mix/v1/market/ticker', params={'symbol': 'X'})['data']
+        other = TradingAPI()
+        other.base_url = api.base_url
+        other._make_bitget_request('GET', '/api/mix/v1/market/ticker')
+
+        client_ports = {address for _, _, address in fake_bitget.requests}
+        assert len(fake_bitget.requests) == 4
+        assert len(client_ports) == 1
+
+    def test_get_retried_on_transient_status(self, api, fake_bitget):
+        fake_bitget.statuses = [503, 429]
+        response = api._make_bitget_request('GET', '/api/mix/v1/position/allPosition')
+
+        assert response['data'] == {'ok': True}
+        assert len(fake_bitget.requests) == 3
+
+    def test_post_not_retried(self, api, fake_bitget):
+        fake_bitget.statuses = [503]
+        response = api._make_bitget_request('POST', '/api/mix/v1/order/placeOrder', data={'size': '1'})
+
+        assert 'error' in response
+        assert len(fake_bitget.requests) == 1
+
+    def test_timeouts_applied(self, api, monkeypatch):
+        monkeypatch.setenv('BITGET_CONNECT_TIMEOUT', '1.5')
+        monkeypatch.setenv('BITGET_READ_TIMEOUT', '4')
+        assert TradingAPI().timeout == (1.5, 4.0)
+
+        seen = {}
+
+        def fake_request(method, url, **kwargs):
+            seen.update(kwargs)
+            raise bidget.requests.exceptions.ReadTimeout("read timed out")
+
+        monkeypatch.setattr(bidget.get_http_session(), 'request', fake_request)
+        assert 'error' in api._make_bitget_request('GET', '/api/mix/v1/market/ticker')
+        assert seen['timeout'] == api.timeout
+
+    def test_latency_histograms_per_endpoint(self, api, fake_bitget):
+        api._make_bitget_request('GET', '/api/mix/v1/market/ticker', params={'symbol': 'A'})
+        api._make_bitget_request('GET', '/api/mix/v1/market/ticker', params={'symbol': 'B'})
+        api._make_bitget_request('GET', '/api/mix/v1/market/ticker?symbol=C')
+        fake_bitget.statuses = [400]
+        api._make_bitget_request('POST', '/api/mix/v1/order/placeOrder', data={'size': '1'})
+
+        stats = api.get_latency_stats()
+        assert list(stats) == ['GET /api/mix/v1/market/ticker', 'POST /api/mix/v1/order/placeOrder']
+        assert stats['GET /api/mix/v1/market/ticker']['count'] == 3
+        assert stats['GET /api/mix/v1/market/ticker']['errors'] == 0
+        assert stats['POST /api/mix/v1/order/placeOrder']['errors'] == 1
+        assert sum(stats['GET /api/mix/v1/market/ticker']['buckets'].values()) == 3
+
+
+class TestPositionsSnapshot:
+    """Test the shared all-positions snapshot"""
+
+    ALL_POSITIONS = '/api/mix/v1/position/allPosition'
+
+    @pytest.fixture(autouse=True)
+    def positions(self, fake_bitget):
+        fake_bitget.payloads[self.ALL_POSITIONS] = [
+            {'symbol': 'BTCUSDT_UMCBL', 'holdSide': 'short', 'total': '0'},
+            {'symbol': 'BTCUSDT_UMCBL', 'holdSide': 'long', 'total': '0.5', 'averageOpenPrice': '60000'},
+            {'symbol': 'XRPUSDT_UMCBL', 'holdSide': 'short', 'total': '100', 'averageOpenPrice': '0.5'}
+        ]
+
+    def snapshot_requests(self, fake_bitget):
+        return sum(path == self.ALL_POSITIONS for _, path, _ in fake_bitget.requests)
+
+    def test_one_request_for_all_symbols(self, api, fake_bitget):
+        positions = api.get_positions(['BTC/USDT', 'ETH/USDT', 'XRP/USDT'])
+
+        assert positions['BTC/USDT']['size'] == 0.5
+        assert positions['BTC/USDT']['holdSide'] == 'long'
+        assert positions['BTC/USDT']['entryPrice'] == 60000.0
+        assert positions['ETH/USDT'] == {'symbol': 'ETH/USDT', 'size': 0.0}
+        assert positions['XRP/USDT']['holdSide'] == 'short'
+        assert self.snapshot_requests(fake_bitget) == 1
+
+    def test_snapshot_shared_within_ttl(self, api, fake_bitget):
+        api.get_positions(['BTC/USDT'])
+        other = TradingAPI()
+        other.base_url = api.base_url
+        other.get_positions(['XRP/USDT'])
+        assert self.snapshot_requests(fake_bitget) == 1
+
+        api.get_positions(['BTC/USDT'], max_age=0)
+        assert self.snapshot_requests(fake_bitget) == 2
+
+    def test_order_requests_drop_snapshot(self, api, fake_bitget):
+        api.get_positions(['BTC/USDT'])
+        api._make_bitget_request('POST', '/api/mix/v1/order/placeOrder', data={'size': '1'})
+        api.get_positions(['BTC/USDT'])
+        assert self.snapshot_requests(fake_bitget) == 2
+
+    def test_errors_not_cached(self, api, fake_bitget):
+        fake_bitget.statuses = [400]
+        positions = api.get_positions(['BTC/USDT', 'XRP/USDT'])
+        assert all('error' in position for position in positions.values())
+
+        assert api.get_positions(['BTC/USDT'])['BTC/USDT']['size'] == 0.5
+        assert self.snapshot_requests(fake_bitget) == 2
+
+    def test_unsupported_symbols_are_errors(self, api, fake_bitget):
+        """A symbol with no USDT-M contract is reported as an error, never as flat"""
+        positions = api.get_positions(['BTC/USDT', 'SC/USDT', 'ETH/USDC'])
+        assert positions['BTC/USDT']['size'] == 0.5
+        assert 'error' in positions['SC/USDT'] and 'error' in positions['ETH/USDC']
+
+
+class TestUnsupportedSymbols:
+    """Symbols without a Bitget USDT-M contract never reach the exchange"""
+
+    @pytest.mark.parametrize('call', [
+        lambda api: api.place_order('SC/USDT', 'long', quantity=1.0),
+        lambda api: api.set_stop_loss('ETH/USDC', 1.0, 95.0, position_side='long'),
+        lambda api: api.set_take_profit('ETH/USDC', 1.0, 110.0, position_side='long'),
+        lambda api: api.cancel_order('42', 'SC/USDT'),
+        lambda api: api.get_position('SC/USDT'),
+        lambda api: api.get_market_data('SC/USDT'),
+    ])
+    def test_rejected_before_any_request(self, api, fake_bitget, call):
+        assert 'error' in call(api)
+        assert fake_bitget.requests == []
+
+    def test_open_orders_not_widened_to_all_symbols(self, api, fake_bitget):
+        assert api.get_open_orders('SC/USDT') == []
+        assert fake_bitget.requests == []
+
+
+class TestLatencyHistogram:
+    """Test bucketed latency percentiles"""
+
+    def test_percentiles_from_buckets(self):
+        histogram = LatencyHistogram(buckets_ms=(10, 100, 1000))
+        for latency_ms in [1.0] * 90 + [50.0] * 9 + [3000.0]:
+            histogram.record(latency_ms)
+
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(95) == 100
+        assert histogram.percentile(100) == 3000.0
+
+        summary = histogram.to_dict()
+        assert summary['count'] == 100
+        assert summary['buckets'] == {'<=10ms': 90, '<=100ms': 9, '<=1000ms': 0, '>1000ms': 1}
+        assert summary['min_ms'] == 1.0 and summary['max_ms'] == 3000.0
+
+    def test_empty(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(95) == 0.0
+        assert histogram.to_dict()['mean_ms'] == 0.0
@@ -0,0 +1,64 @@
+"""
+Unit tests for the candle-close scheduler
+"""
+import calendar
+import pytest
+
+from src.utils.candle_scheduler import CandleCloseScheduler
+
+
+def utc(year, month, day, hour=0, minute=0, second=0):
+    """Unix time of a UTC date"""
+    return float(calendar.timegm((year, month, day, hour, minute, second)))
+
+
+class TestNextClose:
+    """Test candle boundaries per timeframe"""
+
+    @pytest.mark.parametrize("timeframe,after,expected", [
+        ('15m', utc(2024, 3, 5, 10, 7), utc(2024, 3, 5, 10, 15)),
+        ('15m', utc(2024, 3, 5, 10, 15), utc(2024, 3, 5, 10, 30)),  # Strictly after
+        ('1h', utc(2024, 3, 5, 10, 59, 59), utc(2024, 3, 5, 11)),
+        ('4h', utc(2024, 3, 5, 10, 7), utc(2024, 3, 5, 12)),
+        ('1d', utc(2024, 3, 5, 23, 59), utc(2024, 3, 6)),
+        ('1w', utc(2024, 3, 6, 12), utc(2024, 3, 11)),  # Weekly candles open on Monday
+        ('1M', utc(2024, 12, 15), utc(2025, 1, 1)),
+    ])
+    def test_next_close(self, timeframe, after, expected):
+        assert CandleCloseScheduler.next_close(timeframe, after) == expected
+
+
+class TestNextWakeup:
+    """Test wakeups across several timeframes"""
+
+    def test_only_closing_timeframes_are_returned(self):
+        """Between hours only 15m closes; on the hour 15m and 1h close together"""
+        scheduler = CandleCloseScheduler(['15m', '1h', '4h'], settle_delay=5)
+
+        wakeup, closing = scheduler.next_wakeup(utc(2024, 3, 5, 10, 20))
+        assert wakeup == utc(2024, 3, 5, 10, 30, 5)
+        assert closing == ['15m']
+
+        wakeup, closing = scheduler.next_wakeup(utc(2024, 3, 5, 10, 50))
+        assert wakeup == utc(2024, 3, 5, 11, 0, 5)
+        assert closing == ['15m', '1h']
+
+        wakeup, closing = scheduler.next_wakeup(utc(2024, 3, 5, 11, 50))
+        assert closing == ['15m', '1h', '4h']
+
+    def test_chained_wakeups_visit_every_close(self):
+        """Stepping from each close covers every 15m boundary without gaps"""
+        scheduler = CandleCloseScheduler(['15m', '1h'], settle_delay=3)
+        after = utc(2024, 3, 5, 0, 1)
+        closes = []
+        for _ in range(8):
+            wakeup, closing = scheduler.next_wakeup(after)
+            after = wakeup - scheduler.settle_delay
+            closes.append((after, tuple(closing)))
+
+        assert [c for c, _ in closes] == [utc(2024, 3, 5, 0, 15) + 900 * i for i in range(8)]
+        assert [tf for c, tf in closes if '1h' in tf] == [('15m', '1h'), ('15m', '1h')]
+
+    def test_settle_delay_from_environment(self, monkeypatch):
+        monkeypatch.setenv('CANDLE_SETTLE_SECONDS', '2.5')
+        assert CandleCloseScheduler(['1h']).settle_delay == 2.5
@@ -0,0 +1,141 @@
+"""
+Unit tests for the Inside Bar strategy's Bitget contract metadata cache
+"""
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+BIDGET_PATH = Path(__file__).resolve().parents[2] / 'Inside=Bar:Strategy' / 'src' / 'integrations' / 'bidget.py'
+_spec = importlib.util.spec_from_file_location('inside_bar_bidget', BIDGET_PATH)
+bidget = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bidget)
+
+ContractMetadataCache = bidget.ContractMetadataCache
+
+CONTRACTS = [
+    {'symbol': 'BTCUSDT_UMCBL', 'pricePlace': '1', 'priceEndStep': '5', 'volumePlace': '3',
+     'sizeMultiplier': '0.001', 'minTradeNum': '0.001', 'minTradeUSDT': '5', 'maxLever': '125'},
+    {'symbol': 'DOGEUSDT_UMCBL', 'pricePlace': '5', 'priceEndStep': '1', 'volumePlace': '0',
+     'sizeMultiplier': '1', 'minTradeNum': '10', 'minTradeUSDT': '5', 'maxLever': '50'},
+]
+
+
+class CountingFetch:
+    """Contract list stub that counts calls"""
+
+    def __init__(self, contracts=CONTRACTS, delay=0.0, error=None):
+        self.contracts = contracts
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return self.contracts
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """TradingAPI backed by a cache of the stub contracts"""
+    monkeypatch.setattr(bidget, 'contract_cache', ContractMetadataCache(ttl=3600, fetch=CountingFetch()))
+    return bidget.TradingAPI()
+
+
+class TestContractMetadataCache:
+    """Test loading and refreshing contract rules"""
+
+    def test_parse_contract(self):
+        """Tick size combines pricePlace with priceEndStep"""
+        info = ContractMetadataCache.parse_contract(CONTRACTS[0])
+        assert info['tick_size'] == pytest.approx(0.5)
+        assert info['lot_size'] == 0.001
+        assert info['min_size'] == 0.001
+        assert info['max_leverage'] == 125
+
+    def test_loaded_once_within_ttl(self):
+        fetch = CountingFetch()
+        cache = ContractMetadataCache(ttl=3600, fetch=fetch)
+        assert cache.get('BTC/USDT')['price_place'] == 1
+        assert cache.get('BTCUSDT_UMCBL') is cache.get('BTC/USDT:USDT')
+        assert cache.get('XRP/USDT') is None
+        assert fetch.calls == 1
+
+    def test_concurrent_callers_share_one_refresh(self):
+        fetch = CountingFetch(delay=0.05)
+        cache = ContractMetadataCache(ttl=3600, fetch=fetch)
+        threads = [threading.Thread(target=cache.get, args=('BTC/USDT',)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert fetch.calls == 1
+
+    def test_fallback_list_until_loaded(self):
+        """A failed load falls back to the known symbols and is retried later"""
+        fetch = CountingFetch(error=ConnectionError("unreachable"))
+        cache = ContractMetadataCache(ttl=3600, fetch=fetch)
+        assert cache.is_listed('BTC/USDT')
+        assert not cache.is_listed('FOO/USDT')
+        assert fetch.calls == 1
+
+        fetch.error = None
+        cache._next_refresh = 0.0
+        assert cache.is_listed('DOGE/USDT')
+        assert not cache.is_listed('ETH/USDT')  # Listed in the fallback, not in the loaded contracts
+
+    def test_test_mode_stays_offline(self, monkeypatch):
+        monkeypatch.setenv('TEST_MODE', 'true')
+
+        def no_network(*args, **kwargs):
+            raise AssertionError("contracts endpoint called in test mode")
+
+        monkeypatch.setattr(bidget.requests, 'get', no_network)
+        cache = ContractMetadataCache()
+        assert cache.get('BTC/USDT') is None
+        assert cache.is_listed('BTC/USDT')
+
+
+class TestRounding:
+    """Test price and size rounding against contract rules"""
+
+    def test_price_rounds_to_tick(self, api):
+        assert api.round_price('BTC/USDT', 30000.3) == 30000.5
+        assert api.round_price('BTC/USDT', 30000.2) == 30000.0
+        assert api.round_price('DOGE/USDT', 0.123456) == 0.12346
+
+    def test_unknown_contract_uses_defaults(self, api):
+        assert api.round_price('XRP/USDT', 0.5123456) == 0.51235
+        assert api.round_quantity('XRP/USDT', 12.345678) == 12.3457
+
+    def test_quantity_floors_to_lot(self, api):
+        assert api.round_quantity('BTC/USDT', 0.0129) == 0.012
+        assert api.round_quantity('DOGE/USDT', 30.9) == 30
+
+    def test_quantity_below_minimum_is_rejected(self, api):
+        with pytest.raises(ValueError):
+            api.round_quantity('DOGE/USDT', 9.9)
+        with pytest.raises(ValueError):
+            api.round_quantity('BTC/USDT', 0.0009)
+
+    def test_undersized_order_is_not_sent(self, api, monkeypatch):
+        sent = []
+        monkeypatch.setattr(api, '_make_request', lambda *args, **kwargs: sent.append(kwargs) or {})
+        result = api.place_order_direct('DOGE/USDT', 'buy', 5)
+        assert 'error' in result
+        assert sent == []
+
+    def test_leverage_capped_at_contract_maximum(self, api, monkeypatch):
+        sent = []
+        monkeypatch.setattr(api, 'is_configured', True)
+        monkeypatch.setattr(api, 'test_mode', False)
+        monkeypatch.setattr(api, '_make_request', lambda *args, **kwargs: sent.append(kwargs['data']) or {})
+
+        api._set_leverage('BTCUSDT_UMCBL', 200)
+        api._set_leverage('DOGEUSDT_UMCBL', 20)
+        assert [params['leverage'] for params in sent] == ['125', '20']
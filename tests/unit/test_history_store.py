@@ -0,0 +1,110 @@
+"""
+Unit tests for the memory-mapped columnar history store
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.history_store import HistoryStore
+
+
+def make_candles(start=1_700_000_000_000, n=50, step=3_600_000):
+    """Create candle rows as [timestamp_ms, open, high, low, close, volume]"""
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return [[start + i * step, close[i] - 0.5, close[i] + 1.0, close[i] - 1.0, close[i], 1000.0 + i]
+            for i in range(n)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return HistoryStore(str(tmp_path / 'history'))
+
+
+class TestHistoryStore:
+    """Test writing, appending and memory-mapping history"""
+
+    def test_roundtrip_is_exact(self, store):
+        """Columns read back bit-identically, timestamps included"""
+        candles = make_candles()
+        assert store.write('BTC/USDT', '1h', candles) == 50
+
+        columns = store.load('BTC/USDT', '1h')
+        expected = np.asarray(candles)
+        assert columns['timestamp'].dtype == np.int64
+        np.testing.assert_array_equal(columns['timestamp'], [c[0] for c in candles])
+        for i, column in enumerate(HistoryStore.VALUE_COLUMNS, start=1):
+            np.testing.assert_array_equal(columns[column], expected[:, i])
+
+    def test_dataframe_is_memory_mapped(self, store):
+        """DataFrame columns share the mapped pages and are read-only"""
+        store.write('BTC/USDT', '1h', make_candles())
+        df = store.load_dataframe('BTC/USDT', '1h')
+
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert df.attrs == {'symbol': 'BTC/USDT', 'timeframe': '1h'}
+        assert df.index[0] == pd.Timestamp(1_700_000_000_000, unit='ms')
+        close = df['close'].to_numpy()
+        base = close
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+        assert not close.flags.writeable
+
+    def test_append_skips_stored_candles(self, store):
+        """Only candles newer than the last stored one are appended"""
+        candles = make_candles(n=60)
+        store.write('ETH/USDT', '1h', candles[:40])
+        assert store.append('ETH/USDT', '1h', candles[30:]) == 20
+        assert store.append('ETH/USDT', '1h', candles[50:]) == 0
+
+        np.testing.assert_array_equal(store.load('ETH/USDT', '1h')['close'], np.asarray(candles)[:, 4])
+        assert store.bounds('ETH/USDT', '1h') == (candles[0][0], candles[-1][0])
+
+    def test_load_during_rewrite_is_consistent(self, store):
+        """A reader racing backfill rewrites sees a whole series, each close on its own timestamp"""
+        candles = make_candles(n=200)
+        close_at = {candle[0]: candle[4] for candle in candles}
+        store.write('BTC/USDT', '1h', candles[100:])
+        stop = threading.Event()
+        loads, mismatches = [], []
+
+        def reader():
+            while not stop.is_set():
+                columns = store.load('BTC/USDT', '1h')
+                closes = [close_at[int(ts)] for ts in columns['timestamp']]
+                if len(closes) not in (100, 200) or not np.array_equal(columns['close'], closes):
+                    mismatches.append(len(closes))
+                loads.append(len(closes))
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        try:
+            for i in range(50):
+                store.write('BTC/USDT', '1h', candles if i % 2 == 0 else candles[100:])
+        finally:
+            stop.set()
+            thread.join()
+
+        assert loads and not mismatches
+        generations = [name for name in os.listdir(store.series_dir('BTC/USDT', '1h'))
+                       if name.startswith(HistoryStore.GENERATION_PREFIX)]
+        assert len(generations) == 2  # Current and previous only
+
+    def test_load_since(self, store):
+        """`since` selects candles opened at or after it"""
+        candles = make_candles()
+        store.write('BTC/USDT', '1h', candles)
+
+        df = store.load_dataframe('BTC/USDT', '1h', since=candles[10][0] - 1)
+        assert len(df) == 40
+        assert df.index[0] == pd.Timestamp(candles[10][0], unit='ms')
+
+    def test_empty_series(self, store):
+        """Missing series load as empty"""
+        assert store.load('XRP/USDT', '4h') == {}
+        assert store.load_dataframe('XRP/USDT', '4h').empty
+        assert store.bounds('XRP/USDT', '4h') == (None, None)
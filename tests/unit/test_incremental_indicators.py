@@ -0,0 +1,87 @@
+"""
+Unit tests for incremental (streaming) indicators
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.indicators import calculate_atr, calculate_supertrend, calculate_adx, detect_inside_bar
+from src.incremental_indicators import (
+    IncrementalATR,
+    IncrementalSupertrend,
+    IncrementalADX,
+    IncrementalInsideBar
+)
+
+
+def make_sample_ohlcv(n=300, seed=11):
+    """Create swinging OHLCV data with trends, reversals and inside bars"""
+    rng = np.random.default_rng(seed)
+    times = [datetime(2024, 1, 1) + timedelta(minutes=15 * i) for i in range(n)]
+    price = 100 + np.cumsum(rng.normal(0, 1, n)) + 10 * np.sin(np.arange(n) / 8)
+    df = pd.DataFrame({
+        'timestamp': times,
+        'open': price,
+        'high': price + np.abs(rng.normal(0, 1, n)),
+        'low': price - np.abs(rng.normal(0, 1, n)),
+        'close': price + rng.normal(0, 0.5, n),
+        'volume': rng.random(n) * 1000
+    })
+    df.set_index('timestamp', inplace=True)
+    return df
+
+
+def stream(df, indicator, columns=('high', 'low', 'close')):
+    """Feed candles one at a time and collect the outputs"""
+    return [indicator.update(*row) for row in df[list(columns)].itertuples(index=False)]
+
+
+class TestIncrementalIndicators:
+    """Test streaming indicators against the batch functions"""
+    
+    @pytest.mark.parametrize("period", [1, 10, 14])
+    def test_atr_matches_batch(self, period):
+        """Test that streaming ATR is bit-identical to calculate_atr"""
+        df = make_sample_ohlcv()
+        values = stream(df, IncrementalATR(period))
+        
+        np.testing.assert_array_equal(values, calculate_atr(df, period).to_numpy())
+    
+    @pytest.mark.parametrize("atr_period,multiplier", [(10, 3.0), (7, 1.5)])
+    def test_supertrend_matches_batch(self, atr_period, multiplier):
+        """Test that streaming Supertrend is bit-identical to calculate_supertrend"""
+        df = make_sample_ohlcv()
+        values = stream(df, IncrementalSupertrend(atr_period, multiplier))
+        st, direction = calculate_supertrend(df, atr_period, multiplier)
+        
+        assert (direction.diff().abs() > 0).any()
+        np.testing.assert_array_equal([v[0] for v in values], st.to_numpy())
+        np.testing.assert_array_equal([v[1] for v in values], direction.to_numpy())
+    
+    def test_adx_matches_batch(self):
+        """Test that streaming ADX/DI are bit-identical to calculate_adx"""
+        df = make_sample_ohlcv()
+        values = stream(df, IncrementalADX(14))
+        expected = calculate_adx(df, 14)
+        
+        for column in ['plus_di', 'minus_di', 'adx']:
+            np.testing.assert_array_equal([v[column] for v in values], expected[column].to_numpy())
+    
+    def test_inside_bar_matches_batch(self):
+        """Test that the streaming inside bar detector matches detect_inside_bar"""
+        df = make_sample_ohlcv()
+        values = stream(df, IncrementalInsideBar(), columns=('high', 'low'))
+        expected = detect_inside_bar(df)
+        
+        assert expected.any()
+        assert values == expected.tolist()
+    
+    def test_inside_bar_mother_bar(self):
+        """Test that the detector exposes the mother bar range"""
+        detector = IncrementalInsideBar()
+        detector.update(10.0, 1.0)
+        
+        assert detector.update(8.0, 2.0)
+        assert (detector.mother_bar_high, detector.mother_bar_low) == (10.0, 1.0)
+        assert not detector.update(9.0, 1.5)
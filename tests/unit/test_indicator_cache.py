@@ -0,0 +1,142 @@
+"""
+Unit tests for the shared indicator cache
+"""
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.indicators import calculate_atr, calculate_supertrend, calculate_adx
+from src.strategies import SupertrendADXStrategy, InsideBarStrategy
+from src.utils.indicator_cache import IndicatorCache
+
+
+def make_tagged_ohlcv(n=100, symbol='BTC/USDT', timeframe='15m'):
+    """Create sample OHLCV data tagged the way MarketData tags fetched candles"""
+    rng = np.random.default_rng(3)
+    times = [datetime(2024, 1, 1) + timedelta(minutes=15 * i) for i in range(n)]
+    price = np.linspace(100, 200, n) + rng.normal(0, 1, n)
+    df = pd.DataFrame({
+        'timestamp': times,
+        'open': price,
+        'high': price + np.abs(rng.normal(0, 1, n)),
+        'low': price - np.abs(rng.normal(0, 1, n)),
+        'close': price + rng.normal(0, 1, n),
+        'volume': rng.random(n) * 1000
+    })
+    df.set_index('timestamp', inplace=True)
+    df.attrs.update(symbol=symbol, timeframe=timeframe)
+    return df
+
+
+class TestIndicatorCache:
+    """Test caching, keys and eviction"""
+    
+    def test_values_match_direct_computation(self):
+        """Test that cached indicators equal the plain indicator functions"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv()
+        
+        pd.testing.assert_series_equal(cache.atr(df, 14), calculate_atr(df, 14))
+        pd.testing.assert_frame_equal(cache.adx(df, 14), calculate_adx(df, 14))
+        st, direction = cache.supertrend(df, 10, 3)
+        ref_st, ref_direction = calculate_supertrend(df, 10, 3)
+        pd.testing.assert_series_equal(st, ref_st)
+        pd.testing.assert_series_equal(direction, ref_direction)
+    
+    def test_hits_and_misses(self):
+        """Test that a repeated request is served from the cache"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv()
+        
+        first = cache.atr(df, 14)
+        assert cache.get_stats()['misses'] == 2  # ATR and the True Range under it
+        
+        second = cache.atr(df.copy(), 14)
+        assert second is first
+        assert cache.get_stats()['hits'] == 1
+    
+    def test_true_range_shared_across_indicators(self):
+        """Test that ATR, ADX and Supertrend reuse one True Range"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv()
+        
+        cache.atr(df, 14)
+        cache.adx(df, 14)
+        cache.supertrend(df, 10, 3)
+        
+        # true_range computed once, then reused by adx and the supertrend ATR
+        assert cache.get_stats()['hits'] == 2
+    
+    def test_forming_candle_changes_key(self):
+        """Test that an update to the last candle is not served stale values"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv()
+        first = cache.atr(df, 14)
+        
+        updated = df.copy()
+        updated.loc[updated.index[-1], 'high'] += 5
+        second = cache.atr(updated, 14)
+        
+        assert second is not first
+        assert second.iloc[-1] > first.iloc[-1]
+    
+    def test_untagged_frames_bypass_cache(self):
+        """Test that frames without symbol/timeframe are computed but not stored"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv()
+        df.attrs.clear()
+        
+        cache.atr(df, 14)
+        cache.atr(df, 14)
+        
+        stats = cache.get_stats()
+        assert stats['entries'] == 0
+        assert stats['hits'] == 0 and stats['misses'] == 0
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = IndicatorCache(max_entries=2)
+        df = make_tagged_ohlcv()
+        
+        cache.get(df, 'a', (), lambda: 1)
+        cache.get(df, 'b', (), lambda: 2)
+        cache.get(df, 'a', (), lambda: 1)  # 'a' is now most recent
+        cache.get(df, 'c', (), lambda: 3)  # evicts 'b'
+        
+        assert cache.get(df, 'a', (), lambda: -1) == 1
+        assert cache.get(df, 'b', (), lambda: -2) == -2
+        assert cache.get_stats()['evictions'] == 2
+    
+    def test_strategies_share_indicators(self):
+        """Test that strategies on the same candles produce identical output through the cache"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv(200)
+        
+        untagged = df.copy()
+        untagged.attrs.clear()
+        expected = SupertrendADXStrategy(cache=IndicatorCache()).generate_signals(untagged)
+        
+        InsideBarStrategy(cache=cache).generate_signals(df)
+        signals = SupertrendADXStrategy(cache=cache).generate_signals(df)
+        
+        assert cache.get_stats()['hits'] > 0
+        pd.testing.assert_frame_equal(signals, expected, check_flags=False)
+    
+    def test_supertrend_batch_fills_single_entries(self):
+        """Test that a batch computes only uncached pairs and serves later single lookups"""
+        cache = IndicatorCache()
+        df = make_tagged_ohlcv(200)
+        cached = cache.supertrend(df, 10, 3)
+        
+        results = cache.supertrend_batch(df, [10, 7, 14], [3, 2.0, 1.5])
+        
+        assert results[0] is cached
+        for (st, direction), (period, multiplier) in zip(results[1:], [(7, 2.0), (14, 1.5)]):
+            ref_st, ref_direction = calculate_supertrend(df, period, multiplier)
+            pd.testing.assert_series_equal(st, ref_st)
+            pd.testing.assert_series_equal(direction, ref_direction)
+        
+        hits = cache.get_stats()['hits']
+        assert cache.supertrend(df, 14, 1.5) is results[2]
+        assert cache.get_stats()['hits'] == hits + 1
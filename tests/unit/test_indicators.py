@@ -8,10 +8,19 @@ from datetime import datetime, timedelta
 
 # Import indicators to test
 try:
-    from src.indicators import calculate_supertrend, calculate_adx, calculate_atr, detect_inside_bar
+    from src.indicators import (
+        calculate_supertrend, calculate_adx, calculate_atr, detect_inside_bar,
+        is_atr_in_bottom_percentile, rolling_percentile_rank, percentile_rank_last,
+        calculate_supertrend_batch, _supertrend_batch_kernel
+    )
 except ImportError:
     # Fallback for different project structure
-    from Inside.Bar.Strategy.src.indicators import calculate_supertrend, calculate_adx, calculate_atr, detect_inside_bar
+    from Inside.Bar.Strategy.src.indicators import (
+        calculate_supertrend, calculate_adx, calculate_atr, detect_inside_bar,
+        is_atr_in_bottom_percentile, rolling_percentile_rank, percentile_rank_last
+    )
+
+from tests.reference_indicators import reference_supertrend, reference_atr_in_bottom_percentile
 
 
 def make_sample_ohlcv(n=100):
@@ -66,6 +75,82 @@ class TestSupertrendIndicator:
         assert not st1.equals(st2)  # Different parameters should give different results
 
 
+class TestSupertrendParity:
+    """Test the array kernel against the per-row reference implementation"""
+    
+    @pytest.mark.parametrize("n", [1, 2, 50, 500])
+    def test_supertrend_matches_reference(self, n):
+        """Test that supertrend and direction are bit-identical to the reference loop"""
+        df = make_sample_ohlcv(n)
+        st, direction = calculate_supertrend(df, atr_period=10, multiplier=3)
+        ref_st, ref_direction = reference_supertrend(df, atr_period=10, multiplier=3)
+        
+        pd.testing.assert_series_equal(st, ref_st, check_exact=True)
+        pd.testing.assert_series_equal(direction, ref_direction, check_exact=True)
+    
+    def test_supertrend_parity_on_choppy_data(self):
+        """Test parity on mean-reverting data where the direction flips often"""
+        df = make_sample_ohlcv(300)
+        swing = 20 * np.sin(np.arange(300) / 5)
+        for col in ['open', 'high', 'low', 'close']:
+            df[col] = df[col] + swing
+        
+        st, direction = calculate_supertrend(df, atr_period=7, multiplier=1.5)
+        ref_st, ref_direction = reference_supertrend(df, atr_period=7, multiplier=1.5)
+        
+        assert (direction.diff().abs() > 0).sum() > 2
+        pd.testing.assert_series_equal(st, ref_st, check_exact=True)
+        pd.testing.assert_series_equal(direction, ref_direction, check_exact=True)
+
+
+class TestSupertrendBatch:
+    """Test the multi-parameter Supertrend against single-parameter calls"""
+    
+    PERIODS = [7, 10, 14, 7, 10, 14, 7, 10, 14, 21, 21, 5]
+    MULTIPLIERS = [1.5, 1.5, 1.5, 2.0, 2.0, 2.0, 3.0, 3.0, 3.0, 1.0, 4.0, 2.5]
+    
+    def choppy_ohlcv(self, n=400):
+        df = make_sample_ohlcv(n)
+        swing = 20 * np.sin(np.arange(n) / 5)
+        for col in ['open', 'high', 'low', 'close']:
+            df[col] = df[col] + swing
+        return df
+    
+    @pytest.mark.parametrize("pairs", [1, 3, 12])
+    def test_columns_match_single_calls(self, pairs):
+        """Test that every column is bit-identical to calculate_supertrend"""
+        df = self.choppy_ohlcv()
+        st, direction = calculate_supertrend_batch(df, self.PERIODS[:pairs], self.MULTIPLIERS[:pairs])
+        
+        assert st.shape == direction.shape == (len(df), pairs)
+        for j in range(pairs):
+            expected_st, expected_direction = calculate_supertrend(df, self.PERIODS[j], self.MULTIPLIERS[j])
+            np.testing.assert_array_equal(st[:, j], expected_st.to_numpy())
+            np.testing.assert_array_equal(direction[:, j], expected_direction.to_numpy())
+    
+    def test_row_vectorized_kernel(self):
+        """Test the NumPy batch kernel directly (bypassed when numba is installed)"""
+        df = self.choppy_ohlcv()
+        close = df['close'].to_numpy()
+        hl2 = ((df['high'] + df['low']) / 2).to_numpy()[:, None]
+        atr = np.column_stack([calculate_atr(df, period).to_numpy() for period in self.PERIODS])
+        offset = np.asarray(self.MULTIPLIERS) * atr
+        
+        st, direction = _supertrend_batch_kernel(close, hl2 + offset, hl2 - offset)
+        expected = calculate_supertrend_batch(df, self.PERIODS, self.MULTIPLIERS)
+        
+        assert (np.abs(np.diff(direction, axis=0)) > 0).sum() > 10
+        np.testing.assert_array_equal(st, expected[0])
+        np.testing.assert_array_equal(direction, expected[1])
+    
+    def test_empty_and_mismatched_inputs(self):
+        df = make_sample_ohlcv(0)
+        st, direction = calculate_supertrend_batch(df, [10, 14], [3.0, 2.0])
+        assert st.shape == (0, 2)
+        with pytest.raises(ValueError):
+            calculate_supertrend_batch(make_sample_ohlcv(10), [10, 14], [3.0])
+
+
 class TestADXIndicator:
     """Test ADX indicator calculations"""
     
@@ -154,4 +239,41 @@ class TestInsideBarDetection:
         flags = detect_inside_bar(data)
         
         # Should detect inside bars at positions 1 and 2
-        assert flags.tolist() == [False, True, True, False] 
\ No newline at end of file
+        assert flags.tolist() == [False, True, True, False]
+
+
+class TestATRPercentile:
+    """Test the rolling ATR percentile rank"""
+    
+    @pytest.mark.parametrize("lookback", [5, 50])
+    def test_bottom_percentile_matches_reference(self, lookback):
+        """Test that the low-volatility flags match the rolling().apply() path"""
+        df = make_sample_ohlcv(300)
+        flags = is_atr_in_bottom_percentile(df, atr_period=14, lookback=lookback, percentile=30)
+        expected = reference_atr_in_bottom_percentile(df, atr_period=14, lookback=lookback, percentile=30)
+        
+        pd.testing.assert_series_equal(flags, expected)
+    
+    def test_rank_with_ties_and_nans(self):
+        """Test average ranks for ties and NaN handling against pandas"""
+        values = pd.Series([1.0, 2.0, 2.0, np.nan, 3.0, 1.0, 2.0, 2.0, 2.0, 5.0, 1.0, 1.0])
+        ranks = rolling_percentile_rank(values, 3)
+        expected = values.rolling(window=3).apply(lambda x: pd.Series(x).rank(pct=True).iloc[-1] * 100, raw=False)
+        
+        pd.testing.assert_series_equal(ranks, expected)
+    
+    def test_window_longer_than_data(self):
+        """Test that ranks stay NaN until the window is full"""
+        ranks = rolling_percentile_rank(pd.Series([1.0, 2.0, 3.0]), 5)
+        
+        assert ranks.isna().all()
+    
+    def test_last_rank_matches_rolling(self):
+        """Test that ranking only the newest value matches the rolling rank"""
+        values = pd.Series([1.0, 2.0, 2.0, np.nan, 3.0, 1.0, 2.0, 2.0, 2.0, 5.0, 1.0, 1.0])
+        ranks = rolling_percentile_rank(values, 3)
+        
+        for end in range(1, len(values) + 1):
+            last = percentile_rank_last(values.to_numpy()[:end], 3)
+            assert last == ranks.iloc[end - 1] or (np.isnan(last) and np.isnan(ranks.iloc[end - 1]))
+
@@ -0,0 +1,186 @@
+"""
+Unit tests for websocket kline ingestion
+"""
+import json
+import time
+import pytest
+
+from src.kline_stream import (
+    AIOHTTP_AVAILABLE, CandleBuffer, KlineReplayServer, KlineStream,
+    parse_kline_frame, parse_ticker_frame, stream_name
+)
+
+pytestmark = pytest.mark.skipif(not AIOHTTP_AVAILABLE, reason="aiohttp not installed")
+
+MINUTE_MS = 60_000
+START_MS = 1_700_000_040_000  # A minute boundary
+
+
+def kline_frame(symbol_id, timeframe, open_time, close, closed):
+    """Binance combined-stream kline frame"""
+    return {
+        'stream': f"{symbol_id.lower()}@kline_{timeframe}",
+        'data': {
+            'e': 'kline', 'E': open_time + 1, 's': symbol_id,
+            'k': {'t': open_time, 'T': open_time + MINUTE_MS - 1, 's': symbol_id, 'i': timeframe,
+                  'o': str(close - 1), 'h': str(close + 1), 'l': str(close - 2), 'c': str(close),
+                  'v': '100.0', 'x': closed}
+        }
+    }
+
+
+def ticker_frame(symbol_id, price):
+    """Binance combined-stream mini ticker frame"""
+    return {'stream': f"{symbol_id.lower()}@miniTicker",
+            'data': {'e': '24hrMiniTicker', 's': symbol_id, 'c': str(price)}}
+
+
+def recorded_session(candles=5):
+    """Forming updates followed by the final frame for each minute candle, plus tickers"""
+    frames = []
+    for i in range(candles):
+        open_time = START_MS + i * MINUTE_MS
+        frames.append(kline_frame('BTCUSDT', '1m', open_time, 100.0 + i - 0.5, False))
+        frames.append(kline_frame('ETHUSDT', '1m', open_time, 10.0 + i, False))
+        frames.append(kline_frame('BTCUSDT', '1m', open_time, 100.0 + i, True))
+        frames.append(kline_frame('ETHUSDT', '1m', open_time, 10.0 + i, True))
+    frames.append(ticker_frame('BTCUSDT', 104.5))
+    frames.append(kline_frame('BTCUSDT', '1m', START_MS + candles * MINUTE_MS, 105.0, False))
+    return frames
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def replay_server():
+    server = KlineReplayServer(recorded_session())
+    server.start()
+    yield server
+    server.stop()
+
+
+class TestFrameParsing:
+    """Test stream names and frame parsing"""
+
+    def test_stream_names(self):
+        assert stream_name('BTC/USDT', '15m') == 'btcusdt@kline_15m'
+        assert stream_name('BTC/USDT:USDT', '1h') == 'btcusdt@kline_1h'
+        assert stream_name('ETH/USDT') == 'ethusdt@miniTicker'
+
+    def test_parse_kline_and_ticker(self):
+        frame = kline_frame('BTCUSDT', '1m', START_MS, 101.0, True)
+        assert parse_kline_frame(frame) == ('BTCUSDT', '1m', [START_MS, 100.0, 102.0, 99.0, 101.0, 100.0], True)
+        assert parse_kline_frame(frame['data']) == parse_kline_frame(frame)
+        assert parse_ticker_frame(ticker_frame('BTCUSDT', 3.5)) == ('BTCUSDT', 3.5)
+        assert parse_kline_frame(ticker_frame('BTCUSDT', 3.5)) is None
+        assert parse_ticker_frame(frame) is None
+
+
+class TestCandleBuffer:
+    """Test the rolling candle buffer"""
+
+    def test_closed_candles_roll_and_emit_once(self):
+        buffer = CandleBuffer('BTC/USDT', '1m', maxlen=3)
+        for i in range(5):
+            candle = [START_MS + i * MINUTE_MS, 1.0, 2.0, 0.5, 1.5 + i, 10.0]
+            assert buffer.update(candle, closed=False) is False
+            assert buffer.update(candle, closed=True) is True
+            assert buffer.update(candle, closed=True) is False  # Repeated final frame
+
+        assert [c[0] for c in buffer.closed] == [START_MS + i * MINUTE_MS for i in (2, 3, 4)]
+        assert buffer.forming is None
+        assert not buffer.gapped
+
+    def test_dataframe_matches_rest_format(self):
+        buffer = CandleBuffer('BTC/USDT', '1m')
+        buffer.update([START_MS, 1.0, 2.0, 0.5, 1.5, 10.0], closed=True)
+        buffer.update([START_MS + MINUTE_MS, 1.5, 2.5, 1.0, 2.0, 5.0], closed=False)
+
+        df = buffer.to_dataframe()
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert df.index.name == 'timestamp'
+        assert len(df) == 2
+        assert df['close'].iloc[-1] == 2.0
+        assert df.attrs == {'symbol': 'BTC/USDT', 'timeframe': '1m'}
+        assert len(buffer.to_dataframe(include_forming=False)) == 1
+
+    def test_seed_keeps_newer_streamed_candles(self):
+        buffer = CandleBuffer('BTC/USDT', '1m')
+        buffer.update([START_MS + 3 * MINUTE_MS, 1.0, 2.0, 0.5, 9.0, 10.0], closed=True)
+
+        # REST history ends with the candle that is still forming at now_ms
+        rest = [[START_MS + i * MINUTE_MS, 1.0, 2.0, 0.5, 1.0 + i, 10.0] for i in range(4)]
+        buffer.seed(rest, now_ms=START_MS + 3 * MINUTE_MS + 1)
+
+        assert [c[0] for c in buffer.closed] == [START_MS + i * MINUTE_MS for i in range(4)]
+        assert buffer.closed[-1][4] == 9.0  # Final streamed values win over the forming REST row
+        assert buffer.forming is None
+
+    def test_missed_candle_marks_gap_until_reseeded(self):
+        buffer = CandleBuffer('BTC/USDT', '1m')
+        buffer.update([START_MS, 1.0, 2.0, 0.5, 1.5, 10.0], closed=True)
+        buffer.update([START_MS + 2 * MINUTE_MS, 1.0, 2.0, 0.5, 1.5, 10.0], closed=True)
+        assert buffer.gapped
+
+        buffer.seed([[START_MS + i * MINUTE_MS, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(3)],
+                    now_ms=START_MS + 10 * MINUTE_MS)
+        assert not buffer.gapped
+        assert len(buffer.closed) == 3
+
+
+class TestReplayedStream:
+    """Test the stream against recorded frames served by the local replay server"""
+
+    def test_buffers_prices_and_closed_events(self, replay_server):
+        events = []
+        stream = KlineStream(['BTC/USDT', 'ETH/USDT'], ['1m'], url=replay_server.url,
+                             on_candle_closed=lambda symbol, timeframe, df: events.append((symbol, timeframe, len(df))))
+        stream.start()
+        try:
+            assert wait_for(lambda: stream.frames_received == len(replay_server.frames))
+        finally:
+            stream.stop()
+
+        assert stream.candles_closed == 10
+        assert events[:4] == [('BTC/USDT', '1m', 1), ('ETH/USDT', '1m', 1),
+                              ('BTC/USDT', '1m', 2), ('ETH/USDT', '1m', 2)]
+        assert stream.prices == {'BTC/USDT': 104.5}
+
+        df = stream.get_buffer('BTC/USDT', '1m').to_dataframe()
+        assert df['close'].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0, 105.0]
+        assert stream.get_buffer('ETH/USDT', '1m').forming is None
+
+    def test_subscribes_to_kline_and_ticker_streams(self):
+        stream = KlineStream(['BTC/USDT'], ['15m', '1h'], url='ws://127.0.0.1:1/stream')
+        assert stream.subscribe_url == ('ws://127.0.0.1:1/stream?streams='
+                                        'btcusdt@kline_15m/btcusdt@kline_1h/btcusdt@miniTicker')
+
+    def test_recording_replays_identically(self, replay_server, tmp_path):
+        path = str(tmp_path / 'session.jsonl')
+        stream = KlineStream(['BTC/USDT', 'ETH/USDT'], ['1m'], url=replay_server.url, record_path=path)
+        stream.start()
+        try:
+            assert wait_for(lambda: stream.frames_received == len(replay_server.frames))
+        finally:
+            stream.stop()
+
+        with open(path) as f:
+            assert [json.loads(line) for line in f] == replay_server.frames
+
+        server = KlineReplayServer.from_file(path)
+        server.start()
+        replayed = KlineStream(['BTC/USDT', 'ETH/USDT'], ['1m'], url=server.url)
+        replayed.start()
+        try:
+            assert wait_for(lambda: replayed.frames_received == len(server.frames))
+        finally:
+            replayed.stop()
+            server.stop()
+        assert list(replayed.get_buffer('BTC/USDT', '1m').closed) == list(stream.get_buffer('BTC/USDT', '1m').closed)
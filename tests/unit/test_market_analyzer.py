@@ -0,0 +1,104 @@
+"""
+Unit tests for the market analyzer
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.utils.market_analyzer import MarketAnalyzer, MarketRegime, RegimeTimeline
+from tests.reference_indicators import reference_regime_timeline, reference_rsi_divergence
+
+
+def make_candles(n=600, seed=5, volatility=0.01, gapped=False):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, volatility, n)))
+    # Gapped candles take high/low from the open only, so the close can leave the bar range
+    base = np.concatenate([[100.0], close[:-1]]) if gapped else close
+    df = pd.DataFrame({
+        'open': base,
+        'high': base * (1 + np.abs(rng.normal(0, 0.004, n))),
+        'low': base * (1 - np.abs(rng.normal(0, 0.004, n))),
+        'close': close,
+        'volume': rng.uniform(1, 10, n)
+    }, index=pd.DatetimeIndex(pd.date_range('2024-01-01', periods=n, freq='15min'), name='timestamp'))
+    return MarketAnalyzer().calculate_rsi(df, 14)
+
+
+@pytest.fixture
+def analyzer():
+    return MarketAnalyzer()
+
+
+class TestRsiDivergence:
+    """Test vectorized RSI divergence against the per-bar window scan"""
+
+    @pytest.mark.parametrize('gapped', [False, True])
+    @pytest.mark.parametrize('seed', [1, 5])
+    @pytest.mark.parametrize('lookback', [5, 10])
+    def test_matches_reference(self, analyzer, seed, lookback, gapped):
+        df = make_candles(seed=seed, gapped=gapped)
+        result = analyzer.detect_rsi_divergence(df, lookback)
+        expected = reference_rsi_divergence(df, lookback)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_detects_both_directions(self, analyzer):
+        result = analyzer.detect_rsi_divergence(make_candles(n=3000, seed=2, volatility=0.02, gapped=True))
+        assert result['bullish_divergence'].any()
+        assert result['bearish_divergence'].any()
+        # The warm-up bars without a full window are never flagged
+        assert not result[['bullish_divergence', 'bearish_divergence']].iloc[:10].any().any()
+
+    def test_short_frame(self, analyzer):
+        df = make_candles(n=8)
+        result = analyzer.detect_rsi_divergence(df, lookback=10)
+        assert not result['bullish_divergence'].any() and not result['bearish_divergence'].any()
+        assert 'bullish_divergence' not in df
+
+
+class TestBacktestRegimes:
+    """Test vectorized regime backtests against the per-bar classification"""
+
+    def test_matches_reference(self, analyzer):
+        df = make_candles(n=2000, seed=3, volatility=0.006)
+        results = analyzer.backtest_regimes({'BTC/USDT': df})
+
+        indicators = analyzer.calculate_volatility(analyzer.calculate_adx(df.copy(deep=False),
+                                                                          period=analyzer.config['trend_period']),
+                                                   period=analyzer.config['volatility_period'])
+        expected = reference_regime_timeline(analyzer, indicators)
+        timeline = results['regime_timeline']
+
+        assert results['success'] and isinstance(timeline, RegimeTimeline)
+        assert results['total_periods'] == len(timeline) == len(expected)
+        pd.testing.assert_frame_equal(pd.DataFrame(timeline.to_dicts()), pd.DataFrame(expected),
+                                      check_dtype=False)
+
+        names = [r['regime'] for r in expected]
+        assert len(set(names)) > 2
+        for regime in MarketRegime:
+            assert results['regimes'][regime.name]['count'] == names.count(regime.name)
+        assert sum(stats['percentage'] for stats in results['regimes'].values()) == pytest.approx(100.0)
+
+        transitions = {}
+        for prev_regime, curr_regime in zip(names, names[1:]):
+            if prev_regime != curr_regime:
+                key = f"{prev_regime}->{curr_regime}"
+                transitions[key] = transitions.get(key, 0) + 1
+        assert list(results['transitions'].items()) == list(transitions.items())
+
+    def test_timeline_frame(self, analyzer):
+        timeline = analyzer.backtest_regimes({'BTC/USDT': make_candles(n=300)})['regime_timeline']
+        frame = timeline.to_frame()
+
+        assert len(frame) == len(timeline)
+        assert frame['regime'].tolist() == [record['regime'] for record in timeline]
+        assert timeline[0]['timestamp'] == frame.index[0].isoformat()
+
+    def test_short_history_and_missing_symbol(self, analyzer):
+        results = analyzer.backtest_regimes({'BTC/USDT': make_candles(n=20)})
+        assert results['success'] and results['total_periods'] == 0
+        assert results['transitions'] == {} and results['regime_timeline'].to_dicts() == []
+        assert all(stats['count'] == 0 for stats in results['regimes'].values())
+
+        assert analyzer.backtest_regimes({'ETH/USDT': make_candles(n=20)})['success'] is False
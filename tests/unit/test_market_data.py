@@ -0,0 +1,354 @@
+"""
+Unit tests for market data fetching
+"""
+import time
+import threading
+import pytest
+import pandas.testing as pd_testing
+
+from src.market_data import MarketData, RateLimiter
+from src.kline_stream import AIOHTTP_AVAILABLE, KlineReplayServer
+from src.utils.candle_store import CandleStore
+from src.utils.history_store import HistoryStore
+
+
+class FakeExchange:
+    """Minimal ccxt stand-in that records calls and simulates network latency"""
+
+    def __init__(self, latency=0.05, rate_limit=0, prices=None, failing=()):
+        self.latency = latency
+        self.rateLimit = rate_limit
+        self.prices = prices or {}
+        self.failing = set(failing)
+        self.bulk_ticker_fails = False
+        self.ticker_calls = 0
+        self.bulk_ticker_calls = 0
+        self.call_starts = []
+        self.ohlcv_calls = []
+        self.now_ms = 1_700_000_000_000
+        self.forming_close = 0.0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def parse_timeframe(timeframe):
+        return {'1m': 60, '15m': 900, '1h': 3600, '4h': 14400}[timeframe]
+
+    def milliseconds(self):
+        return self.now_ms
+
+    def candles(self, timeframe, since=None, limit=100):
+        """Deterministic candles up to the currently forming one"""
+        timeframe_ms = self.parse_timeframe(timeframe) * 1000
+        forming = self.now_ms // timeframe_ms * timeframe_ms
+        if since is None:
+            start = forming - (limit - 1) * timeframe_ms
+        else:
+            start = -(-since // timeframe_ms) * timeframe_ms
+        rows = []
+        for ts in range(start, min(forming, start + (limit - 1) * timeframe_ms) + 1, timeframe_ms):
+            k = float(ts // timeframe_ms % 7)
+            close = 1.5 + k + (self.forming_close if ts == forming else 0.0)
+            rows.append([ts, 1.0 + k, 2.0 + k, 0.5 + k, close, 10.0 + k])
+        return rows
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=100):
+        with self._lock:
+            self.call_starts.append(time.monotonic())
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.latency)
+            if (symbol, timeframe) in self.failing:
+                raise ConnectionError("simulated network failure")
+            with self._lock:
+                self.ohlcv_calls.append({'symbol': symbol, 'timeframe': timeframe, 'since': since, 'limit': limit})
+            return self.candles(timeframe, since, limit)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def fetch_ticker(self, symbol):
+        self.ticker_calls += 1
+        return {'last': self.prices.get(symbol)}
+
+    def fetch_tickers(self, symbols=None):
+        self.bulk_ticker_calls += 1
+        if self.bulk_ticker_fails:
+            raise NotImplementedError("fetchTickers not supported")
+        return {symbol: {'symbol': symbol, 'last': price} for symbol, price in self.prices.items()}
+
+
+@pytest.fixture
+def market_data(monkeypatch):
+    """MarketData wired to a fake exchange"""
+    monkeypatch.setenv('FUTURES_MARKETS', 'BTC/USDT,ETH/USDT,XRP/USDT,DOGE/USDT')
+    monkeypatch.setenv('TIMEFRAMES', '15m,1h,4h')
+    monkeypatch.setenv('LOW_PRICE_FILTER', 'false')
+    monkeypatch.setenv('SCAN_CONCURRENCY', '6')
+    md = MarketData(test_mode=True)
+    md.test_mode = False
+    md.exchange = FakeExchange()
+    return md
+
+
+class TestConcurrentScan:
+    """Test concurrent OHLCV fetching in scan_all_markets"""
+
+    def test_result_structure_and_order(self, market_data):
+        """Nested dict keeps configured symbol and timeframe order"""
+        data = market_data.scan_all_markets()
+
+        assert list(data.keys()) == market_data.markets
+        for symbol in market_data.markets:
+            assert list(data[symbol].keys()) == market_data.timeframes
+            for timeframe, df in data[symbol].items():
+                assert len(df) == 100
+                assert df.attrs == {'symbol': symbol, 'timeframe': timeframe}
+
+    def test_fetches_run_concurrently_within_limit(self, market_data):
+        """Requests overlap but never exceed the configured concurrency"""
+        start = time.perf_counter()
+        market_data.scan_all_markets()
+        elapsed = time.perf_counter() - start
+
+        sequential = 12 * market_data.exchange.latency
+        assert elapsed < sequential / 2
+        assert 1 < market_data.exchange.max_active <= market_data.max_concurrency
+
+    def test_failed_fetch_is_skipped_and_recorded(self, market_data):
+        """A failing request leaves its slot empty and is recorded as a failure"""
+        market_data.exchange.failing = {('ETH/USDT', '1h')}
+        data = market_data.scan_all_markets()
+
+        assert 'ETH/USDT' in data
+        assert list(data['ETH/USDT'].keys()) == ['15m', '4h']
+
+        stats = market_data.get_fetch_stats()
+        assert stats['requests'] == 12
+        assert stats['failures'] == 1
+        assert stats['p50_ms'] >= market_data.exchange.latency * 1000 * 0.9
+        assert len(market_data.fetch_latencies) == 12
+        assert market_data.fetch_latencies[0]['symbol'] == 'BTC/USDT'
+        assert market_data.fetch_latencies[0]['timeframe'] == '15m'
+
+    def test_rate_limit_is_respected(self, market_data):
+        """Request starts are spaced by the exchange rate limit across workers"""
+        market_data.exchange = FakeExchange(latency=0.0, rate_limit=20)
+        market_data.rate_limiter = RateLimiter(0.02)
+        scan_start = time.monotonic()
+        market_data.scan_all_markets()
+
+        # Slots are reserved 20ms apart; thread wakeup jitter can only delay a start
+        starts = sorted(market_data.exchange.call_starts)
+        assert len(starts) == 12
+        assert starts[-1] - scan_start >= 11 * 0.02
+
+    def test_latency_excludes_limiter_wait(self, market_data):
+        """Recorded latency covers the request only, not the wait for a slot"""
+        market_data.exchange = FakeExchange(latency=0.0, rate_limit=50)
+        market_data.rate_limiter = RateLimiter(0.05)
+        market_data.scan_all_markets()
+
+        # Queued workers wait up to 11 slots (550ms); the requests themselves are instant
+        assert max(record['latency_ms'] for record in market_data.fetch_latencies) < 40
+
+    def test_low_price_filter(self, market_data, monkeypatch):
+        """High-priced markets are dropped before fetching"""
+        monkeypatch.setenv('LOW_PRICE_FILTER', 'true')
+        market_data.exchange.prices = {'BTC/USDT': 60000.0, 'ETH/USDT': 3000.0,
+                                       'XRP/USDT': 0.5, 'DOGE/USDT': 0.1}
+        data = market_data.scan_all_markets()
+
+        assert list(data.keys()) == ['XRP/USDT', 'DOGE/USDT']
+
+
+@pytest.mark.skipif(not AIOHTTP_AVAILABLE, reason="aiohttp not installed")
+class TestStreamedCandles:
+    """Test serving scans from websocket candle buffers fed by the replay server"""
+
+    @staticmethod
+    def frames(open_time):
+        """Final frame of the candle forming at open_time, the next forming update and a ticker"""
+        def kline(t, close, closed):
+            return {'stream': 'btcusdt@kline_1m',
+                    'data': {'e': 'kline', 's': 'BTCUSDT',
+                             'k': {'t': t, 's': 'BTCUSDT', 'i': '1m', 'o': '1.0', 'h': '50.0', 'l': '0.5',
+                                   'c': str(close), 'v': '7.0', 'x': closed}}}
+        return [kline(open_time, 42.0, True), kline(open_time + 60_000, 43.0, False),
+                {'stream': 'btcusdt@miniTicker', 'data': {'e': '24hrMiniTicker', 's': 'BTCUSDT', 'c': '43.0'}}]
+
+    def test_scan_served_from_stream_buffers(self, market_data, monkeypatch):
+        exchange = market_data.exchange
+        exchange.latency = 0.0
+        forming = exchange.now_ms // 60_000 * 60_000
+        server = KlineReplayServer(self.frames(forming))
+        server.start()
+        monkeypatch.setenv('KLINE_STREAM_URL', server.url)
+        market_data.markets = ['BTC/USDT']
+        market_data.timeframes = ['1m']
+        market_data.stream_enabled = True
+        market_data.stream_buffer_size = 200
+
+        closed = []
+        try:
+            assert market_data.start_stream(on_candle_closed=lambda *event: closed.append(event[:2]))
+            stream = market_data.kline_stream
+            deadline = time.monotonic() + 10
+            while stream.frames_received < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            seed_calls = len(exchange.ohlcv_calls)
+
+            df = market_data.fetch_ohlcv_data('BTC/USDT', '1m', limit=100)
+            assert len(exchange.ohlcv_calls) == seed_calls  # No REST request
+            assert len(df) == 100
+            assert df['close'].iloc[-2:].tolist() == [42.0, 43.0]
+            assert df.index[-1].value // 10**6 == forming + 60_000
+            assert df.attrs == {'symbol': 'BTC/USDT', 'timeframe': '1m'}
+            assert closed == [('BTC/USDT', '1m')]
+            assert market_data.get_ticker_prices(['BTC/USDT']) == {'BTC/USDT': 43.0}
+            assert exchange.bulk_ticker_calls == 0
+        finally:
+            market_data.stop_stream()
+            server.stop()
+
+        # Without the stream, scans poll REST again
+        market_data.fetch_ohlcv_data('BTC/USDT', '1m', limit=100)
+        assert len(exchange.ohlcv_calls) == seed_calls + 1
+
+    def test_disabled_without_flag(self, market_data):
+        assert market_data.start_stream() is False
+        assert market_data.kline_stream is None
+
+
+class TestTickerPrices:
+    """Test the bulk ticker snapshot used by the low-price filter"""
+
+    PRICES = {'BTC/USDT': 60000.0, 'ETH/USDT': 3000.0, 'XRP/USDT': 0.5}
+
+    def test_single_bulk_request(self, market_data):
+        """All prices come from one fetch_tickers call"""
+        market_data.exchange.prices = dict(self.PRICES)
+        prices = market_data.get_ticker_prices(market_data.markets)
+
+        assert prices == {**self.PRICES, 'DOGE/USDT': None}
+        assert market_data.exchange.bulk_ticker_calls == 1
+        assert market_data.exchange.ticker_calls == 0
+
+    def test_snapshot_reused_within_ttl(self, market_data):
+        """A second lookup inside the TTL makes no request"""
+        market_data.exchange.prices = dict(self.PRICES)
+        market_data.get_ticker_prices(market_data.markets)
+        market_data.get_ticker_prices(['BTC/USDT'])
+        assert market_data.exchange.bulk_ticker_calls == 1
+
+        market_data.ticker_ttl = 0
+        market_data.get_ticker_prices(['BTC/USDT'])
+        assert market_data.exchange.bulk_ticker_calls == 2
+
+    def test_falls_back_to_per_symbol_requests(self, market_data):
+        """A failing bulk request falls back to fetch_ticker per symbol"""
+        market_data.exchange.prices = dict(self.PRICES)
+        market_data.exchange.bulk_ticker_fails = True
+        prices = market_data.get_ticker_prices(market_data.markets)
+
+        assert prices['XRP/USDT'] == 0.5
+        assert market_data.exchange.ticker_calls == len(market_data.markets)
+
+
+@pytest.fixture
+def stored_market_data(market_data, tmp_path):
+    """MarketData wired to a fake exchange and an on-disk candle store"""
+    market_data.exchange.latency = 0.0
+    market_data.candle_store = CandleStore(str(tmp_path / 'candles.db'))
+    yield market_data
+    market_data.candle_store.close()
+
+
+class TestCandleStore:
+    """Test the persistent candle store and incremental fetching"""
+
+    def test_append_replaces_and_loads_in_order(self, tmp_path):
+        """Candles are keyed by timestamp and read back oldest first"""
+        store = CandleStore(str(tmp_path / 'candles.db'))
+        store.append('BTC/USDT', '1h', [[2000, 1, 2, 0.5, 1.5, 10], [1000, 1, 2, 0.5, 1.2, 10]])
+        store.append('BTC/USDT', '1h', [[2000, 1, 2, 0.5, 1.8, 12]])
+
+        assert store.count('BTC/USDT', '1h') == 2
+        assert store.first_timestamp('BTC/USDT', '1h') == 1000
+        assert store.last_timestamp('BTC/USDT', '1h') == 2000
+        assert store.load('BTC/USDT', '1h') == [[1000, 1, 2, 0.5, 1.2, 10], [2000, 1, 2, 0.5, 1.8, 12]]
+        assert store.load('BTC/USDT', '1h', limit=1) == [[2000, 1, 2, 0.5, 1.8, 12]]
+        assert store.load('BTC/USDT', '4h') == []
+        store.close()
+
+    def test_second_fetch_downloads_only_new_candles(self, stored_market_data):
+        """After the first window, only candles since the last stored one are requested"""
+        exchange = stored_market_data.exchange
+        first = stored_market_data.fetch_ohlcv_data('BTC/USDT', '1h')
+        assert len(first) == 100
+        assert exchange.ohlcv_calls[-1]['since'] is None
+
+        exchange.now_ms += 3 * 3600 * 1000
+        exchange.forming_close = 0.25
+        second = stored_market_data.fetch_ohlcv_data('BTC/USDT', '1h')
+
+        assert exchange.ohlcv_calls[-1]['since'] == first.index[-1].value // 10**6
+        assert exchange.ohlcv_calls[-1]['limit'] == 4
+
+        expected = MarketData._ohlcv_to_dataframe(exchange.candles('1h'), 'BTC/USDT', '1h')
+        pd_testing.assert_frame_equal(second, expected)
+        assert second.attrs == {'symbol': 'BTC/USDT', 'timeframe': '1h'}
+
+    def test_gap_wider_than_window_is_paged_forward(self, stored_market_data, monkeypatch):
+        """A store more than `limit` candles stale is filled from its last candle, without a hole"""
+        monkeypatch.setattr(MarketData, 'HISTORY_PAGE_SIZE', 200)
+        exchange = stored_market_data.exchange
+        first = stored_market_data.fetch_ohlcv_data('BTC/USDT', '1h')
+        last_timestamp = first.index[-1].value // 10**6
+        exchange.now_ms += 500 * 3600 * 1000
+        calls = len(exchange.ohlcv_calls)
+        df = stored_market_data.fetch_ohlcv_data('BTC/USDT', '1h')
+
+        assert exchange.ohlcv_calls[calls]['since'] == last_timestamp
+        assert len(exchange.ohlcv_calls) - calls == 3
+        expected = MarketData._ohlcv_to_dataframe(exchange.candles('1h'), 'BTC/USDT', '1h')
+        pd_testing.assert_frame_equal(df, expected)
+
+        stored = [candle[0] for candle in stored_market_data.candle_store.load('BTC/USDT', '1h')]
+        assert len(stored) == 600
+        assert set(b - a for a, b in zip(stored, stored[1:])) == {3600 * 1000}
+
+    def test_historical_data_served_from_disk(self, stored_market_data, monkeypatch):
+        """Deep history is backfilled once and then read from the store"""
+        monkeypatch.setattr(MarketData, 'HISTORY_PAGE_SIZE', 200)
+        exchange = stored_market_data.exchange
+        since = exchange.now_ms - 500 * 3600 * 1000
+
+        df = stored_market_data.get_historical_data('BTC/USDT', '1h', since=since)
+        assert df.index[0].value // 10**6 >= since
+        assert len(df) == 500
+        assert df.index.is_monotonic_increasing and df.index.is_unique
+
+        calls = len(exchange.ohlcv_calls)
+        again = stored_market_data.get_historical_data('BTC/USDT', '1h', since=since)
+        assert len(exchange.ohlcv_calls) == calls + 1  # Only the delta refresh
+        pd_testing.assert_frame_equal(again, df)
+
+    def test_historical_data_memory_mapped(self, stored_market_data, tmp_path):
+        """With the history store, closed candles come back memory-mapped from column files"""
+        stored_market_data.history_store = HistoryStore(str(tmp_path / 'history'))
+        exchange = stored_market_data.exchange
+        since = exchange.now_ms - 300 * 3600 * 1000
+
+        df = stored_market_data.get_historical_data('BTC/USDT', '1h', since=since)
+        expected = MarketData._ohlcv_to_dataframe(exchange.candles('1h', since=since, limit=300)[:-1],
+                                                  'BTC/USDT', '1h')
+        pd_testing.assert_frame_equal(df, expected, check_index_type=False)
+        assert not df['close'].to_numpy().flags.writeable
+
+        # New closed candles are appended on the next call
+        exchange.now_ms += 2 * 3600 * 1000
+        df = stored_market_data.get_historical_data('BTC/USDT', '1h', since=since)
+        assert len(df) == 301
@@ -0,0 +1,152 @@
+"""
+Unit tests for parameter sweeps
+"""
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.backtest import Backtester
+from src.optimizer import ParameterSweep, grid_combinations, random_combinations
+from src.strategies import InsideBarStrategy, SupertrendADXStrategy
+from src.utils.indicator_cache import IndicatorCache
+
+
+def make_candles(symbols=('BTC/USDT', 'ETH/USDT'), n=1200, seed=11):
+    rng = np.random.default_rng(seed)
+    candles = {}
+    for symbol in symbols:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.004, n)))
+        candles[symbol] = pd.DataFrame({
+            'open': close,
+            'high': close * (1 + np.abs(rng.normal(0, 0.002, n))),
+            'low': close * (1 - np.abs(rng.normal(0, 0.002, n))),
+            'close': close,
+            'volume': rng.uniform(1, 10, n)
+        }, index=pd.DatetimeIndex(pd.date_range('2024-01-01', periods=n, freq='15min'), name='timestamp'))
+    return candles
+
+
+class StubParameterManager:
+    """Records profiles instead of writing the config directory"""
+
+    def __init__(self, existing=()):
+        self.profiles = {profile_id: {} for profile_id in existing}
+        self.updated = []
+
+    def create_profile(self, profile_id, name, description, parameters=None):
+        if profile_id in self.profiles:
+            return False
+        self.profiles[profile_id] = {'name': name, 'description': description, 'parameters': parameters}
+        return True
+
+    def update_profile(self, profile_id, name=None, description=None, parameters=None):
+        self.updated.append(profile_id)
+        self.profiles[profile_id] = {'name': name, 'description': description, 'parameters': parameters}
+        return True
+
+
+class TestCombinations:
+    """Test grid and random search spaces"""
+
+    def test_grid(self):
+        combinations = grid_combinations({'a': [1, 2], 'b': [0.5, 1.0, 1.5]})
+        assert len(combinations) == 6
+        assert combinations[0] == {'a': 1, 'b': 0.5}
+        assert combinations[-1] == {'a': 2, 'b': 1.5}
+
+    def test_random_ranges_and_choices(self):
+        combinations = random_combinations({'period': (5, 30), 'multiplier': (1.0, 4.0), 'adx': [20, 25]},
+                                           samples=50, seed=7)
+        assert len(combinations) == 50
+        assert all(isinstance(c['period'], int) and 5 <= c['period'] <= 30 for c in combinations)
+        assert all(1.0 <= c['multiplier'] <= 4.0 for c in combinations)
+        assert {c['adx'] for c in combinations} == {20, 25}
+        assert combinations == random_combinations({'period': (5, 30), 'multiplier': (1.0, 4.0), 'adx': [20, 25]},
+                                                   samples=50, seed=7)
+
+    def test_random_stops_at_space_size(self):
+        assert len(random_combinations({'a': [1, 2], 'b': [3]}, samples=10, seed=1)) == 2
+
+
+class TestParameterSweep:
+    """Test sweep results, ranking and profile export"""
+
+    def test_matches_standalone_backtests(self):
+        candles = make_candles()
+        combinations = [{'supertrend_period': 7, 'supertrend_multiplier': 2.0, 'adx_threshold': 20, 'atr_period': 10},
+                        {'supertrend_period': 10, 'supertrend_multiplier': 3.0, 'adx_threshold': 25, 'atr_period': 14}]
+        sweep = ParameterSweep('supertrend_adx', min_trades=0, max_workers=1)
+        results = sweep.run(candles, combinations=combinations)
+
+        assert results['success'] and results['combinations'] == 2
+        for result in results['results']:
+            strategy = SupertrendADXStrategy(cache=IndicatorCache())
+            strategy.set_parameters(result['parameters'])
+            expected = Backtester({'s': strategy}, max_workers=1).run(candles)['strategies']['s']
+            assert result['final_balance'] == pytest.approx(expected['final_balance'])
+            assert result['trades'] == expected['trades']
+
+    def test_ranked_by_objective(self):
+        sweep = ParameterSweep('inside_bar', objective='win_rate', min_trades=1, max_workers=1)
+        results = sweep.run(make_candles(), space={'atr_period': [7, 14], 'volatility_percentile': [10, 50]})
+
+        scores = [result['score'] for result in results['results']]
+        assert len(scores) == 4
+        assert scores == sorted(scores, reverse=True)
+        assert scores[0] == results['results'][0]['win_rate']
+
+    def test_parallel_matches_serial(self):
+        candles = make_candles(n=600)
+        space = {'atr_period': [7, 14], 'volatility_percentile': [20, 40]}
+        serial = ParameterSweep('inside_bar', min_trades=0, max_workers=1).run(candles, space=space)
+        parallel = ParameterSweep('inside_bar', min_trades=0, max_workers=2).run(candles, space=space)
+
+        assert [r['parameters'] for r in parallel['results']] == [r['parameters'] for r in serial['results']]
+        assert [r['final_balance'] for r in parallel['results']] == \
+            pytest.approx([r['final_balance'] for r in serial['results']])
+
+    def test_save_profiles(self):
+        sweep = ParameterSweep('inside_bar', min_trades=0, max_workers=1)
+        results = sweep.run(make_candles(n=600), space={'atr_period': [7, 14], 'volatility_percentile': [30]})
+        manager = StubParameterManager(existing=['inside_bar_sweep_1'])
+
+        profile_ids = sweep.save_profiles(results['results'], top=2, manager=manager)
+
+        assert profile_ids == ['inside_bar_sweep_1', 'inside_bar_sweep_2']
+        assert manager.updated == ['inside_bar_sweep_1']
+        assert manager.profiles['inside_bar_sweep_1']['parameters'] == results['results'][0]['parameters']
+        assert 'total_pnl_percent' in manager.profiles['inside_bar_sweep_2']['description']
+
+    def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            ParameterSweep('unknown')
+        with pytest.raises(ValueError):
+            ParameterSweep('inside_bar', objective='sharpe')
+        with pytest.raises(ValueError):
+            InsideBarStrategy().set_parameters({'supertrend_period': 5})
+
+
+class TestSharedInputs:
+    """Test reuse of precomputed indicator inputs"""
+
+    def test_put_seeds_cache(self):
+        df = make_candles(symbols=('BTC/USDT',))['BTC/USDT']
+        df.attrs.update(symbol='BTC/USDT', timeframe='15m')
+        cache = IndicatorCache()
+        true_range = pd.Series(np.ones(len(df)), index=df.index)
+        cache.put(df, 'true_range', (), true_range)
+
+        assert cache.true_range(df) is true_range
+        assert cache.atr(df, 14).iloc[-1] == pytest.approx(1.0)
+        assert cache.get_stats()['misses'] == 1
+
+    def test_percentile_rank_shared_across_thresholds(self):
+        df = make_candles(symbols=('BTC/USDT',))['BTC/USDT']
+        df.attrs.update(symbol='BTC/USDT', timeframe='15m')
+        cache = IndicatorCache()
+        low = cache.atr_in_bottom_percentile(df, 14, 50, 20)
+        high = cache.atr_in_bottom_percentile(df, 14, 50, 60)
+
+        rank = cache.atr_percentile_rank(df, 14, 50)
+        assert (low == (rank <= 20)).all() and (high == (rank <= 60)).all()
+        assert low.sum() < high.sum()
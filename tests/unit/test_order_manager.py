@@ -0,0 +1,77 @@
+"""
+Unit tests for order manager position tracking
+"""
+import threading
+import pytest
+
+from src.integrations.order_manager import OrderManager
+
+
+class StubTradingAPI:
+    """Records calls and checks that order_lock is free during requests"""
+
+    def __init__(self, positions):
+        self.positions = positions
+        self.order_manager = None
+        self.lock_free_during_requests = []
+        self.position_requests = 0
+        self.cancelled = []
+
+    def _lock_is_free(self):
+        result = []
+
+        def try_acquire():
+            acquired = self.order_manager.order_lock.acquire(blocking=False)
+            if acquired:
+                self.order_manager.order_lock.release()
+            result.append(acquired)
+
+        thread = threading.Thread(target=try_acquire)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def get_positions(self, symbols):
+        self.position_requests += 1
+        self.lock_free_during_requests.append(self._lock_is_free())
+        return {symbol: self.positions.get(symbol, {'symbol': symbol, 'size': 0.0}) for symbol in symbols}
+
+    def cancel_order(self, order_id, symbol):
+        self.lock_free_during_requests.append(self._lock_is_free())
+        self.cancelled.append((symbol, order_id))
+        return {'orderId': order_id, 'status': 'canceled'}
+
+
+@pytest.fixture
+def order_manager():
+    api = StubTradingAPI({'BTC/USDT': {'symbol': 'BTC/USDT', 'size': 0.5}})
+    manager = OrderManager(api)
+    api.order_manager = manager
+    for symbol in ('BTC/USDT', 'ETH/USDT', 'XRP/USDT'):
+        manager.open_positions[symbol] = {'size': 1.0, 'position_side': 'long', 'entry_price': 1.0}
+        manager.open_orders[symbol] = [{'orderId': f'{symbol}-tp', 'type': 'take_profit', 'position_side': 'long'}]
+    return manager
+
+
+class TestUpdatePositionStatus:
+    """Test reconciliation against the all-positions snapshot"""
+
+    def test_one_snapshot_for_all_positions(self, order_manager):
+        order_manager.update_position_status()
+
+        api = order_manager.trading_api
+        assert api.position_requests == 1
+        assert list(order_manager.open_positions) == ['BTC/USDT']
+        assert list(order_manager.open_orders) == ['BTC/USDT']
+        assert api.cancelled == [('ETH/USDT', 'ETH/USDT-tp'), ('XRP/USDT', 'XRP/USDT-tp')]
+
+    def test_lock_not_held_during_requests(self, order_manager):
+        order_manager.update_position_status()
+        assert order_manager.trading_api.lock_free_during_requests == [True, True, True]
+
+    def test_snapshot_errors_keep_tracking(self, order_manager):
+        order_manager.trading_api.positions = {symbol: {'error': 'timeout'} for symbol in order_manager.open_positions}
+        order_manager.update_position_status()
+
+        assert len(order_manager.open_positions) == 3
+        assert order_manager.trading_api.cancelled == []
@@ -0,0 +1,263 @@
+"""
+Unit tests for entry fill detection and TP/SL placement
+"""
+import time
+import threading
+import pytest
+
+from src.integrations import bidget
+from src.integrations.bidget import ContractMetadataCache, TradingAPI
+from src.integrations.order_manager import OrderManager
+from src.integrations.order_tracker import BitgetPrivateStream, OrderStateTracker
+from src.kline_stream import AIOHTTP_AVAILABLE, KlineReplayServer
+
+
+class StubTradingAPI:
+    """Reports the position open after a number of get_position calls"""
+
+    is_configured = False
+
+    def __init__(self, fills_after=0):
+        self.fills_after = fills_after
+        self.position_calls = []
+        self.orders = []
+        self.tpsl = []
+
+    def get_current_price(self, symbol):
+        return {'symbol': symbol, 'price': 100.0}
+
+    def get_position(self, symbol):
+        self.position_calls.append(time.monotonic())
+        if self.fills_after is not None and len(self.position_calls) > self.fills_after:
+            return {'symbol': symbol, 'size': 0.4, 'holdSide': 'long', 'entryPrice': 100.5}
+        return {'symbol': symbol, 'size': 0.0}
+
+    def place_order(self, **kwargs):
+        self.orders.append(kwargs)
+        return {'orderId': '42', 'status': 'new'}
+
+    def set_take_profit(self, symbol, quantity, price, position_side):
+        self.tpsl.append(('take_profit', quantity, price))
+        return {'orderId': 'tp-1'}
+
+    def set_stop_loss(self, symbol, quantity, stop_price, position_side):
+        self.tpsl.append(('stop_loss', quantity, stop_price))
+        return {'orderId': 'sl-1'}
+
+
+def position_frame(inst_id, total, hold_side='long'):
+    """Bitget private positions channel push"""
+    return {'action': 'snapshot', 'arg': {'instType': 'UMCBL', 'channel': 'positions', 'instId': 'default'},
+            'data': [{'instId': inst_id, 'holdSide': hold_side, 'total': str(total), 'averageOpenPrice': '100.5'}]}
+
+
+class TestOrderStateTracker:
+    """Test adaptive polling and streamed wake-ups"""
+
+    def test_poll_interval_backs_off(self):
+        api = StubTradingAPI(fills_after=4)
+        tracker = OrderStateTracker(api, poll_initial=0.02, poll_max=0.08)
+
+        position = tracker.wait_for_position('BTC/USDT', timeout=5)
+
+        assert position['size'] == 0.4
+        gaps = [b - a for a, b in zip(api.position_calls, api.position_calls[1:])]
+        assert len(gaps) == 4
+        assert gaps[0] < gaps[2]
+        assert all(gap < 0.5 for gap in gaps)
+
+    def test_timeout(self):
+        tracker = OrderStateTracker(StubTradingAPI(fills_after=None), poll_initial=0.01, poll_max=0.02)
+        start = time.monotonic()
+        assert tracker.wait_for_position('BTC/USDT', timeout=0.1) is None
+        assert time.monotonic() - start < 1
+
+    def test_streamed_update_wakes_wait(self):
+        api = StubTradingAPI(fills_after=None)
+        tracker = OrderStateTracker(api, poll_initial=5, poll_max=5)
+        results = []
+        waiter = threading.Thread(target=lambda: results.append(tracker.wait_for_position('XRP/USDT', timeout=10)))
+
+        start = time.monotonic()
+        waiter.start()
+        time.sleep(0.05)
+        tracker.on_position_update({'instId': 'BTCUSDT_UMCBL', 'holdSide': 'long', 'total': '1'})
+        tracker.on_position_update({'instId': 'XRPUSDT_UMCBL', 'holdSide': 'short', 'total': '100',
+                                    'averageOpenPrice': '0.5'})
+        waiter.join(5)
+
+        assert time.monotonic() - start < 1
+        assert results == [{'symbol': 'XRP/USDT', 'size': 100.0, 'holdSide': 'short', 'entryPrice': 0.5}]
+        assert len(api.position_calls) == 1
+
+    def test_stale_updates_ignored(self):
+        tracker = OrderStateTracker(StubTradingAPI(fills_after=None), poll_initial=0.01, poll_max=0.01)
+        tracker.on_position_update({'instId': 'BTCUSDT_UMCBL', 'holdSide': 'long', 'total': '1'})
+        assert tracker.wait_for_position('BTC/USDT', timeout=0.05) is None
+
+    def test_order_updates(self):
+        tracker = OrderStateTracker(StubTradingAPI())
+        tracker.on_order_update({'ordId': '42', 'instId': 'BTCUSDT_UMCBL', 'status': 'full-fill',
+                                 'accFillSz': '0.4', 'avgPx': '100.5'})
+        assert tracker.get_order('42') == {'orderId': '42', 'symbol': 'BTC/USDT', 'status': 'full-fill',
+                                           'filled_qty': 0.4, 'avg_price': 100.5}
+
+    @pytest.mark.skipif(not AIOHTTP_AVAILABLE, reason="aiohttp not installed")
+    def test_private_stream_feeds_tracker(self):
+        server = KlineReplayServer([position_frame('BTCUSDT_UMCBL', 0), position_frame('BTCUSDT_UMCBL', 0.4),
+                                    {'event': 'login', 'code': 0}])
+        server.start()
+        api = StubTradingAPI(fills_after=None)
+        tracker = OrderStateTracker(api, poll_initial=5, poll_max=5)
+        stream = BitgetPrivateStream('key', 'secret', 'pass', tracker, url=server.url)
+        since = time.monotonic()
+        stream.start()
+        try:
+            position = tracker.wait_for_position('BTC/USDT', timeout=10, since=since)
+        finally:
+            stream.stop()
+            server.stop()
+
+        assert position == {'symbol': 'BTC/USDT', 'size': 0.4, 'holdSide': 'long', 'entryPrice': 100.5}
+        assert len(api.position_calls) == 1
+
+    def test_login_signature(self):
+        message = BitgetPrivateStream('key', 'secret', 'pass', None, url='ws://127.0.0.1:1').login_message()
+        args = message['args'][0]
+        assert message['op'] == 'login'
+        assert args['apiKey'] == 'key' and args['passphrase'] == 'pass'
+        assert args['sign'] and args['timestamp'].isdigit()
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setenv('ORDER_POLL_INITIAL', '0.01')
+    monkeypatch.setenv('ORDER_POLL_MAX', '0.02')
+    monkeypatch.setenv('BITGET_PRIVATE_WS', 'false')
+    order_manager = OrderManager(StubTradingAPI(fills_after=2))
+    yield order_manager
+    order_manager.shutdown()
+
+
+class TestPlaceMainOrder:
+    """Test TP/SL placement around the entry fill"""
+
+    def test_preset_tpsl_is_opt_in(self, manager, monkeypatch):
+        assert manager.preset_tpsl is False
+        manager.place_main_order_with_tpsl('BTC/USDT', 'LONG', 0.4, take_profit=110.0, stop_loss=95.0)
+        assert 'take_profit' not in manager.trading_api.orders[0]
+
+        monkeypatch.setenv('ORDER_PRESET_TPSL', 'true')
+        enabled = OrderManager(StubTradingAPI())
+        assert enabled.preset_tpsl is True
+        enabled.shutdown()
+
+    def test_preset_tpsl_returns_without_waiting(self, manager):
+        manager.preset_tpsl = True
+        result = manager.place_main_order_with_tpsl('BTC/USDT', 'LONG', 0.4, take_profit=110.0, stop_loss=95.0)
+
+        api = manager.trading_api
+        assert api.orders[0]['take_profit'] == 110.0 and api.orders[0]['stop_loss'] == 95.0
+        assert result['take_profit_order'] == {'orderId': '42', 'preset': True, 'price': 110.0}
+        assert result['stop_loss_order'] == {'orderId': '42', 'preset': True, 'price': 95.0}
+        assert api.tpsl == []
+
+        manager.shutdown()
+        assert manager.open_positions['BTC/USDT'] == {'size': 0.4, 'position_side': 'long', 'entry_price': 100.5}
+
+    def test_separate_orders_use_filled_size(self, manager):
+        result = manager.place_main_order_with_tpsl('BTC/USDT', 'LONG', 0.5, take_profit=110.0, stop_loss=95.0)
+
+        api = manager.trading_api
+        assert 'take_profit' not in api.orders[0]
+        assert api.tpsl == [('take_profit', 0.4, 110.0), ('stop_loss', 0.4, 95.0)]
+        assert result['take_profit_order'] == {'orderId': 'tp-1'}
+        assert [order['type'] for order in manager.open_orders['BTC/USDT']] == ['main', 'take_profit', 'stop_loss']
+
+    def test_background_protection(self, manager):
+        result = manager.place_main_order_with_tpsl('BTC/USDT', 'LONG', 0.5, take_profit=110.0, wait=False)
+
+        assert result['take_profit_order'] is None
+        protection = result['protection'].result(timeout=5)
+        assert protection['take_profit_order'] == {'orderId': 'tp-1'}
+        assert protection['stop_loss_order'] is None
+
+    def test_place_order_sends_preset_prices(self, monkeypatch):
+        """Preset triggers are rounded to the contract tick (5 decimals for unknown contracts)"""
+        contracts = [{'symbol': 'BTCUSDT_UMCBL', 'pricePlace': '1', 'priceEndStep': '5'}]
+        monkeypatch.setattr(bidget, 'contract_cache', ContractMetadataCache(fetch=lambda: contracts))
+        monkeypatch.setenv('BITGET_API_KEY', 'key')
+        monkeypatch.setenv('BITGET_API_SECRET', 'secret')
+        monkeypatch.setenv('BITGET_API_PASSPHRASE', 'pass')
+        api = TradingAPI()
+        api.test_mode = False
+        posted = {}
+
+        def fake_request(method, endpoint, params=None, data=None, signed=True):
+            posted[endpoint] = data
+            if 'ticker' in endpoint:
+                return {'data': {'last': '100', 'high24h': '110', 'low24h': '90'}}
+            return {'data': {'orderId': '42', 'available': '1000'}}
+
+        monkeypatch.setattr(api, '_make_request', fake_request)
+        result = api.place_order('BTC/USDT', 'long', quantity=1.0, position_side='long',
+                                 take_profit=110.3, stop_loss=95.1)
+
+        order = posted['/api/mix/v1/order/placeOrder']
+        assert order['presetTakeProfitPrice'] == '110.5'
+        assert order['presetStopLossPrice'] == '95.0'
+        assert result['orderId'] == '42'
+
+        api.place_order('XRP/USDT', 'long', quantity=1.0, position_side='long', take_profit=0.5123456)
+        assert posted['/api/mix/v1/order/placeOrder']['presetTakeProfitPrice'] == '0.51235'
+
+    def test_place_order_rounds_size_to_lot(self, monkeypatch):
+        """Sizes are floored to the contract lot and undersized orders are never sent"""
+        contracts = [{'symbol': 'BTCUSDT_UMCBL', 'pricePlace': '1', 'priceEndStep': '5', 'volumePlace': '3',
+                      'sizeMultiplier': '0.001', 'minTradeNum': '0.001'}]
+        monkeypatch.setattr(bidget, 'contract_cache', ContractMetadataCache(fetch=lambda: contracts))
+        monkeypatch.setenv('BITGET_API_KEY', 'key')
+        monkeypatch.setenv('BITGET_API_SECRET', 'secret')
+        monkeypatch.setenv('BITGET_API_PASSPHRASE', 'pass')
+        api = TradingAPI()
+        api.test_mode = False
+        posted = []
+
+        def fake_request(method, endpoint, params=None, data=None, signed=True):
+            if endpoint == '/api/mix/v1/order/placeOrder':
+                posted.append(data)
+            if 'ticker' in endpoint:
+                return {'data': {'last': '100', 'high24h': '110', 'low24h': '90'}}
+            return {'data': {'orderId': '42', 'available': '1000'}}
+
+        monkeypatch.setattr(api, '_make_request', fake_request)
+        api.place_order('BTC/USDT', 'long', quantity=0.0129, position_side='long')
+        assert posted[-1]['size'] == '0.012'
+
+        result = api.place_order('BTC/USDT', 'long', quantity=0.0009, position_side='long')
+        assert 'error' in result
+        assert len(posted) == 1
+
+    def test_separate_tpsl_rounded_to_contract(self, monkeypatch):
+        """TP/SL plan orders use the contract tick and lot, as the default (non-preset) path sends every TP/SL there"""
+        contracts = [{'symbol': 'BTCUSDT_UMCBL', 'pricePlace': '1', 'priceEndStep': '5', 'volumePlace': '3',
+                      'sizeMultiplier': '0.001', 'minTradeNum': '0.001'}]
+        monkeypatch.setattr(bidget, 'contract_cache', ContractMetadataCache(fetch=lambda: contracts))
+        monkeypatch.setenv('BITGET_API_KEY', 'key')
+        monkeypatch.setenv('BITGET_API_SECRET', 'secret')
+        monkeypatch.setenv('BITGET_API_PASSPHRASE', 'pass')
+        api = TradingAPI()
+        api.test_mode = False
+        plans = []
+
+        def fake_request(method, endpoint, params=None, data=None, signed=True):
+            plans.append(data)
+            return {'data': {'orderId': '7'}}
+
+        monkeypatch.setattr(api, '_make_request', fake_request)
+        api.set_take_profit('BTC/USDT', 0.0129, 110.3, position_side='long')
+        api.set_stop_loss('BTC/USDT', 0.0129, 95.1, position_side='long')
+        assert [(plan['triggerPrice'], plan['size']) for plan in plans] == [('110.5', '0.012'), ('95.0', '0.012')]
+
+        assert 'error' in api.set_stop_loss('BTC/USDT', 0.0009, 95.1, position_side='long')
+        assert len(plans) == 2
@@ -13,6 +13,8 @@ except ImportError:
     # Fallback for different project structure
     from Inside.Bar.Strategy.src.strategies import SupertrendADXStrategy, InsideBarStrategy
 
+from tests.reference_strategies import reference_supertrend_adx_signals, reference_inside_bar_signals
+
 
 def make_sample_ohlcv(n=100):
     """Create sample OHLCV data for testing"""
@@ -91,6 +93,40 @@ class TestSuperTrendStrategy:
         assert not signals1['signal'].equals(signals2['signal'])
 
 
+class TestSuperTrendStrategyParity:
+    """Test the columnar signal path against the per-row reference"""
+    
+    def make_choppy_ohlcv(self, n=300):
+        """Create swinging data so the Supertrend flips several times"""
+        df = make_sample_ohlcv(n)
+        swing = 20 * np.sin(np.arange(n) / 6)
+        for col in ['open', 'high', 'low', 'close']:
+            df[col] = df[col] + swing
+        return df
+    
+    def test_signals_match_reference(self):
+        """Test that every output column matches the reference loop exactly"""
+        df = self.make_choppy_ohlcv()
+        strat = SupertrendADXStrategy()
+        strat.supertrend_multiplier = 1.5
+        
+        signals = strat.generate_signals(df)
+        expected = reference_supertrend_adx_signals(strat, df)
+        
+        assert signals['signal_triggered'].any()
+        pd.testing.assert_frame_equal(signals, expected, check_exact=True)
+    
+    def test_scalar_confidence_matches_scores(self):
+        """Test that calculate_confidence agrees with the vectorized scores"""
+        df = self.make_choppy_ohlcv()
+        strat = SupertrendADXStrategy()
+        signals = strat.generate_signals(df)
+        scores = strat.calculate_confidence_scores(signals)
+        
+        for i in [0, 1, len(signals) // 2, len(signals) - 1]:
+            assert strat.calculate_confidence(signals, i) == scores[i]
+
+
 class TestInsideBarStrategy:
     """Test Inside Bar strategy implementation"""
     
@@ -133,6 +169,48 @@ class TestInsideBarStrategy:
         assert signals['signal'].abs().sum() >= 0  # May or may not detect depending on implementation
 
 
+class TestInsideBarStrategyParity:
+    """Test the columnar signal path against the per-row reference"""
+    
+    def make_ranging_ohlcv(self, n=1500):
+        """Create flat, noisy data with plenty of inside bars and breakouts"""
+        rng = np.random.default_rng(7)
+        times = [datetime(2024, 1, 1) + timedelta(minutes=15 * i) for i in range(n)]
+        mid = 100 + rng.normal(0, 0.5, n)
+        df = pd.DataFrame({
+            'timestamp': times,
+            'open': mid,
+            'high': mid + np.abs(rng.normal(0, 1, n)) * rng.uniform(0.2, 2, n),
+            'low': mid - np.abs(rng.normal(0, 1, n)) * rng.uniform(0.2, 2, n),
+            'close': mid + rng.normal(0, 0.3, n),
+            'volume': rng.random(n) * 1000
+        })
+        df.set_index('timestamp', inplace=True)
+        return df
+    
+    @pytest.mark.parametrize("lookback", [5, 50])
+    def test_signals_match_reference(self, lookback):
+        """Test that every output column matches the reference loop exactly"""
+        df = self.make_ranging_ohlcv()
+        strat = InsideBarStrategy()
+        strat.lookback_period = lookback
+        
+        signals = strat.generate_signals(df)
+        expected = reference_inside_bar_signals(strat, df)
+        
+        assert (signals['signal'] == 1).any() and (signals['signal'] == -1).any()
+        pd.testing.assert_frame_equal(signals, expected, check_exact=True)
+    
+    def test_target_columns_without_signals(self):
+        """Test that profit target and stop loss columns exist even with no signals"""
+        df = make_sample_ohlcv(30)
+        signals = InsideBarStrategy().generate_signals(df)
+        
+        assert not signals['signal_triggered'].any()
+        assert signals['profit_target'].isna().all()
+        assert signals['stop_loss'].isna().all()
+
+
 class TestStrategyIntegration:
     """Test integration between strategies and indicators"""
     
@@ -0,0 +1,156 @@
+"""
+Unit tests for parallel strategy evaluation
+"""
+import pickle
+import pytest
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+
+from src.strategies import SupertrendADXStrategy, InsideBarStrategy
+from src.strategy_evaluator import ParallelStrategyEvaluator, closed_candles
+from src.utils.indicator_cache import IndicatorCache, indicator_cache
+
+
+def make_market_data(symbols=('BTC/USDT', 'ETH/USDT', 'XRP/USDT'), timeframes=('15m', '1h'), n=300):
+    """Nested dict of tagged OHLCV frames, shaped like MarketData.scan_all_markets output"""
+    rng = np.random.default_rng(5)
+    market_data = {}
+    for symbol in symbols:
+        market_data[symbol] = {}
+        for timeframe in timeframes:
+            times = pd.to_datetime([datetime(2024, 1, 1) + timedelta(minutes=15 * i) for i in range(n)])
+            close = 100 + np.cumsum(rng.normal(0, 1.5, n))
+            df = pd.DataFrame({
+                'open': close + rng.normal(0, 0.3, n),
+                'high': close + np.abs(rng.normal(0, 1, n)) + 0.5,
+                'low': close - np.abs(rng.normal(0, 1, n)) - 0.5,
+                'close': close,
+                'volume': rng.random(n) * 1000
+            }, index=pd.DatetimeIndex(times, name='timestamp'))
+            df.attrs.update(symbol=symbol, timeframe=timeframe)
+            market_data[symbol][timeframe] = df
+    market_data['DOGE/USDT'] = {'15m': pd.DataFrame()}
+    return market_data
+
+
+def make_strategies():
+    return {
+        "supertrend_adx": SupertrendADXStrategy(cache=IndicatorCache()),
+        "inside_bar": InsideBarStrategy(cache=IndicatorCache())
+    }
+
+
+class TestParallelStrategyEvaluator:
+    """Test process-pool evaluation against the serial scan"""
+
+    def test_parallel_matches_serial(self):
+        """Same signals in the same (symbol, timeframe, strategy) order"""
+        market_data = make_market_data()
+        serial = ParallelStrategyEvaluator(make_strategies(), max_workers=1, last_bar_only=False).evaluate(market_data)
+
+        evaluator = ParallelStrategyEvaluator(make_strategies(), max_workers=2, last_bar_only=False)
+        try:
+            parallel = evaluator.evaluate(market_data)
+            again = evaluator.evaluate(market_data)
+        finally:
+            evaluator.shutdown()
+
+        assert len(serial) > 0
+        assert parallel == serial
+        assert again == serial
+
+    def test_parameter_changes_reach_running_pool(self):
+        """set_parameters on the parent's strategies applies to the next parallel scan"""
+        market_data = make_market_data()
+        changed = {'supertrend_period': 7, 'supertrend_multiplier': 2.0, 'adx_threshold': 15}
+        serial_strategies = make_strategies()
+        serial_strategies['supertrend_adx'].set_parameters(changed)
+        expected = ParallelStrategyEvaluator(serial_strategies, max_workers=1, last_bar_only=False).evaluate(market_data)
+
+        evaluator = ParallelStrategyEvaluator(make_strategies(), max_workers=2, last_bar_only=False)
+        try:
+            before = evaluator.evaluate(market_data)
+            evaluator.strategies['supertrend_adx'].set_parameters(changed)
+            after = evaluator.evaluate(market_data)
+        finally:
+            evaluator.shutdown()
+
+        assert before != expected
+        assert after == expected
+
+    def test_cache_stats_summed_over_workers(self):
+        """Lookups made in the worker processes are reported, not the parent's cache"""
+        market_data = make_market_data()
+        evaluator = ParallelStrategyEvaluator(make_strategies(), max_workers=2, last_bar_only=False)
+        parent_stats = indicator_cache.get_stats()
+        try:
+            evaluator.evaluate(market_data)
+        finally:
+            evaluator.shutdown()
+
+        assert evaluator.cache_stats['hits'] + evaluator.cache_stats['misses'] > 0
+        assert indicator_cache.get_stats()['misses'] == parent_stats['misses']
+
+    def test_signals_in_deterministic_order(self):
+        """Signals are grouped by symbol, then timeframe, then strategy"""
+        market_data = make_market_data()
+        signals = ParallelStrategyEvaluator(make_strategies(), max_workers=1, last_bar_only=False).evaluate(market_data)
+
+        order = [(s['symbol'], s['timeframe'], s['strategy']) for s in signals]
+        rank = {key: i for i, key in enumerate(
+            (symbol, timeframe, strategy)
+            for symbol in market_data for timeframe in market_data[symbol]
+            for strategy in ('supertrend_adx', 'inside_bar')
+        )}
+        assert [rank[key] for key in order] == sorted(rank[key] for key in order)
+
+    def test_strategy_pickles_without_cache(self):
+        """Strategies cross the process boundary and use the receiving process' cache"""
+        strategy = SupertrendADXStrategy(cache=IndicatorCache())
+        restored = pickle.loads(pickle.dumps(strategy))
+
+        assert restored.indicator_cache is indicator_cache
+        assert restored.atr_period == strategy.atr_period
+
+
+class TestLastBarEvaluation:
+    """Test last-bar evaluation mode"""
+
+    def test_last_bar_matches_full_history(self):
+        """Each closed bar yields exactly the signal the full-history scan reports for it"""
+        market_data = make_market_data(symbols=('BTC/USDT',), timeframes=('15m',), n=400)
+        df = market_data['BTC/USDT']['15m']
+        full = ParallelStrategyEvaluator(make_strategies(), max_workers=1, last_bar_only=False).evaluate(market_data)
+
+        evaluator = ParallelStrategyEvaluator(make_strategies(), max_workers=1, last_bar_only=True)
+        streamed = []
+        for end in range(2, len(df) + 1):
+            window = df.iloc[:end]
+            streamed.extend(evaluator.evaluate({'BTC/USDT': {'15m': window}}))
+
+        key = lambda s: (s['timestamp'], s['strategy'])
+        assert len(full) > 0
+        assert sorted(streamed, key=key) == sorted(full, key=key)
+
+    def test_bar_emitted_once(self):
+        """Re-scanning the same closed candles does not emit the same signal again"""
+        market_data = make_market_data(symbols=('BTC/USDT',), timeframes=('15m',), n=400)
+        df = market_data['BTC/USDT']['15m']
+        evaluator = ParallelStrategyEvaluator(make_strategies(), max_workers=1, last_bar_only=True)
+
+        for end in range(3, len(df) + 1):
+            first = evaluator.evaluate({'BTC/USDT': {'15m': df.iloc[:end]}})
+            if first:
+                break
+        assert first
+        assert evaluator.evaluate({'BTC/USDT': {'15m': df.iloc[:end]}}) == []
+
+    def test_forming_candle_is_dropped(self):
+        """Only candles whose period has ended are evaluated"""
+        df = make_market_data(symbols=('BTC/USDT',), timeframes=('15m',), n=10)['BTC/USDT']['15m']
+        last_open = df.index[-1]
+
+        assert len(closed_candles(df, now=last_open + pd.Timedelta(minutes=14))) == 9
+        assert len(closed_candles(df, now=last_open + pd.Timedelta(minutes=15))) == 10
+        assert closed_candles(df, now=last_open).attrs == df.attrs
@@ -0,0 +1,44 @@
+"""
+Unit tests for the symbol registry
+"""
+import pytest
+
+from src.utils.symbols import SymbolRegistry
+
+
+@pytest.fixture
+def registry():
+    return SymbolRegistry()
+
+
+class TestSymbolRegistry:
+    """Test conversions between ccxt, Bitget and Binance notations"""
+
+    @pytest.mark.parametrize('symbol', ['BTC/USDT', 'BTC/USDT:USDT', 'BTCUSDT', 'btcusdt', 'BTCUSDT_UMCBL', 'BTC'])
+    def test_every_notation_converts(self, registry, symbol):
+        assert registry.to_ccxt(symbol) == 'BTC/USDT'
+        assert registry.to_bitget(symbol) == 'BTCUSDT_UMCBL'
+        assert registry.to_binance(symbol) == 'BTCUSDT'
+
+    def test_other_quotes(self, registry):
+        assert registry.parse('ETHUSDC') == ('ETH', 'USDC')
+        assert registry.to_ccxt('ETHUSDC') == 'ETH/USDC'
+        # _UMCBL is the USDT-margined product, other quotes have no symbol there
+        assert registry.to_bitget('ETH/USDC') is None
+        assert registry.to_bitget('ETHBUSD') is None
+
+    def test_bitget_aliases_round_trip(self, registry):
+        assert registry.to_bitget('1000SHIB/USDT') == 'SHIBUSDT_UMCBL'
+        assert registry.from_bitget('SHIBUSDT_UMCBL') == '1000SHIB/USDT'
+        assert registry.to_ccxt('SHIBUSDT_UMCBL') == '1000SHIB/USDT'
+        assert registry.from_bitget('PEPEUSDT_UMCBL') == 'PEPE/USDT'
+
+    def test_unlisted_on_bitget(self, registry):
+        assert registry.to_bitget('SC/USDT') is None
+        assert registry.to_binance('SC/USDT') == 'SCUSDT'
+
+    def test_conversions_memoized(self, registry):
+        first = registry.to_bitget('XRP/USDT')
+        assert registry.to_bitget('XRP/USDT') is first
+        assert registry.to_binance('XRP/USDT') is registry.to_binance('XRP/USDT')
+        assert 'XRP/USDT' in registry._pairs